@@ -1,9 +1,40 @@
 """Admin blueprint - system administration routes."""
 
-from flask import Blueprint, request, jsonify, make_response, current_app
+from flask import Blueprint, Response, request, jsonify, make_response, current_app, send_file
 from backend.db_connection import db
+from backend.admin.log_partitions import list_partitions, run_partition_maintenance
+from backend.admin.health import get_health, latest_snapshot
+from backend.admin.index_advisor import advise, workload_from_digests
+from backend.admin.data_loads import (
+    LOAD_STATUSES, LOAD_STATUS_SEVERITY, CLEANUP_FREQUENCIES, DEFAULT_RETRY_POLICY,
+    create_data_load, record_load_failure, create_retry_attempt, claim_next_load
+)
+from backend.admin.stat_validation import VALIDATORS, validate_player_game_stats, record_rejections
+from backend.metrics import registry as metrics_registry
+from backend.profiling import list_profiles, profile_paths
+from backend.tracing import recent_traces, get_trace
+from backend import etags, query_stats, startup
 from datetime import datetime, timedelta
 import json
+import os
+
+# Statuses a loader may report through PUT /data-loads/<id>; the retry
+# states are only set by the retry policy
+REPORTABLE_LOAD_STATUSES = ('pending', 'running', 'completed', 'failed')
+
+# Cap on rejections echoed back by POST /data-validation (all are logged)
+MAX_RETURNED_REJECTIONS = 500
+
+
+def _window_start(days=0, hours=0):
+    """Start of a lookback window as a literal datetime.
+
+    SystemLogs is partitioned on created_at; binding the cutoff as a value
+    (rather than DATE_SUB(NOW(), ...)) lets MySQL prune partitions when the
+    statement is planned.
+    """
+    return datetime.now() - timedelta(days=days, hours=hours)
+
 
 # --- New helper: normalize severity values used across routes ---
 def _normalize_severity(raw):
@@ -49,88 +80,19 @@ def get_system_health():
     """
     Get comprehensive system health status including database connectivity,
     recent errors, and performance metrics.
+
+    Served from the snapshot the `health_snapshot` background job refreshes
+    every HEALTH_SAMPLE_INTERVAL seconds; `sample_age_seconds` says how old
+    it is. A snapshot is taken inline only when none exists yet or the job
+    has fallen behind.
     """
     try:
-        current_app.logger.info('GET /system/health - Checking system health status')
-
-        cursor = db.get_db().cursor()
-
-        # Verify database connectivity
-        cursor.execute('SELECT 1')
-        db_status = 'healthy' if cursor.fetchone() else 'unhealthy'
-
-        # Get recent error count (last 24 hours)
-        # Be tolerant of sample data where severity or log_type may use alternate values
-        cursor.execute('''
-            SELECT COUNT(*) as error_count
-            FROM SystemLogs
-            WHERE (log_type IN ('error','validation') OR severity IN ('error','critical','high','medium'))
-              AND created_at >= DATE_SUB(NOW(), INTERVAL 24 HOUR)
-        ''')
-        recent_errors_result = cursor.fetchone()
-        recent_errors = recent_errors_result['error_count'] if recent_errors_result else 0
-
-        # Get active data loads - be permissive and look for rows that clearly indicate a load
-        cursor.execute('''
-            SELECT COUNT(*) as active_loads
-            FROM SystemLogs
-            WHERE (log_type = 'data_load'
-                   OR LOWER(service_name) LIKE '%data%'
-                   OR LOWER(service_name) LIKE '%feed%'
-                   OR LOWER(message) LIKE '%load%')
-              AND resolved_at IS NULL
-        ''')
-        active_loads_result = cursor.fetchone()
-        active_loads = active_loads_result['active_loads'] if active_loads_result else 0
-
-        # Get last successful data load - look for explicit data_load records or messages that contain 'completed' or 'processed'
-        cursor.execute('''
-            SELECT log_id, service_name, message, created_at, resolved_at
-            FROM SystemLogs
-            WHERE (log_type = 'data_load' OR LOWER(message) LIKE '%completed%' OR LOWER(message) LIKE '%processed%')
-            ORDER BY IFNULL(resolved_at, created_at) DESC
-            LIMIT 1
-        ''')
-        last_successful_load_raw = cursor.fetchone()
-
-        last_successful_load = None
-        if last_successful_load_raw:
-            last_successful_load = {
-                'load_id': last_successful_load_raw.get('log_id'),
-                'load_type': last_successful_load_raw.get('service_name'),
-                'message': last_successful_load_raw.get('message'),
-                'completed_at': last_successful_load_raw.get('resolved_at') or last_successful_load_raw.get('created_at')
-            }
-
-        # Get system metrics
-        cursor.execute('''
-            SELECT
-                (SELECT COUNT(*) FROM Players) as total_players,
-                (SELECT COUNT(*) FROM Teams) as total_teams,
-                (SELECT COUNT(*) FROM Game) as total_games,
-                (SELECT COUNT(*) FROM Users) as total_users
-        ''')
-        system_metrics = cursor.fetchone()
-
-        # Determine overall system status
-        overall_status = 'operational'
-        if db_status != 'healthy':
-            overall_status = 'critical'
-        elif recent_errors > 10:
-            overall_status = 'degraded'
-        elif active_loads > 5:
-            overall_status = 'warning'
-
-        response_data = {
-            'overall_status': overall_status,
-            'database_status': db_status,
-            'recent_errors_24h': recent_errors,
-            'active_data_loads': active_loads,
-            'last_successful_load': last_successful_load,
-            'system_metrics': system_metrics,
-            'health_check_timestamp': datetime.now().isoformat()
-        }
+        interval = current_app.config['HEALTH_SAMPLE_INTERVAL']
+        jobs_enabled = current_app.config.get('BACKGROUND_JOBS_ENABLED')
+        max_age = interval * 3 if jobs_enabled else interval
 
+        response_data = get_health(max_age)
+        response_data['sample_interval_seconds'] = interval
         return make_response(jsonify(response_data), 200)
 
     except Exception as e:
@@ -142,6 +104,53 @@ def get_system_health():
         }), 500)
 
 
+@admin.route('/live', methods=['GET'])
+def get_liveness():
+    """Liveness probe: the process is up and serving requests. Never touches the database."""
+    return make_response(jsonify({'status': 'alive'}), 200)
+
+
+@admin.route('/ready', methods=['GET'])
+def get_readiness():
+    """
+    Readiness probe: warm-up has finished (WARMUP_ENABLED) and a pooled
+    database connection answers a ping. Returns 503 otherwise, so load
+    balancers only route here once the process is warm. The body carries the
+    startup phase timings and the warm-up summary.
+    """
+    _, age = latest_snapshot()
+    body = {
+        'health_sample_age_seconds': round(age, 3) if age is not None else None,
+        'startup': startup.status(),
+        'timestamp': datetime.now().isoformat()
+    }
+    if not startup.is_ready():
+        body.update({'status': 'warming_up'})
+        return make_response(jsonify(body), 503)
+
+    try:
+        db.get_db().ping(reconnect=True)
+    except Exception as e:
+        current_app.logger.warning(f'GET /system/ready - database not reachable: {e}')
+        body.update({'status': 'not_ready', 'database': 'unreachable'})
+        return make_response(jsonify(body), 503)
+
+    body.update({'status': 'ready', 'database': 'ok'})
+    return make_response(jsonify(body), 200)
+
+
+@admin.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Process metrics in the Prometheus text exposition format: request
+    latency histograms per blueprint and route, in-flight requests, SQL
+    statement counts and durations, connection pool gauges, cache hit
+    ratios and background job state. Reads only in-memory counters, so it is
+    cheap to scrape.
+    """
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+
 # ============================================================================
 # DATA LOAD MANAGEMENT ROUTES
 # ============================================================================
@@ -150,6 +159,8 @@ def get_system_health():
 def get_data_loads():
     """
     Get details about data load operations and their status.
+
+    Query params: status (pending/running/completed/failed/retry_scheduled/dead_letter), days, load_type
     """
     try:
         current_app.logger.info('GET /system/data-loads - Fetching data loads')
@@ -158,84 +169,61 @@ def get_data_loads():
         days = request.args.get('days', 7, type=int)
         load_type = request.args.get('load_type')
 
+        if status and status not in LOAD_STATUSES:
+            return make_response(jsonify({
+                "error": f"Invalid status. Must be one of: {', '.join(LOAD_STATUSES)}"
+            }), 400)
+
         cursor = db.get_db().cursor()
 
-        # Be permissive when identifying data_load rows: either explicit log_type or service/message patterns
-        query = f'''
+        query = '''
             SELECT
-                log_id as load_id,
-                service_name as load_type,
-                -- normalize status using both log_type and severity (including legacy values)
-                CASE
-                    WHEN (severity IN ('info','low') AND resolved_at IS NOT NULL) OR (log_type = 'data_load' AND severity IN ('info','low')) THEN 'completed'
-                    WHEN (severity IN ('error','critical','high') OR log_type = 'error') THEN 'failed'
-                    WHEN (severity IN ('warning','medium') AND resolved_at IS NULL) THEN 'running'
-                    WHEN (severity IN ('warning','medium') AND resolved_at IS NOT NULL) THEN 'completed'
-                    ELSE 'pending'
-                END as status,
-                severity,
-                created_at as started_at,
-                resolved_at as completed_at,
-                IFNULL(records_processed, 0) as records_processed,
-                IFNULL(records_failed, 0) as records_failed,
-                message as error_message,
-                source_file,
-                (SELECT username FROM Users WHERE user_id = SystemLogs.user_id) as initiated_by,
-                TIMESTAMPDIFF(SECOND, created_at, IFNULL(resolved_at, NOW())) as duration_seconds
-            FROM SystemLogs
-            WHERE (log_type = 'data_load' OR LOWER(service_name) LIKE '%%data%%' OR LOWER(service_name) LIKE '%%feed%%' OR LOWER(message) LIKE '%%load%%')
-              AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
+                dl.load_id,
+                dl.load_type,
+                dl.status,
+                dl.started_at,
+                dl.completed_at,
+                dl.records_processed,
+                dl.records_failed,
+                dl.error_message,
+                dl.source_file,
+                dl.attempt,
+                dl.original_load_id,
+                dl.next_retry_at,
+                dl.error_code,
+                u.username as initiated_by,
+                TIMESTAMPDIFF(SECOND, dl.started_at, IFNULL(dl.completed_at, NOW())) as duration_seconds
+            FROM DataLoads dl
+            LEFT JOIN Users u ON u.user_id = dl.initiated_by
+            WHERE dl.started_at >= %s
         '''
 
-        params = []
+        since = _window_start(days=days)
+        params = [since]
 
         if status:
-            # Accept frontend status and filter against our computed status or legacy severity values
-            if status == 'completed':
-                query += ' AND ((severity IN ("info","low") AND resolved_at IS NOT NULL) OR (severity IN ("warning","medium") AND resolved_at IS NOT NULL) OR log_type = "data_load")'
-            elif status == 'failed':
-                query += ' AND (severity IN ("error","critical","high") OR log_type = "error")'
-            elif status == 'running':
-                query += ' AND ( (severity IN ("warning","medium") AND resolved_at IS NULL) OR (resolved_at IS NULL AND log_type = "data_load") )'
-            elif status == 'pending':
-                query += ' AND severity NOT IN ("info","low","warning","medium","error","critical","high")'
+            query += ' AND dl.status = %s'
+            params.append(status)
 
         if load_type:
-            query += ' AND service_name = %s'
+            query += ' AND dl.load_type = %s'
             params.append(load_type)
 
-        query += ' ORDER BY created_at DESC'
+        query += ' ORDER BY dl.started_at DESC'
 
         cursor.execute(query, params)
         loads_data = cursor.fetchall()
 
-        # Post-process to ensure severity/status normalized for JSON consumers
+        # Severity kept for consumers that colour rows by it
         for row in loads_data:
-            row['severity'] = _normalize_severity(row.get('severity') or row.get('log_type'))
-            # ensure load_type has a friendly value
-            row['load_type'] = row.get('load_type')
+            row['severity'] = LOAD_STATUS_SEVERITY[row['status']]
 
-        # Get status summary (tolerant of legacy severity values)
-        cursor.execute(f'''
-            SELECT
-                CASE
-                    WHEN (severity IN ('info','low') AND resolved_at IS NOT NULL) OR (severity IN ('warning','medium') AND resolved_at IS NOT NULL) THEN 'completed'
-                    WHEN (severity IN ('error','critical','high')) THEN 'failed'
-                    WHEN (severity IN ('warning','medium') AND resolved_at IS NULL) THEN 'running'
-                    ELSE 'pending'
-                END as status,
-                COUNT(*) as count
-            FROM SystemLogs
-            WHERE (log_type = 'data_load' OR LOWER(service_name) LIKE '%%data%%' OR LOWER(message) LIKE '%%load%%')
-              AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            GROUP BY
-                CASE
-                    WHEN (severity IN ('info','low') AND resolved_at IS NOT NULL) OR (severity IN ('warning','medium') AND resolved_at IS NOT NULL) THEN 'completed'
-                    WHEN (severity IN ('error','critical','high')) THEN 'failed'
-                    WHEN (severity IN ('warning','medium') AND resolved_at IS NULL) THEN 'running'
-                    ELSE 'pending'
-                END
-        ''')
+        cursor.execute('''
+            SELECT status, COUNT(*) as count
+            FROM DataLoads
+            WHERE started_at >= %s
+            GROUP BY status
+        ''', (since,))
 
         status_summary = cursor.fetchall()
 
@@ -282,8 +270,9 @@ def start_data_load():
 
         # Check for existing running loads of the same type
         cursor.execute('''
-            SELECT log_id FROM SystemLogs
-            WHERE log_type = 'data_load' AND service_name = %s AND resolved_at IS NULL
+            SELECT load_id FROM DataLoads
+            WHERE load_type = %s AND status = 'running'
+            LIMIT 1
         ''', (load_data['load_type'],))
 
         if cursor.fetchone():
@@ -291,26 +280,13 @@ def start_data_load():
                 "error": "A load of this type is already running"
             }), 409)
 
-        # Insert new data load
-        query = '''
-            INSERT INTO SystemLogs (
-                log_type, service_name, severity, message, source_file, user_id
-            ) VALUES ('data_load', %s, 'warning', 'Data load initiated', %s, 
-                (SELECT user_id FROM Users WHERE username = %s LIMIT 1))
-        '''
-
-        values = (
-            load_data['load_type'],
-            load_data.get('source_file'),
-            load_data['initiated_by']
-        )
-
-        cursor.execute(query, values)
+        load_id = create_data_load(cursor, load_data['load_type'],
+                                   load_data.get('source_file'), load_data['initiated_by'])
         db.get_db().commit()
 
         return make_response(jsonify({
             "message": "Data load initiated successfully",
-            "load_id": cursor.lastrowid,
+            "load_id": load_id,
             "load_type": load_data['load_type'],
             "status": "running"
         }), 201)
@@ -326,12 +302,17 @@ def update_data_load(load_id):
     """
     Update the status and metrics of a data load.
 
+    A 'failed' status goes through the load_type's retry policy: transient
+    failures (deadlocks, lock wait timeouts, dropped connections) are
+    scheduled for an automatic retry, or dead-lettered once attempts run out.
+
     Expected JSON Body:
         {
-            "status": "string" (completed, failed),
+            "status": "string" (running, completed, failed),
             "records_processed": int,
             "records_failed": int,
-            "error_message": "string"
+            "error_message": "string",
+            "error_code": int (MySQL error number, used to detect transient failures)
         }
 
     User Stories: [Mike-2.1]
@@ -344,10 +325,16 @@ def update_data_load(load_id):
         if not update_data:
             return make_response(jsonify({"error": "No update data provided"}), 400)
 
+        status = update_data.get('status')
+        if status is not None and status not in REPORTABLE_LOAD_STATUSES:
+            return make_response(jsonify({
+                "error": f"Invalid status. Must be one of: {', '.join(REPORTABLE_LOAD_STATUSES)}"
+            }), 400)
+
         cursor = db.get_db().cursor()
 
         # Verify load exists
-        cursor.execute("SELECT log_id FROM SystemLogs WHERE log_id = %s AND log_type = 'data_load'", (load_id,))
+        cursor.execute('SELECT load_id FROM DataLoads WHERE load_id = %s', (load_id,))
         if not cursor.fetchone():
             return make_response(jsonify({"error": "Data load not found"}), 404)
 
@@ -355,20 +342,10 @@ def update_data_load(load_id):
         update_fields = []
         values = []
 
-        if 'status' in update_data:
-            status = update_data['status']
-            if status == 'completed':
-                update_fields.append("severity = 'info'")
-                update_fields.append("message = 'Data load completed successfully'")
-            elif status == 'failed':
-                update_fields.append("severity = 'error'")
-                if 'error_message' in update_data:
-                    update_fields.append("message = %s")
-                    values.append(update_data['error_message'])
-                else:
-                    update_fields.append("message = 'Data load failed'")
-            update_fields.append('resolved_at = NOW()')
-
+        if status is not None and status != 'failed':
+            update_fields.append('status = %s')
+            values.append(status)
+            update_fields.append('completed_at = NOW()' if status == 'completed' else 'completed_at = NULL')
 
         for field in ['records_processed', 'records_failed']:
             if field in update_data:
@@ -376,16 +353,28 @@ def update_data_load(load_id):
                 values.append(update_data[field])
 
         if update_fields:
-            query = f"UPDATE SystemLogs SET {', '.join(update_fields)} WHERE log_id = %s"
+            query = f"UPDATE DataLoads SET {', '.join(update_fields)} WHERE load_id = %s"
             values.append(load_id)
             cursor.execute(query, values)
-            db.get_db().commit()
 
-        return make_response(jsonify({
+        retry = None
+        if status == 'failed':
+            retry = record_load_failure(cursor, load_id,
+                                        error_message=update_data.get('error_message'),
+                                        error_code=update_data.get('error_code'))
+
+        db.get_db().commit()
+
+        response_data = {
             "message": "Data load updated successfully",
             "load_id": load_id,
             "updated_fields": list(update_data.keys())
-        }), 200)
+        }
+        if retry:
+            response_data['status'] = retry['status']
+            response_data['retry'] = retry
+
+        return make_response(jsonify(response_data), 200)
 
     except Exception as e:
         current_app.logger.error(f'Error updating data load: {e}')
@@ -393,6 +382,253 @@ def update_data_load(load_id):
         return make_response(jsonify({"error": "Failed to update data load"}), 500)
 
 
+@admin.route('/data-loads/<int:load_id>/retry', methods=['POST'])
+def retry_data_load(load_id):
+    """
+    Manually retry a failed or dead-lettered load. The new attempt is created
+    as 'pending' and linked to the original load like an automatic retry.
+
+    User Stories: [Mike-2.1]
+    """
+    try:
+        current_app.logger.info(f'POST /system/data-loads/{load_id}/retry - Retrying data load')
+
+        cursor = db.get_db().cursor()
+
+        # Locked until commit, so a concurrent manual retry or the retry job waits and then
+        # sees the attempt created here
+        cursor.execute('''
+            SELECT load_id, status, attempt, IFNULL(original_load_id, load_id) AS root_id
+            FROM DataLoads
+            WHERE load_id = %s
+            FOR UPDATE
+        ''', (load_id,))
+        load = cursor.fetchone()
+        if not load:
+            return make_response(jsonify({"error": "Data load not found"}), 404)
+        if load['status'] not in ('failed', 'dead_letter', 'retry_scheduled'):
+            return make_response(jsonify({
+                "error": f"Only failed loads can be retried (status is {load['status']})"
+            }), 409)
+
+        # A retried attempt goes back to 'failed': only the latest attempt can be retried
+        cursor.execute('''
+            SELECT load_id
+            FROM DataLoads
+            WHERE original_load_id = %s AND attempt > %s
+            ORDER BY attempt DESC
+            LIMIT 1
+            FOR UPDATE
+        ''', (load['root_id'], load['attempt']))
+        newer = cursor.fetchone()
+        if newer:
+            db.get_db().rollback()
+            return make_response(jsonify({
+                "error": f"Load {load_id} was already retried (latest attempt is load {newer['load_id']})",
+                "latest_load_id": newer['load_id']
+            }), 409)
+
+        new_load_id = create_retry_attempt(cursor, load_id)
+        db.get_db().commit()
+
+        return make_response(jsonify({
+            "message": "Retry scheduled",
+            "load_id": new_load_id,
+            "retry_of": load_id,
+            "status": "pending"
+        }), 201)
+
+    except Exception as e:
+        current_app.logger.error(f'Error retrying data load: {e}')
+        db.get_db().rollback()
+        return make_response(jsonify({"error": "Failed to retry data load"}), 500)
+
+
+@admin.route('/data-loads/<int:load_id>/attempts', methods=['GET'])
+def get_data_load_attempts(load_id):
+    """
+    Get every attempt of a load (the original and all of its retries), in order.
+    """
+    try:
+        current_app.logger.info(f'GET /system/data-loads/{load_id}/attempts - Fetching attempt history')
+
+        cursor = db.get_db().cursor()
+
+        cursor.execute('SELECT IFNULL(original_load_id, load_id) as root_id FROM DataLoads WHERE load_id = %s',
+                       (load_id,))
+        row = cursor.fetchone()
+        if not row:
+            return make_response(jsonify({"error": "Data load not found"}), 404)
+
+        cursor.execute('''
+            SELECT load_id, attempt, status, started_at, completed_at, next_retry_at,
+                   records_processed, records_failed, error_code, error_message
+            FROM DataLoads
+            WHERE load_id = %s OR original_load_id = %s
+            ORDER BY attempt
+        ''', (row['root_id'], row['root_id']))
+        attempts = cursor.fetchall()
+
+        return make_response(jsonify({
+            'original_load_id': row['root_id'],
+            'attempts': attempts,
+            'total_attempts': len(attempts)
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching data load attempts: {e}')
+        return make_response(jsonify({"error": "Failed to fetch data load attempts"}), 500)
+
+
+@admin.route('/data-loads/claim', methods=['POST'])
+def claim_data_load():
+    """
+    Claim the oldest pending load (new or retry) for a loader to run. The
+    load is moved to 'running'; returns 204 when nothing is waiting.
+
+    Expected JSON Body:
+        {
+            "load_type": "string" (optional, restrict to one load type)
+        }
+    """
+    try:
+        current_app.logger.info('POST /system/data-loads/claim - Claiming pending data load')
+
+        payload = request.get_json(silent=True) or {}
+
+        cursor = db.get_db().cursor()
+        load = claim_next_load(cursor, payload.get('load_type'))
+        db.get_db().commit()
+
+        if not load:
+            return make_response('', 204)
+        return make_response(jsonify(load), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error claiming data load: {e}')
+        db.get_db().rollback()
+        return make_response(jsonify({"error": "Failed to claim data load"}), 500)
+
+
+@admin.route('/data-load-policies', methods=['GET'])
+def get_data_load_policies():
+    """
+    Get the retry policy for each load type ('default' applies to the rest).
+    """
+    try:
+        current_app.logger.info('GET /system/data-load-policies - Fetching retry policies')
+
+        cursor = db.get_db().cursor()
+        cursor.execute('''
+            SELECT load_type, max_attempts, base_delay_seconds, max_delay_seconds,
+                   backoff_multiplier, jitter_ratio, retry_transient_only, updated_at
+            FROM DataLoadRetryPolicies
+            ORDER BY load_type
+        ''')
+        policies = cursor.fetchall()
+
+        return make_response(jsonify({'policies': policies, 'builtin_default': DEFAULT_RETRY_POLICY}), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching retry policies: {e}')
+        return make_response(jsonify({"error": "Failed to fetch retry policies"}), 500)
+
+
+def _parse_policy(payload):
+    """The retry policy fields of a request body, parsed, or an error naming the bad field."""
+    if not isinstance(payload, dict):
+        return None, 'body must be an object'
+    policy = {}
+    for key in ('max_attempts', 'base_delay_seconds', 'max_delay_seconds'):
+        value = payload.get(key, DEFAULT_RETRY_POLICY[key])
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            return None, f'{key} must be an integer'
+        try:
+            policy[key] = int(value)
+        except (TypeError, ValueError):
+            return None, f'{key} must be an integer'
+    for key in ('backoff_multiplier', 'jitter_ratio'):
+        value = payload.get(key, DEFAULT_RETRY_POLICY[key])
+        if isinstance(value, bool):
+            return None, f'{key} must be a number'
+        try:
+            policy[key] = float(value)
+        except (TypeError, ValueError):
+            return None, f'{key} must be a number'
+    value = payload.get('retry_transient_only', DEFAULT_RETRY_POLICY['retry_transient_only'])
+    if isinstance(value, str) and value.lower() in ('true', 'false'):
+        value = value.lower() == 'true'
+    if not isinstance(value, bool):
+        return None, 'retry_transient_only must be true or false'
+    policy['retry_transient_only'] = value
+
+    if policy['max_attempts'] < 1:
+        return None, 'max_attempts must be at least 1'
+    if policy['base_delay_seconds'] < 0:
+        return None, 'base_delay_seconds must not be negative'
+    if policy['max_delay_seconds'] < policy['base_delay_seconds']:
+        return None, 'max_delay_seconds must be at least base_delay_seconds'
+    if not policy['backoff_multiplier'] >= 1:
+        return None, 'backoff_multiplier must be at least 1'
+    if not 0 <= policy['jitter_ratio'] <= 1:
+        return None, 'jitter_ratio must be between 0 and 1'
+    return policy, None
+
+
+@admin.route('/data-load-policies/<load_type>', methods=['PUT'])
+def upsert_data_load_policy(load_type):
+    """
+    Create or update the retry policy for a load type.
+
+    Expected JSON Body (all optional, missing fields use the built-in default):
+        {
+            "max_attempts": int,
+            "base_delay_seconds": int (>= 0),
+            "max_delay_seconds": int (>= base_delay_seconds),
+            "backoff_multiplier": float,
+            "jitter_ratio": float (0-1),
+            "retry_transient_only": bool
+        }
+    """
+    try:
+        current_app.logger.info(f'PUT /system/data-load-policies/{load_type} - Saving retry policy')
+
+        policy, error = _parse_policy(request.get_json(silent=True) or {})
+        if error:
+            return make_response(jsonify({"error": error}), 400)
+
+        cursor = db.get_db().cursor()
+        cursor.execute('''
+            INSERT INTO DataLoadRetryPolicies (
+                load_type, max_attempts, base_delay_seconds, max_delay_seconds,
+                backoff_multiplier, jitter_ratio, retry_transient_only
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                max_attempts = VALUES(max_attempts),
+                base_delay_seconds = VALUES(base_delay_seconds),
+                max_delay_seconds = VALUES(max_delay_seconds),
+                backoff_multiplier = VALUES(backoff_multiplier),
+                jitter_ratio = VALUES(jitter_ratio),
+                retry_transient_only = VALUES(retry_transient_only)
+        ''', (
+            load_type,
+            policy['max_attempts'],
+            policy['base_delay_seconds'],
+            policy['max_delay_seconds'],
+            policy['backoff_multiplier'],
+            policy['jitter_ratio'],
+            policy['retry_transient_only']
+        ))
+        db.get_db().commit()
+
+        return make_response(jsonify({'message': 'Retry policy saved', 'load_type': load_type, **policy}), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error saving retry policy: {e}')
+        db.get_db().rollback()
+        return make_response(jsonify({"error": "Failed to save retry policy"}), 500)
+
+
 # ============================================================================
 # ERROR LOGGING & MANAGEMENT ROUTES
 # ============================================================================
@@ -413,7 +649,7 @@ def get_error_logs():
         cursor = db.get_db().cursor()
 
         # Be permissive: sample data sometimes stores severity-like values in log_type
-        query = f'''
+        query = '''
             SELECT
                 log_id,
                 log_id as data_error_id,
@@ -428,10 +664,11 @@ def get_error_logs():
                 user_id as record_id
             FROM SystemLogs
             WHERE (log_type IN ('error','validation') OR severity IS NOT NULL)
-              AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
+              AND created_at >= %s
         '''
 
-        params = []
+        since = _window_start(days=days)
+        params = [since]
 
         if severity:
             # accept either canonical or legacy values
@@ -458,7 +695,7 @@ def get_error_logs():
             r['severity'] = _normalize_severity(raw)
 
         # Get error summary by severity - tolerant grouping (avoid ONLY_FULL_GROUP_BY) using subquery
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT sev_bucket as severity,
                    COUNT(*) as count,
                    SUM(CASE WHEN resolved_at IS NOT NULL THEN 1 ELSE 0 END) as resolved_count
@@ -472,11 +709,11 @@ def get_error_logs():
                        resolved_at
                 FROM SystemLogs
                 WHERE (log_type IN ('error','validation') OR severity IS NOT NULL)
-                  AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
+                  AND created_at >= %s
             ) t
             GROUP BY sev_bucket
             ORDER BY FIELD(sev_bucket, 'critical','error','warning','info')
-        ''')
+        ''', (since,))
 
         severity_summary = cursor.fetchall()
 
@@ -565,7 +802,7 @@ def get_data_errors():
 
         cursor = db.get_db().cursor()
 
-        query = f'''
+        query = '''
             SELECT
                 log_id as data_error_id,
                 service_name as table_name,
@@ -580,10 +817,11 @@ def get_data_errors():
                 user_id
             FROM SystemLogs
             WHERE (log_type = 'validation' OR log_type = 'error' OR LOWER(service_name) LIKE '%%data%%')
-              AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
+              AND created_at >= %s
         '''
 
-        params = []
+        since = _window_start(days=days)
+        params = [since]
 
         if service_name:
             query += ' AND service_name = %s'
@@ -603,7 +841,7 @@ def get_data_errors():
             r['severity'] = _normalize_severity(r.get('severity'))
 
         # Update error summary to show by service and severity
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT
                 service_name as component,
                 CASE
@@ -615,11 +853,11 @@ def get_data_errors():
                 COUNT(*) as count,
                 SUM(CASE WHEN resolved_at IS NOT NULL THEN 1 ELSE 0 END) as resolved_count
             FROM SystemLogs
-            WHERE (log_type = 'validation' OR log_type = 'error' OR LOWER(service_name) LIKE '%data%')
-              AND created_at >= DATE_SUB(NOW(), INTERVAL {days} DAY)
+            WHERE (log_type = 'validation' OR log_type = 'error' OR LOWER(service_name) LIKE '%%data%%')
+              AND created_at >= %s
             GROUP BY service_name, severity
             ORDER BY count DESC
-        ''')
+        ''', (since,))
 
         error_summary = cursor.fetchall()
 
@@ -637,8 +875,73 @@ def get_data_errors():
         return make_response(jsonify({"error": "Failed to fetch data errors"}), 500)
 
 
+@admin.route('/data-validation', methods=['POST'])
+def validate_data_batch():
+    """
+    Validate a batch of incoming PlayerGameStats or Game rows before loading.
+
+    Rejected rows are written to SystemLogs as 'validation' entries, so they
+    show up under GET /system/data-errors with their reasons.
+
+    Expected JSON Body:
+    {
+        "table": "PlayerGameStats" | "Game" (required),
+        "rows": [ {...}, ... ] (required),
+        "source_file": str,
+        "user_id": int,
+        "overtime_periods": { "<game_id>": int },     # PlayerGameStats only
+        "require_complete_box_scores": bool           # PlayerGameStats only
+    }
+    """
+    try:
+        current_app.logger.info('POST /system/data-validation - Validating incoming data batch')
+
+        payload = request.get_json() or {}
+        table = payload.get('table')
+        rows = payload.get('rows')
+
+        if table not in VALIDATORS:
+            return make_response(jsonify({
+                'error': f'table must be one of: {", ".join(VALIDATORS)}'
+            }), 400)
+        if not isinstance(rows, list) or not rows:
+            return make_response(jsonify({'error': 'rows must be a non-empty list'}), 400)
+
+        cursor = db.get_db().cursor()
+
+        if table == 'PlayerGameStats':
+            result = validate_player_game_stats(
+                cursor, rows,
+                overtime_periods=payload.get('overtime_periods'),
+                require_complete_box_scores=bool(payload.get('require_complete_box_scores'))
+            )
+        else:
+            result = VALIDATORS[table](cursor, rows)
+
+        logged = record_rejections(cursor, result,
+                                   source_file=payload.get('source_file'),
+                                   user_id=payload.get('user_id'))
+        db.get_db().commit()
+
+        rejections = result.rejections()
+        response_data = result.summary()
+        response_data.update({
+            'accepted_row_indices': result.accepted_indices.tolist(),
+            'rejections': rejections[:MAX_RETURNED_REJECTIONS],
+            'rejections_truncated': len(rejections) > MAX_RETURNED_REJECTIONS,
+            'rejections_logged': logged
+        })
+
+        return make_response(jsonify(response_data), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error validating data batch: {e}')
+        db.get_db().rollback()
+        return make_response(jsonify({"error": "Failed to validate data batch"}), 500)
+
+
 # ============================================================================
-# DATA CLEANUP SCHEDULER (lightweight via SystemLogs)
+# DATA CLEANUP SCHEDULER
 # ============================================================================
 
 @admin.route('/data-cleanup', methods=['GET'])
@@ -646,26 +949,28 @@ def get_data_cleanup_schedule():
     """
     Return active cleanup schedules and recent cleanup history.
 
-    Uses SystemLogs as a lightweight store:
-      - Schedules: rows with log_type='cleanup_schedule'
-      - History: rows with log_type='cleanup_run'
+    Schedules live in CleanupSchedules; run history is still logged to
+    SystemLogs with log_type='cleanup_run'.
     """
     try:
         cursor = db.get_db().cursor()
 
         # Active schedules
         cursor.execute('''
-            SELECT 
-                log_id as schedule_id,
-                service_name as cleanup_type,
-                message as frequency,
-                records_processed as retention_days,
-                created_at as created_at,
-                resolved_at as last_run,
-                user_id as created_by
-            FROM SystemLogs
-            WHERE log_type = 'cleanup_schedule'
-            ORDER BY created_at DESC
+            SELECT
+                cs.schedule_id,
+                cs.cleanup_type,
+                cs.frequency,
+                cs.retention_days,
+                cs.status,
+                cs.next_run,
+                cs.last_run,
+                cs.created_at,
+                u.username as created_by
+            FROM CleanupSchedules cs
+            LEFT JOIN Users u ON u.user_id = cs.created_by
+            WHERE cs.status = 'active'
+            ORDER BY cs.next_run
         ''')
         schedules = cursor.fetchall() or []
 
@@ -704,7 +1009,7 @@ def schedule_data_cleanup():
     Expected JSON body:
       {
         "cleanup_type": str,
-        "frequency": str,             # e.g., daily/weekly/monthly
+        "frequency": str,             # daily/weekly/monthly
         "retention_days": int,
         "next_run": ISO8601 datetime,
         "created_by": str (username)
@@ -717,20 +1022,23 @@ def schedule_data_cleanup():
             if f not in payload:
                 return make_response(jsonify({'error': f'Missing required field: {f}'}), 400)
 
+        if payload['frequency'] not in CLEANUP_FREQUENCIES:
+            return make_response(jsonify({
+                'error': f"Invalid frequency. Must be one of: {', '.join(CLEANUP_FREQUENCIES)}"
+            }), 400)
+
         cursor = db.get_db().cursor()
 
-        # Persist schedule in SystemLogs as a 'cleanup_schedule'
         cursor.execute('''
-            INSERT INTO SystemLogs (
-                log_type, service_name, severity, message, records_processed, resolved_at, user_id
+            INSERT INTO CleanupSchedules (
+                cleanup_type, frequency, retention_days, next_run, created_by
             ) VALUES (
-                'cleanup_schedule', %s, 'info', %s, %s,
-                %s,
+                %s, %s, %s, %s,
                 (SELECT user_id FROM Users WHERE username = %s LIMIT 1)
             )
         ''', (
             payload['cleanup_type'],
-            payload.get('frequency'),
+            payload['frequency'],
             int(payload.get('retention_days') or 0),
             payload.get('next_run'),
             payload.get('created_by')
@@ -773,9 +1081,9 @@ def delete_error_logs():
         query = '''
             DELETE FROM SystemLogs
             WHERE (log_type IN ('error','validation') OR severity IS NOT NULL)
-              AND created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+              AND created_at < %s
         '''
-        params = [older_than_days]
+        params = [_window_start(days=older_than_days)]
 
         if severity:
             sev = _normalize_severity(severity)
@@ -813,3 +1121,287 @@ def delete_error_logs():
         db.get_db().rollback()
         return make_response(jsonify({"error": "Failed to delete error logs"}), 500)
 
+
+
+# ============================================================================
+# SYSTEM LOG PARTITION MAINTENANCE
+# ============================================================================
+
+@admin.route('/log-partitions', methods=['GET'])
+def get_log_partitions():
+    """
+    List SystemLogs monthly partitions with approximate row counts.
+    """
+    try:
+        current_app.logger.info('GET /system/log-partitions - Listing SystemLogs partitions')
+
+        cursor = db.get_db().cursor()
+        partitions = list_partitions(cursor)
+
+        for p in partitions:
+            p['upper_bound'] = p['upper_bound'].isoformat() if p['upper_bound'] else 'MAXVALUE'
+
+        return make_response(jsonify({
+            'partitions': partitions,
+            'total_partitions': len(partitions),
+            'retention_days': current_app.config.get('LOG_RETENTION_DAYS'),
+            'months_ahead': current_app.config.get('LOG_PARTITION_MONTHS_AHEAD')
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error listing log partitions: {e}')
+        return make_response(jsonify({"error": "Failed to list log partitions"}), 500)
+
+
+@admin.route('/log-partitions/maintenance', methods=['POST'])
+def run_log_partition_maintenance():
+    """
+    Run partition maintenance now: pre-create future monthly partitions and
+    drop partitions past retention.
+
+    Expected JSON body (all optional):
+      {
+        "months_ahead": int,
+        "retention_days": int
+      }
+    """
+    try:
+        current_app.logger.info('POST /system/log-partitions/maintenance - Running partition maintenance')
+
+        payload = request.get_json(silent=True) or {}
+        summary = run_partition_maintenance(
+            months_ahead=payload.get('months_ahead'),
+            retention_days=payload.get('retention_days')
+        )
+
+        return make_response(jsonify({
+            'message': 'Partition maintenance completed',
+            **summary
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error running partition maintenance: {e}')
+        return make_response(jsonify({"error": "Failed to run partition maintenance"}), 500)
+
+
+# ============================================================================
+# REQUEST PROFILES
+# ============================================================================
+
+@admin.route('/profiles', methods=['GET'])
+def get_profiles():
+    """
+    List stored request profiles, newest first.
+
+    Query params:
+      - route: only profiles whose route contains this text
+      - limit: max profiles to return (default 100)
+
+    Profiles are captured by sending `X-Profile: 1` (or `?profile=1`) to any
+    route while PROFILING_ENABLED is set.
+    """
+    try:
+        current_app.logger.info('GET /system/profiles - Listing request profiles')
+
+        route = request.args.get('route')
+        limit = request.args.get('limit', 100, type=int)
+        profiles = list_profiles(current_app.config['PROFILE_DIR'], route, limit)
+
+        return make_response(jsonify({
+            'profiles': profiles,
+            'total_profiles': len(profiles),
+            'profiling_enabled': current_app.config.get('PROFILING_ENABLED')
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error listing profiles: {e}')
+        return make_response(jsonify({"error": "Failed to list profiles"}), 500)
+
+
+@admin.route('/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    Get one profile's metadata: route, parameters, wall/DB/Python time and
+    the top functions by cumulative time.
+    """
+    try:
+        current_app.logger.info(f'GET /system/profiles/{profile_id} - Fetching profile')
+
+        paths = profile_paths(current_app.config['PROFILE_DIR'], profile_id)
+        if not paths:
+            return make_response(jsonify({"error": "Profile not found"}), 404)
+
+        with open(paths[0]) as f:
+            return make_response(jsonify(json.load(f)), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching profile: {e}')
+        return make_response(jsonify({"error": "Failed to fetch profile"}), 500)
+
+
+@admin.route('/profiles/<profile_id>/download', methods=['GET'])
+def download_profile(profile_id):
+    """
+    Download the raw cProfile (pstats) file, e.g. for
+    `snakeviz <id>.prof` or `flameprof <id>.prof > flame.svg`.
+    """
+    try:
+        current_app.logger.info(f'GET /system/profiles/{profile_id}/download - Downloading profile')
+
+        paths = profile_paths(current_app.config['PROFILE_DIR'], profile_id)
+        if not paths or not os.path.exists(paths[1]):
+            return make_response(jsonify({"error": "Profile not found"}), 404)
+
+        return send_file(paths[1], mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
+
+    except Exception as e:
+        current_app.logger.error(f'Error downloading profile: {e}')
+        return make_response(jsonify({"error": "Failed to download profile"}), 500)
+
+
+# ============================================================================
+# REQUEST TRACES
+# ============================================================================
+
+@admin.route('/traces', methods=['GET'])
+def get_traces():
+    """
+    Recent requests handled by this API process, newest first, without
+    their SQL spans.
+
+    Query params:
+      - trace_id: only requests of one trace (e.g. one Streamlit page run)
+      - page: only requests whose page name contains this text
+      - min_duration_ms: only requests at least this slow
+      - limit: max traces to return (default 100)
+    """
+    try:
+        traces = recent_traces(
+            limit=request.args.get('limit', 100, type=int),
+            trace_id=request.args.get('trace_id'),
+            page=request.args.get('page'),
+            min_duration_ms=request.args.get('min_duration_ms', type=float)
+        )
+        return make_response(jsonify({
+            'traces': traces,
+            'total_traces': len(traces),
+            'buffer_size': current_app.config.get('TRACE_BUFFER_SIZE')
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error listing traces: {e}')
+        return make_response(jsonify({"error": "Failed to list traces"}), 500)
+
+
+@admin.route('/traces/<request_id>', methods=['GET'])
+def get_trace_detail(request_id):
+    """
+    One traced request with a span (SQL text, start offset, duration,
+    error) for every statement it ran.
+    """
+    try:
+        trace = get_trace(request_id)
+        if not trace:
+            return make_response(jsonify({"error": "Trace not found"}), 404)
+        return make_response(jsonify(trace), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching trace: {e}')
+        return make_response(jsonify({"error": "Failed to fetch trace"}), 500)
+
+
+# ============================================================================
+# QUERY STATS AND INDEX ADVICE
+# ============================================================================
+
+QUERY_STATS_ORDERS = ('total_ms', 'count', 'avg_ms', 'max_ms', 'errors')
+
+
+@admin.route('/query-stats', methods=['GET'])
+def get_query_stats():
+    """
+    Statements executed by this API process, grouped by fingerprint, with
+    call count, total/avg/max time and errors.
+
+    Query params:
+      - order_by: total_ms (default), count, avg_ms, max_ms or errors
+      - limit: max fingerprints to return (default 50)
+    """
+    try:
+        if not current_app.config.get('QUERY_STATS_ENABLED'):
+            return make_response(jsonify({"error": "Query stats are disabled (QUERY_STATS_ENABLED=false)"}), 404)
+
+        order_by = request.args.get('order_by', 'total_ms')
+        if order_by not in QUERY_STATS_ORDERS:
+            return make_response(jsonify({
+                "error": f"order_by must be one of: {', '.join(QUERY_STATS_ORDERS)}"
+            }), 400)
+
+        statements = query_stats.snapshot(order_by, request.args.get('limit', 50, type=int))
+        return make_response(jsonify({
+            'statements': statements,
+            'total_statements': len(statements),
+            'collecting_since': query_stats.collecting_since().isoformat()
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching query stats: {e}')
+        return make_response(jsonify({"error": "Failed to fetch query stats"}), 500)
+
+
+@admin.route('/index-advice', methods=['GET'])
+def get_index_advice():
+    """
+    Composite/covering index recommendations and possibly unused indexes,
+    judged against the statements the app has actually executed.
+
+    Query params:
+      - source: process (default; this process's query stats) or
+        performance_schema (MySQL's digest summary, covering every worker)
+      - min_calls: ignore statements executed fewer times (default 1)
+    """
+    try:
+        current_app.logger.info('GET /system/index-advice - Analyzing workload')
+
+        source = request.args.get('source', 'process')
+        cursor = db.get_db().cursor()
+        if source == 'process':
+            if not current_app.config.get('QUERY_STATS_ENABLED'):
+                return make_response(jsonify({
+                    "error": "Query stats are disabled (QUERY_STATS_ENABLED=false); use source=performance_schema"
+                }), 400)
+            workload = query_stats.snapshot()
+        elif source == 'performance_schema':
+            workload = workload_from_digests(cursor)
+        else:
+            return make_response(jsonify({"error": "source must be process or performance_schema"}), 400)
+
+        report = advise(cursor, workload, request.args.get('min_calls', 1, type=int))
+        report['source'] = source
+        return make_response(jsonify(report), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error building index advice: {e}')
+        return make_response(jsonify({"error": "Failed to build index advice"}), 500)
+
+
+@admin.route('/etags', methods=['GET'])
+def get_etag_state():
+    """
+    Conditional GET state of this API process: the tables each endpoint has
+    been seen reading (its ETag inputs) and the current table versions.
+    """
+    try:
+        if not current_app.config.get('ETAGS_ENABLED'):
+            return make_response(jsonify({"error": "ETags are disabled (ETAGS_ENABLED=false)"}), 404)
+
+        current_app.logger.info('GET /system/etags - Fetching ETag state')
+        return make_response(jsonify({
+            'endpoint_tables': etags.endpoint_tables(),
+            'table_versions': etags.versions()
+        }), 200)
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching ETag state: {e}')
+        return make_response(jsonify({"error": "Failed to fetch ETag state"}), 500)
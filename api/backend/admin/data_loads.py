@@ -0,0 +1,233 @@
+"""DataLoads / CleanupSchedules helpers shared by the admin and data engineer blueprints.
+
+Failed loads are retried according to the per-load_type policy in
+DataLoadRetryPolicies. A retryable failure moves the load to
+'retry_scheduled' with a backoff deadline; the `data_load_retries`
+background job then creates the next attempt as a new 'pending' DataLoads
+row linked to the first attempt through original_load_id, for a loader to
+claim. Once max_attempts is reached the load is parked as 'dead_letter'.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from backend.db_connection import db
+from backend.metrics import data_load_queue
+
+LOAD_STATUSES = ('pending', 'running', 'completed', 'failed', 'retry_scheduled', 'dead_letter')
+
+# Severity reported alongside each load for consumers that colour rows by it
+LOAD_STATUS_SEVERITY = {
+    'pending': 'info',
+    'running': 'warning',
+    'completed': 'info',
+    'failed': 'error',
+    'retry_scheduled': 'warning',
+    'dead_letter': 'critical'
+}
+
+CLEANUP_FREQUENCIES = ('daily', 'weekly', 'monthly')
+CLEANUP_STATUSES = ('active', 'paused')
+
+# Used when a load_type has no row in DataLoadRetryPolicies (nor a 'default' row)
+DEFAULT_RETRY_POLICY = {
+    'load_type': 'default',
+    'max_attempts': 3,
+    'base_delay_seconds': 30,
+    'max_delay_seconds': 900,
+    'backoff_multiplier': 2.0,
+    'jitter_ratio': 0.5,
+    'retry_transient_only': True
+}
+
+# MySQL errors caused by contention or a dropped connection rather than bad data:
+# lock wait timeout, deadlock, too many connections, server gone away, lost connection
+TRANSIENT_ERROR_CODES = (1205, 1213, 1040, 2006, 2013)
+TRANSIENT_ERROR_MARKERS = ('deadlock', 'lock wait timeout', 'too many connections',
+                           'server has gone away', 'lost connection')
+
+
+def create_data_load(cursor, load_type, source_file, initiated_by, status='running'):
+    """Insert a DataLoads row; `initiated_by` is a username. Returns the new load_id."""
+    cursor.execute('''
+        INSERT INTO DataLoads (load_type, status, source_file, initiated_by)
+        VALUES (%s, %s, %s, (SELECT user_id FROM Users WHERE username = %s LIMIT 1))
+    ''', (load_type, status, source_file, initiated_by))
+    return cursor.lastrowid
+
+
+def is_transient_failure(error_code=None, error_message=None):
+    """True when a failure looks like DB contention that is worth retrying as-is."""
+    try:
+        if error_code is not None and int(error_code) in TRANSIENT_ERROR_CODES:
+            return True
+    except (TypeError, ValueError):
+        pass
+    message = (error_message or '').lower()
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+def get_retry_policy(cursor, load_type):
+    """Policy for a load_type, falling back to the 'default' row, then the built-in default."""
+    cursor.execute('''
+        SELECT load_type, max_attempts, base_delay_seconds, max_delay_seconds,
+               backoff_multiplier, jitter_ratio, retry_transient_only
+        FROM DataLoadRetryPolicies
+        WHERE load_type IN (%s, 'default')
+        ORDER BY load_type = 'default'
+        LIMIT 1
+    ''', (load_type,))
+    row = cursor.fetchone()
+    if not row:
+        return dict(DEFAULT_RETRY_POLICY)
+    policy = dict(row)
+    policy['backoff_multiplier'] = float(policy['backoff_multiplier'])
+    policy['jitter_ratio'] = float(policy['jitter_ratio'])
+    policy['retry_transient_only'] = bool(policy['retry_transient_only'])
+    return policy
+
+
+def compute_backoff(policy, attempt, rand=random.random):
+    """
+    Seconds to wait before the attempt after `attempt` (1-based).
+
+    Exponential in the attempt number, capped at max_delay_seconds, then
+    reduced by up to jitter_ratio of itself so retries of loads that failed
+    together (e.g. on the same deadlock) do not collide again.
+    """
+    delay = policy['base_delay_seconds'] * policy['backoff_multiplier'] ** (attempt - 1)
+    delay = min(delay, policy['max_delay_seconds'])
+    return max(1, int(delay * (1 - policy['jitter_ratio'] * rand())))
+
+
+def record_load_failure(cursor, load_id, error_message=None, error_code=None, now=None):
+    """
+    Mark a load failed and decide what happens next.
+
+    Returns a dict with the resulting status ('retry_scheduled', 'dead_letter'
+    or 'failed'), the attempt number and next_retry_at when scheduled.
+    """
+    cursor.execute('SELECT load_id, load_type, attempt FROM DataLoads WHERE load_id = %s', (load_id,))
+    load = cursor.fetchone()
+    if not load:
+        return None
+
+    try:
+        error_code = int(error_code) if error_code is not None else None
+    except (TypeError, ValueError):
+        error_code = None
+
+    now = now or datetime.now()
+    policy = get_retry_policy(cursor, load['load_type'])
+    transient = is_transient_failure(error_code, error_message)
+    retryable = transient or not policy['retry_transient_only']
+
+    next_retry_at = None
+    if not retryable:
+        status = 'failed'
+    elif load['attempt'] >= policy['max_attempts']:
+        status = 'dead_letter'
+    else:
+        status = 'retry_scheduled'
+        next_retry_at = now + timedelta(seconds=compute_backoff(policy, load['attempt']))
+
+    cursor.execute('''
+        UPDATE DataLoads
+        SET status = %s, error_message = %s, error_code = %s,
+            completed_at = %s, next_retry_at = %s
+        WHERE load_id = %s
+    ''', (status, error_message or 'Data load failed', error_code, now, next_retry_at, load_id))
+
+    return {
+        'load_id': load_id,
+        'status': status,
+        'attempt': load['attempt'],
+        'max_attempts': policy['max_attempts'],
+        'transient': transient,
+        'next_retry_at': next_retry_at.isoformat() if next_retry_at else None
+    }
+
+
+def create_retry_attempt(cursor, load_id):
+    """
+    Create the next attempt for a load as a new 'pending' row linked to the
+    first attempt. Returns the new load_id.
+    """
+    cursor.execute('''
+        INSERT INTO DataLoads (load_type, status, source_file, initiated_by, original_load_id, attempt)
+        SELECT load_type, 'pending', source_file, initiated_by,
+               IFNULL(original_load_id, load_id), attempt + 1
+        FROM DataLoads
+        WHERE load_id = %s
+    ''', (load_id,))
+    new_load_id = cursor.lastrowid
+    cursor.execute('''
+        UPDATE DataLoads
+        SET status = IF(status = 'retry_scheduled', 'failed', status), next_retry_at = NULL
+        WHERE load_id = %s
+    ''', (load_id,))
+    return new_load_id
+
+
+def claim_next_load(cursor, load_type=None):
+    """
+    Atomically move the oldest pending load (optionally of one load_type) to
+    'running' and return it, or None when nothing is waiting. The caller
+    commits.
+    """
+    query = "SELECT load_id FROM DataLoads WHERE status = 'pending'"
+    params = []
+    if load_type:
+        query += ' AND load_type = %s'
+        params.append(load_type)
+    query += ' ORDER BY started_at LIMIT 1 FOR UPDATE SKIP LOCKED'
+    cursor.execute(query, params)
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    cursor.execute('''
+        UPDATE DataLoads SET status = 'running', started_at = NOW(), completed_at = NULL
+        WHERE load_id = %s
+    ''', (row['load_id'],))
+    cursor.execute('''
+        SELECT load_id, load_type, source_file, attempt, original_load_id, started_at
+        FROM DataLoads WHERE load_id = %s
+    ''', (row['load_id'],))
+    return cursor.fetchone()
+
+
+def process_due_retries(limit=50):
+    """
+    Background job: turn every 'retry_scheduled' load whose backoff has
+    elapsed into a new pending attempt. Requires an app context.
+
+    Rows are locked with SKIP LOCKED so several API processes can run the
+    job concurrently without creating duplicate attempts.
+    """
+    conn = db.get_db()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT load_id
+        FROM DataLoads
+        WHERE status = 'retry_scheduled' AND next_retry_at <= NOW()
+        ORDER BY next_retry_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ''', (limit,))
+    due = [row['load_id'] for row in cursor.fetchall()]
+
+    created = [create_retry_attempt(cursor, load_id) for load_id in due]
+    conn.commit()
+
+    # Sample the queue for /system/metrics while we are here
+    cursor.execute('''
+        SELECT status, COUNT(*) AS loads
+        FROM DataLoads
+        WHERE status IN ('pending', 'running', 'retry_scheduled')
+        GROUP BY status
+    ''')
+    depth = {row['status']: row['loads'] for row in cursor.fetchall()}
+    for status in ('pending', 'running', 'retry_scheduled'):
+        data_load_queue.set(depth.get(status, 0), status=status)
+    return {'retried': due, 'created': created}
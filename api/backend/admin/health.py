@@ -0,0 +1,133 @@
+"""Background-sampled system health snapshot.
+
+The health queries (recent errors, active loads, table counts) run on the
+`health_snapshot` background job rather than on every GET /system/health,
+which the Data Engineer pages poll constantly. The route serves the latest
+snapshot from memory together with its age. When background jobs are off,
+the route refreshes the snapshot itself once it is older than the sample
+interval.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from backend.db_connection import db
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_snapshot = None
+_sampled_at = None  # time.monotonic() of the last sample
+
+
+def collect_health_snapshot():
+    """Run the health queries and return the snapshot. Requires an app context."""
+    cursor = db.get_db().cursor()
+
+    # Verify database connectivity
+    cursor.execute('SELECT 1')
+    db_status = 'healthy' if cursor.fetchone() else 'unhealthy'
+
+    # Recent error count (last 24 hours); the cutoff is bound as a literal so
+    # MySQL can prune SystemLogs partitions
+    cursor.execute('''
+        SELECT COUNT(*) as error_count
+        FROM SystemLogs
+        WHERE (log_type IN ('error','validation') OR severity IN ('error','critical','high','medium'))
+          AND created_at >= %s
+    ''', (datetime.now() - timedelta(hours=24),))
+    recent_errors_result = cursor.fetchone()
+    recent_errors = recent_errors_result['error_count'] if recent_errors_result else 0
+
+    cursor.execute('''
+        SELECT COUNT(*) as active_loads
+        FROM DataLoads
+        WHERE status = 'running'
+    ''')
+    active_loads_result = cursor.fetchone()
+    active_loads = active_loads_result['active_loads'] if active_loads_result else 0
+
+    cursor.execute('''
+        SELECT load_id, load_type, source_file, records_processed, completed_at
+        FROM DataLoads
+        WHERE status = 'completed'
+        ORDER BY started_at DESC
+        LIMIT 1
+    ''')
+    last_successful_load = cursor.fetchone()
+
+    cursor.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM Players) as total_players,
+            (SELECT COUNT(*) FROM Teams) as total_teams,
+            (SELECT COUNT(*) FROM Game) as total_games,
+            (SELECT COUNT(*) FROM Users) as total_users
+    ''')
+    system_metrics = cursor.fetchone()
+
+    overall_status = 'operational'
+    if db_status != 'healthy':
+        overall_status = 'critical'
+    elif recent_errors > 10:
+        overall_status = 'degraded'
+    elif active_loads > 5:
+        overall_status = 'warning'
+
+    return {
+        'overall_status': overall_status,
+        'database_status': db_status,
+        'recent_errors_24h': recent_errors,
+        'active_data_loads': active_loads,
+        'last_successful_load': last_successful_load,
+        'system_metrics': system_metrics,
+        'health_check_timestamp': datetime.now().isoformat()
+    }
+
+
+def sample_health():
+    """Background job: refresh the stored snapshot. A failed sample is stored as critical."""
+    started = time.perf_counter()
+    try:
+        snapshot = collect_health_snapshot()
+    except Exception as e:
+        snapshot = {
+            'overall_status': 'critical',
+            'database_status': 'unhealthy',
+            'error': str(e),
+            'health_check_timestamp': datetime.now().isoformat()
+        }
+    snapshot['sample_duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    global _snapshot, _sampled_at
+    with _lock:
+        _snapshot = snapshot
+        _sampled_at = time.monotonic()
+    return {'overall_status': snapshot['overall_status']}
+
+
+def latest_snapshot():
+    """(snapshot, age in seconds), or (None, None) before the first sample."""
+    with _lock:
+        if _snapshot is None:
+            return None, None
+        return _snapshot, time.monotonic() - _sampled_at
+
+
+def get_health(max_age_seconds):
+    """
+    Latest snapshot with its age, sampling inline when there is none or it
+    is older than max_age_seconds. Only one request samples at a time; the
+    others keep serving the previous snapshot.
+    """
+    snapshot, age = latest_snapshot()
+    if snapshot is None or age > max_age_seconds:
+        blocking = snapshot is None
+        if _refresh_lock.acquire(blocking=blocking):
+            try:
+                snapshot, age = latest_snapshot()
+                if snapshot is None or age > max_age_seconds:
+                    sample_health()
+            finally:
+                _refresh_lock.release()
+        snapshot, age = latest_snapshot()
+    return dict(snapshot, sample_age_seconds=round(age, 3))
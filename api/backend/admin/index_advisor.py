@@ -0,0 +1,492 @@
+"""Workload-driven index advice.
+
+Takes the statements the app actually runs (fingerprinted, with call counts
+and total time - from this process's query stats or from MySQL's
+performance_schema digest table) and the live indexes from
+information_schema, and reports
+
+  recommendations  composite indexes built from each statement's equality
+                   filters and join columns, then one range column or its
+                   ORDER BY / GROUP BY columns, extended into a covering
+                   index when the statement reads few enough other columns
+                   of the table. Candidates an existing index already serves
+                   through a leftmost prefix are dropped, and a candidate
+                   that is a leftmost prefix of another is folded into it.
+  unused_indexes   secondary indexes with no reads since the server started,
+                   indexes that are a leftmost prefix of another index, and
+                   indexes the observed workload never filters, joins or
+                   sorts on - each with the write traffic that maintains it.
+
+InnoDB secondary indexes carry the primary key columns and the primary key
+holds the whole row, so both are taken into account when deciding whether a
+candidate is already served or covered.
+
+estimated_benefit_ms is a ranking heuristic, not a prediction: the total time
+of the supporting statements, scaled by the share of the candidate key the
+best existing index does not provide. EXPLAIN the statements (see
+bench.plan_check) before adding an index to database-files/99_indexes.sql.
+
+Run from the api/ directory against the database's digest table:
+    python -m backend.admin.index_advisor [--min-calls 5] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+
+from backend.db_connection import db
+
+MAX_INDEX_COLUMNS = 8
+# Share of a statement's time credited to an index that only adds covering columns
+COVERING_ONLY_GAIN = 0.3
+INDEX_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), 'database-files', '99_indexes.sql')
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_KEYWORDS = {'where', 'join', 'inner', 'left', 'right', 'outer', 'cross', 'natural', 'straight_join',
+             'on', 'using', 'group', 'order', 'limit', 'having', 'set', 'values', 'select', 'union',
+             'as', 'for', 'lock', 'window', 'partition', 'value'}
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.I)
+_REF = r'(?<![\w.])(?:(\w+)\.)?(\w+)'
+_JOIN_EQUALITY = re.compile(_REF + r'\s*(?:<=>|=)\s*(?:(\w+)\.)?(\w+)(?![\w.(])', re.I)
+_EQUALITY = re.compile(_REF + r'\s*(?:(?:<=>|=)\s*\?|\s+IN\s*\(|\s+IS\s+NULL\b)', re.I)
+_RANGE = re.compile(_REF + r'\s*(?:(?:<=|>=|<(?![>=])|>)\s*\?|\s+BETWEEN\b|\s+LIKE\b)', re.I)
+_COLUMN = re.compile(_REF + r'(?!\s*\()')
+_SORT_CLAUSE = re.compile(r'\b(ORDER|GROUP)\s+BY\s+(.*?)(?=\bLIMIT\b|\bHAVING\b|\bORDER\s+BY\b|\)|$)', re.I | re.S)
+_SORT_ITEM = re.compile(r'^\s*(?:(\w+)\.)?(\w+)(?:\s+(ASC|DESC))?\s*$', re.I)
+_SELECT_LIST = re.compile(r'\bSELECT\b.*?\bFROM\b', re.I | re.S)
+_SET_LIST = re.compile(r'\bSET\b.*?(?=\bWHERE\b|$)', re.I | re.S)
+_STAR = re.compile(r'(?:\bSELECT|,)\s*\*|(\w+)\.\*', re.I)
+_CREATE_INDEX = re.compile(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)', re.I)
+
+
+# ============================================================================
+# SCHEMA AND WORKLOAD
+# ============================================================================
+
+def load_schema(cursor):
+    """(columns by table, indexes by table) of the current database."""
+    cursor.execute('''
+        SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    ''')
+    columns = {}
+    for row in cursor.fetchall():
+        columns.setdefault(row['table_name'], []).append(row['column_name'])
+
+    cursor.execute('''
+        SELECT TABLE_NAME AS table_name, INDEX_NAME AS index_name,
+               COLUMN_NAME AS column_name, NON_UNIQUE AS non_unique
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    ''')
+    indexes = {}
+    for row in cursor.fetchall():
+        table_indexes = indexes.setdefault(row['table_name'], {})
+        index = table_indexes.setdefault(row['index_name'], {
+            'table': row['table_name'],
+            'name': row['index_name'],
+            'columns': [],
+            'unique': not row['non_unique'],
+            'primary': row['index_name'] == 'PRIMARY'
+        })
+        if row['column_name']:
+            index['columns'].append(row['column_name'])
+    return columns, {table: list(found.values()) for table, found in indexes.items()}
+
+
+def index_reads(cursor):
+    """(table, index) -> reads since server start, or None without performance_schema."""
+    try:
+        cursor.execute('''
+            SELECT OBJECT_NAME AS table_name, INDEX_NAME AS index_name, COUNT_READ AS reads
+            FROM performance_schema.table_io_waits_summary_by_index_usage
+            WHERE OBJECT_SCHEMA = DATABASE() AND INDEX_NAME IS NOT NULL
+        ''')
+    except Exception:
+        return None
+    return {(row['table_name'], row['index_name']): row['reads'] for row in cursor.fetchall()}
+
+
+def workload_from_digests(cursor, limit=500):
+    """Statement workload from performance_schema's digest summary (all clients)."""
+    cursor.execute('''
+        SELECT DIGEST AS fingerprint, DIGEST_TEXT AS sql_text, COUNT_STAR AS count,
+               SUM_TIMER_WAIT / 1000000000 AS total_ms
+        FROM performance_schema.events_statements_summary_by_digest
+        WHERE SCHEMA_NAME = DATABASE() AND DIGEST_TEXT IS NOT NULL
+        ORDER BY SUM_TIMER_WAIT DESC
+        LIMIT %s
+    ''', (limit,))
+    workload = []
+    for row in cursor.fetchall():
+        # Digest text quotes identifiers and spaces out qualifiers: `p` . `player_id`
+        text = re.sub(r'\s*\.\s*', '.', row['sql_text'].replace('`', ''))
+        workload.append({
+            'fingerprint': row['fingerprint'][:16],
+            'sql': text,
+            'count': int(row['count']),
+            'total_ms': float(row['total_ms'] or 0)
+        })
+    return workload
+
+
+def indexes_in_file(path=INDEX_FILE):
+    """Index names created by database-files/99_indexes.sql, if the file is reachable."""
+    try:
+        with open(path) as f:
+            return {match.group(1) for match in _CREATE_INDEX.finditer(f.read())}
+    except OSError:
+        return set()
+
+
+# ============================================================================
+# STATEMENT ANALYSIS
+# ============================================================================
+
+class _Resolver:
+    """Maps `alias.column` / bare column references of one statement to tables."""
+
+    def __init__(self, sql, columns):
+        self.columns = {table: {c.lower(): c for c in cols} for table, cols in columns.items()}
+        by_lower = {table.lower(): table for table in columns}
+        self.aliases = {}
+        self.tables = []
+        for match in _TABLE_REF.finditer(sql):
+            table = by_lower.get(match.group(1).lower())
+            if table is None:
+                continue
+            if table not in self.tables:
+                self.tables.append(table)
+            self.aliases[table.lower()] = table
+            alias = match.group(2)
+            if alias and alias.lower() not in _KEYWORDS:
+                self.aliases[alias.lower()] = table
+
+    def resolve(self, qualifier, column):
+        column = column.lower()
+        if qualifier:
+            table = self.aliases.get(qualifier.lower())
+            if table and column in self.columns[table]:
+                return table, self.columns[table][column]
+            return None
+        owners = [table for table in self.tables if column in self.columns[table]]
+        if len(owners) == 1:
+            return owners[0], self.columns[owners[0]][column]
+        return None
+
+
+def _usage(table_usage, table):
+    return table_usage.setdefault(table, {'eq': [], 'join': [], 'range': [], 'sort': [],
+                                          'columns': set(), 'star': False})
+
+
+def _append(items, value):
+    if value not in items:
+        items.append(value)
+
+
+def analyze_statement(sql, columns):
+    """Per-table column usage of one normalized statement.
+
+    Returns (kind, tables) where kind is 'read' or 'write' and tables maps a
+    table to its equality filter, join, range, sort and referenced columns.
+    """
+    resolver = _Resolver(sql, columns)
+    kind = 'write' if sql.lstrip().upper().startswith(WRITE_PREFIXES) else 'read'
+    tables = {table: _usage({}, table) for table in resolver.tables}
+    if not tables:
+        return kind, tables
+
+    predicates = _SET_LIST.sub(' ', _SELECT_LIST.sub('SELECT FROM', sql))
+
+    for match in _JOIN_EQUALITY.finditer(predicates):
+        left = resolver.resolve(match.group(1), match.group(2))
+        right = resolver.resolve(match.group(3), match.group(4))
+        if left and right and left[0] != right[0]:
+            _append(tables[left[0]]['join'], left[1])
+            _append(tables[right[0]]['join'], right[1])
+    for match in _EQUALITY.finditer(predicates):
+        found = resolver.resolve(match.group(1), match.group(2))
+        if found:
+            _append(tables[found[0]]['eq'], found[1])
+    for match in _RANGE.finditer(predicates):
+        found = resolver.resolve(match.group(1), match.group(2))
+        if found:
+            _append(tables[found[0]]['range'], found[1])
+
+    for match in _SORT_CLAUSE.finditer(sql):
+        items = [_SORT_ITEM.match(item) for item in match.group(2).split(',')]
+        if not all(items) or len({(item.group(3) or 'ASC').upper() for item in items}) > 1:
+            continue
+        resolved = [resolver.resolve(item.group(1), item.group(2)) for item in items]
+        # An index can only deliver the order if one table supplies every sort column
+        if all(resolved) and len({table for table, _ in resolved}) == 1:
+            for table, column in resolved:
+                _append(tables[table]['sort'], column)
+
+    for match in _COLUMN.finditer(sql):
+        found = resolver.resolve(match.group(1), match.group(2))
+        if found:
+            tables[found[0]]['columns'].add(found[1])
+    for match in _STAR.finditer(sql):
+        if match.group(1):
+            table = resolver.aliases.get(match.group(1).lower())
+            if table:
+                tables[table]['star'] = True
+        else:
+            for usage in tables.values():
+                usage['star'] = True
+    return kind, tables
+
+
+def candidate_for(usage):
+    """(key columns, equality prefix length, covering columns) for one table's usage, or None."""
+    key = []
+    for column in usage['eq'] + usage['join']:
+        _append(key, column)
+    eq_count = len(key)
+    range_columns = [c for c in usage['range'] if c not in key]
+    if range_columns:
+        key.append(range_columns[0])
+    else:
+        for column in usage['sort']:
+            _append(key, column)
+    if not key:
+        return None
+
+    covering = []
+    extra = sorted(usage['columns'] - set(key))
+    if not usage['star'] and extra and len(key) + len(extra) <= MAX_INDEX_COLUMNS:
+        covering = extra
+    return key[:MAX_INDEX_COLUMNS], eq_count, covering
+
+
+# ============================================================================
+# MATCHING AGAINST EXISTING INDEXES
+# ============================================================================
+
+def _effective_columns(index, primary_columns):
+    """Columns an index can serve from: secondary indexes also carry the primary key."""
+    if index['primary']:
+        return list(index['columns'])
+    return index['columns'] + [c for c in primary_columns if c not in index['columns']]
+
+
+def _prefix_match(key, eq_count, index_columns):
+    """How many leading key columns the index serves (equality columns in any order)."""
+    equality = set(key[:eq_count])
+    matched = 0
+    for column in index_columns:
+        if matched < eq_count and column in equality:
+            matched += 1
+        elif matched >= eq_count and matched < len(key) and column == key[matched]:
+            matched += 1
+        else:
+            break
+    return matched
+
+
+def best_existing(key, eq_count, covering, table_indexes):
+    """(index name, matched key columns, covers) of the existing index closest to the candidate."""
+    primary = next((index['columns'] for index in table_indexes if index['primary']), [])
+    needed = set(key) | set(covering)
+    best = (None, 0, False)
+    for index in table_indexes:
+        columns = _effective_columns(index, primary)
+        matched = _prefix_match(key, eq_count, columns)
+        covers = index['primary'] or needed <= set(columns)
+        if (matched, covers) > best[1:]:
+            best = (index['name'], matched, covers)
+    return best
+
+
+def _table_prefix(table):
+    capitals = re.findall(r'[A-Z]', table)
+    return ''.join(capitals).lower() if len(capitals) > 1 else table.lower()
+
+
+def _index_ddl(table, key, covering):
+    name = f"idx_{_table_prefix(table)}_{'_'.join(key)}{'_cov' if covering else ''}"[:64]
+    return f"CREATE INDEX {name} ON {table} ({', '.join(key + covering)});"
+
+
+# ============================================================================
+# ADVICE
+# ============================================================================
+
+def recommend(workload, columns, indexes, min_calls=1):
+    """Composite/covering index candidates ranked by estimated benefit."""
+    candidates = {}
+    for statement in workload:
+        if statement['count'] < min_calls:
+            continue
+        kind, tables = analyze_statement(statement['sql'], columns)
+        if kind == 'write' and not re.match(r'\s*(UPDATE|DELETE)\b', statement['sql'], re.I):
+            continue
+        for table, usage in tables.items():
+            found = candidate_for(usage)
+            if found is None:
+                continue
+            key, eq_count, covering = found
+            if kind == 'write':
+                covering = []
+            name, matched, covers = best_existing(key, eq_count, covering, indexes.get(table, []))
+            if matched == len(key) and (covers or not covering):
+                continue
+            gain = COVERING_ONLY_GAIN if matched == len(key) else 1 - matched / len(key)
+
+            entry = candidates.setdefault((table, tuple(key + covering)), {
+                'table': table,
+                'columns': key + covering,
+                'key_columns': key,
+                'covering_columns': covering,
+                'closest_existing': {'index': name, 'matched_key_columns': matched, 'covers': covers},
+                'statements': [],
+                'calls': 0,
+                'total_ms': 0.0,
+                'estimated_benefit_ms': 0.0,
+                'ddl': _index_ddl(table, key, covering)
+            })
+            entry['statements'].append({'fingerprint': statement['fingerprint'], 'sql': statement['sql'][:300],
+                                        'calls': statement['count']})
+            entry['calls'] += statement['count']
+            entry['total_ms'] += statement['total_ms']
+            entry['estimated_benefit_ms'] += statement['total_ms'] * gain
+
+    # A candidate that is a leftmost prefix of a wider one is served by it
+    ranked = sorted(candidates.values(), key=lambda c: len(c['columns']), reverse=True)
+    kept = []
+    for candidate in ranked:
+        wider = next((k for k in kept if k['table'] == candidate['table']
+                      and k['columns'][:len(candidate['key_columns'])] == candidate['key_columns']
+                      and set(candidate['columns']) <= set(k['columns'])), None)
+        if wider is None:
+            kept.append(candidate)
+            continue
+        wider['statements'].extend(candidate['statements'])
+        wider['calls'] += candidate['calls']
+        wider['total_ms'] += candidate['total_ms']
+        wider['estimated_benefit_ms'] += candidate['estimated_benefit_ms']
+
+    for candidate in kept:
+        candidate['total_ms'] = round(candidate['total_ms'], 3)
+        candidate['estimated_benefit_ms'] = round(candidate['estimated_benefit_ms'], 3)
+        candidate['statements'].sort(key=lambda s: s['calls'], reverse=True)
+    kept.sort(key=lambda c: c['estimated_benefit_ms'], reverse=True)
+    return kept
+
+
+def unused_indexes(workload, columns, indexes, reads=None):
+    """Secondary indexes that cost writes without serving the workload."""
+    used_columns, read_tables, writes = {}, set(), {}
+    for statement in workload:
+        kind, tables = analyze_statement(statement['sql'], columns)
+        for table, usage in tables.items():
+            if kind == 'read':
+                read_tables.add(table)
+            used_columns.setdefault(table, set()).update(
+                usage['eq'] + usage['join'] + usage['range'] + usage['sort'])
+        if kind == 'write':
+            target = next(iter(tables), None)
+            if target:
+                entry = writes.setdefault(target, {'calls': 0, 'total_ms': 0.0})
+                entry['calls'] += statement['count']
+                entry['total_ms'] = round(entry['total_ms'] + statement['total_ms'], 3)
+
+    flagged = []
+    for table, table_indexes in indexes.items():
+        for index in table_indexes:
+            if index['primary'] or index['unique'] or not index['columns']:
+                continue
+            reasons = []
+            if reads is not None and reads.get((table, index['name'])) == 0:
+                reasons.append('no reads since the server started')
+            wider = next((other['name'] for other in table_indexes if other is not index
+                          and len(other['columns']) > len(index['columns'])
+                          and other['columns'][:len(index['columns'])] == index['columns']), None)
+            if wider:
+                reasons.append(f'leftmost prefix of {wider}, which serves the same lookups')
+            if table in read_tables and index['columns'][0] not in used_columns.get(table, set()):
+                reasons.append(f"observed workload never filters, joins or sorts on {index['columns'][0]}")
+            if reasons:
+                flagged.append({
+                    'table': table,
+                    'index': index['name'],
+                    'columns': index['columns'],
+                    'reasons': reasons,
+                    'writes': writes.get(table, {'calls': 0, 'total_ms': 0.0})
+                })
+    flagged.sort(key=lambda f: (f['writes']['calls'], len(f['reasons'])), reverse=True)
+    return flagged
+
+
+def advise(cursor, workload, min_calls=1):
+    """Full report: recommendations, unused indexes and the indexes they were judged against."""
+    columns, indexes = load_schema(cursor)
+    reads = index_reads(cursor)
+    from_file = indexes_in_file()
+    return {
+        'recommendations': recommend(workload, columns, indexes, min_calls),
+        'unused_indexes': unused_indexes(workload, columns, indexes, reads),
+        'existing_indexes': [{
+            'table': index['table'],
+            'index': index['name'],
+            'columns': index['columns'],
+            'unique': index['unique'],
+            'defined_in_99_indexes': index['name'] in from_file,
+            'reads': reads.get((index['table'], index['name'])) if reads is not None else None
+        } for table in sorted(indexes) for index in indexes[table]],
+        'index_usage_available': reads is not None,
+        'workload': {
+            'statements': len(workload),
+            'calls': sum(statement['count'] for statement in workload),
+            'total_ms': round(sum(statement['total_ms'] for statement in workload), 3)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recommend indexes from the statements the database has executed.')
+    parser.add_argument('--min-calls', type=int, default=1,
+                        help='ignore statements executed fewer times than this')
+    parser.add_argument('--limit', type=int, default=500, help='digests to analyze, most expensive first')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    args = parser.parse_args()
+
+    from backend.rest_entry import create_app
+
+    # One-shot run: don't also start the periodic jobs
+    os.environ['BACKGROUND_JOBS_ENABLED'] = 'false'
+    app = create_app()
+    with app.app_context():
+        cursor = db.get_db().cursor()
+        report = advise(cursor, workload_from_digests(cursor, args.limit), args.min_calls)
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+
+    print(f"Workload: {report['workload']['statements']} statements, {report['workload']['calls']:,} calls, "
+          f"{report['workload']['total_ms']:,.0f} ms")
+    print('\nRecommended indexes (by estimated benefit):')
+    for candidate in report['recommendations'] or []:
+        print(f"  ~{candidate['estimated_benefit_ms']:>12,.0f} ms  {candidate['ddl']}  "
+              f"({len(candidate['statements'])} statements, {candidate['calls']:,} calls)")
+    if not report['recommendations']:
+        print('  none')
+    print('\nIndexes that may not be earning their write cost:')
+    for flag in report['unused_indexes']:
+        print(f"  {flag['table']}.{flag['index']} ({', '.join(flag['columns'])}): {'; '.join(flag['reasons'])} "
+              f"[{flag['writes']['calls']:,} write calls]")
+    if not report['unused_indexes']:
+        print('  none')
+
+
+if __name__ == '__main__':
+    main()
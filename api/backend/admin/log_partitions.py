@@ -0,0 +1,180 @@
+"""SystemLogs partition maintenance - pre-create monthly partitions and drop expired ones.
+
+SystemLogs is RANGE COLUMNS partitioned on created_at with one partition per
+month (named pYYYYMM) plus a catch-all `pmax`. Retention is enforced by
+dropping whole partitions, which is a metadata operation, instead of running
+DELETE over millions of rows.
+
+Run from the api/ directory (e.g. from cron):
+    python -m backend.admin.log_partitions [--months-ahead 3] [--retention-days 90]
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from backend.db_connection import db
+
+TABLE_NAME = 'SystemLogs'
+CATCH_ALL_PARTITION = 'pmax'
+
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_RETENTION_DAYS = 90
+
+
+def _month_start(d):
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d, months):
+    month_index = d.year * 12 + (d.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_name(month):
+    return f'p{month.year:04d}{month.month:02d}'
+
+
+def _parse_bound(raw):
+    """Turn a PARTITION_DESCRIPTION value ("'2026-11-01 00:00:00'" or MAXVALUE) into a date."""
+    if raw is None or str(raw).upper() == 'MAXVALUE':
+        return None
+    return datetime.strptime(str(raw).strip("'")[:10], '%Y-%m-%d').date()
+
+
+def list_partitions(cursor):
+    """
+    Return the SystemLogs partitions in order.
+
+    Each entry has name, upper_bound (date, or None for the catch-all) and the
+    approximate row count reported by information_schema.
+    """
+    cursor.execute('''
+        SELECT PARTITION_NAME AS name,
+               PARTITION_DESCRIPTION AS description,
+               TABLE_ROWS AS approx_rows
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = %s
+          AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    ''', (TABLE_NAME,))
+    return [{
+        'name': row['name'],
+        'upper_bound': _parse_bound(row['description']),
+        'approx_rows': row['approx_rows'] or 0
+    } for row in cursor.fetchall()]
+
+
+def ensure_future_partitions(cursor, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """
+    Split the catch-all partition so monthly partitions exist up to
+    `months_ahead` months past the current month.
+
+    Running this ahead of time keeps pmax empty, so the REORGANIZE has no rows
+    to copy. Returns the names of the partitions created.
+    """
+    partitions = list_partitions(cursor)
+    if not partitions:
+        current_app.logger.warning(f'{TABLE_NAME} is not partitioned; skipping partition creation')
+        return []
+
+    today = today or date.today()
+    bounds = [p['upper_bound'] for p in partitions if p['upper_bound']]
+    # The first new partition starts where the last bounded one ends. When only
+    # the catch-all exists (fresh install or just migrated) start at the oldest
+    # row so existing logs are spread over monthly partitions too.
+    if bounds:
+        start = max(bounds)
+    else:
+        cursor.execute(f'SELECT MIN(created_at) AS oldest FROM {TABLE_NAME}')
+        oldest = cursor.fetchone()['oldest']
+        start = min(_month_start(oldest), _month_start(today)) if oldest else _month_start(today)
+    last_bound = _add_months(_month_start(today), months_ahead + 1)
+
+    new_partitions = []
+    month = _month_start(start)
+    while month < last_bound:
+        new_partitions.append((_partition_name(month), _add_months(month, 1)))
+        month = _add_months(month, 1)
+
+    if not new_partitions:
+        return []
+
+    definitions = ', '.join(
+        f"PARTITION {name} VALUES LESS THAN ('{bound.isoformat()}')" for name, bound in new_partitions
+    )
+    cursor.execute(
+        f'ALTER TABLE {TABLE_NAME} REORGANIZE PARTITION {CATCH_ALL_PARTITION} INTO '
+        f'({definitions}, PARTITION {CATCH_ALL_PARTITION} VALUES LESS THAN (MAXVALUE))'
+    )
+    created = [name for name, _ in new_partitions]
+    current_app.logger.info(f'Created {TABLE_NAME} partitions: {", ".join(created)}')
+    return created
+
+
+def drop_expired_partitions(cursor, retention_days=DEFAULT_RETENTION_DAYS, today=None):
+    """
+    Drop every partition whose rows are all older than the retention window.
+
+    A partition qualifies when its upper bound is on or before the cutoff.
+    Returns a dict with the dropped partition names and the cutoff date.
+    """
+    today = today or date.today()
+    cutoff = today - timedelta(days=retention_days)
+
+    dropped = []
+    for partition in list_partitions(cursor):
+        bound = partition['upper_bound']
+        if bound is None or bound > cutoff:
+            continue
+
+        cursor.execute(f'ALTER TABLE {TABLE_NAME} DROP PARTITION {partition["name"]}')
+        dropped.append(partition['name'])
+
+    if dropped:
+        current_app.logger.info(f'Dropped expired {TABLE_NAME} partitions: {", ".join(dropped)}')
+    return {'dropped': dropped, 'cutoff': cutoff.isoformat()}
+
+
+def run_partition_maintenance(months_ahead=None, retention_days=None):
+    """Pre-create future partitions, then drop expired ones. Requires an app context."""
+    if months_ahead is None:
+        months_ahead = current_app.config.get('LOG_PARTITION_MONTHS_AHEAD', DEFAULT_MONTHS_AHEAD)
+    if retention_days is None:
+        retention_days = current_app.config.get('LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+    cursor = db.get_db().cursor()
+    created = ensure_future_partitions(cursor, months_ahead=months_ahead)
+    expired = drop_expired_partitions(cursor, retention_days=retention_days)
+
+    return {
+        'created': created,
+        'dropped': expired['dropped'],
+        'retention_cutoff': expired['cutoff'],
+        'months_ahead': months_ahead,
+        'retention_days': retention_days
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain SystemLogs monthly partitions.')
+    parser.add_argument('--months-ahead', type=int, default=None,
+                        help='months of partitions to keep pre-created (default: LOG_PARTITION_MONTHS_AHEAD)')
+    parser.add_argument('--retention-days', type=int, default=None,
+                        help='drop partitions older than this (default: LOG_RETENTION_DAYS)')
+    args = parser.parse_args()
+
+    import os
+    from backend.rest_entry import create_app
+
+    # One-shot run: don't also start the periodic job
+    os.environ['BACKGROUND_JOBS_ENABLED'] = 'false'
+    app = create_app()
+    with app.app_context():
+        summary = run_partition_maintenance(args.months_ahead, args.retention_days)
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,443 @@
+"""Vectorized data-quality validation for incoming PlayerGameStats and Game loads.
+
+A batch is validated column-wise with NumPy: every rule produces a boolean
+violation mask over the whole batch, so the cost of a season backfill is a
+handful of array operations plus two or three context queries, not a Python
+loop per row. Only rejected rows are touched individually, to attach reasons.
+
+Batches may be a pandas DataFrame, a dict of column arrays/lists, a NumPy
+structured array, or a list of row dicts (the JSON shape posted to the API).
+"""
+
+from datetime import date
+
+import numpy as np
+
+REGULATION_MINUTES = 48
+OVERTIME_MINUTES = 5
+
+PERCENTAGE_COLUMNS = ['shooting_percentage', 'three_point_percentage', 'free_throw_percentage']
+COUNTING_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'minutes_played']
+
+PLAYER_GAME_STATS_COLUMNS = ['player_id', 'game_id'] + COUNTING_COLUMNS + PERCENTAGE_COLUMNS + ['plus_minus']
+GAME_COLUMNS = ['game_date', 'home_team_id', 'away_team_id', 'home_score', 'away_score',
+                'season', 'game_type', 'status']
+
+VALID_GAME_TYPES = ['regular', 'playoff']
+VALID_GAME_STATUSES = ['scheduled', 'in_progress', 'completed']
+
+# Keep IN (...) lists to a reasonable size when fetching context for big batches
+_IN_CHUNK = 1000
+_NO_END_DATE = np.datetime64('9999-12-31')
+_KEY_BASE = np.int64(1 << 32)
+_TEAM_KEY_BASE = np.int64(1 << 20)
+
+
+class ValidationResult:
+    """Outcome of validating one batch: per-row rejection reasons plus summary counts."""
+
+    def __init__(self, table, total, columns):
+        self.table = table
+        self.total = total
+        self.columns = columns
+        self.rejected_mask = np.zeros(total, dtype=bool)
+        self.reasons = {}
+        self.rule_counts = {}
+
+    def add_rule(self, name, violations, reason):
+        """Record a rule's violation mask; `reason` is a string or a per-row callable."""
+        violations = np.asarray(violations, dtype=bool)
+        self.rule_counts[name] = int(violations.sum())
+        if not self.rule_counts[name]:
+            return
+        self.rejected_mask |= violations
+        for i in np.flatnonzero(violations):
+            text = reason(i) if callable(reason) else reason
+            self.reasons.setdefault(int(i), []).append(text)
+
+    @property
+    def accepted_indices(self):
+        return np.flatnonzero(~self.rejected_mask)
+
+    @property
+    def rejected_indices(self):
+        return np.flatnonzero(self.rejected_mask)
+
+    def row_key(self, i):
+        if self.table == 'PlayerGameStats':
+            return {'player_id': _scalar(self.columns['player_id'][i]),
+                    'game_id': _scalar(self.columns['game_id'][i])}
+        return {'game_date': str(self.columns['game_date'][i]),
+                'home_team_id': _scalar(self.columns['home_team_id'][i]),
+                'away_team_id': _scalar(self.columns['away_team_id'][i])}
+
+    def rejections(self):
+        return [{'row': int(i), 'key': self.row_key(i), 'reasons': self.reasons[int(i)]}
+                for i in self.rejected_indices]
+
+    def summary(self):
+        return {
+            'table': self.table,
+            'total_rows': self.total,
+            'accepted_rows': int(self.total - self.rejected_mask.sum()),
+            'rejected_rows': int(self.rejected_mask.sum()),
+            'rule_violations': self.rule_counts
+        }
+
+
+def _scalar(value):
+    """Convert NumPy scalars to plain Python values for JSON/SQL."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if np.isnan(value):
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def _to_columns(batch, numeric, text=(), dates=()):
+    """Normalize a batch into a dict of NumPy arrays keyed by column name."""
+    if hasattr(batch, 'dtype') and getattr(batch.dtype, 'names', None):
+        source = {name: batch[name] for name in batch.dtype.names}
+        n = len(batch)
+    elif hasattr(batch, 'columns') and hasattr(batch, 'to_numpy'):
+        # pandas DataFrame (pandas itself is not a dependency of the API)
+        source = {name: batch[name].to_numpy() for name in batch.columns}
+        n = len(batch)
+    elif isinstance(batch, dict):
+        source = batch
+        n = len(next(iter(batch.values()))) if batch else 0
+    else:
+        rows = list(batch or [])
+        n = len(rows)
+        wanted = list(numeric) + list(text) + list(dates)
+        source = {name: [row.get(name) for row in rows] for name in wanted if any(name in row for row in rows)}
+
+    columns = {}
+    for name in numeric:
+        values = source.get(name)
+        columns[name] = np.full(n, np.nan) if values is None else np.asarray(values, dtype=float)
+    for name in text:
+        values = source.get(name)
+        # Missing text values become '' so comparisons stay vectorized
+        columns[name] = (np.full(n, '', dtype=object) if values is None
+                         else np.array(['' if v is None else str(v) for v in values], dtype=object))
+    for name in dates:
+        values = source.get(name)
+        columns[name] = (np.full(n, np.datetime64('NaT'), dtype='datetime64[D]') if values is None
+                         else np.asarray(values, dtype='datetime64[D]'))
+    return columns, n
+
+
+def _pair_keys(a, b):
+    """Pack two integer id columns into one int64 key per row."""
+    return a.astype(np.int64) * _KEY_BASE + b.astype(np.int64)
+
+
+def _game_keys(days, home, away):
+    """Pack (game day, home team, away team) into one int64 key per row."""
+    return (days.astype(np.int64) * _TEAM_KEY_BASE + home) * _TEAM_KEY_BASE + away
+
+
+def _duplicate_mask(keys):
+    """Flag every occurrence of a key after its first appearance."""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    dup = np.zeros(len(keys), dtype=bool)
+    dup[order[1:]] = sorted_keys[1:] == sorted_keys[:-1]
+    return dup
+
+
+def _chunks(values):
+    values = [int(v) for v in values]
+    for start in range(0, len(values), _IN_CHUNK):
+        yield values[start:start + _IN_CHUNK]
+
+
+def _fetch_games(cursor, game_ids):
+    rows = []
+    for chunk in _chunks(game_ids):
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(f'''
+            SELECT game_id, game_date, home_team_id, away_team_id, home_score, away_score, status
+            FROM Game
+            WHERE game_id IN ({placeholders})
+            ORDER BY game_id
+        ''', chunk)
+        rows.extend(cursor.fetchall())
+    rows.sort(key=lambda r: r['game_id'])
+    return {
+        'game_id': np.array([r['game_id'] for r in rows], dtype=np.int64),
+        'game_date': np.array([r['game_date'] for r in rows], dtype='datetime64[D]'),
+        'home_team_id': np.array([r['home_team_id'] for r in rows], dtype=np.int64),
+        'away_team_id': np.array([r['away_team_id'] for r in rows], dtype=np.int64),
+        'home_score': np.array([r['home_score'] or 0 for r in rows], dtype=np.int64),
+        'away_score': np.array([r['away_score'] or 0 for r in rows], dtype=np.int64),
+        'completed': np.array([r['status'] == 'completed' for r in rows], dtype=bool)
+    }
+
+
+def _fetch_stints(cursor, player_ids):
+    rows = []
+    for chunk in _chunks(player_ids):
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(f'''
+            SELECT player_id, team_id, joined_date, left_date
+            FROM TeamsPlayers
+            WHERE player_id IN ({placeholders})
+        ''', chunk)
+        rows.extend(cursor.fetchall())
+    rows.sort(key=lambda r: r['player_id'])
+    return {
+        'player_id': np.array([r['player_id'] for r in rows], dtype=np.int64),
+        'team_id': np.array([r['team_id'] for r in rows], dtype=np.int64),
+        'joined_date': np.array([r['joined_date'] or date.min for r in rows], dtype='datetime64[D]'),
+        'left_date': np.array([r['left_date'] or _NO_END_DATE for r in rows], dtype='datetime64[D]')
+    }
+
+
+def _fetch_existing_stat_keys(cursor, game_ids):
+    keys = []
+    for chunk in _chunks(game_ids):
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(f'SELECT player_id, game_id FROM PlayerGameStats WHERE game_id IN ({placeholders})', chunk)
+        keys.extend((r['player_id'], r['game_id']) for r in cursor.fetchall())
+    if not keys:
+        return np.array([], dtype=np.int64)
+    pairs = np.array(keys, dtype=np.int64)
+    return _pair_keys(pairs[:, 0], pairs[:, 1])
+
+
+def _team_at_game(stints, player_ids, game_dates, home, away):
+    """
+    Resolve, per row, the team the player was rostered on at the game date,
+    restricted to the two teams playing. Returns -1 where there is none.
+
+    Every row is paired with all stints of its player in one flat expansion,
+    so the interval test runs as a single vectorized comparison.
+    """
+    n = len(player_ids)
+    team = np.full(n, -1, dtype=np.int64)
+    if not len(stints['player_id']) or not n:
+        return team
+
+    starts = np.searchsorted(stints['player_id'], player_ids, side='left')
+    counts = np.searchsorted(stints['player_id'], player_ids, side='right') - starts
+
+    row_idx = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    stint_idx = np.repeat(starts, counts) + offsets
+
+    stint_team = stints['team_id'][stint_idx]
+    on_date = ((stints['joined_date'][stint_idx] <= game_dates[row_idx]) &
+               (stints['left_date'][stint_idx] >= game_dates[row_idx]))
+    playing = (stint_team == home[row_idx]) | (stint_team == away[row_idx])
+    match = on_date & playing
+
+    team[row_idx[match]] = stint_team[match]
+    return team
+
+
+def validate_player_game_stats(cursor, batch, overtime_periods=None, require_complete_box_scores=False):
+    """
+    Validate a batch of PlayerGameStats rows.
+
+    Rules: percentages within [0, 1]; non-negative counting stats; minutes no
+    more than 48 plus 5 per overtime period; no duplicate (player_id, game_id)
+    within the batch or already loaded; game exists; player on the home or
+    away roster at the game date; per-team point totals consistent with the
+    final score of completed games (at most the score, or exactly equal when
+    `require_complete_box_scores` is set).
+
+    `overtime_periods` is an optional {game_id: periods} mapping; a per-row
+    `overtime_periods` column in the batch takes precedence.
+    """
+    columns, n = _to_columns(batch, numeric=PLAYER_GAME_STATS_COLUMNS + ['overtime_periods'])
+    result = ValidationResult('PlayerGameStats', n, columns)
+    if not n:
+        return result
+
+    player_ids = np.nan_to_num(columns['player_id'], nan=-1).astype(np.int64)
+    game_ids = np.nan_to_num(columns['game_id'], nan=-1).astype(np.int64)
+
+    result.add_rule('missing_keys', (player_ids < 0) | (game_ids < 0), 'player_id and game_id are required')
+
+    # Range rules (NaN means the value was not supplied and is skipped)
+    for name in PERCENTAGE_COLUMNS:
+        values = columns[name]
+        result.add_rule(f'{name}_range', (values < 0) | (values > 1), f'{name} must be between 0 and 1')
+    for name in COUNTING_COLUMNS:
+        result.add_rule(f'{name}_negative', columns[name] < 0, f'{name} cannot be negative')
+
+    # Game context
+    unique_games = np.unique(game_ids[game_ids >= 0])
+    games = _fetch_games(cursor, unique_games)
+    if len(games['game_id']):
+        pos = np.clip(np.searchsorted(games['game_id'], game_ids), 0, len(games['game_id']) - 1)
+        known_game = games['game_id'][pos] == game_ids
+        game_dates = np.where(known_game, games['game_date'][pos], np.datetime64('NaT'))
+        home = np.where(known_game, games['home_team_id'][pos], -1)
+        away = np.where(known_game, games['away_team_id'][pos], -1)
+        game_completed = known_game & games['completed'][pos]
+        home_score = games['home_score'][pos]
+        away_score = games['away_score'][pos]
+    else:
+        known_game = game_completed = np.zeros(n, dtype=bool)
+        game_dates = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+        home = away = np.full(n, -1, dtype=np.int64)
+        home_score = away_score = np.zeros(n, dtype=np.int64)
+    result.add_rule('unknown_game', (game_ids >= 0) & ~known_game, 'game_id does not exist')
+
+    # Minutes cap: 48 + 5 per overtime period
+    ot = columns['overtime_periods']
+    if overtime_periods:
+        lookup = {int(k): int(v) for k, v in overtime_periods.items()}
+        from_map = np.array([lookup.get(int(g), 0) for g in game_ids], dtype=float)
+        ot = np.where(np.isnan(ot), from_map, ot)
+    ot = np.nan_to_num(ot, nan=0)
+    max_minutes = REGULATION_MINUTES + OVERTIME_MINUTES * ot
+    result.add_rule('minutes_cap', columns['minutes_played'] > max_minutes,
+                    lambda i: f'minutes_played exceeds {int(max_minutes[i])} for this game')
+
+    # Duplicates within the batch and against rows already loaded
+    keys = _pair_keys(player_ids, game_ids)
+    result.add_rule('duplicate_in_batch', _duplicate_mask(keys), 'duplicate (player_id, game_id) in batch')
+    existing = _fetch_existing_stat_keys(cursor, unique_games)
+    result.add_rule('already_loaded', np.isin(keys, existing), '(player_id, game_id) already loaded')
+
+    # Roster membership at game date
+    stints = _fetch_stints(cursor, np.unique(player_ids[player_ids >= 0]))
+    team = _team_at_game(stints, player_ids, game_dates, home, away)
+    result.add_rule('not_on_roster', known_game & (team < 0),
+                    'player not on either team roster at game date')
+
+    # Team point totals vs. final score (completed games only)
+    completed = game_completed & (team >= 0)
+    if completed.any():
+        team_score = np.where(team == home, home_score, away_score)
+        group_keys = _pair_keys(game_ids[completed], team[completed])
+        groups, inverse = np.unique(group_keys, return_inverse=True)
+        points = np.nan_to_num(columns['points'][completed], nan=0)
+        sums = np.bincount(inverse, weights=points, minlength=len(groups))
+        scores = np.zeros(len(groups))
+        scores[inverse] = team_score[completed]
+
+        bad_group = sums != scores if require_complete_box_scores else sums > scores
+        inconsistent = np.zeros(n, dtype=bool)
+        inconsistent[np.flatnonzero(completed)] = bad_group[inverse]
+        group_of_row = np.full(n, -1)
+        group_of_row[np.flatnonzero(completed)] = inverse
+        result.add_rule(
+            'points_vs_score', inconsistent,
+            lambda i: (f'team points in batch ({int(sums[group_of_row[i]])}) '
+                       f'inconsistent with final score ({int(scores[group_of_row[i]])})')
+        )
+
+    return result
+
+
+def validate_games(cursor, batch):
+    """
+    Validate a batch of Game rows.
+
+    Rules: home and away teams differ and exist; scores non-negative; valid
+    game_type/status; completed games cannot end tied; no duplicate
+    (game_date, home_team_id, away_team_id) within the batch or already loaded.
+    """
+    columns, n = _to_columns(batch,
+                             numeric=['home_team_id', 'away_team_id', 'home_score', 'away_score'],
+                             text=['season', 'game_type', 'status'],
+                             dates=['game_date'])
+    result = ValidationResult('Game', n, columns)
+    if not n:
+        return result
+
+    home = np.nan_to_num(columns['home_team_id'], nan=-1).astype(np.int64)
+    away = np.nan_to_num(columns['away_team_id'], nan=-1).astype(np.int64)
+    dates = columns['game_date']
+
+    result.add_rule('missing_fields',
+                    (home < 0) | (away < 0) | np.isnat(dates) | (columns['season'] == ''),
+                    'game_date, home_team_id, away_team_id and season are required')
+    result.add_rule('same_teams', (home >= 0) & (home == away), 'home and away teams must be different')
+    for name in ('home_score', 'away_score'):
+        result.add_rule(f'{name}_negative', columns[name] < 0, f'{name} cannot be negative')
+
+    game_type = columns['game_type']
+    status = columns['status']
+    result.add_rule('invalid_game_type', (game_type != '') & ~np.isin(game_type, VALID_GAME_TYPES),
+                    f'game_type must be one of {VALID_GAME_TYPES}')
+    result.add_rule('invalid_status', (status != '') & ~np.isin(status, VALID_GAME_STATUSES),
+                    f'status must be one of {VALID_GAME_STATUSES}')
+    result.add_rule('completed_tie', (status == 'completed') & (columns['home_score'] == columns['away_score']),
+                    'completed game cannot end tied')
+
+    # Teams must exist
+    team_ids = np.unique(np.concatenate([home[home >= 0], away[away >= 0]]))
+    known_teams = []
+    for chunk in _chunks(team_ids):
+        placeholders = ','.join(['%s'] * len(chunk))
+        cursor.execute(f'SELECT team_id FROM Teams WHERE team_id IN ({placeholders})', chunk)
+        known_teams.extend(r['team_id'] for r in cursor.fetchall())
+    known_teams = np.array(known_teams, dtype=np.int64)
+    result.add_rule('unknown_team',
+                    ((home >= 0) & ~np.isin(home, known_teams)) | ((away >= 0) & ~np.isin(away, known_teams)),
+                    'home_team_id or away_team_id does not exist')
+
+    # Duplicates: same matchup on the same date
+    day_numbers = dates.astype('datetime64[D]').astype(np.int64)
+    keys = _game_keys(day_numbers, home, away)
+    result.add_rule('duplicate_in_batch', _duplicate_mask(keys), 'duplicate game (date, home, away) in batch')
+
+    valid_dates = dates[~np.isnat(dates)]
+    existing = np.array([], dtype=np.int64)
+    if len(valid_dates):
+        cursor.execute('''
+            SELECT game_date, home_team_id, away_team_id
+            FROM Game
+            WHERE game_date BETWEEN %s AND %s
+        ''', (str(valid_dates.min()), str(valid_dates.max())))
+        rows = cursor.fetchall()
+        if rows:
+            existing_days = np.array([r['game_date'] for r in rows], dtype='datetime64[D]').astype(np.int64)
+            existing_home = np.array([r['home_team_id'] for r in rows], dtype=np.int64)
+            existing_away = np.array([r['away_team_id'] for r in rows], dtype=np.int64)
+            existing = _game_keys(existing_days, existing_home, existing_away)
+    result.add_rule('already_loaded', np.isin(keys, existing), 'game already exists for these teams on this date')
+
+    return result
+
+
+VALIDATORS = {
+    'PlayerGameStats': validate_player_game_stats,
+    'Game': validate_games
+}
+
+
+def record_rejections(cursor, result, source_file=None, user_id=None, severity='error'):
+    """
+    Write one SystemLogs 'validation' row per rejected record so rejections
+    show up under GET /system/data-errors. Uses a single executemany.
+    """
+    rejections = result.rejections()
+    if not rejections:
+        return 0
+
+    values = [(
+        result.table,
+        severity,
+        f"Rejected {result.table} row {r['row']} {r['key']}: {'; '.join(r['reasons'])}",
+        1,
+        1,
+        source_file,
+        user_id
+    ) for r in rejections]
+
+    cursor.executemany('''
+        INSERT INTO SystemLogs (
+            log_type, service_name, severity, message, records_processed, records_failed, source_file, user_id
+        ) VALUES ('validation', %s, %s, %s, %s, %s, %s, %s)
+    ''', values)
+    return len(values)
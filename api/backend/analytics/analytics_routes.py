@@ -1,14 +1,15 @@
 """Analytics blueprint - performance and comparison endpoints."""
 
-from flask import Blueprint, request, jsonify, make_response, current_app
-from backend.db_connection import db
+from flask import Blueprint, current_app
+from backend.fanout import FanoutTimeout, Query
+from backend.query_routes import query_route
 
 # Create blueprint
 analytics = Blueprint('analytics', __name__)
 #------------------------------------------------------------
 # Player comparisons for side-by-side analysis [Johnny-1.4, Andre-4.2]
-@analytics.route('/player-comparisons', methods=['GET'])
-def get_player_comparisons():
+@query_route(analytics, '/player-comparisons')
+def get_player_comparisons(args):
     """
     Compare two or more players side-by-side using basic per-game averages.
 
@@ -19,14 +20,12 @@ def get_player_comparisons():
     try:
         current_app.logger.info('GET /player-comparisons handler started')
 
-        player_ids_param = request.args.get('player_ids', '')
-        season = request.args.get('season')
+        player_ids_param = args.get('player_ids', '')
+        season = args.get('season')
 
         player_ids = [int(pid) for pid in player_ids_param.split(',') if pid.strip().isdigit()]
         if len(player_ids) < 2:
-            return make_response(jsonify({"error": "Provide at least two player_ids"}), 400)
-
-        cursor = db.get_db().cursor()
+            return {"error": "Provide at least two player_ids"}, 400
 
         placeholders = ','.join(['%s'] * len(player_ids))
         params = list(player_ids)
@@ -58,24 +57,23 @@ def get_player_comparisons():
 
         query += ' GROUP BY p.player_id, p.first_name, p.last_name, p.position, t.name'
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        rows = yield Query(query, params)
 
-        return make_response(jsonify({
+        return {
             'players': rows,
             'total': len(rows)
-        }), 200)
+        }, 200
 
     except Exception as e:
         current_app.logger.error(f'Error in get_player_comparisons: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch player comparisons"}), 500)
+        return {"error": "Failed to fetch player comparisons"}, 500
 
 
 
 #------------------------------------------------------------
 # Get player matchup analysis [Marcus-3.2]
-@analytics.route('/player-matchups', methods=['GET'])
-def get_player_matchups():
+@query_route(analytics, '/player-matchups')
+def get_player_matchups(args):
     """
     Get comprehensive matchup analysis between two players.
 
@@ -91,16 +89,14 @@ def get_player_matchups():
         current_app.logger.info('GET /player-matchups handler started')
 
         # Extract and validate parameters
-        player1_id = request.args.get('player1_id', type=int)
-        player2_id = request.args.get('player2_id', type=int)
-        season = request.args.get('season')
+        player1_id = args.get('player1_id', type=int)
+        player2_id = args.get('player2_id', type=int)
+        season = args.get('season')
 
         if not player1_id or not player2_id:
-            return make_response(jsonify({
+            return {
                 "error": "Both player1_id and player2_id are required"
-            }), 400)
-
-        cursor = db.get_db().cursor()
+            }, 400
 
         # Existing matchup query (unchanged) - reuse to get matchup_games
         season_clause = ''
@@ -175,8 +171,7 @@ def get_player_matchups():
 
         matchup_query += ' ORDER BY game_date DESC'
 
-        cursor.execute(matchup_query, params)
-        matchup_games = cursor.fetchall()
+        matchup_games = yield Query(matchup_query, params)
 
         # Calculate aggregated comparison statistics
         if matchup_games:
@@ -245,19 +240,17 @@ def get_player_matchups():
         }
 
         current_app.logger.info(f'Successfully analyzed matchup between players {player1_id} and {player2_id}')
-        response = make_response(jsonify(response_data))
-        response.status_code = 200
-        return response
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error in get_player_matchups: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch player matchups"}), 500)
+        return {"error": "Failed to fetch player matchups"}, 500
 
 
 #------------------------------------------------------------
 # Get opponent analysis and scouting report [Marcus-3.1]
-@analytics.route('/opponent-reports', methods=['GET'])
-def get_opponent_reports():
+@query_route(analytics, '/opponent-reports')
+def get_opponent_reports(args):
     """
     Get comprehensive opponent team analysis and scouting information.
 
@@ -273,16 +266,14 @@ def get_opponent_reports():
         current_app.logger.info('GET /opponent-reports handler started')
 
         # Extract and validate parameters
-        team_id = request.args.get('team_id', type=int)
-        opponent_id = request.args.get('opponent_id', type=int)
-        last_n_games = request.args.get('last_n_games', 10, type=int)
+        team_id = args.get('team_id', type=int)
+        opponent_id = args.get('opponent_id', type=int)
+        last_n_games = args.get('last_n_games', 10, type=int)
 
         if not team_id or not opponent_id:
-            return make_response(jsonify({
+            return {
                 "error": "Both team_id and opponent_id are required"
-            }), 400)
-
-        cursor = db.get_db().cursor()
+            }, 400
 
         # Get opponent team information
         opponent_info_query = '''
@@ -299,12 +290,6 @@ def get_opponent_reports():
                 t.founded_year, t.championships, t.offensive_system, t.defensive_system
         '''
 
-        cursor.execute(opponent_info_query, (opponent_id,))
-        opponent_info = cursor.fetchone()
-
-        if not opponent_info:
-            return make_response(jsonify({"error": "Opponent team not found"}), 404)
-
         # Get recent head-to-head history
         head_to_head_query = '''
             SELECT
@@ -327,10 +312,6 @@ def get_opponent_reports():
             LIMIT %s
         '''
 
-        cursor.execute(head_to_head_query,
-                      (team_id, team_id, team_id, opponent_id, opponent_id, team_id, last_n_games))
-        head_to_head = cursor.fetchall()
-
         # Get opponent's recent performance
         recent_performance_query = '''
             SELECT
@@ -357,10 +338,6 @@ def get_opponent_reports():
             LIMIT %s
         '''
 
-        cursor.execute(recent_performance_query,
-                      (opponent_id, opponent_id, opponent_id, opponent_id, opponent_id, last_n_games))
-        recent_games = cursor.fetchall()
-
         # Get opponent's key players
         key_players_query = '''
             SELECT
@@ -382,8 +359,37 @@ def get_opponent_reports():
             LIMIT 5
         '''
 
-        cursor.execute(key_players_query, (opponent_id,))
-        key_players = cursor.fetchall()
+        # Aggregated team shooting stats, if the table exists
+        shooting_query = '''
+            SELECT
+                ROUND(AVG(ts.fg_pct),2) AS fg_pct,
+                ROUND(AVG(ts.three_pt_pct),2) AS three_pt_pct,
+                ROUND(AVG(ts.two_pt_pct),2) AS two_pt_pct,
+                ROUND(AVG(ts.freethrow_pct),2) AS ft_pct,
+                ROUND(AVG(ts.turnovers),1) AS turnovers
+            FROM TeamShootingStats ts
+            WHERE ts.team_id = %s
+            AND ts.game_date >= (SELECT MAX(game_date) - INTERVAL %s DAY FROM Game)
+        '''
+
+        # The sections are independent: run them concurrently
+        results = yield {
+            'opponent_info': Query(opponent_info_query, (opponent_id,), one=True),
+            'head_to_head': Query(head_to_head_query,
+                                  (team_id, team_id, team_id, opponent_id, opponent_id, team_id, last_n_games)),
+            'recent_games': Query(recent_performance_query,
+                                  (opponent_id, opponent_id, opponent_id, opponent_id, opponent_id, last_n_games)),
+            'key_players': Query(key_players_query, (opponent_id,)),
+            'shooting': Query(shooting_query, (opponent_id, last_n_games), one=True, optional=True)
+        }
+
+        opponent_info = results['opponent_info']
+        if not opponent_info:
+            return {"error": "Opponent team not found"}, 404
+
+        head_to_head = results['head_to_head']
+        recent_games = results['recent_games']
+        key_players = results['key_players']
 
         # Calculate performance statistics
         if recent_games:
@@ -399,19 +405,10 @@ def get_opponent_reports():
         defensive_weaknesses = None
         tactical_recommendations = []
         try:
-            # Try to query aggregated team shooting stats if the table exists
-            cursor.execute('''
-                SELECT
-                    ROUND(AVG(ts.fg_pct),2) AS fg_pct,
-                    ROUND(AVG(ts.three_pt_pct),2) AS three_pt_pct,
-                    ROUND(AVG(ts.two_pt_pct),2) AS two_pt_pct,
-                    ROUND(AVG(ts.freethrow_pct),2) AS ft_pct,
-                    ROUND(AVG(ts.turnovers),1) AS turnovers
-                FROM TeamShootingStats ts
-                WHERE ts.team_id = %s
-                AND ts.game_date >= (SELECT MAX(game_date) - INTERVAL %s DAY FROM Game)
-            ''', (opponent_id, last_n_games))
-            shooting_row = cursor.fetchone()
+            # None when the optional TeamShootingStats query failed: fall back below
+            shooting_row = results['shooting']
+            if shooting_row is None:
+                raise LookupError('TeamShootingStats is not available')
             if shooting_row and shooting_row.get('fg_pct') is not None:
                 shooting_patterns = {
                     'fg_pct': float(shooting_row['fg_pct']),
@@ -464,19 +461,20 @@ def get_opponent_reports():
         }
 
         current_app.logger.info(f'Successfully generated opponent report for team {opponent_id}')
-        response = make_response(jsonify(response_data))
-        response.status_code = 200
-        return response
+        return response_data, 200
 
+    except FanoutTimeout as e:
+        current_app.logger.error(f'Opponent report timed out: {e}')
+        return {"error": "Opponent report timed out"}, 504
     except Exception as e:
         current_app.logger.error(f'Error in get_opponent_reports: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch opponent report"}), 500)
+        return {"error": "Failed to fetch opponent report"}, 500
 
 
 #------------------------------------------------------------
 # Get lineup effectiveness analysis [Marcus-3.4]
-@analytics.route('/lineup-configurations', methods=['GET'])
-def get_lineup_configurations():
+@query_route(analytics, '/lineup-configurations')
+def get_lineup_configurations(args):
     """
     Get lineup effectiveness analysis for strategic decision making.
 
@@ -492,14 +490,12 @@ def get_lineup_configurations():
         current_app.logger.info('GET /lineup-configurations handler started')
 
         # Extract and validate parameters
-        team_id = request.args.get('team_id', type=int)
-        min_games = request.args.get('min_games', 5, type=int)
-        season = request.args.get('season')
+        team_id = args.get('team_id', type=int)
+        min_games = args.get('min_games', 5, type=int)
+        season = args.get('season')
 
         if not team_id:
-            return make_response(jsonify({"error": "team_id is required"}), 400)
-
-        cursor = db.get_db().cursor()
+            return {"error": "team_id is required"}, 400
 
         # Strategy:
         # 1) Try strict team-membership (current roster) filter
@@ -527,8 +523,7 @@ def get_lineup_configurations():
             LIMIT 10;
         '''
 
-        cursor.execute(strict_query, [team_id, team_id])
-        lineup_stats = cursor.fetchall() or []
+        lineup_stats = (yield Query(strict_query, [team_id, team_id])) or []
 
         if not lineup_stats:
             relaxed_query = '''
@@ -551,8 +546,7 @@ def get_lineup_configurations():
                 ORDER BY lc.plus_minus DESC
                 LIMIT 10;
             '''
-            cursor.execute(relaxed_query, [team_id, team_id])
-            lineup_stats = cursor.fetchall() or []
+            lineup_stats = (yield Query(relaxed_query, [team_id, team_id])) or []
 
         if not lineup_stats:
             fallback_query = '''
@@ -570,8 +564,7 @@ def get_lineup_configurations():
                 ORDER BY lc.plus_minus DESC
                 LIMIT 10;
             '''
-            cursor.execute(fallback_query, [team_id])
-            lineup_stats = cursor.fetchall() or []
+            lineup_stats = (yield Query(fallback_query, [team_id])) or []
 
         response_data = {
             'team_id': team_id,
@@ -583,19 +576,17 @@ def get_lineup_configurations():
         }
 
         current_app.logger.info(f'Successfully retrieved lineup configurations for team {team_id}')
-        response = make_response(jsonify(response_data))
-        response.status_code = 200
-        return response
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error in get_lineup_configurations: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch lineup configurations"}), 500)
+        return {"error": "Failed to fetch lineup configurations"}, 500
 
 
 #------------------------------------------------------------
 # Get season performance summaries [Marcus-3.6]
-@analytics.route('/season-summaries', methods=['GET'])
-def get_season_summaries():
+@query_route(analytics, '/season-summaries')
+def get_season_summaries(args):
     """
     Get comprehensive season performance summaries for teams or players.
 
@@ -611,21 +602,19 @@ def get_season_summaries():
         current_app.logger.info('GET /season-summaries handler started')
 
         # Extract and validate parameters
-        entity_type = request.args.get('entity_type')
-        entity_id = request.args.get('entity_id', type=int)
-        season = request.args.get('season')
+        entity_type = args.get('entity_type')
+        entity_id = args.get('entity_id', type=int)
+        season = args.get('season')
 
         if not entity_type or not entity_id:
-            return make_response(jsonify({
+            return {
                 "error": "entity_type and entity_id are required"
-            }), 400)
+            }, 400
 
         if entity_type not in ['team', 'player']:
-            return make_response(jsonify({
+            return {
                 "error": "entity_type must be 'team' or 'player'"
-            }), 400)
-
-        cursor = db.get_db().cursor()
+            }, 400
 
         if entity_type == 'team':
             # Get comprehensive team season summary
@@ -664,8 +653,7 @@ def get_season_summaries():
 
             team_summary_query += ' GROUP BY t.name'
 
-            cursor.execute(team_summary_query, params)
-            summary = cursor.fetchone()
+            summary = yield Query(team_summary_query, params, one=True)
 
         else:  # entity_type == 'player'
             # Get comprehensive player season summary
@@ -702,8 +690,7 @@ def get_season_summaries():
 
             player_summary_query += ' GROUP BY p.player_id, p.first_name, p.last_name, p.position, t.name'
 
-            cursor.execute(player_summary_query, params)
-            summary = cursor.fetchone()
+            summary = yield Query(player_summary_query, params, one=True)
 
         response_data = {
             'entity_type': entity_type,
@@ -713,17 +700,15 @@ def get_season_summaries():
         }
 
         current_app.logger.info(f'Successfully generated season summary for {entity_type} {entity_id}')
-        response = make_response(jsonify(response_data))
-        response.status_code = 200
-        return response
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error in get_season_summaries: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch season summary"}), 500)
+        return {"error": "Failed to fetch season summary"}, 500
     
 # Enhanced Situational Performance Route
-@analytics.route('/situational-performance', methods=['GET'])
-def get_situational_performance():
+@query_route(analytics, '/situational-performance')
+def get_situational_performance(args):
     """
     Get comprehensive situational team performance with actual game data.
     
@@ -737,14 +722,12 @@ def get_situational_performance():
     """
     try:
         current_app.logger.info('GET /situational-performance handler started')
-        team_id = request.args.get('team_id', type=int)
-        season = request.args.get('season')
-        last_n_games = request.args.get('last_n_games', 20, type=int)
+        team_id = args.get('team_id', type=int)
+        season = args.get('season')
+        last_n_games = args.get('last_n_games', 20, type=int)
 
         if not team_id:
-            return make_response(jsonify({"error": "team_id is required"}), 400)
-
-        cursor = db.get_db().cursor()
+            return {"error": "team_id is required"}, 400
 
         situational = {
             'clutch': None,
@@ -789,9 +772,39 @@ def get_situational_performance():
             
         base_game_query += ' ORDER BY g.game_date DESC LIMIT %s'
         params.append(last_n_games)
-        
-        cursor.execute(base_game_query, params)
-        recent_games = cursor.fetchall()
+
+        # Clutch performers: current players' averages in the close games
+        # (decided by 5 points or less) among those recent games. Selecting the
+        # games in a derived table keeps this independent of the query above.
+        clutch_query = f'''
+            SELECT 
+                p.first_name,
+                p.last_name,
+                p.position,
+                ROUND(AVG(pgs.points), 1) as avg_points,
+                ROUND(AVG(pgs.plus_minus), 1) as avg_plus_minus,
+                COUNT(pgs.game_id) as games_played
+            FROM PlayerGameStats pgs
+            JOIN Players p ON pgs.player_id = p.player_id
+            JOIN TeamsPlayers tp ON p.player_id = tp.player_id
+            WHERE pgs.game_id IN (
+                SELECT recent.game_id
+                FROM ({base_game_query}) recent
+                WHERE ABS(recent.team_score - recent.opp_score) <= 5
+            )
+            AND tp.team_id = %s
+            AND tp.left_date IS NULL
+            GROUP BY p.player_id, p.first_name, p.last_name, p.position
+            ORDER BY avg_points DESC
+            LIMIT 5
+        '''
+
+        results = yield {
+            'recent_games': Query(base_game_query, params),
+            'clutch_performers': Query(clutch_query, params + [team_id])
+        }
+        recent_games = results['recent_games']
+        close_games = []
 
         if recent_games:
             # Calculate clutch performance (games decided by 5 points or less)
@@ -871,43 +884,19 @@ def get_situational_performance():
                 'result': 'W' if g['team_score'] > g['opp_score'] else 'L'
             } for g in close_games]
 
-        # Get player performance in clutch (optional enhancement)
-        if close_games:
-            game_ids = [g['game_id'] for g in close_games]
-            if game_ids:
-                placeholders = ','.join(['%s'] * len(game_ids))
-                cursor.execute(f'''
-                    SELECT 
-                        p.first_name,
-                        p.last_name,
-                        p.position,
-                        ROUND(AVG(pgs.points), 1) as avg_points,
-                        ROUND(AVG(pgs.plus_minus), 1) as avg_plus_minus,
-                        COUNT(pgs.game_id) as games_played
-                    FROM PlayerGameStats pgs
-                    JOIN Players p ON pgs.player_id = p.player_id
-                    JOIN TeamsPlayers tp ON p.player_id = tp.player_id
-                    WHERE pgs.game_id IN ({placeholders})
-                    AND tp.team_id = %s
-                    AND tp.left_date IS NULL
-                    GROUP BY p.player_id, p.first_name, p.last_name, p.position
-                    ORDER BY avg_points DESC
-                    LIMIT 5
-                ''', game_ids + [team_id])
-                
-                clutch_performers = cursor.fetchall()
-                if clutch_performers:
-                    situational['clutch_performers'] = clutch_performers
+        if close_games and results['clutch_performers']:
+            situational['clutch_performers'] = results['clutch_performers']
 
-        response = make_response(jsonify({
+        return {
             'team_id': team_id,
             'season': season,
             'games_analyzed': len(recent_games),
             'situational': situational
-        }))
-        response.status_code = 200
-        return response
+        }, 200
 
+    except FanoutTimeout as e:
+        current_app.logger.error(f'Situational performance timed out: {e}')
+        return {"error": "Situational performance timed out"}, 504
     except Exception as e:
         current_app.logger.error(f'Error in get_situational_performance: {str(e)}')
-        return make_response(jsonify({"error": "Failed to fetch situational performance"}), 500)
\ No newline at end of file
+        return {"error": "Failed to fetch situational performance"}, 500
\ No newline at end of file
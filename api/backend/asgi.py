@@ -0,0 +1,371 @@
+"""ASGI serving mode: the heavy read endpoints on asyncio, the rest on Flask.
+
+    uvicorn backend.asgi:app --host 0.0.0.0 --port 4000 --workers 4
+
+The analytics and strategy aggregates (the routes registered with
+query_routes.query_route) are answered natively. Their generators run on the
+event loop and every Query they yield goes to an aiomysql pool, so a request
+waiting on a slow GROUP BY costs a coroutine rather than a thread. Fanned-out
+queries run concurrently under the same FANOUT_DEADLINE_SECONDS; statements
+still running at the deadline are killed and the route answers 504 as it
+does under Flask. Every other path falls through to the Flask app, which
+a2wsgi runs on a thread pool. URLs, payloads and JSON encoding are the same
+as under the dev server or gunicorn, so api_client does not care which one
+it talks to. Native routes are traced like Flask's (backend/tracing.py):
+X-Request-ID and Server-Timing headers, SQL comments, spans in /system/traces.
+
+Identical requests in flight at once are coalesced as under Flask
+(backend/coalescing.py): followers share the leader's payload. ETags and
+304s work as under Flask too (backend/etags.py): TableVersions is read on
+the aiomysql pool and the tables a route reads are learned from its
+statements, whichever path ran them.
+
+Requests asking for a profile (backend/profiling.py: `X-Profile: 1` or
+`?profile=1`, with PROFILING_ENABLED) are handed to the Flask app instead,
+so they run under cProfile and get their X-Profile-Id as they would there.
+
+Live game streams (/basketball/games/<id>/live) are served natively too:
+each watcher is a coroutine awaiting the shared hub (backend/live_games.py)
+rather than a thread, so thousands can stay open per worker.
+
+Each worker process holds up to ASYNC_DB_POOL_SIZE connections for the
+native routes, on top of the Flask app's DB_POOL_SIZE.
+"""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+
+import aiomysql
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags
+
+from backend import etags, live_games, metrics, profiling, tracing
+from backend.coalescing import coalesces, request_key, single_flight
+from backend.compression import compress
+from backend.db_connection import report_query, with_statement_comment
+from backend.fanout import FanoutTimeout, Query
+from backend.query_routes import ROUTES
+from backend.rest_entry import create_app
+
+# werkzeug <converter(args):name> -> starlette {name:converter}
+_RULE_VARIABLE = re.compile(r'<(?:(\w+)(?:\([^)]*\))?:)?(\w+)>')
+_CONVERTERS = {'int': 'int', 'float': 'float', 'path': 'path'}
+
+
+def _starlette_path(rule):
+    def convert(match):
+        converter = _CONVERTERS.get(match.group(1) or 'string', 'str')
+        return f'{{{match.group(2)}:{converter}}}'
+    return _RULE_VARIABLE.sub(convert, rule)
+
+
+def _connect_args(config):
+    return {
+        'host': config['MYSQL_DATABASE_HOST'],
+        'port': config['MYSQL_DATABASE_PORT'],
+        'user': config['MYSQL_DATABASE_USER'],
+        'password': config['MYSQL_DATABASE_PASSWORD'] or '',
+        'db': config['MYSQL_DATABASE_DB'],
+        'charset': config['MYSQL_DATABASE_CHARSET'],
+        'autocommit': True,
+        'cursorclass': aiomysql.DictCursor
+    }
+
+
+# ============================================================================
+# ASYNC QUERY DRIVER
+# ============================================================================
+
+async def _fetch(pool, query, running=None, name=None):
+    async with pool.acquire() as conn:
+        if running is not None:
+            running[name] = conn.thread_id()
+        try:
+            async with conn.cursor() as cursor:
+                sent = with_statement_comment(query.sql)
+                started = time.perf_counter()
+                error = None
+                try:
+                    await cursor.execute(sent, query.params)
+                    return await (cursor.fetchone() if query.one else cursor.fetchall())
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    report_query(query.sql, time.perf_counter() - started, error,
+                                 lambda: cursor.mogrify(sent, query.params))
+        finally:
+            if running is not None:
+                running.pop(name, None)
+
+
+async def _run(flask_app, pool, query, running=None, name=None):
+    try:
+        return await _fetch(pool, query, running, name)
+    except Exception as e:
+        if not query.optional:
+            raise
+        flask_app.logger.warning(f"Optional query{' ' + name if name else ''} failed: {e}")
+        return None
+
+
+async def _kill(connect_args, thread_ids, logger):
+    """KILL QUERY on a connection of its own: the pool may be exhausted."""
+    conn = await aiomysql.connect(**connect_args)
+    try:
+        async with conn.cursor() as cursor:
+            for thread_id in thread_ids:
+                try:
+                    await cursor.execute('KILL QUERY %s', (thread_id,))
+                except Exception as e:
+                    logger.warning(f'Could not kill fan-out query on connection {thread_id}: {e}')
+    finally:
+        conn.close()
+
+
+async def _fan_out(flask_app, pool, queries):
+    deadline = flask_app.config['FANOUT_DEADLINE_SECONDS']
+    running = {}
+    tasks = {name: asyncio.ensure_future(_run(flask_app, pool, query, running, name))
+             for name, query in queries.items()}
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    if pending:
+        try:
+            await _kill(_connect_args(flask_app.config), list(running.values()), flask_app.logger)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        late = sorted(name for name, task in tasks.items() if task in pending)
+        raise FanoutTimeout(f"{', '.join(late)} still running after {deadline}s")
+
+    results, error = {}, None
+    for name, task in tasks.items():
+        try:
+            results[name] = task.result()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return results
+
+
+async def run_async(flask_app, pool, steps):
+    """Drive a query route to completion; returns its (payload, status)."""
+    try:
+        step = next(steps)
+        while True:
+            try:
+                if isinstance(step, dict):
+                    rows = await _fan_out(flask_app, pool, step)
+                else:
+                    rows = await _run(flask_app, pool, step)
+            except Exception as e:
+                step = steps.throw(e)
+            else:
+                step = steps.send(rows)
+    except StopIteration as done:
+        return done.value
+
+
+async def _table_versions(pool):
+    """TableVersions as {table: version}, loading the schema's table names first if needed."""
+    if not etags.has_known_tables():
+        etags.set_known_tables(row['name'] for row in await _fetch(pool, Query(etags.KNOWN_TABLES_SQL)))
+    return {row['table_name']: row['version'] for row in await _fetch(pool, Query(etags.VERSIONS_SQL))}
+
+
+# ============================================================================
+# APPLICATION
+# ============================================================================
+
+def _endpoint(flask_app, wsgi, name, rule, handler):
+    blueprint = name.split('.', 1)[0]
+    coalesce = coalesces(flask_app.config, name)
+    tag = flask_app.config['ETAGS_ENABLED'] and not rule.startswith(flask_app.config['ETAG_EXCLUDE_PREFIXES'])
+    traced = flask_app.config['TRACING_ENABLED']
+    warned = False
+
+    async def serve(request):
+        nonlocal warned
+        if profiling.requested(flask_app.config, request.headers, request.query_params):
+            # Starlette sends whatever ASGI app the endpoint returns: let Flask profile it
+            return wsgi
+        started = time.perf_counter()
+        track = flask_app.config['METRICS_ENABLED']
+        if track:
+            metrics.http_in_flight.inc()
+        status = 500
+        # Bound to this request's context: its statements (fan-out tasks included) get the
+        # trace comment and become spans, as under Flask
+        trace = tracing.start_trace(request.headers, request.method, request.url.path,
+                                    request.url.query) if traced else None
+
+        def respond(content, media_type, headers):
+            if trace is not None:
+                headers.update(tracing.response_headers(trace))
+                trace['status_code'] = status
+            return Response(content, status_code=status, headers=headers, media_type=media_type)
+
+        try:
+            # current_app (logging, config) works inside the route as under Flask
+            with flask_app.app_context():
+                pool = request.app.state.pool
+                args = request.query_params.multi_items()
+                accept = request.headers.get('accept')
+                headers = {'Vary': 'Accept'} if flask_app.json.columnar else {}
+
+                def etag(tables, table_versions):
+                    return etags.etag_for(request.url.path, args, accept, tables, table_versions)
+
+                table_versions = None
+                if tag:
+                    try:
+                        table_versions = await _table_versions(pool)
+                    except Exception as e:
+                        if not warned:
+                            warned = True
+                            flask_app.logger.warning(f'{name} goes without ETags: cannot read table versions ({e})')
+                tables = etags.learned_tables(name)
+                if_none_match = request.headers.get('if-none-match')
+                if table_versions is not None and tables and if_none_match:
+                    value = etag(tables, table_versions)
+                    if parse_etags(if_none_match).contains_weak(value):
+                        status = 304
+                        return respond(None, None, {**headers, 'ETag': f'W/"{value}"',
+                                                    'Cache-Control': 'no-cache'})
+
+                try:
+                    async def compute():
+                        # Followers share the leader's versions and reads along with its payload
+                        reads = set() if table_versions is not None else None
+                        etags.bind_reads(reads)
+                        try:
+                            payload, status = await run_async(flask_app, pool,
+                                                              handler(MultiDict(args), **request.path_params))
+                        finally:
+                            etags.bind_reads(None)
+                        return payload, status, table_versions, reads
+
+                    if coalesce:
+                        key = request_key(name, request.path_params, args, accept)
+                        payload, status, used_versions, reads = await single_flight(
+                            name, key, flask_app.config['COALESCE_TIMEOUT'], compute)
+                    else:
+                        payload, status, used_versions, reads = await compute()
+                except Exception as e:
+                    flask_app.logger.exception(f'Unhandled error in {name}: {e}')
+                    payload, status, used_versions, reads = {"error": "Internal server error"}, 500, None, None
+                # Same encoders as jsonify, so the bytes match the Flask path
+                encode_columnar = flask_app.json.columnar
+                encoded = encode_columnar(flask_app, payload, accept,
+                                          request.query_params.get('frame')) if encode_columnar else None
+                if encoded:
+                    content, media_type = encoded
+                else:
+                    body = flask_app.json.response(payload)
+                    content, media_type = body.get_data(), body.mimetype
+                if status == 200 and used_versions is not None and reads is not None:
+                    tables = etags.learn(name, reads)
+                    if tables:
+                        headers['ETag'] = f'W/"{etag(tables, used_versions)}"'
+                        headers['Cache-Control'] = 'no-cache'
+            if flask_app.config['COMPRESSION_ENABLED']:
+                content, encoding = compress(content, request.headers.get('accept-encoding'), flask_app.config)
+                headers['Vary'] = ', '.join(filter(None, (headers.get('Vary'), 'Accept-Encoding')))
+                if encoding:
+                    headers['Content-Encoding'] = encoding
+            return respond(content, media_type, headers)
+        finally:
+            if trace is not None:
+                tracing.bind_trace(None)
+                tracing.record_trace(trace, rule)
+            if track:
+                metrics.http_in_flight.dec()
+                metrics.http_latency.observe(time.perf_counter() - started, blueprint=blueprint,
+                                             route=rule, method=request.method)
+                metrics.http_requests.inc(blueprint=blueprint, route=rule, method=request.method,
+                                          status=status)
+
+    return serve
+
+
+def _live_endpoint(flask_app):
+    """Relay the live game hub's messages to one watcher, as Flask's stream_game does."""
+
+    def error(payload, status):
+        return Response(flask_app.json.dumps(payload), status_code=status, media_type='application/json')
+
+    async def serve(request):
+        game_id = request.path_params['game_id']
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue()
+
+        def deliver(message, final):
+            # Called on the hub thread
+            loop.call_soon_threadsafe(messages.put_nowait, (message, final))
+
+        try:
+            first = await asyncio.to_thread(live_games.subscribe, flask_app, game_id, deliver)
+        except live_games.TooManyWatchers:
+            return error({"error": "Too many live streams open, poll the game instead"}, 503)
+        except Exception as e:
+            flask_app.logger.error(f'Error streaming game: {e}')
+            return error({"error": "Failed to stream game"}, 500)
+        if first is None:
+            return error({"error": "Game not found"}, 404)
+
+        heartbeat = flask_app.config['LIVE_HEARTBEAT_SECONDS']
+
+        async def events():
+            try:
+                message, final = first
+                yield message
+                while not final:
+                    try:
+                        message, final = await asyncio.wait_for(messages.get(), heartbeat)
+                    except asyncio.TimeoutError:
+                        message = live_games.KEEPALIVE
+                    yield message
+            finally:
+                live_games.unsubscribe(game_id, deliver)
+
+        return StreamingResponse(events(), media_type='text/event-stream',
+                                 headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    return serve
+
+
+def create_asgi_app(flask_app=None):
+    """Wrap the Flask app, serving its query routes natively on asyncio."""
+    flask_app = flask_app or create_app()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.pool = await aiomysql.create_pool(
+            minsize=1, maxsize=flask_app.config['ASYNC_DB_POOL_SIZE'], pool_recycle=3600,
+            **_connect_args(flask_app.config))
+        try:
+            yield
+        finally:
+            app.state.pool.close()
+            await app.state.pool.wait_closed()
+
+    wsgi = WSGIMiddleware(flask_app)
+    routes = [Route(_starlette_path(rule.rule), _endpoint(flask_app, wsgi, rule.endpoint, rule.rule,
+                                                          ROUTES[rule.endpoint]), methods=['GET'])
+              for rule in flask_app.url_map.iter_rules() if rule.endpoint in ROUTES]
+    routes += [Route(_starlette_path(rule.rule), _live_endpoint(flask_app), methods=['GET'])
+               for rule in flask_app.url_map.iter_rules() if rule.endpoint == 'basketball.stream_game']
+    flask_app.logger.info(f'⚡ ASGI: {len(routes)} routes served natively, the rest through Flask')
+    routes.append(Mount('/', app=wsgi))
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+app = create_asgi_app()
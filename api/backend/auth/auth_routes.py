@@ -2,10 +2,28 @@
 
 from flask import Blueprint, request, jsonify, make_response, current_app
 from backend.db_connection import db
+from backend.fanout import Query
 
 auth = Blueprint('auth', __name__)
 
 
+def users_query(role=None):
+    """Users, optionally of one role, ordered by username."""
+    query = '''
+        SELECT user_id, username, email, role, created_at, is_active, team_id
+        FROM Users
+        WHERE 1=1
+    '''
+
+    params = []
+    if role:
+        query += ' AND role = %s'
+        params.append(role)
+
+    query += ' ORDER BY username'
+    return Query(query, params)
+
+
 @auth.route('/users', methods=['GET'])
 def get_users():
     """
@@ -20,20 +38,8 @@ def get_users():
         role = request.args.get('role')
         cursor = db.get_db().cursor()
 
-        query = '''
-            SELECT user_id, username, email, role, created_at, is_active, team_id
-            FROM Users
-            WHERE 1=1
-        '''
-
-        params = []
-        if role:
-            query += ' AND role = %s'
-            params.append(role)
-
-        query += ' ORDER BY username'
-
-        cursor.execute(query, params)
+        query = users_query(role)
+        cursor.execute(query.sql, query.params)
         users = cursor.fetchall()
 
         return make_response(jsonify({'users': users, 'total': len(users)}), 200)
@@ -1,13 +1,233 @@
 """Basketball blueprint - players, teams, and games endpoints."""
 
-from flask import Blueprint, request, jsonify, make_response, current_app
+import queue
+from flask import Blueprint, Response, request, jsonify, make_response, current_app
 from datetime import datetime, timedelta
+from backend import live_games
 from backend.db_connection import db
+from backend.fanout import FanoutTimeout, Query, fan_out
 
 # Create the Basketball Blueprint
 basketball = Blueprint('basketball', __name__)
 
 
+# ============================================================================
+# SHARED QUERIES (also composed by the page-data endpoints, backend/pages)
+# ============================================================================
+
+def player_filters(args):
+    """The /players query parameters, parsed."""
+    return {
+        'position': args.get('position'),
+        'min_age': args.get('min_age', type=int),
+        'max_age': args.get('max_age', type=int),
+        'team_id': args.get('team_id', type=int),
+        'team_name': args.get('team_name'),
+        'min_salary': args.get('min_salary', type=float),
+        'max_salary': args.get('max_salary', type=float)
+    }
+
+
+def players_query(args):
+    """Players with their current team, filtered by the /players query parameters."""
+    query = '''
+        SELECT
+            p.player_id,
+            p.first_name,
+            p.last_name,
+            p.position,
+            p.age,
+            p.years_exp,
+            p.college,
+            p.current_salary,
+            p.expected_salary,
+            p.height,
+            p.weight,
+            t.name AS current_team,
+            t.team_id
+        FROM Players p
+        LEFT JOIN TeamsPlayers tp ON p.player_id = tp.player_id AND tp.left_date IS NULL
+        LEFT JOIN Teams t ON tp.team_id = t.team_id
+        WHERE 1=1
+    '''
+
+    params = []
+
+    # Apply filters dynamically
+    filters = player_filters(args)
+    position = filters['position']
+    min_age = filters['min_age']
+    max_age = filters['max_age']
+    team_id = filters['team_id']
+    team_name = filters['team_name']
+    min_salary = filters['min_salary']
+    max_salary = filters['max_salary']
+    if position:
+        query += ' AND p.position = %s'
+        params.append(position)
+    if min_age is not None:
+        query += ' AND p.age >= %s'
+        params.append(min_age)
+    if max_age is not None:
+        query += ' AND p.age <= %s'
+        params.append(max_age)
+    if team_id:
+        query += ' AND t.team_id = %s'
+        params.append(team_id)
+    if team_name:
+        query += ' AND t.name LIKE %s'
+        params.append(f'%{team_name}%')
+    if min_salary is not None:
+        query += ' AND p.current_salary >= %s'
+        params.append(min_salary)
+    if max_salary is not None:
+        query += ' AND p.current_salary <= %s'
+        params.append(max_salary)
+
+    query += ' ORDER BY p.last_name, p.first_name'
+    return Query(query, params)
+
+
+def teams_query(args):
+    """Teams with roster size, average age and payroll, filtered by the /teams query parameters."""
+    query = '''
+        SELECT
+            t.team_id,
+            t.name,
+            t.city,
+            t.arena,
+            t.conference,
+            t.division,
+            t.coach,
+            t.championships,
+            t.founded_year,
+            t.offensive_system,
+            t.defensive_system,
+            COUNT(DISTINCT tp.player_id) AS roster_size,
+            ROUND(AVG(p.age), 1) AS avg_player_age,
+            SUM(p.current_salary) AS total_salary
+        FROM Teams t
+        LEFT JOIN TeamsPlayers tp ON t.team_id = tp.team_id AND tp.left_date IS NULL
+        LEFT JOIN Players p ON tp.player_id = p.player_id
+        WHERE 1=1
+    '''
+
+    params = []
+
+    conference = args.get('conference')
+    division = args.get('division')
+    city = args.get('city')
+    if conference:
+        query += ' AND t.conference = %s'
+        params.append(conference)
+    if division:
+        query += ' AND t.division = %s'
+        params.append(division)
+    if city:
+        query += ' AND t.city = %s'
+        params.append(city)
+
+    query += '''
+        GROUP BY t.team_id, t.name, t.city, t.arena,
+                 t.conference, t.division, t.coach,
+                 t.championships, t.founded_year, t.offensive_system, t.defensive_system
+        ORDER BY t.conference, t.division, t.name
+    '''
+    return Query(query, params)
+
+
+def player_stats_query(player_ids, season=None, game_type=None):
+    """Per-player averages and totals, one row per player in `player_ids`."""
+    query = '''
+        SELECT
+            p.player_id,
+            p.first_name,
+            p.last_name,
+            p.position,
+            COUNT(pgs.game_id) AS games_played,
+            ROUND(AVG(pgs.points), 1) AS avg_points,
+            ROUND(AVG(pgs.rebounds), 1) AS avg_rebounds,
+            ROUND(AVG(pgs.assists), 1) AS avg_assists,
+            ROUND(AVG(pgs.steals), 1) AS avg_steals,
+            ROUND(AVG(pgs.blocks), 1) AS avg_blocks,
+            ROUND(AVG(pgs.turnovers), 1) AS avg_turnovers,
+            ROUND(AVG(pgs.shooting_percentage), 3) AS avg_shooting_pct,
+            ROUND(AVG(pgs.three_point_percentage), 3) AS avg_three_point_pct,
+            ROUND(AVG(pgs.free_throw_percentage), 3) AS avg_free_throw_pct,
+            ROUND(AVG(pgs.plus_minus), 1) AS avg_plus_minus,
+            ROUND(AVG(pgs.minutes_played), 1) AS avg_minutes,
+            SUM(pgs.points) AS total_points,
+            SUM(pgs.rebounds) AS total_rebounds,
+            SUM(pgs.assists) AS total_assists,
+            MAX(pgs.points) AS season_high_points,
+            MIN(pgs.points) AS season_low_points
+        FROM Players p
+        LEFT JOIN PlayerGameStats pgs ON p.player_id = pgs.player_id
+        LEFT JOIN Game g ON pgs.game_id = g.game_id
+    '''
+    query += f" WHERE p.player_id IN ({', '.join(['%s'] * len(player_ids))})"
+
+    params = list(player_ids)
+
+    if season:
+        query += ' AND g.season = %s'
+        params.append(season)
+    if game_type:
+        query += ' AND g.game_type = %s'
+        params.append(game_type)
+
+    query += ' GROUP BY p.player_id, p.first_name, p.last_name, p.position'
+    return Query(query, params)
+
+
+_RECENT_GAME_COLUMNS = '''
+    pgs.player_id,
+    g.game_id,
+    g.game_date,
+    g.home_team_id,
+    g.away_team_id,
+    ht.name AS home_team,
+    at.name AS away_team,
+    pgs.points,
+    pgs.rebounds,
+    pgs.assists,
+    pgs.minutes_played
+'''
+
+_RECENT_GAME_JOINS = '''
+    FROM PlayerGameStats pgs
+    JOIN Game g ON pgs.game_id = g.game_id
+    JOIN Teams ht ON g.home_team_id = ht.team_id
+    JOIN Teams at ON g.away_team_id = at.team_id
+'''
+
+
+def recent_games_query(player_ids, limit=10):
+    """The last `limit` box scores of each player in `player_ids`, newest first."""
+    if len(player_ids) == 1:
+        # One player: ORDER BY ... LIMIT stops after `limit` rows of the player's index range
+        return Query(f'''
+            SELECT {_RECENT_GAME_COLUMNS}
+            {_RECENT_GAME_JOINS}
+            WHERE pgs.player_id = %s
+            ORDER BY g.game_date DESC
+            LIMIT %s
+        ''', (player_ids[0], limit))
+    return Query(f'''
+        SELECT player_id, game_id, game_date, home_team_id, away_team_id, home_team, away_team,
+               points, rebounds, assists, minutes_played
+        FROM (
+            SELECT {_RECENT_GAME_COLUMNS},
+                   ROW_NUMBER() OVER (PARTITION BY pgs.player_id ORDER BY g.game_date DESC) AS game_rank
+            {_RECENT_GAME_JOINS}
+            WHERE pgs.player_id IN ({', '.join(['%s'] * len(player_ids))})
+        ) recent
+        WHERE game_rank <= %s
+        ORDER BY player_id, game_date DESC
+    ''', (*player_ids, limit))
+
+
+
 # ============================================================================
 # PLAYER MANAGEMENT ROUTES
 # ============================================================================
@@ -22,6 +242,7 @@ def get_players():
         min_age: Minimum age filter
         max_age: Maximum age filter
         team_id: Filter by team ID
+        team_name: Filter by team name (case-insensitive substring)
         min_salary: Minimum salary filter
         max_salary: Maximum salary filter
 
@@ -30,72 +251,25 @@ def get_players():
     try:
         current_app.logger.info('GET /basketball/players - Fetching players with filters')
 
-        # Extract query parameters
-        position = request.args.get('position')
-        min_age = request.args.get('min_age', type=int)
-        max_age = request.args.get('max_age', type=int)
-        team_id = request.args.get('team_id', type=int)
-        min_salary = request.args.get('min_salary', type=float)
-        max_salary = request.args.get('max_salary', type=float)
+        # Reported as parsed by players_query
+        filters = player_filters(request.args)
+        min_age, max_age = filters['min_age'], filters['max_age']
+        min_salary, max_salary = filters['min_salary'], filters['max_salary']
 
         cursor = db.get_db().cursor()
 
-        # Build dynamic query with filters
-        query = '''
-            SELECT
-                p.player_id,
-                p.first_name,
-                p.last_name,
-                p.position,
-                p.age,
-                p.years_exp,
-                p.college,
-                p.current_salary,
-                p.expected_salary,
-                p.height,
-                p.weight,
-                t.name AS current_team,
-                t.team_id
-            FROM Players p
-            LEFT JOIN TeamsPlayers tp ON p.player_id = tp.player_id AND tp.left_date IS NULL
-            LEFT JOIN Teams t ON tp.team_id = t.team_id
-            WHERE 1=1
-        '''
-
-        params = []
-
-        # Apply filters dynamically
-        if position:
-            query += ' AND p.position = %s'
-            params.append(position)
-        if min_age is not None:
-            query += ' AND p.age >= %s'
-            params.append(min_age)
-        if max_age is not None:
-            query += ' AND p.age <= %s'
-            params.append(max_age)
-        if team_id:
-            query += ' AND t.team_id = %s'
-            params.append(team_id)
-        if min_salary is not None:
-            query += ' AND p.current_salary >= %s'
-            params.append(min_salary)
-        if max_salary is not None:
-            query += ' AND p.current_salary <= %s'
-            params.append(max_salary)
-
-        query += ' ORDER BY p.last_name, p.first_name'
-
-        cursor.execute(query, params)
+        query = players_query(request.args)
+        cursor.execute(query.sql, query.params)
         players_data = cursor.fetchall()
 
         return make_response(jsonify({
             'players': players_data,
             'total_count': len(players_data),
             'filters_applied': {
-                'position': position,
+                'position': filters['position'],
                 'age_range': f"{min_age}-{max_age}" if min_age or max_age else None,
-                'team_id': team_id,
+                'team_id': filters['team_id'],
+                'team_name': filters['team_name'],
                 'salary_range': f"${min_salary}-${max_salary}" if min_salary or max_salary else None
             }
         }), 200)
@@ -279,74 +453,16 @@ def get_player_stats(player_id):
         cursor = db.get_db().cursor()
 
         # Get comprehensive player statistics
-        query = '''
-            SELECT
-                p.player_id,
-                p.first_name,
-                p.last_name,
-                p.position,
-                COUNT(pgs.game_id) AS games_played,
-                ROUND(AVG(pgs.points), 1) AS avg_points,
-                ROUND(AVG(pgs.rebounds), 1) AS avg_rebounds,
-                ROUND(AVG(pgs.assists), 1) AS avg_assists,
-                ROUND(AVG(pgs.steals), 1) AS avg_steals,
-                ROUND(AVG(pgs.blocks), 1) AS avg_blocks,
-                ROUND(AVG(pgs.turnovers), 1) AS avg_turnovers,
-                ROUND(AVG(pgs.shooting_percentage), 3) AS avg_shooting_pct,
-                ROUND(AVG(pgs.three_point_percentage), 3) AS avg_three_point_pct,
-                ROUND(AVG(pgs.free_throw_percentage), 3) AS avg_free_throw_pct,
-                ROUND(AVG(pgs.plus_minus), 1) AS avg_plus_minus,
-                ROUND(AVG(pgs.minutes_played), 1) AS avg_minutes,
-                SUM(pgs.points) AS total_points,
-                SUM(pgs.rebounds) AS total_rebounds,
-                SUM(pgs.assists) AS total_assists,
-                MAX(pgs.points) AS season_high_points,
-                MIN(pgs.points) AS season_low_points
-            FROM Players p
-            LEFT JOIN PlayerGameStats pgs ON p.player_id = pgs.player_id
-            LEFT JOIN Game g ON pgs.game_id = g.game_id
-            WHERE p.player_id = %s
-        '''
-
-        params = [player_id]
-
-        if season:
-            query += ' AND g.season = %s'
-            params.append(season)
-        if game_type:
-            query += ' AND g.game_type = %s'
-            params.append(game_type)
-
-        query += ' GROUP BY p.player_id, p.first_name, p.last_name, p.position'
-
-        cursor.execute(query, params)
+        query = player_stats_query([player_id], season, game_type)
+        cursor.execute(query.sql, query.params)
         stats_data = cursor.fetchone()
 
         if not stats_data:
             return make_response(jsonify({"error": "Player not found"}), 404)
 
         # Get recent games performance
-        cursor.execute('''
-            SELECT
-                g.game_id,
-                g.game_date,
-                g.home_team_id,
-                g.away_team_id,
-                ht.name AS home_team,
-                at.name AS away_team,
-                pgs.points,
-                pgs.rebounds,
-                pgs.assists,
-                pgs.minutes_played
-            FROM PlayerGameStats pgs
-            JOIN Game g ON pgs.game_id = g.game_id
-            JOIN Teams ht ON g.home_team_id = ht.team_id
-            JOIN Teams at ON g.away_team_id = at.team_id
-            WHERE pgs.player_id = %s
-            ORDER BY g.game_date DESC
-            LIMIT 10
-        ''', (player_id,))
-
+        query = recent_games_query([player_id])
+        cursor.execute(query.sql, query.params)
         recent_games = cursor.fetchall()
 
         response_data = {
@@ -457,6 +573,7 @@ def update_player_stats(player_id):
             cursor.execute(query, values)
 
         db.get_db().commit()
+        live_games.game_changed(stats_data['game_id'])
 
         return make_response(jsonify({
             "message": "Player stats updated successfully",
@@ -496,48 +613,8 @@ def get_teams():
         cursor = db.get_db().cursor()
 
         # Get teams with roster statistics
-        query = '''
-            SELECT
-                t.team_id,
-                t.name,
-                t.city,
-                t.arena,
-                t.conference,
-                t.division,
-                t.coach,
-                t.championships,
-                t.founded_year,
-                t.offensive_system,
-                t.defensive_system,
-                COUNT(DISTINCT tp.player_id) AS roster_size,
-                ROUND(AVG(p.age), 1) AS avg_player_age,
-                SUM(p.current_salary) AS total_salary
-            FROM Teams t
-            LEFT JOIN TeamsPlayers tp ON t.team_id = tp.team_id AND tp.left_date IS NULL
-            LEFT JOIN Players p ON tp.player_id = p.player_id
-            WHERE 1=1
-        '''
-
-        params = []
-
-        if conference:
-            query += ' AND t.conference = %s'
-            params.append(conference)
-        if division:
-            query += ' AND t.division = %s'
-            params.append(division)
-        if city:
-            query += ' AND t.city = %s'
-            params.append(city)
-
-        query += '''
-            GROUP BY t.team_id, t.name, t.city, t.arena,
-                     t.conference, t.division, t.coach,
-                     t.championships, t.founded_year, t.offensive_system, t.defensive_system
-            ORDER BY t.conference, t.division, t.name
-        '''
-
-        cursor.execute(query, params)
+        query = teams_query(request.args)
+        cursor.execute(query.sql, query.params)
         teams_data = cursor.fetchall()
 
         return make_response(jsonify({
@@ -565,10 +642,8 @@ def get_team_by_id(team_id):
     try:
         current_app.logger.info(f'GET /basketball/teams/{team_id} - Fetching team details')
 
-        cursor = db.get_db().cursor()
-
         # Get comprehensive team details
-        query = '''
+        team_query = '''
             SELECT
                 t.team_id, t.name, t.city, t.conference, t.division, t.coach,
                 t.arena, t.founded_year, t.championships, t.offensive_system,
@@ -586,15 +661,8 @@ def get_team_by_id(team_id):
                 t.defensive_system
         '''
 
-
-        cursor.execute(query, (team_id,))
-        team_data = cursor.fetchone()
-
-        if not team_data:
-            return make_response(jsonify({"error": "Team not found"}), 404)
-
         # Get recent games performance
-        cursor.execute('''
+        recent_games_query = '''
             SELECT
                 g.game_id,
                 g.game_date,
@@ -615,9 +683,19 @@ def get_team_by_id(team_id):
             WHERE g.home_team_id = %s OR g.away_team_id = %s
             ORDER BY g.game_date DESC
             LIMIT 10
-        ''', (team_id, team_id, team_id, team_id))
+        '''
 
-        recent_games = cursor.fetchall()
+        # Independent queries: run them concurrently
+        results = fan_out({
+            'team': Query(team_query, (team_id,), one=True),
+            'recent_games': Query(recent_games_query, (team_id, team_id, team_id, team_id))
+        })
+
+        team_data = results['team']
+        if not team_data:
+            return make_response(jsonify({"error": "Team not found"}), 404)
+
+        recent_games = results['recent_games']
 
         response_data = {
             'team_details': team_data,
@@ -626,6 +704,9 @@ def get_team_by_id(team_id):
 
         return make_response(jsonify(response_data), 200)
 
+    except FanoutTimeout as e:
+        current_app.logger.error(f'Team details timed out: {e}')
+        return make_response(jsonify({"error": "Team details timed out"}), 504)
     except Exception as e:
         current_app.logger.error(f'Error fetching team details: {e}')
         return make_response(jsonify({"error": "Failed to fetch team"}), 500)
@@ -1367,6 +1448,7 @@ def update_game(game_id):
 
         cursor.execute(query, values)
         db.get_db().commit()
+        live_games.game_changed(game_id)
 
         return make_response(jsonify({
             "message": "Game updated successfully",
@@ -1380,6 +1462,59 @@ def update_game(game_id):
         return make_response(jsonify({"error": "Failed to update game"}), 500)
 
 
+@basketball.route('/games/<int:game_id>/live', methods=['GET'])
+def stream_game(game_id):
+    """
+    Stream a game's score and box score as server-sent events.
+
+    Events:
+        snapshot: The game and its box score, sent first
+        score: game_id, home_score, away_score and status, when any of them changes
+        box_score: game_id and the player rows that changed
+        end: The game was completed (or deleted); the stream closes
+
+    User Stories: [Johnny-1.5, Marcus-3.6]
+    """
+    try:
+        current_app.logger.info(f'GET /basketball/games/{game_id}/live - Streaming game updates')
+
+        app = current_app._get_current_object()
+        messages = queue.Queue()
+
+        def deliver(message, final):
+            messages.put((message, final))
+
+        try:
+            first = live_games.subscribe(app, game_id, deliver)
+        except live_games.TooManyWatchers:
+            return make_response(jsonify({"error": "Too many live streams open, poll the game instead"}), 503)
+        if first is None:
+            return make_response(jsonify({"error": "Game not found"}), 404)
+
+        heartbeat = app.config['LIVE_HEARTBEAT_SECONDS']
+
+        def events():
+            message, final = first
+            yield message
+            while not final:
+                try:
+                    message, final = messages.get(timeout=heartbeat)
+                except queue.Empty:
+                    message = live_games.KEEPALIVE
+                yield message
+
+        response = Response(events(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        # Runs when the client goes away too, even before the first event was sent
+        response.call_on_close(lambda: live_games.unsubscribe(game_id, deliver))
+        return response
+
+    except Exception as e:
+        current_app.logger.error(f'Error streaming game: {e}')
+        return make_response(jsonify({"error": "Failed to stream game"}), 500)
+
+
 @basketball.route('/games/upcoming', methods=['GET'])
 def get_upcoming_games():
     """
@@ -1575,6 +1710,7 @@ def delete_game(game_id):
         # Delete the game (cascades to PlayerGameStats)
         cursor.execute('DELETE FROM Game WHERE game_id = %s', (game_id,))
         db.get_db().commit()
+        live_games.game_changed(game_id)
 
         return make_response(jsonify({
             "message": "Game deleted successfully",
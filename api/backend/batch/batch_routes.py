@@ -0,0 +1,194 @@
+"""Batch blueprint - several API calls in one HTTP request.
+
+Streamlit pages issue dozens of small sequential calls (Player Finder
+fetches the stats of up to 200 players one by one), each paying for a
+connection, routing and JSON parsing on both sides. POST /batch takes the
+calls as a list and runs them in-process through the full Flask stack, so
+each one still gets its own request hooks (metrics, tracing, ETags,
+coalescing), pooled connection and error handling:
+
+    POST /batch
+    {"requests": [
+        {"method": "GET", "path": "/basketball/players/12/stats"},
+        {"method": "GET", "path": "/basketball/teams", "query": {"conference": "Eastern"}},
+        {"method": "PUT", "path": "/strategy/game-plans/3", "body": {"status": "active"}}
+    ]}
+    -> {"responses": [{"status": 200, "body": {...}}, ...]}
+
+Consecutive GETs run concurrently on up to BATCH_MAX_WORKERS threads; any
+other method runs alone, after everything before it and before everything
+after it, so writes keep their order. Responses come back in request order,
+each with its own status: one failing call does not fail the batch.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Blueprint, current_app, jsonify, make_response, request
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+batch = Blueprint('batch', __name__)
+
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+BODY_METHODS = ('POST', 'PUT')
+
+# Passed on to every sub-request so its spans join the page's trace
+_FORWARDED_HEADERS = ('X-Trace-ID', 'X-Trace-Page', 'Authorization', 'Cookie')
+
+# Responses that are read until the client disconnects, not until they end
+STREAMING_TYPES = ('text/event-stream',)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app):
+    """Threads for batched calls, separate from fan-out's so a batched
+    composite endpoint can still fan out."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=app.config['BATCH_MAX_WORKERS'],
+                                               thread_name_prefix='batch')
+                _executor_pid = pid
+    return _executor
+
+
+def _is_scalar(value):
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _is_query_dict(query):
+    """An object EnvironBuilder can encode: {name: value or [values]} with string/number values."""
+    return isinstance(query, dict) and all(
+        _is_scalar(value) or (isinstance(value, list) and all(_is_scalar(v) for v in value))
+        for value in query.values())
+
+
+def _validate(items, limit):
+    """The sub-requests as (method, path, query, body), or an error message."""
+    if not isinstance(items, list) or not items:
+        return None, 'requests must be a non-empty list'
+    if len(items) > limit:
+        return None, f'At most {limit} requests per batch'
+    calls = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            return None, f'requests[{index}] must be an object'
+        method = str(item.get('method', 'GET')).upper()
+        path = item.get('path')
+        if method not in METHODS:
+            return None, f'requests[{index}]: method must be one of {", ".join(METHODS)}'
+        if not isinstance(path, str) or not path.startswith('/'):
+            return None, f'requests[{index}]: path must start with /'
+        if path.split('?', 1)[0].rstrip('/') == request.path.rstrip('/'):
+            return None, f'requests[{index}]: batches cannot be nested'
+        if '?' in path and item.get('query'):
+            return None, f'requests[{index}]: pass the query string in path or query, not both'
+        query = item.get('query')
+        if query is not None and not (isinstance(query, str) or _is_query_dict(query)):
+            return None, (f'requests[{index}]: query must be a string or an object of strings, '
+                          'numbers or lists of them')
+        if item.get('body') is not None and method not in BODY_METHODS:
+            return None, f'requests[{index}]: body is only allowed for {" and ".join(BODY_METHODS)}'
+        calls.append((method, path, query, item.get('body')))
+    return calls, None
+
+
+def _dispatch(app, environ):
+    """Run one sub-request through the app: (status, content type, body bytes)."""
+    app_iter, status, headers = run_wsgi_app(app.wsgi_app, environ)
+    try:
+        if headers.get('Content-Type', '').startswith(STREAMING_TYPES):
+            # Would never end (live game streams): closing it unsubscribes the stream
+            return 400, 'application/json', json.dumps({"error": "Streaming endpoints cannot be batched"}).encode()
+        body = b''.join(app_iter)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+    return int(status.split(' ', 1)[0]), headers.get('Content-Type', ''), body
+
+
+def _encode(status, content_type, body):
+    """One entry of the responses array; JSON bodies are spliced in as they are."""
+    if not body:
+        encoded = b'null'
+    elif content_type.startswith('application/json'):
+        encoded = body.strip()
+    else:
+        encoded = json.dumps(body.decode('utf-8', 'replace')).encode()
+    return b'{"status":%d,"body":%s}' % (status, encoded)
+
+
+def _groups(calls):
+    """Consecutive GETs together; every other call in a group of its own."""
+    group = []
+    for call in calls:
+        if call[0] == 'GET':
+            group.append(call)
+            continue
+        if group:
+            yield group
+            group = []
+        yield [call]
+    if group:
+        yield group
+
+
+@batch.route('', methods=['POST'])
+def run_batch():
+    """
+    Run several API calls in one request.
+
+    Expected JSON Body:
+        {
+            "requests": [
+                {"method": "GET", "path": str, "query": {...} (optional),
+                 "body": {...} (optional, for POST/PUT)}
+            ]
+        }
+
+    Returns: {"responses": [{"status": int, "body": <that call's JSON>}, ...]}
+    """
+    try:
+        current_app.logger.info('POST /batch - Running batched requests')
+
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return make_response(jsonify({"error": "body must be an object with a requests list"}), 400)
+        calls, error = _validate(data.get('requests'), current_app.config['BATCH_MAX_REQUESTS'])
+        if error:
+            return make_response(jsonify({"error": error}), 400)
+
+        app = current_app._get_current_object()
+        headers = {name: request.headers[name] for name in _FORWARDED_HEADERS if name in request.headers}
+        headers['Accept'] = 'application/json'
+        environs = [
+            EnvironBuilder(path=path, base_url=request.host_url, method=method, query_string=query,
+                           json=body, headers=headers,
+                           environ_base={'REMOTE_ADDR': request.remote_addr}).get_environ()
+            for method, path, query, body in calls
+        ]
+
+        # Always on the batch threads: dispatched on this one, a call would share
+        # this request's app context (its g and database connection)
+        executor = _get_executor(app)
+        results = []
+        position = 0
+        for group in _groups(calls):
+            futures = [executor.submit(_dispatch, app, environ)
+                       for environ in environs[position:position + len(group)]]
+            position += len(group)
+            results.extend(future.result() for future in futures)
+
+        body = b'{"responses":[' + b','.join(_encode(*result) for result in results) + b']}\n'
+        return current_app.response_class(body, mimetype='application/json')
+
+    except Exception as e:
+        current_app.logger.error(f'Error running batch: {e}')
+        return make_response(jsonify({"error": "Failed to run batch"}), 500)
@@ -0,0 +1,156 @@
+"""Single-flight coalescing of identical expensive GETs.
+
+When a big game starts, dozens of dashboards ask for the same opponent
+report or health snapshot at the same moment, and each request would run the
+full query set. For the endpoints matched by COALESCE_ENDPOINTS, the first
+request for a key (endpoint, URL variables, normalized query string and
+Accept header) runs the view; identical requests arriving while it runs wait
+for it and are answered with a copy of its response. Only requests that
+overlap are coalesced; nothing is cached once the leader finishes.
+
+A follower waits at most COALESCE_TIMEOUT seconds, then runs the view
+itself, as it does when the leader raised or streamed its response. Each
+follower still goes through its own after_request hooks (metrics, ETag,
+compression). Its ETag is computed from the tables the leader read, as of
+the leader's table versions. Profiled requests are never coalesced.
+
+Coalesced requests and follower timeouts are counted per endpoint in
+/system/metrics.
+"""
+
+import asyncio
+import threading
+from fnmatch import fnmatchcase
+from functools import wraps
+
+from flask import current_app, g, request
+
+from backend import etags
+from backend.metrics import registry
+
+coalesced_requests = registry.counter(
+    'ballwatch_coalesced_requests_total',
+    'GET requests answered with the response of an identical in-flight request', ('endpoint',))
+coalesce_leaders = registry.counter(
+    'ballwatch_coalesce_leaders_total', 'Coalescable GET requests that ran the view', ('endpoint',))
+coalesce_timeouts = registry.counter(
+    'ballwatch_coalesce_timeouts_total',
+    'Coalesced requests that stopped waiting for the in-flight request and ran the view', ('endpoint',))
+
+_lock = threading.Lock()
+_flights = {}  # key -> _Flight of the request computing it
+
+
+class _Flight:
+    """The in-flight computation for one key; `result` is None if followers must run it themselves."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+def request_key(endpoint, view_args, args, accept):
+    """The coalescing key; `args` are the query string's (name, value) pairs."""
+    return endpoint, tuple(sorted(view_args.items())), tuple(sorted(args)), accept or ''
+
+
+def coalesces(config, endpoint):
+    return config['COALESCE_ENABLED'] and any(fnmatchcase(endpoint, pattern)
+                                              for pattern in config['COALESCE_ENDPOINTS'])
+
+
+# ============================================================================
+# FLASK VIEWS
+# ============================================================================
+
+def _lead(endpoint, key, flight, view, view_args):
+    coalesce_leaders.inc(endpoint=endpoint)
+    try:
+        response = current_app.make_response(view(**view_args))
+        if not (response.is_streamed or response.direct_passthrough):
+            flight.result = (response.status_code, list(response.headers.items()), response.get_data(),
+                             g.get('_etag_versions'), frozenset(etags.current_reads() or ()))
+        return response
+    finally:
+        with _lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _follow(endpoint, flight, view, view_args):
+    if not flight.done.wait(current_app.config['COALESCE_TIMEOUT']):
+        coalesce_timeouts.inc(endpoint=endpoint)
+        return view(**view_args)
+    if flight.result is None:
+        return view(**view_args)
+    status, headers, body, versions, reads = flight.result
+    coalesced_requests.inc(endpoint=endpoint)
+    if '_etag_versions' in g:
+        # This request ran no SQL: tag the response with what the leader read, when it read it
+        if versions is None:
+            g.pop('_etag_versions')
+        else:
+            g._etag_versions = versions
+            own_reads = etags.current_reads()
+            if own_reads is not None:
+                own_reads.update(reads)
+    return current_app.response_class(body, status=status, headers=headers)
+
+
+def _coalesced(endpoint, view):
+    @wraps(view)
+    def run(**view_args):
+        if request.method != 'GET' or '_profile' in g:
+            return view(**view_args)
+        key = request_key(endpoint, view_args, request.args.items(multi=True), request.headers.get('Accept'))
+        with _lock:
+            flight = _flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _flights[key] = _Flight()
+        if leader:
+            return _lead(endpoint, key, flight, view, view_args)
+        return _follow(endpoint, flight, view, view_args)
+    return run
+
+
+def init_app(app):
+    """Coalesce the endpoints matching COALESCE_ENDPOINTS (call after registering blueprints)."""
+    wrapped = []
+    for endpoint, view in list(app.view_functions.items()):
+        if coalesces(app.config, endpoint):
+            app.view_functions[endpoint] = _coalesced(endpoint, view)
+            wrapped.append(endpoint)
+    app.logger.info(f'🔀 Coalescing identical GETs to {len(wrapped)} endpoints')
+
+
+# ============================================================================
+# ASGI ROUTES
+# ============================================================================
+
+_async_flights = {}  # key -> asyncio.Future of (payload, status), None if followers must run it themselves
+
+
+async def single_flight(endpoint, key, timeout, compute):
+    """Await `compute()` for the first caller of `key`; identical callers meanwhile share its result."""
+    future = _async_flights.get(key)
+    if future is not None:
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            coalesce_timeouts.inc(endpoint=endpoint)
+        else:
+            if result is not None:
+                coalesced_requests.inc(endpoint=endpoint)
+                return result
+        return await compute()
+
+    coalesce_leaders.inc(endpoint=endpoint)
+    future = _async_flights[key] = asyncio.get_running_loop().create_future()
+    result = None
+    try:
+        result = await compute()
+        return result
+    finally:
+        _async_flights.pop(key, None)
+        future.set_result(result)
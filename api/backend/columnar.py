@@ -0,0 +1,175 @@
+"""Columnar responses (Arrow IPC, MessagePack) for DataFrame consumers.
+
+Most Streamlit pages turn a response straight into a DataFrame, e.g.
+pd.DataFrame(resp['players']). As JSON that list repeats every key string on
+every row and is parsed value by value in Python. A client that sends
+
+    Accept: application/vnd.apache.arrow.stream    (pyarrow installed here)
+    Accept: application/x-msgpack                  (msgpack installed here)
+
+gets the same rows as columns instead, built straight from the cursor rows:
+an Arrow IPC stream pandas reads without touching a Python object per value,
+or a MessagePack map of column lists. JSON stays the default, including for
+*/* and for anything that is not a list of rows.
+
+The framed list is the payload itself when a route returns a list, the
+key named by ?frame=<key>, or else the only list of row dicts in the payload.
+The rest of the payload (counts, filters, ...) travels alongside as JSON: in
+the Arrow schema metadata under ballwatch.meta, in the MessagePack map under
+meta. Columnar values are typed for pandas: DECIMAL columns become floats and
+dates stay dates (JSON sends both as strings); TIME columns are 'HH:MM:SS'
+as in JSON.
+"""
+
+import decimal
+import io
+from datetime import date, datetime, timedelta
+
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from backend.json_provider import _time_of_day
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: no Arrow responses
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # optional: no MessagePack responses
+    msgpack = None
+
+JSON = 'application/json'
+ARROW = 'application/vnd.apache.arrow.stream'
+MSGPACK = 'application/x-msgpack'
+
+
+def negotiate(accept):
+    """The response format an Accept header asks for among those installed; JSON when in doubt."""
+    offered = [JSON]
+    if pa is not None:
+        offered.append(ARROW)
+    if msgpack is not None:
+        offered.append(MSGPACK)
+    if len(offered) == 1 or not accept:
+        return JSON
+    # JSON is offered first, so */* and ties keep getting JSON
+    return parse_accept_header(accept, MIMEAccept).best_match(offered, default=JSON)
+
+
+def _is_rows(value):
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def _frame(obj, frame):
+    """(key, rows, meta) for the list to send as columns, or None to send JSON."""
+    if _is_rows(obj):
+        return None, obj, None
+    if not isinstance(obj, dict):
+        return None
+    if frame:
+        key = frame if _is_rows(obj.get(frame)) else None
+    else:
+        candidates = [k for k, v in obj.items() if _is_rows(v)]
+        if len(candidates) > 1:
+            # An empty side list (e.g. no warnings) does not make the payload ambiguous
+            candidates = [k for k in candidates if obj[k]]
+        key = candidates[0] if len(candidates) == 1 else None
+    if key is None:
+        return None
+    return key, obj[key], {k: v for k, v in obj.items() if k != key}
+
+
+def _columns(rows):
+    """{column: [values]} in first-seen column order; rows missing a column get None."""
+    names = {}
+    for row in rows:
+        for name in row:
+            names.setdefault(name, None)
+    return {name: [row.get(name) for row in rows] for name in names}
+
+
+def _plain(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return _time_of_day(value)
+    return value
+
+
+# ============================================================================
+# ENCODERS
+# ============================================================================
+
+def _arrow_array(values, app):
+    values = [_plain(v) for v in values]
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed or nested values: send the column as strings (nested ones as JSON)
+        return pa.array([None if v is None else v if isinstance(v, str)
+                         else app.json.dumps(v) if isinstance(v, (dict, list)) else str(v) for v in values],
+                        type=pa.string())
+
+
+def _encode_arrow(app, key, rows, meta):
+    columns = _columns(rows)
+    metadata = {'ballwatch.meta': app.json.dumps(meta or {})}
+    if key is not None:
+        metadata['ballwatch.key'] = key
+    table = pa.table({name: _arrow_array(values, app) for name, values in columns.items()},
+                     metadata=metadata) if columns else pa.table({}, metadata=metadata)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _msgpack_default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return _time_of_day(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_msgpack(app, key, rows, meta):
+    columns = _columns(rows)
+    types = {}
+    for name, values in columns.items():
+        sample = next((v for v in values if v is not None), None)
+        if isinstance(sample, datetime):
+            types[name] = 'datetime'
+        elif isinstance(sample, date):
+            types[name] = 'date'
+    return msgpack.packb({'key': key, 'columns': list(columns), 'data': list(columns.values()),
+                          'types': types, 'meta': meta or {}},
+                         default=_msgpack_default, use_bin_type=True, datetime=False)
+
+
+_ENCODERS = {ARROW: _encode_arrow, MSGPACK: _encode_msgpack}
+
+
+def encode(app, obj, accept, frame=None):
+    """(body, mimetype) for `obj` in the columnar format `accept` asks for, or None for JSON."""
+    mimetype = negotiate(accept)
+    if mimetype == JSON:
+        return None
+    framed = _frame(obj, frame)
+    if framed is None:
+        return None
+    try:
+        return _ENCODERS[mimetype](app, *framed), mimetype
+    except Exception as e:
+        app.logger.warning(f'Could not encode {mimetype}, sending JSON: {e}')
+        return None
+
+
+def init_app(app):
+    """Let the app's JSON provider answer columnar Accept headers (after json_provider.init_app)."""
+    app.json.columnar = encode
+    formats = [name for name, lib in (('arrow', pa), ('msgpack', msgpack)) if lib is not None]
+    app.logger.info(f'🧾 Columnar formats: {", ".join(formats) or "none installed"}')
@@ -0,0 +1,67 @@
+"""Opt-in gzip/brotli compression of large responses.
+
+Roster, game and draft-evaluation payloads run to hundreds of KB of
+repetitive JSON; compressed they shrink 5-10x, which matters more than the
+few milliseconds the compression costs once the client is not on localhost.
+With COMPRESSION_ENABLED, responses of at least COMPRESS_MIN_BYTES are
+encoded with brotli (if the brotli package is installed and the client
+accepts br) or gzip. Small bodies are left alone: under a kilobyte or so the
+headers dominate and compressing only adds latency.
+"""
+
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+_COMPRESSIBLE = ('application/json', 'text/', 'application/vnd.apache.arrow', 'application/x-msgpack')
+
+
+def _accepted(accept_encoding):
+    """Encodings the client accepts (those with q=0 excluded)."""
+    accepted = set()
+    for part in (accept_encoding or '').lower().split(','):
+        coding, _, params = part.partition(';')
+        params = params.strip()
+        try:
+            weight = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            weight = 1.0
+        if coding.strip() and weight > 0:
+            accepted.add(coding.strip())
+    return accepted
+
+
+def compress(body, accept_encoding, config):
+    """(body, encoding) for a response body, encoding None when left as is."""
+    if len(body) < config['COMPRESS_MIN_BYTES']:
+        return body, None
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and 'br' in accepted:
+        return brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY']), 'br'
+    if 'gzip' in accepted:
+        return gzip.compress(body, compresslevel=config['COMPRESS_GZIP_LEVEL']), 'gzip'
+    return body, None
+
+
+def _after_request(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(_COMPRESSIBLE)):
+        return response
+    body, encoding = compress(response.get_data(), request.headers.get('Accept-Encoding'), current_app.config)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Compress responses; register before other after_request hooks so this runs last."""
+    app.after_request(_after_request)
@@ -1,6 +1,170 @@
-"""DB connection helper using flask-mysql and dict cursor."""
+"""DB connection helper using flask-mysql and dict cursor.
+
+`db.get_db()` returns one connection per application context, checked out
+from a per-process connection pool and returned to it when the context ends.
+"""
+import os
+import threading
+import time
+
+from flask import g
 from flaskext.mysql import MySQL
 from pymysql import cursors
 
+from backend.db_connection.pool import ConnectionPool, PoolTimeout
+
+# Callables invoked as listener(sql, duration_seconds, error) after every query
+_query_listeners = []
+# Same, but given the statement as sent to the server (parameters bound)
+_bound_listeners = []
+
+
+def add_query_listener(listener, bound=False):
+    """
+    Register a callable to be told about every query run through `db`.
+    With bound=True it receives the final statement text, parameters
+    included, instead of the query template.
+    """
+    listeners = _bound_listeners if bound else _query_listeners
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def remove_query_listener(listener):
+    for listeners in (_query_listeners, _bound_listeners):
+        if listener in listeners:
+            listeners.remove(listener)
+
+
+# Callable returning text to prepend to each statement as a /* comment */, or None
+_statement_comment = None
+
+
+def set_statement_comment(provider):
+    """Prefix every statement with `/* provider() */` (e.g. trace ids); None turns it off."""
+    global _statement_comment
+    _statement_comment = provider
+
+
+def with_statement_comment(query):
+    """`query` as sent to MySQL: prefixed with the statement comment, if any."""
+    comment = _statement_comment() if _statement_comment else None
+    if not comment:
+        return query
+    prefix = f'/* {comment} */ '
+    if isinstance(query, (bytes, bytearray)):
+        return prefix.encode('utf-8') + bytes(query)
+    return prefix + query
+
+
+def _listener_sql(query):
+    # executemany() hands multi-row INSERTs to execute() as bytes
+    if isinstance(query, (bytes, bytearray)):
+        return bytes(query[:4000]).decode('utf-8', 'replace')
+    return query
+
+
+def report_query(query, duration, error, bound_statement):
+    """
+    Tell the query listeners about a statement run outside InstrumentedCursor
+    (e.g. on the ASGI app's async connections). bound_statement is a callable
+    returning the statement with its parameters bound, only called if needed.
+    """
+    if _query_listeners:
+        sql = _listener_sql(query)
+        for listener in list(_query_listeners):
+            listener(sql, duration, error)
+    if _bound_listeners:
+        statement = _listener_sql(bound_statement())
+        for listener in list(_bound_listeners):
+            listener(statement, duration, error)
+
+
+class InstrumentedCursor(cursors.DictCursor):
+    """DictCursor that times each execute() and reports it to the query listeners."""
+
+    def execute(self, query, args=None):
+        sent = with_statement_comment(query)
+
+        if not _query_listeners and not _bound_listeners:
+            return super().execute(sent, args)
+        started = time.perf_counter()
+        error = None
+        try:
+            return super().execute(sent, args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            report_query(query, time.perf_counter() - started, error, lambda: self.mogrify(sent, args))
+
+
+class PooledMySQL(MySQL):
+    """flask-mysql extension whose per-context connections come from a ConnectionPool."""
+
+    def __init__(self, **connect_args):
+        super().__init__(**connect_args)
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault('MYSQL_DATABASE_HOST', 'localhost')
+        app.config.setdefault('MYSQL_DATABASE_PORT', 3306)
+        app.config.setdefault('MYSQL_DATABASE_USER', None)
+        app.config.setdefault('MYSQL_DATABASE_PASSWORD', None)
+        app.config.setdefault('MYSQL_DATABASE_DB', None)
+        app.config.setdefault('MYSQL_DATABASE_CHARSET', 'utf8')
+        app.config.setdefault('MYSQL_USE_UNICODE', True)
+        app.config.setdefault('MYSQL_DATABASE_SOCKET', None)
+        app.config.setdefault('MYSQL_SQL_MODE', None)
+        app.config.setdefault('MYSQL_CURSORCLASS', None)
+        app.config.setdefault('MYSQL_SSL_CA', None)
+        app.config.setdefault('MYSQL_POOL_SIZE', 10)
+        app.config.setdefault('MYSQL_POOL_TIMEOUT', 5)
+        # Runs for request contexts and for bare app contexts (background jobs)
+        app.teardown_appcontext(self.teardown)
+
+    @property
+    def pool(self):
+        """The pool for this process; a forked worker builds its own on first use."""
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid:
+            with self._pool_lock:
+                if self._pool is None or self._pool_pid != pid:
+                    self._pool = ConnectionPool(
+                        self.new_connection,
+                        max_size=self.app.config['MYSQL_POOL_SIZE'],
+                        timeout=self.app.config['MYSQL_POOL_TIMEOUT']
+                    )
+                    self._pool_pid = pid
+        return self._pool
+
+    def pool_stats(self):
+        """Pool gauges, or None before the first connection in this process."""
+        if self._pool is None or self._pool_pid != os.getpid():
+            return None
+        return self._pool.stats()
+
+    def new_connection(self):
+        """Open a connection outside the pool."""
+        return MySQL.connect(self)
+
+    def connect(self):
+        return self.pool.acquire()
+
+    def get_db(self):
+        conn = g.get('_mysql_conn')
+        if conn is None:
+            conn = g._mysql_conn = self.connect()
+        return conn
+
+    def teardown(self, exception):
+        conn = g.pop('_mysql_conn', None)
+        if conn is not None:
+            self.pool.release(conn)
+
+
 # Return rows as dictionaries
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+db = PooledMySQL(cursorclass=InstrumentedCursor)
@@ -0,0 +1,45 @@
+"""SQL statement fingerprints.
+
+A fingerprint identifies a statement shape independent of its parameter
+values: comments are removed, whitespace is collapsed, literals and
+placeholders become `?` and IN lists collapse to `(?+)`. The queries in the
+route modules are assembled by string concatenation, so the same route can
+produce several shapes depending on which filters were supplied; each shape
+gets its own fingerprint.
+"""
+
+import hashlib
+import re
+
+_COMMENT = re.compile(r'/\*.*?\*/|--\s[^\n]*', re.S)
+_LEADING_COMMENT = re.compile(r'^\s*(?:/\*.*?\*/\s*)+', re.S)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUES_LIST = re.compile(r'(\(\?\+\))(?:\s*,\s*\(\?\+\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def strip_comments(sql):
+    """Drop leading /* ... */ comments (e.g. trace ids), leaving the statement runnable."""
+    return _LEADING_COMMENT.sub('', sql).strip()
+
+
+def normalize(sql):
+    """Statement text with values replaced by `?`."""
+    if isinstance(sql, (bytes, bytearray)):
+        sql = bytes(sql).decode('utf-8', 'replace')
+    text = _STRING.sub('?', sql)
+    text = _COMMENT.sub(' ', text)
+    text = _PLACEHOLDER.sub('?', text)
+    text = _NUMBER.sub('?', text)
+    text = _WHITESPACE.sub(' ', text).strip().rstrip(';').strip()
+    text = _IN_LIST.sub('(?+)', text)
+    text = _VALUES_LIST.sub(r'\1, ...', text)
+    return text
+
+
+def fingerprint(sql):
+    """Short stable id of a statement shape."""
+    return hashlib.sha1(normalize(sql).lower().encode('utf-8')).hexdigest()[:16]
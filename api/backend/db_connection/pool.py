@@ -0,0 +1,155 @@
+"""Thread-safe pool of PyMySQL connections.
+
+Connections are handed out LIFO so a small hot set stays warm, pinged before
+reuse when they have sat idle long enough for the server to drop them, and
+rolled back on release so no transaction (or REPEATABLE READ snapshot) leaks
+into the next request.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the pool timeout."""
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=10, timeout=5.0, ping_after_seconds=30):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.ping_after_seconds = ping_after_seconds
+        self._idle = deque()  # (connection, released_at)
+        self._cond = threading.Condition()
+        self._size = 0
+        self._waiting = 0
+        # Lifetime counters, exported as metrics
+        self.created = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self):
+        """Return an open connection, creating one if the pool is not full."""
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, released_at = None, None
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(f'No database connection free after {self.timeout}s '
+                                      f'(pool size {self.max_size})')
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self.acquired += 1
+            self.wait_seconds += time.perf_counter() - started
+        return self._checkout(conn, released_at)
+
+    def try_acquire(self):
+        """A connection if one is idle or can be opened without waiting, else None."""
+        with self._cond:
+            if self._idle:
+                conn, released_at = self._idle.pop()
+            elif self._size < self.max_size:
+                self._size += 1
+                conn, released_at = None, None
+            else:
+                return None
+            self.acquired += 1
+        return self._checkout(conn, released_at)
+
+    def _checkout(self, conn, released_at):
+        """Hand out an idle connection (pinged if stale), or open one in the slot reserved for it."""
+        if conn is not None and time.monotonic() - released_at > self.ping_after_seconds:
+            try:
+                conn.ping(reconnect=True)
+            except Exception:
+                self._discard(conn, reserve=True)
+                conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.created += 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, dropping it if it is no longer usable."""
+        try:
+            conn.rollback()
+            healthy = conn.open
+        except Exception:
+            healthy = False
+        if not healthy:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn, reserve=False):
+        """Close a broken connection. With reserve, its slot stays taken for a replacement."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        if not reserve:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+
+    def prefill(self, count):
+        """Open up to `count` connections ahead of traffic; returns how many are idle."""
+        held = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                held.append(self.acquire())
+        finally:
+            for conn in held:
+                self.release(conn)
+        with self._cond:
+            return len(self._idle)
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._size -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'waiting': self._waiting,
+                'created': self.created,
+                'acquired': self.acquired,
+                'timeouts': self.timeouts,
+                'wait_seconds': round(self.wait_seconds, 6)
+            }
@@ -0,0 +1,241 @@
+"""Conditional GETs: ETags from table versions, 304 without running the SQL.
+
+Every table has a version counter in TableVersions, bumped after each
+request (or background job) that writes to it. A GET response's ETag hashes
+the request path and normalized query string together with the versions of
+the tables its route reads. While none of those tables change, a client
+sending the ETag back in If-None-Match gets a 304 before the route runs.
+
+Which tables a route reads is learned, not declared: statements are watched
+through the query listeners and each endpoint accumulates the tables its
+queries have touched. A route is only tagged once it has run here, so a
+worker that has not learned a branch yet just misses, it never answers 304
+wrongly. Versions are snapshotted before the route runs, so a write landing
+while it runs leaves the response with the older versions and the next
+revalidation refetches.
+
+Versions are read from MySQL on every eligible GET (one primary-key scan of
+a small table), so a write made through any worker is seen by the next
+request on every other one. ETAG_VERSIONS_TTL > 0 caches them per process
+instead (writes made by this process still refresh them at once), at the
+cost of 304s for data another worker changed within the TTL. Writes that do
+not go through the API (mysql shell, migrations) must bump the table
+themselves:
+    INSERT INTO TableVersions (table_name) VALUES ('Players')
+    ON DUPLICATE KEY UPDATE version = version + 1;
+
+Routes backend/asgi.py serves natively are tagged the same way, with the
+versions read on its aiomysql pool; etag_for and learn are shared.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from contextvars import ContextVar
+from urllib.parse import urlencode
+
+from flask import current_app, g, has_app_context, make_response, request
+
+from backend import columnar
+from backend.db_connection import add_query_listener, db
+
+VERSIONS_TABLE = 'TableVersions'
+
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?(\w+)`?', re.IGNORECASE)
+_WRITE = re.compile(r'^\s*(?:/\*.*?\*/\s*)*(INSERT|UPDATE|DELETE|REPLACE|TRUNCATE|LOAD|ALTER)\b',
+                    re.IGNORECASE | re.DOTALL)
+
+# A context variable rather than a thread-local: ASGI requests share the event loop's thread
+_reads = ContextVar('etag_reads', default=None)
+_lock = threading.Lock()
+_versions = {}
+_versions_read_at = None
+_endpoint_tables = {}  # endpoint -> frozenset of the tables its statements have read
+_known_tables = None
+_warned = False
+
+
+def current_reads():
+    """The set collecting tables read by the current request, or None."""
+    return _reads.get()
+
+
+def bind_reads(reads):
+    """Collect this thread's reads into `reads` (e.g. a fan-out worker); None when done."""
+    _reads.set(reads)
+
+
+def _tables_in(sql):
+    return {name for name in _TABLE_REF.findall(sql) if name in _known_tables and name != VERSIONS_TABLE}
+
+
+def _on_query(sql, duration, error):
+    if error is not None or _known_tables is None or not isinstance(sql, str):
+        return
+    if _WRITE.match(sql):
+        written = _tables_in(sql)
+        if written and has_app_context():
+            g.setdefault('_etag_written', set()).update(written)
+        return
+    reads = current_reads()
+    if reads is not None:
+        reads.update(_tables_in(sql))
+
+
+# ============================================================================
+# TABLE VERSIONS
+# ============================================================================
+
+KNOWN_TABLES_SQL = 'SELECT table_name AS name FROM information_schema.TABLES WHERE table_schema = DATABASE()'
+VERSIONS_SQL = f'SELECT table_name, version FROM {VERSIONS_TABLE}'
+
+
+def has_known_tables():
+    return _known_tables is not None
+
+
+def set_known_tables(names):
+    """The schema's tables, which statements are matched against."""
+    global _known_tables
+    _known_tables = frozenset(names)
+
+
+def _load_known_tables():
+    cursor = db.get_db().cursor()
+    cursor.execute(KNOWN_TABLES_SQL)
+    set_known_tables(row['name'] for row in cursor.fetchall())
+
+
+def versions():
+    """{table: version}, re-read from TableVersions once the cached copy is ETAG_VERSIONS_TTL old."""
+    global _versions, _versions_read_at
+    now = time.monotonic()
+    with _lock:
+        if _versions_read_at is not None and now - _versions_read_at < current_app.config['ETAG_VERSIONS_TTL']:
+            return _versions
+    cursor = db.get_db().cursor()
+    cursor.execute(VERSIONS_SQL)
+    fresh = {row['table_name']: row['version'] for row in cursor.fetchall()}
+    with _lock:
+        _versions, _versions_read_at = fresh, now
+    return fresh
+
+
+def bump(tables):
+    """Advance the version of each table (on its own connection, committed at once)."""
+    conn = db.pool.acquire()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {VERSIONS_TABLE} (table_name) VALUES '
+                           + ', '.join(['(%s)'] * len(tables))
+                           + ' ON DUPLICATE KEY UPDATE version = version + 1', sorted(tables))
+        conn.commit()
+    finally:
+        db.pool.release(conn)
+    global _versions_read_at
+    with _lock:
+        _versions_read_at = None
+
+
+def _bump_written(exception):
+    # Runs before the request's connection goes back to the pool; routes have committed by now
+    written = g.pop('_etag_written', None)
+    if not written:
+        return
+    try:
+        bump(written)
+    except Exception as e:
+        current_app.logger.warning(f'Could not bump table versions for {sorted(written)}: {e}')
+
+
+# ============================================================================
+# REQUEST HOOKS
+# ============================================================================
+
+def etag_for(path, args, accept, tables, table_versions):
+    """The ETag of a GET to `path` with query (name, value) pairs `args`, given the tables it reads."""
+    query = urlencode(sorted(args))
+    state = ','.join(f'{t}:{table_versions.get(t, 0)}' for t in sorted(tables))
+    # The same rows as JSON and as Arrow are different bodies
+    fmt = columnar.negotiate(accept) if current_app.json.columnar else columnar.JSON
+    return hashlib.sha1(f'{path}?{query}|{fmt}|{state}'.encode()).hexdigest()[:32]
+
+
+def learned_tables(endpoint):
+    """The tables `endpoint` is known to read, or None before it has run here."""
+    return _endpoint_tables.get(endpoint)
+
+
+def learn(endpoint, reads):
+    """Add the tables a run of `endpoint` read; returns all it is known to read."""
+    with _lock:
+        tables = _endpoint_tables[endpoint] = _endpoint_tables.get(endpoint, frozenset()) | reads
+    return tables
+
+
+def _etag(tables, table_versions):
+    return etag_for(request.path, request.args.items(multi=True), request.headers.get('Accept'),
+                    tables, table_versions)
+
+
+def _eligible():
+    return (request.method == 'GET' and request.endpoint is not None
+            and not request.path.startswith(current_app.config['ETAG_EXCLUDE_PREFIXES']))
+
+
+def _before_request():
+    if not _eligible():
+        return None
+    try:
+        if _known_tables is None:
+            _load_known_tables()
+        g._etag_versions = versions()
+    except Exception as e:
+        global _warned
+        if not _warned:
+            _warned = True
+            current_app.logger.warning(f'Responses go without ETags: cannot read table versions ({e})')
+        return None
+    bind_reads(set())
+
+    tables = learned_tables(request.endpoint)
+    if tables and request.if_none_match:
+        etag = _etag(tables, g._etag_versions)
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+            response.headers['ETag'] = f'W/"{etag}"'
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+    return None
+
+
+def _after_request(response):
+    reads = current_reads()
+    table_versions = g.pop('_etag_versions', None)
+    if (reads is None or table_versions is None or response.status_code != 200
+            or response.is_streamed):
+        return response
+    tables = learn(request.endpoint, reads)
+    if tables:
+        response.headers['ETag'] = f'W/"{_etag(tables, table_versions)}"'
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _teardown_request(exception):
+    bind_reads(None)
+
+
+def endpoint_tables():
+    """{endpoint: [tables]} learned so far in this process."""
+    with _lock:
+        return {endpoint: sorted(tables) for endpoint, tables in sorted(_endpoint_tables.items())}
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.teardown_appcontext(_bump_written)
+    add_query_listener(_on_query)
@@ -0,0 +1,152 @@
+"""Run a route's independent queries concurrently.
+
+Composite endpoints (opponent reports, team details, situational
+performance) issue several queries that do not depend on each other. fan_out
+runs each on its own pooled connection from a shared thread pool, so the
+endpoint waits for the slowest query instead of the sum:
+
+    results = fan_out({
+        'team': Query(team_sql, (team_id,), one=True),
+        'recent_games': Query(games_sql, (team_id, team_id)),
+    })
+
+A query that cannot get a connection of its own right away runs on the
+request's connection instead, so a busy pool degrades to serial execution
+rather than queueing. Everything must finish within the request deadline
+(FANOUT_DEADLINE_SECONDS); statements still running then are killed with
+KILL QUERY and FanoutTimeout is raised. Worker threads are bound to the
+request's trace, ETag read set and profiling DB timer, so their statements
+show up as spans of the request, count towards the tables it reads and
+towards the DB time of its profile.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import current_app
+
+from backend.db_connection import PoolTimeout, db
+from backend.etags import bind_reads, current_reads
+from backend.profiling import bind_state as bind_profile, current_state as current_profile
+from backend.tracing import bind_trace, current_trace
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+class FanoutTimeout(Exception):
+    """Raised when fanned-out queries are not all done by the deadline."""
+
+
+class Query:
+    """One statement of a fan-out. `one` fetches a single row; an `optional`
+    query that fails yields None instead of failing the request."""
+
+    def __init__(self, sql, params=(), one=False, optional=False):
+        self.sql = sql
+        self.params = params
+        self.one = one
+        self.optional = optional
+
+
+def _get_executor():
+    """The worker threads for this process; a forked worker starts its own."""
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=current_app.config['FANOUT_MAX_WORKERS'],
+                                               thread_name_prefix='fanout')
+                _executor_pid = pid
+    return _executor
+
+
+def _fetch(cursor, query):
+    cursor.execute(query.sql, query.params)
+    return cursor.fetchone() if query.one else cursor.fetchall()
+
+
+def _run(name, query, conn, trace, reads, profile, state):
+    """Worker: run one query on its own connection and hand the connection back."""
+    bind_trace(trace)
+    bind_reads(reads)
+    bind_profile(profile)
+    try:
+        if state['cancelled']:
+            raise FanoutTimeout(f'{name} cancelled before it started')
+        state['running'][name] = conn.thread_id()
+        with conn.cursor() as cursor:
+            return _fetch(cursor, query)
+    finally:
+        state['running'].pop(name, None)
+        bind_trace(None)
+        bind_reads(None)
+        bind_profile(None)
+        db.pool.release(conn)
+
+
+def _kill(thread_ids):
+    cursor = db.get_db().cursor()
+    for thread_id in thread_ids:
+        try:
+            cursor.execute('KILL QUERY %s', (thread_id,))
+        except Exception as e:
+            current_app.logger.warning(f'Could not kill fan-out query on connection {thread_id}: {e}')
+
+
+def fan_out(queries, deadline=None):
+    """Run independent queries concurrently; returns {name: rows} for the given {name: Query}."""
+    if deadline is None:
+        deadline = current_app.config['FANOUT_DEADLINE_SECONDS']
+    ends = time.monotonic() + deadline
+    state = {'cancelled': False, 'running': {}}
+    trace = current_trace()
+    reads = current_reads()
+    profile = current_profile()
+
+    futures, inline = {}, []
+    for name, query in queries.items():
+        try:
+            conn = db.pool.try_acquire()
+        except PoolTimeout:
+            conn = None
+        if conn is None:
+            inline.append(name)
+        else:
+            futures[name] = _get_executor().submit(_run, name, query, conn, trace, reads, profile, state)
+
+    results = {}
+    try:
+        if inline:
+            cursor = db.get_db().cursor()
+            for name in inline:
+                try:
+                    results[name] = _fetch(cursor, queries[name])
+                except Exception as e:
+                    if not queries[name].optional:
+                        raise
+                    current_app.logger.warning(f'Optional query {name} failed: {e}')
+                    results[name] = None
+    finally:
+        _, pending = wait(futures.values(), timeout=max(0.0, ends - time.monotonic()))
+        if pending:
+            state['cancelled'] = True
+            _kill(list(state['running'].values()))
+
+    if pending:
+        late = sorted(name for name, future in futures.items() if future in pending)
+        raise FanoutTimeout(f"{', '.join(late)} still running after {deadline}s")
+
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            if not queries[name].optional:
+                raise
+            current_app.logger.warning(f'Optional query {name} failed: {e}')
+            results[name] = None
+    return results
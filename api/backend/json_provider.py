@@ -0,0 +1,130 @@
+"""JSON encoding for API responses.
+
+Every route jsonify()s lists of DictCursor rows, full of Decimal, date,
+datetime and timedelta (TIME columns) values. Flask's default provider runs
+json.dumps with a Python callback for each of those values, and cannot
+encode timedelta at all. JSON_PROVIDER picks the encoder:
+
+  orjson   orjson, which serializes dicts, lists, strings, numbers, numpy
+           values and (with JSON_DATE_FORMAT=iso) dates and datetimes in C;
+           only Decimal and timedelta reach a Python callback
+  stdlib   Flask's provider plus timedelta support
+  auto     orjson when it is installed, else stdlib (the default)
+
+JSON_DATE_FORMAT=http (default) keeps Flask's wire format for dates,
+'Wed, 01 Jan 2025 00:00:00 GMT'; iso emits '2025-01-01' and
+'2025-01-01T19:30:00', which is faster with orjson and what pandas and
+most clients expect. Decimals stay strings ('12.5') and TIME values become
+'HH:MM:SS', whichever encoder is used, so switching encoder alone never
+changes a payload.
+
+With COLUMNAR_ENABLED, backend/columnar.py hooks in here so list responses
+can be sent as Arrow or MessagePack to clients that ask for them.
+"""
+
+import decimal
+from functools import lru_cache
+from datetime import date, time, timedelta
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib provider
+    orjson = None
+
+
+# Rows repeat the same few game dates; formatting each once saves most of the cost
+_http_date = lru_cache(maxsize=4096)(http_date)
+
+
+def _time_of_day(value):
+    """A MySQL TIME (timedelta) as HH:MM:SS, which may exceed 24 hours or be negative."""
+    seconds = int(value.total_seconds())
+    sign = '-' if seconds < 0 else ''
+    hours, rest = divmod(abs(seconds), 3600)
+    return f'{sign}{hours:02d}:{rest // 60:02d}:{rest % 60:02d}'
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider, plus TIME columns and an optional ISO date format."""
+
+    iso_dates = False
+    columnar = None  # columnar.encode, set by columnar.init_app
+
+    def _encode(self, o):
+        if isinstance(o, decimal.Decimal):
+            return str(o)
+        if isinstance(o, timedelta):
+            return _time_of_day(o)
+        if isinstance(o, date):
+            return o.isoformat() if self.iso_dates else _http_date(o)
+        if isinstance(o, time):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        kwargs.setdefault('default', self._encode)
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.columnar is not None and has_request_context():
+            encoded = self.columnar(self._app, obj, request.headers.get('Accept'), request.args.get('frame'))
+            if encoded is not None:
+                body, mimetype = encoded
+                response = self._app.response_class(body, mimetype=mimetype)
+            else:
+                response = self._json_response(obj)
+            response.vary.add('Accept')
+            return response
+        return self._json_response(obj)
+
+    def _json_response(self, obj):
+        return super().response(obj)
+
+
+class OrjsonJSONProvider(StdlibJSONProvider):
+    """The same output as StdlibJSONProvider, encoded by orjson."""
+
+    @property
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if not self.iso_dates:
+            options |= orjson.OPT_PASSTHROUGH_DATETIME
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Callers passing json.dumps arguments (indent, cls, ...) get the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self._encode, option=self._options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _json_response(self, obj):
+        option = self._options | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self._encode, option=option),
+                                        mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Install the provider chosen by JSON_PROVIDER / JSON_DATE_FORMAT."""
+    name = app.config['JSON_PROVIDER']
+    if name == 'orjson' and orjson is None:
+        app.logger.warning('JSON_PROVIDER=orjson but orjson is not installed; using stdlib')
+    use_orjson = orjson is not None and name in ('auto', 'orjson')
+    provider = (OrjsonJSONProvider if use_orjson else StdlibJSONProvider)(app)
+    provider.iso_dates = app.config['JSON_DATE_FORMAT'] == 'iso'
+    app.json = provider
+    app.logger.info(f'🧾 JSON encoder: {"orjson" if use_orjson else "stdlib"}, '
+                    f'{app.config["JSON_DATE_FORMAT"]} dates')
@@ -0,0 +1,298 @@
+"""Live game updates: one in-process pub/sub behind the SSE streams.
+
+While a game is in progress, clients used to poll /basketball/games/<id>
+for the score, each poll running the game and box score queries. Clients
+now open
+
+    GET /basketball/games/<id>/live    (text/event-stream)
+
+and are sent the game once, then only what changes:
+
+    event: snapshot   {"game": {...}, "box_score": [...]}
+    event: score      {"game_id", "home_score", "away_score", "status"}
+    event: box_score  {"game_id", "players": [the rows that changed]}
+    event: end        {"game_id", "status"}   (completed or deleted; the stream closes)
+
+Every stream of the process is fed by one hub thread. update_game,
+delete_game and update_player_stats call game_changed() after committing
+(a deleted game ends its streams); the hub then reads
+the changed games (two queries for all of them, whatever the number of
+watchers), diffs them against the last snapshot and hands the same encoded
+messages to every watcher. Writes made by other worker processes are picked
+up from TableVersions, checked every LIVE_POLL_SECONDS while anyone is
+watching. Idle streams get a comment line every LIVE_HEARTBEAT_SECONDS so
+proxies keep them open.
+
+Under gunicorn each stream holds a worker thread for its lifetime, so
+LIVE_MAX_WATCHERS is capped below GUNICORN_THREADS; serve many watchers
+through backend.asgi, where a stream is a coroutine.
+"""
+
+import os
+import threading
+
+from backend.db_connection import db
+from backend.metrics import registry
+
+live_watchers = registry.gauge('ballwatch_live_watchers', 'Open live game streams in this process')
+live_events = registry.counter('ballwatch_live_events_total', 'Live game events published', ('event',))
+
+SCORE_FIELDS = ('home_score', 'away_score', 'status')
+KEEPALIVE = ': keepalive\n\n'
+
+
+class TooManyWatchers(Exception):
+    """LIVE_MAX_WATCHERS streams are already open in this process."""
+
+
+_lock = threading.Lock()
+_watchers = {}   # game_id -> set of deliver(message, final) callables
+_snapshots = {}  # game_id -> last published {'game': row, 'box_score': {player_id: row}}
+_changed = set()
+_wake = threading.Event()
+_hub = None
+_hub_pid = None
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _read(app, game_ids):
+    """{game_id: snapshot} for the games that exist, on a connection of its own."""
+    placeholders = ', '.join(['%s'] * len(game_ids))
+    with app.app_context():
+        conn = db.pool.acquire()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f'''
+                    SELECT
+                        g.game_id,
+                        g.status,
+                        g.home_team_id,
+                        g.away_team_id,
+                        ht.name AS home_team_name,
+                        at.name AS away_team_name,
+                        g.home_score,
+                        g.away_score
+                    FROM Game g
+                    JOIN Teams ht ON g.home_team_id = ht.team_id
+                    JOIN Teams at ON g.away_team_id = at.team_id
+                    WHERE g.game_id IN ({placeholders})
+                ''', game_ids)
+                snapshots = {row['game_id']: {'game': row, 'box_score': {}} for row in cursor.fetchall()}
+                if snapshots:
+                    cursor.execute(f'''
+                        SELECT
+                            pgs.game_id,
+                            pgs.player_id,
+                            p.first_name,
+                            p.last_name,
+                            tp.team_id,
+                            pgs.points,
+                            pgs.rebounds,
+                            pgs.assists,
+                            pgs.steals,
+                            pgs.blocks,
+                            pgs.turnovers,
+                            pgs.shooting_percentage,
+                            pgs.three_point_percentage,
+                            pgs.free_throw_percentage,
+                            pgs.plus_minus,
+                            pgs.minutes_played
+                        FROM PlayerGameStats pgs
+                        JOIN Players p ON pgs.player_id = p.player_id
+                        LEFT JOIN TeamsPlayers tp ON tp.player_id = p.player_id AND tp.left_date IS NULL
+                        WHERE pgs.game_id IN ({', '.join(['%s'] * len(snapshots))})
+                        ORDER BY pgs.game_id, pgs.player_id
+                    ''', list(snapshots))
+                    for row in cursor.fetchall():
+                        snapshots[row['game_id']]['box_score'][row['player_id']] = row
+            return snapshots
+        finally:
+            db.pool.release(conn)
+
+
+def _table_versions(app):
+    """The (Game, PlayerGameStats) versions from TableVersions."""
+    with app.app_context():
+        conn = db.pool.acquire()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT table_name, version FROM TableVersions "
+                               "WHERE table_name IN ('Game', 'PlayerGameStats')")
+                versions = {row['table_name']: row['version'] for row in cursor.fetchall()}
+        finally:
+            db.pool.release(conn)
+    return versions.get('Game', 0), versions.get('PlayerGameStats', 0)
+
+
+# ============================================================================
+# MESSAGES
+# ============================================================================
+
+def _message(app, event, data):
+    live_events.inc(event=event)
+    return f'event: {event}\ndata: {app.json.dumps(data)}\n\n'
+
+
+def _snapshot_message(app, snapshot):
+    return 'retry: 5000\n' + _message(app, 'snapshot', {'game': snapshot['game'],
+                                                         'box_score': list(snapshot['box_score'].values())})
+
+
+def _end_message(app, game_id, status):
+    return _message(app, 'end', {'game_id': game_id, 'status': status})
+
+
+def _diff(app, game_id, old, new):
+    """The messages taking a watcher from `old` to `new`; `new` None means the game was deleted."""
+    if new is None:
+        return [_end_message(app, game_id, 'deleted')]
+    messages = []
+    if any(old['game'][field] != new['game'][field] for field in SCORE_FIELDS):
+        messages.append(_message(app, 'score', {'game_id': game_id,
+                                                **{field: new['game'][field] for field in SCORE_FIELDS}}))
+    players = [row for player_id, row in new['box_score'].items() if old['box_score'].get(player_id) != row]
+    if players:
+        messages.append(_message(app, 'box_score', {'game_id': game_id, 'players': players}))
+    if new['game']['status'] == 'completed':
+        messages.append(_end_message(app, game_id, 'completed'))
+    return messages
+
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+def _publish(app, fresh, game_ids):
+    """Send each watcher of `game_ids` what changed since the last snapshot."""
+    for game_id in game_ids:
+        new = fresh.get(game_id)
+        with _lock:
+            old = _snapshots.get(game_id)
+            if old is None:
+                continue
+            messages = _diff(app, game_id, old, new)
+            final = new is None or new['game']['status'] == 'completed'
+            if final:
+                _snapshots.pop(game_id, None)
+                targets = _watchers.pop(game_id, set())
+                live_watchers.set(sum(len(watchers) for watchers in _watchers.values()))
+            else:
+                _snapshots[game_id] = new
+                targets = set(_watchers.get(game_id, ()))
+        if not messages:
+            continue
+        message = ''.join(messages)
+        for deliver in targets:
+            try:
+                deliver(message, final)
+            except Exception as e:
+                app.logger.warning(f'Dropping live watcher of game {game_id}: {e}')
+                unsubscribe(game_id, deliver)
+
+
+def _run(app):
+    poll = app.config['LIVE_POLL_SECONDS']
+    last_versions = None
+    warned = False
+    while True:
+        with _lock:
+            watching = bool(_watchers)
+        _wake.wait(poll if watching else None)
+        _wake.clear()
+        with _lock:
+            watched = set(_watchers)
+            changed = _changed & watched
+            _changed.clear()
+        if not watched:
+            last_versions = None
+            continue
+        try:
+            try:
+                versions = _table_versions(app)
+            except Exception as e:
+                versions = last_versions
+                if not warned:
+                    warned = True
+                    app.logger.warning(f'Live games only see writes made by this process: '
+                                       f'cannot read table versions ({e})')
+            if versions != last_versions:
+                # Written through another process (or this one): re-read everything watched
+                changed = watched
+                last_versions = versions
+            if changed:
+                _publish(app, _read(app, sorted(changed)), sorted(changed))
+        except Exception as e:
+            app.logger.error(f'Error refreshing live games: {e}')
+            with _lock:
+                _changed.update(changed)
+
+
+def _ensure_hub(app):
+    global _hub, _hub_pid
+    pid = os.getpid()
+    with _lock:
+        if _hub is not None and _hub_pid == pid and _hub.is_alive():
+            return
+        _hub = threading.Thread(target=_run, args=(app,), name='live-games', daemon=True)
+        _hub_pid = pid
+        _hub.start()
+
+
+# ============================================================================
+# SUBSCRIPTIONS
+# ============================================================================
+
+def subscribe(app, game_id, deliver):
+    """Watch a game: (first message, final), or None if there is no such game.
+
+    deliver(message, final) is then called from the hub thread with each
+    update until final is True or unsubscribe() is called; it must not block.
+    A completed game is answered with its snapshot and end at once (final,
+    not subscribed). Raises TooManyWatchers past LIVE_MAX_WATCHERS.
+    """
+    _ensure_hub(app)
+    with _lock:
+        if sum(len(watchers) for watchers in _watchers.values()) >= app.config['LIVE_MAX_WATCHERS']:
+            raise TooManyWatchers()
+        snapshot = _snapshots.get(game_id)
+    if snapshot is None:
+        snapshot = _read(app, [game_id]).get(game_id)
+        if snapshot is None:
+            return None
+    if snapshot['game']['status'] == 'completed':
+        return _snapshot_message(app, snapshot) + _end_message(app, game_id, 'completed'), True
+    with _lock:
+        # A refresh published meanwhile is newer; otherwise this read starts the game's snapshots
+        snapshot = _snapshots.setdefault(game_id, snapshot)
+        _watchers.setdefault(game_id, set()).add(deliver)
+        live_watchers.set(sum(len(watchers) for watchers in _watchers.values()))
+    _wake.set()
+    return _snapshot_message(app, snapshot), False
+
+
+def unsubscribe(game_id, deliver):
+    with _lock:
+        watchers = _watchers.get(game_id)
+        if watchers is None:
+            return
+        watchers.discard(deliver)
+        if not watchers:
+            del _watchers[game_id]
+            _snapshots.pop(game_id, None)
+        live_watchers.set(sum(len(watchers) for watchers in _watchers.values()))
+
+
+def game_changed(game_id):
+    """Tell the hub a game or its box score was written (after the commit)."""
+    try:
+        game_id = int(game_id)
+    except (TypeError, ValueError):
+        return
+    with _lock:
+        if game_id not in _watchers:
+            return
+        _changed.add(game_id)
+    _wake.set()
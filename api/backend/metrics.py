@@ -0,0 +1,293 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Request latency, DB query, connection pool, cache and background job
+metrics are collected here and served by GET /system/metrics. Everything is
+kept in memory per process; with several worker processes each one reports
+its own series and the scraper aggregates them.
+"""
+
+import re
+import threading
+import time
+
+from flask import g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_SQL_VERB = re.compile(r'^\s*(?:/\*.*?\*/\s*)*(\w+)', re.S)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def header(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type}']
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self):
+        lines = self.header()
+        for key, value in sorted(self.samples()):
+            lines.append(f'{self.name}{_labels(self.labelnames, key)} {_number(value)}')
+        return lines
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, ("le", _number(bound)))} '
+                             f'{cumulative}')
+            lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, ("le", "+Inf"))} {series[-1]}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(float(series[-2]))}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {series[-1]}')
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Gauge or counter whose samples are read from `func` at scrape time.
+
+    `func` returns an iterable of (label values tuple, value).
+    """
+
+    def __init__(self, name, help_text, labelnames, func, type='gauge'):
+        super().__init__(name, help_text, labelnames)
+        self.func = func
+        self.type = type
+
+    def render(self):
+        lines = self.header()
+        try:
+            samples = list(self.func())
+        except Exception:
+            samples = []
+        for key, value in samples:
+            lines.append(f'{self.name}{_labels(self.labelnames, key)} {_number(value)}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name, help_text, labelnames, func, type='gauge'):
+        return self.register(CallbackMetric(name, help_text, labelnames, func, type))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# ============================================================================
+# APPLICATION METRICS
+# ============================================================================
+
+http_requests = registry.counter(
+    'ballwatch_http_requests_total', 'HTTP requests served',
+    ('blueprint', 'route', 'method', 'status'))
+http_latency = registry.histogram(
+    'ballwatch_http_request_duration_seconds', 'HTTP request latency',
+    ('blueprint', 'route', 'method'))
+http_in_flight = registry.gauge(
+    'ballwatch_http_requests_in_flight', 'HTTP requests currently being served')
+
+db_queries = registry.counter(
+    'ballwatch_db_queries_total', 'SQL statements executed', ('operation', 'outcome'))
+db_query_latency = registry.histogram(
+    'ballwatch_db_query_duration_seconds', 'SQL statement execution time', ('operation',), DB_BUCKETS)
+
+cache_requests = registry.counter(
+    'ballwatch_cache_requests_total', 'Cache lookups', ('cache', 'result'))
+
+data_load_queue = registry.gauge(
+    'ballwatch_data_load_queue_depth', 'DataLoads waiting to be processed, sampled by the retry job',
+    ('status',))
+
+
+def record_cache_access(cache, hit):
+    """Count a lookup in a named in-process cache."""
+    cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _cache_hit_ratios():
+    totals = {}
+    for (cache, result), value in cache_requests.samples():
+        hits, total = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if result == 'hit' else 0), total + value)
+    return [((cache,), hits / total) for cache, (hits, total) in sorted(totals.items()) if total]
+
+
+registry.callback('ballwatch_cache_hit_ratio', 'Share of cache lookups served from cache', ('cache',),
+                  _cache_hit_ratios)
+
+
+def _on_query(sql, duration, error):
+    match = _SQL_VERB.match(sql if isinstance(sql, str) else '')
+    operation = match.group(1).upper() if match else 'OTHER'
+    if operation not in ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE'):
+        operation = 'OTHER'
+    db_queries.inc(operation=operation, outcome='error' if error else 'ok')
+    db_query_latency.observe(duration, operation=operation)
+
+
+# ============================================================================
+# FLASK INTEGRATION
+# ============================================================================
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    http_in_flight.inc()
+
+
+def _after_request(response):
+    g._metrics_status = response.status_code
+    return response
+
+
+def _teardown_request(exception):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    http_in_flight.dec()
+    rule = request.url_rule.rule if request.url_rule else 'unmatched'
+    blueprint = request.blueprint or 'app'
+    status = g.pop('_metrics_status', 500)
+    http_latency.observe(time.perf_counter() - started, blueprint=blueprint, route=rule,
+                         method=request.method)
+    http_requests.inc(blueprint=blueprint, route=rule, method=request.method, status=status)
+
+
+def init_app(app, db, scheduler):
+    """Hook request timing into the app and expose pool and scheduler state."""
+    from backend.db_connection import add_query_listener
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    add_query_listener(_on_query)
+
+    def pool_stat(field):
+        def read():
+            stats = db.pool_stats()
+            return [((), stats[field])] if stats else []
+        return read
+
+    for field, help_text in (('max_size', 'Configured maximum pool size'),
+                             ('size', 'Open pooled connections'),
+                             ('idle', 'Idle pooled connections'),
+                             ('in_use', 'Pooled connections checked out'),
+                             ('waiting', 'Threads waiting for a pooled connection')):
+        registry.callback(f'ballwatch_db_pool_{field}', help_text, (), pool_stat(field))
+    for field, help_text in (('created', 'Pooled connections opened'),
+                             ('acquired', 'Pool checkouts'),
+                             ('timeouts', 'Pool checkouts that timed out'),
+                             ('wait_seconds', 'Time spent waiting for a pooled connection')):
+        registry.callback(f'ballwatch_db_pool_{field}_total', help_text, (), pool_stat(field), type='counter')
+
+    def job_stat(field):
+        return lambda: [((job['name'],), job[field] or 0) for job in scheduler.status()]
+
+    registry.callback('ballwatch_job_runs_total', 'Background job runs', ('job',), job_stat('runs'), type='counter')
+    registry.callback('ballwatch_job_failures_total', 'Background job runs that raised', ('job',),
+                      job_stat('failures'), type='counter')
+    registry.callback('ballwatch_job_last_duration_seconds', 'Duration of the last run of each job', ('job',),
+                      lambda: [((job['name'],), (job['last_duration_ms'] or 0) / 1000) for job in scheduler.status()])
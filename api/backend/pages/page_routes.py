@@ -0,0 +1,179 @@
+"""Pages blueprint - the data for a whole Streamlit page in one request.
+
+Pages used to chain calls per render: Player Comparison fetched the teams,
+the players of each matching team, then stats and recent games per player.
+Each endpoint here gathers the sections a page shows into one payload,
+using the same queries as the individual routes (players_query,
+player_stats_query, ...). Sections run one after another on the request's
+connection, so a page render costs one round trip and one pool checkout:
+
+    GET /pages/player-comparison?team_name=Celtics&player_ids=12,40
+    -> {'players': [...], 'stats': {'12': {...}, '40': {...}},
+        'recent_games': {'12': [...], '40': [...]}, 'include': [...]}
+
+?include=teams,players,... replaces a page's default sections, and
+/pages/data serves any combination. Filters are passed as on the individual
+routes (position, team_id, team_name, role, ...). Stats and recent games are
+fetched for all of player_ids at once (at most MAX_PLAYER_IDS). A section
+that fails is left out and named under 'errors'; the others are still sent.
+"""
+
+from flask import Blueprint, current_app
+
+from backend.auth.auth_routes import users_query
+from backend.basketball.basketball_routes import (
+    player_stats_query, players_query, recent_games_query, teams_query,
+)
+from backend.query_routes import ROUTES, query_route
+
+pages = Blueprint('pages', __name__)
+
+MAX_PLAYER_IDS = 10
+MAX_RECENT_GAMES = 50
+
+
+# ============================================================================
+# SECTIONS
+# ============================================================================
+
+def _teams(args, player_ids):
+    return (yield teams_query(args))
+
+
+def _players(args, player_ids):
+    return (yield players_query(args))
+
+
+def _users(args, player_ids):
+    return (yield users_query(args.get('role')))
+
+
+def _stats(args, player_ids):
+    if not player_ids:
+        return {}
+    rows = yield player_stats_query(player_ids, args.get('season'), args.get('game_type'))
+    return {str(row['player_id']): row for row in rows}
+
+
+def _recent_games(args, player_ids):
+    if not player_ids:
+        return {}
+    limit = min(max(args.get('recent', 10, type=int), 1), MAX_RECENT_GAMES)
+    rows = yield recent_games_query(player_ids, limit)
+    games = {str(player_id): [] for player_id in player_ids}
+    for row in rows:
+        games[str(row['player_id'])].append(row)
+    return games
+
+
+def _game_plans(args, player_ids):
+    if not args.get('team_id', type=int):
+        return []
+    payload, status = yield from ROUTES['strategy.get_game_plans'](args)
+    if status != 200:
+        raise RuntimeError(payload.get('error'))
+    return payload['game_plans']
+
+
+SECTIONS = {
+    'teams': _teams,
+    'players': _players,
+    'users': _users,
+    'stats': _stats,
+    'recent_games': _recent_games,
+    'game_plans': _game_plans,
+}
+
+
+def _player_ids(args):
+    """Unique ids from ?player_ids=1,2,3 in order; ValueError if malformed or too many."""
+    raw = args.get('player_ids', '')
+    ids = list(dict.fromkeys(int(part) for part in raw.split(',') if part.strip()))
+    if len(ids) > MAX_PLAYER_IDS:
+        raise ValueError(f'At most {MAX_PLAYER_IDS} player_ids')
+    return ids
+
+
+def _compose(args, default_include):
+    """Run the requested sections in order and return (payload, status)."""
+    include = [name.strip() for name in args.get('include', '').split(',') if name.strip()] or list(default_include)
+    unknown = [name for name in include if name not in SECTIONS]
+    if unknown:
+        return {"error": f"Unknown sections: {', '.join(unknown)}", "sections": sorted(SECTIONS)}, 400
+    if not include:
+        return {"error": "include is required", "sections": sorted(SECTIONS)}, 400
+    try:
+        player_ids = _player_ids(args)
+    except ValueError:
+        return {"error": f"player_ids must be up to {MAX_PLAYER_IDS} comma-separated integers"}, 400
+
+    payload = {}
+    for name in include:
+        try:
+            payload[name] = yield from SECTIONS[name](args, player_ids)
+        except Exception as e:
+            current_app.logger.error(f'Error loading page section {name}: {e}')
+            payload.setdefault('errors', {})[name] = f'Failed to load {name}'
+    payload['include'] = include
+    return payload, 200
+
+
+# ============================================================================
+# PAGE ROUTES
+# ============================================================================
+
+@query_route(pages, '/player-comparison')
+def get_player_comparison_page(args):
+    """
+    Players to pick from, plus stats and recent games of the picked ones.
+
+    Query Parameters:
+        position, team_id, team_name, ...: Player filters (as /basketball/players)
+        player_ids: Comma-separated players to compare
+        recent: Recent games per player (default 10, max 50)
+        season, game_type: Stats filters (as /basketball/players/<id>/stats)
+
+    User Stories: [Johnny-1.1, Johnny-1.3]
+    """
+    current_app.logger.info('GET /pages/player-comparison - Fetching page data')
+    return (yield from _compose(args, ('players', 'stats', 'recent_games')))
+
+
+@query_route(pages, '/scouting')
+def get_scouting_page(args):
+    """
+    Teams to scout and the team's game plans.
+
+    Query Parameters:
+        team_id: Team whose game plans to include
+        opponent_id, status: Game plan filters (as /strategy/game-plans)
+
+    User Stories: [Marcus-3.5]
+    """
+    current_app.logger.info('GET /pages/scouting - Fetching page data')
+    return (yield from _compose(args, ('teams', 'game_plans')))
+
+
+@query_route(pages, '/home')
+def get_home_page(args):
+    """
+    Users for the persona logins and the teams they can be assigned to.
+
+    Query Parameters:
+        role: Optional role filter for users
+    """
+    current_app.logger.info('GET /pages/home - Fetching page data')
+    return (yield from _compose(args, ('users', 'teams')))
+
+
+@query_route(pages, '/data')
+def get_page_data(args):
+    """
+    Any combination of sections.
+
+    Query Parameters:
+        include: Comma-separated sections (teams, players, users, stats,
+                 recent_games, game_plans), plus their filters
+    """
+    current_app.logger.info('GET /pages/data - Fetching page data')
+    return (yield from _compose(args, ()))
@@ -4,6 +4,8 @@ User Stories: Mike (2.1, 2.4, 2.6)
 
 from flask import Blueprint, request, jsonify, make_response, current_app
 from backend.db_connection import db
+from backend.admin.data_loads import create_data_load
+from datetime import datetime, timedelta
 
 data_engineer = Blueprint('data_engineer', __name__)
 
@@ -17,13 +19,9 @@ def de_start_data_load():
             if f not in payload:
                 return make_response(jsonify({'error': f'Missing required field: {f}'}), 400)
         cursor = db.get_db().cursor()
-        cursor.execute('''
-            INSERT INTO SystemLogs (log_type, service_name, severity, message, source_file, user_id)
-            VALUES ('data_load', %s, 'warning', 'Data load initiated', %s,
-                (SELECT user_id FROM Users WHERE username = %s LIMIT 1))
-        ''', (payload['load_type'], payload.get('source_file'), payload['initiated_by']))
+        load_id = create_data_load(cursor, payload['load_type'], payload.get('source_file'), payload['initiated_by'])
         db.get_db().commit()
-        return make_response(jsonify({'message': 'Data load initiated', 'load_id': cursor.lastrowid}), 201)
+        return make_response(jsonify({'message': 'Data load initiated', 'load_id': load_id}), 201)
     except Exception as e:
         current_app.logger.error(f'de_start_data_load error: {e}')
         db.get_db().rollback()
@@ -42,10 +40,10 @@ def de_get_data_validation():
             SELECT log_id as data_error_id, service_name as table_name, severity, message as error_message,
                    records_processed, records_failed, created_at as detected_at, resolved_at
             FROM SystemLogs
-            WHERE (log_type = 'validation' OR log_type = 'error' OR LOWER(service_name) LIKE '%data%')
-              AND created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+            WHERE (log_type = 'validation' OR log_type = 'error' OR LOWER(service_name) LIKE '%%data%%')
+              AND created_at >= %s
         '''
-        params = [days]
+        params = [datetime.now() - timedelta(days=days)]
         if service_name:
             query += ' AND service_name = %s'
             params.append(service_name)
@@ -73,9 +71,9 @@ def de_delete_error_logs():
         query = '''
             DELETE FROM SystemLogs
             WHERE (log_type IN ('error','validation') OR severity IS NOT NULL)
-              AND created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+              AND created_at < %s
         '''
-        params = [older_than_days]
+        params = [datetime.now() - timedelta(days=older_than_days)]
         if severity:
             query += ' AND LOWER(severity) = %s'
             params.append(severity.lower())
@@ -0,0 +1,208 @@
+"""Opt-in profiling of single requests.
+
+With PROFILING_ENABLED set, a request carrying `X-Profile: 1` or
+`?profile=1` runs under cProfile. If PROFILING_TOKEN is set, the request
+must also send it in `X-Profile-Token`. The profile is written to PROFILE_DIR
+as `<id>.prof` (pstats format, readable by snakeviz, flameprof or
+`python -m pstats`) with a `<id>.json` sidecar recording the route,
+parameters, wall time split into DB and Python time, and the top functions.
+DB time includes queries run by fan-out workers; as those overlap, it can
+exceed the wall time (Python time is then reported as 0).
+The profile id is returned in the `X-Profile-Id` response header and the
+files are listed and downloaded through /system/profiles.
+
+Only one request is profiled at a time per process; a second profiled
+request while one is running is served normally with `X-Profile: busy`.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+
+from flask import current_app, g, request
+
+from backend.db_connection import add_query_listener
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+TOP_FUNCTIONS = 30
+
+_active = threading.Lock()
+_timer_lock = threading.Lock()
+# A context variable rather than a thread-local: ASGI requests share the event loop's thread
+_state = ContextVar('profile_state', default=None)
+_PROFILE_ID = re.compile(r'^[\w.-]+$')
+
+
+def current_state():
+    """The DB timer of the request being profiled, or None."""
+    return _state.get()
+
+
+def bind_state(state):
+    """Count this thread's queries into `state` (e.g. a fan-out worker); None when done."""
+    _state.set(state)
+
+
+def _on_query(sql, duration, error):
+    state = _state.get()
+    if state is not None:
+        # Fan-out workers add to the same timer concurrently
+        with _timer_lock:
+            state['db_seconds'] += duration
+            state['queries'] += 1
+
+
+def requested(config, headers, args):
+    """Whether a request with these headers and query args asks to be profiled."""
+    if not config['PROFILING_ENABLED']:
+        return False
+    flag = headers.get('X-Profile') or args.get('profile')
+    if flag not in ('1', 'true'):
+        return False
+    token = config.get('PROFILING_TOKEN')
+    return not token or headers.get('X-Profile-Token') == token
+
+
+def _before_request():
+    if not requested(current_app.config, request.headers, request.args):
+        return
+    if not _active.acquire(blocking=False):
+        g._profile_busy = True
+        return
+    bind_state({'db_seconds': 0.0, 'queries': 0})
+    g._profile = cProfile.Profile()
+    g._profile_started = time.perf_counter()
+    g._profile.enable()
+
+
+def _after_request(response):
+    profiler = g.pop('_profile', None)
+    if profiler is None:
+        if g.pop('_profile_busy', False):
+            response.headers['X-Profile'] = 'busy'
+        return response
+
+    profiler.disable()
+    wall = time.perf_counter() - g.pop('_profile_started')
+    state = _state.get()
+    bind_state(None)
+    try:
+        profile_id = _save(profiler, wall, state, response.status_code)
+        response.headers['X-Profile-Id'] = profile_id
+    except Exception as e:
+        current_app.logger.error(f'Failed to save request profile: {e}')
+    finally:
+        _active.release()
+    return response
+
+
+def _teardown_request(exception):
+    # Release the profiler if the request died before after_request ran
+    profiler = g.pop('_profile', None)
+    if profiler is not None:
+        profiler.disable()
+        bind_state(None)
+        _active.release()
+
+
+def _top_functions(stats, limit):
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{name} ({os.path.basename(filename)}:{line})',
+            'calls': calls,
+            'own_ms': round(own * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3)
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+def _save(profiler, wall, state, status):
+    directory = current_app.config['PROFILE_DIR']
+    os.makedirs(directory, exist_ok=True)
+
+    endpoint = (request.endpoint or 'unmatched').replace('.', '-')
+    profile_id = f'{datetime.now():%Y%m%d-%H%M%S}-{endpoint}-{uuid.uuid4().hex[:6]}'
+    profiler.dump_stats(os.path.join(directory, f'{profile_id}.prof'))
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    db_ms = state['db_seconds'] * 1000
+    metadata = {
+        'profile_id': profile_id,
+        'created_at': datetime.now().isoformat(),
+        'method': request.method,
+        'route': request.url_rule.rule if request.url_rule else None,
+        'path': request.path,
+        'view_args': request.view_args or {},
+        'query_params': {k: v for k, v in request.args.items() if k != 'profile'},
+        'status_code': status,
+        'wall_ms': round(wall * 1000, 3),
+        'db_ms': round(db_ms, 3),
+        'python_ms': round(max(wall * 1000 - db_ms, 0), 3),
+        'queries': state['queries'],
+        'top_functions': _top_functions(stats, TOP_FUNCTIONS)
+    }
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w') as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+    _prune(directory, current_app.config['PROFILE_MAX_FILES'])
+    return profile_id
+
+
+def _prune(directory, keep):
+    """Delete the oldest profiles beyond `keep`."""
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for profile_id in ids[:-keep] if keep > 0 else []:
+        for suffix in ('.json', '.prof'):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except OSError:
+                pass
+
+
+def list_profiles(directory, route=None, limit=100):
+    """Metadata of stored profiles, newest first, without the function tables."""
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if route and route not in (metadata.get('route') or ''):
+            continue
+        metadata.pop('top_functions', None)
+        profiles.append(metadata)
+        if len(profiles) >= limit:
+            break
+    return profiles
+
+
+def profile_paths(directory, profile_id):
+    """(json path, prof path) for a profile id, or None for ids that are not ours."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    json_path = os.path.join(directory, f'{profile_id}.json')
+    if not os.path.exists(json_path):
+        return None
+    return json_path, os.path.join(directory, f'{profile_id}.prof')
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    add_query_listener(_on_query)
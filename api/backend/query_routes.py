@@ -0,0 +1,79 @@
+"""GET routes written once and served by either the Flask or the ASGI app.
+
+A query route is a generator. It is given the query string arguments (a
+werkzeug MultiDict, so `args.get('team_id', type=int)` works as with
+request.args) plus the URL variables. It yields a Query whenever it needs
+rows, or a {name: Query} dict to run several at once, receives the rows
+back from the yield, and finally returns (payload, status):
+
+    @query_route(analytics, '/season-summaries')
+    def get_season_summaries(args):
+        entity_id = args.get('entity_id', type=int)
+        summary = yield Query(summary_sql, (entity_id,), one=True)
+        return {'summary': summary}, 200
+
+Under Flask, run_sync answers the yields on the request's connection (dicts
+go through fan_out). backend.asgi answers the same yields on an aiomysql
+pool, so slow aggregates wait on MySQL without holding a thread. The URL,
+the payload and its JSON encoding are identical either way. A statement that
+fails is raised inside the generator at its yield, so the route's own
+try/except produces its usual error response. Routes must not touch
+`request` or `db` directly: neither exists on the async path.
+"""
+
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+
+from backend.db_connection import db
+from backend.fanout import fan_out
+
+# Flask endpoint name -> generator function, served natively by backend.asgi
+ROUTES = {}
+
+
+def query_route(blueprint, rule):
+    """Register a query-yielding generator as a GET route on a blueprint."""
+    def register(handler):
+        @wraps(handler)
+        def view(**view_args):
+            return run_sync(handler, request.args, **view_args)
+
+        blueprint.add_url_rule(rule, view_func=view, methods=['GET'])
+        ROUTES[f'{blueprint.name}.{handler.__name__}'] = handler
+        return view
+    return register
+
+
+def run_sync(handler, args, **view_args):
+    """Drive a query route to completion on this request's connection."""
+    steps = handler(args, **view_args)
+    cursor = None
+    try:
+        step = next(steps)
+        while True:
+            try:
+                if isinstance(step, dict):
+                    rows = fan_out(step)
+                else:
+                    if cursor is None:
+                        cursor = db.get_db().cursor()
+                    rows = _fetch(cursor, step)
+            except Exception as e:
+                step = steps.throw(e)
+            else:
+                step = steps.send(rows)
+    except StopIteration as done:
+        payload, status = done.value
+        return make_response(jsonify(payload), status)
+
+
+def _fetch(cursor, query):
+    try:
+        cursor.execute(query.sql, query.params)
+        return cursor.fetchone() if query.one else cursor.fetchall()
+    except Exception as e:
+        if not query.optional:
+            raise
+        current_app.logger.warning(f'Optional query failed: {e}')
+        return None
@@ -0,0 +1,78 @@
+"""Per-fingerprint statistics of the statements this process executes.
+
+Fed by a query listener: each statement template is reduced to its
+fingerprint (see db_connection.fingerprint) and counted with its total, max
+and error count. Templates repeat, so fingerprints are memoised per template
+string. Served by GET /system/query-stats and used as the workload for the
+index advisor.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from backend.db_connection import add_query_listener
+from backend.db_connection.fingerprint import fingerprint, normalize
+
+MAX_FINGERPRINTS = 2000
+MAX_MEMO = 5000
+
+_lock = threading.Lock()
+_stats = {}
+_memo = {}
+_started_at = datetime.now()
+
+
+def _identify(sql):
+    key = _memo.get(sql)
+    if key is None:
+        key = (fingerprint(sql), normalize(sql))
+        if len(_memo) < MAX_MEMO:
+            _memo[sql] = key
+    return key
+
+
+def _on_query(sql, duration, error):
+    fp, text = _identify(sql)
+    ms = duration * 1000
+    with _lock:
+        entry = _stats.get(fp)
+        if entry is None:
+            if len(_stats) >= MAX_FINGERPRINTS:
+                return
+            entry = _stats[fp] = {'fingerprint': fp, 'sql': text, 'count': 0, 'errors': 0,
+                                  'total_ms': 0.0, 'max_ms': 0.0, 'last_seen': None}
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['max_ms'] = max(entry['max_ms'], ms)
+        entry['last_seen'] = time.time()
+        if error is not None:
+            entry['errors'] += 1
+
+
+def snapshot(order_by='total_ms', limit=None):
+    """Fingerprint stats, most expensive first."""
+    with _lock:
+        rows = [dict(entry) for entry in _stats.values()]
+    for row in rows:
+        row['avg_ms'] = round(row['total_ms'] / row['count'], 3) if row['count'] else 0.0
+        row['total_ms'] = round(row['total_ms'], 3)
+        row['max_ms'] = round(row['max_ms'], 3)
+        row['last_seen'] = datetime.fromtimestamp(row['last_seen']).isoformat() if row['last_seen'] else None
+    rows.sort(key=lambda row: row.get(order_by) or 0, reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def collecting_since():
+    return _started_at
+
+
+def reset():
+    global _started_at
+    with _lock:
+        _stats.clear()
+        _started_at = datetime.now()
+
+
+def init_app(app):
+    add_query_listener(_on_query)
@@ -1,57 +1,79 @@
 """Flask REST API entry point and application factory."""
 
+import time
+
+# Startup phase 'imports' covers everything imported below, blueprints included
+_IMPORTS_STARTED = time.perf_counter()
+
 from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
-import time
 import logging
 import pymysql
 
 # Database connection
 from backend.db_connection import db
 
+# Metrics and background maintenance jobs
+from backend import coalescing, columnar, compression, etags, json_provider, metrics, profiling, query_stats, startup, tracing
+from backend.scheduler import scheduler
+from backend.admin.log_partitions import run_partition_maintenance
+from backend.admin.data_loads import process_due_retries
+from backend.admin.health import sample_health
+
 # Blueprints
 from backend.basketball.basketball_routes import basketball
 from backend.analytics.analytics_routes import analytics
 from backend.strategy.strategy_routes import strategy
 from backend.admin.admin_routes import admin
 from backend.auth.auth_routes import auth
+from backend.pages.page_routes import pages
+from backend.batch.batch_routes import batch
 from backend.personas.superfan_routes import superfan
 from backend.personas.data_engineer_routes import data_engineer
 from backend.personas.coach_routes import coach
 from backend.personas.gm_routes import gm
 
 
-def wait_for_db(app, max_retries=30, retry_delay=2):
-    """Wait for database to be ready before starting the application."""
-    db_config = {
-        'host': app.config.get('MYSQL_DATABASE_HOST', 'db'),
-        'port': app.config.get('MYSQL_DATABASE_PORT', 3306),
-        'user': app.config.get('MYSQL_DATABASE_USER', 'root'),
-        'password': app.config.get('MYSQL_DATABASE_PASSWORD', ''),
-        'database': app.config.get('MYSQL_DATABASE_DB', 'BallWatch')
-    }
-    
-    for attempt in range(max_retries):
+_IMPORTS_MS = (time.perf_counter() - _IMPORTS_STARTED) * 1000
+
+
+def wait_for_db(app, max_wait=None, initial_delay=0.25, max_delay=5.0):
+    """Wait for the database to accept connections, retrying with exponential
+    backoff (initial_delay doubling up to max_delay) for at most max_wait
+    seconds (DB_WAIT_TIMEOUT)."""
+    if max_wait is None:
+        max_wait = app.config['DB_WAIT_TIMEOUT']
+    deadline = time.monotonic() + max_wait
+    delay = initial_delay
+    attempt = 0
+
+    while True:
+        attempt += 1
         try:
-            # Try to connect to MySQL
             connection = pymysql.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['database']
+                host=app.config.get('MYSQL_DATABASE_HOST', 'db'),
+                port=app.config.get('MYSQL_DATABASE_PORT', 3306),
+                user=app.config.get('MYSQL_DATABASE_USER', 'root'),
+                password=app.config.get('MYSQL_DATABASE_PASSWORD', ''),
+                database=app.config.get('MYSQL_DATABASE_DB', 'BallWatch'),
+                connect_timeout=max(1, min(5, int(deadline - time.monotonic())))
             )
             connection.close()
-            app.logger.info(f"✅ Database connection successful on attempt {attempt + 1}")
+            app.logger.info(f"✅ Database connection successful on attempt {attempt}")
             return True
         except Exception as e:
-            app.logger.warning(f"🔄 Database connection attempt {attempt + 1}/{max_retries} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-    
-    app.logger.error("❌ Failed to connect to database after all retries")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                app.logger.warning(f"🔄 Database connection attempt {attempt} failed: {e}")
+                break
+            app.logger.warning(f"🔄 Database connection attempt {attempt} failed: {e}; "
+                               f"retrying in {min(delay, remaining):.2f}s")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    app.logger.error(f"❌ Failed to connect to database within {max_wait}s")
     return False
 
 
@@ -60,28 +82,75 @@ def create_app():
     app = Flask(__name__)
     # Enable CORS for Streamlit (default 8501) and localhost development
     CORS(app, resources={r"/*": {"origins": ["http://localhost:8501", "http://127.0.0.1:8501", "*"]}})
-    
+    startup.record_phase(app, 'imports', _IMPORTS_MS)
+
     # Load environment configuration
-    load_dotenv()
-    _configure_app(app)
+    with startup.phase(app, 'configure'):
+        load_dotenv()
+        _configure_app(app)
+        json_provider.init_app(app)
+        if app.config['COLUMNAR_ENABLED']:
+            columnar.init_app(app)
     
     # Wait for database to be ready
-    if not wait_for_db(app):
-        app.logger.error("Cannot start application without database connection")
-        # Continue anyway for development, but log the error
+    with startup.phase(app, 'wait_for_db'):
+        if not wait_for_db(app):
+            app.logger.error("Cannot start application without database connection")
+            # Continue anyway for development, but log the error
     
     # Initialize database connection
-    _initialize_database(app)
+    with startup.phase(app, 'database'):
+        _initialize_database(app)
     
     # Register API blueprints
-    _register_blueprints(app)
+    with startup.phase(app, 'blueprints'):
+        _register_blueprints(app)
+        if app.config['COALESCE_ENABLED']:
+            coalescing.init_app(app)
+
+    # Registered ahead of the instrumentation's after_request hooks, so it runs after them
+    if app.config['COMPRESSION_ENABLED']:
+        compression.init_app(app)
+
+    # Request tracing, metrics, profiling, statement stats and ETags
+    with startup.phase(app, 'instrumentation'):
+        if app.config['TRACING_ENABLED']:
+            tracing.init_app(app)
+        if app.config['METRICS_ENABLED']:
+            metrics.init_app(app, db, scheduler)
+        if app.config['PROFILING_ENABLED']:
+            profiling.init_app(app)
+        if app.config['QUERY_STATS_ENABLED']:
+            query_stats.init_app(app)
+        # After the others' before_request hooks, which a 304 short-circuits
+        if app.config['ETAGS_ENABLED']:
+            etags.init_app(app)
     
     # Log application setup completion
     _log_startup_info(app)
+
+    # Under a pre-forking server (gunicorn.conf.py) the app is built in the
+    # master and threads started here would not survive fork
+    if app.config['DEFER_WORKER_START']:
+        app.logger.info('⏸ Background jobs and warm-up deferred to the worker processes')
+    else:
+        start_worker(app)
     
     return app
 
 
+def start_worker(app):
+    """Start the periodic jobs and warm-up in the serving process."""
+    with startup.phase(app, 'background_jobs'):
+        _start_background_jobs(app)
+
+    # Report ready once warmed up (or right away without warm-up)
+    if app.config['WARMUP_ENABLED']:
+        startup.start_warmup(app)
+    else:
+        startup.mark_ready(app)
+
+
 def _configure_app(app):
     """Configure Flask application settings."""
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
@@ -92,6 +161,96 @@ def _configure_app(app):
     app.config['MYSQL_DATABASE_HOST'] = os.getenv('DB_HOST', 'db').strip()  # Use 'db' for Docker
     app.config['MYSQL_DATABASE_PORT'] = int(os.getenv('DB_PORT', '3306').strip())
     app.config['MYSQL_DATABASE_DB'] = os.getenv('DB_NAME', 'BallWatch').strip()
+    app.config['MYSQL_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', '10'))
+    app.config['MYSQL_POOL_TIMEOUT'] = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+    app.config['DB_WAIT_TIMEOUT'] = float(os.getenv('DB_WAIT_TIMEOUT', '60'))
+
+    # Concurrent independent queries in composite endpoints (backend/fanout.py)
+    app.config['FANOUT_MAX_WORKERS'] = int(os.getenv('FANOUT_MAX_WORKERS', '16'))
+    app.config['FANOUT_DEADLINE_SECONDS'] = float(os.getenv('FANOUT_DEADLINE_SECONDS', '10'))
+
+    # aiomysql connections per process for the routes backend/asgi.py serves natively
+    app.config['ASYNC_DB_POOL_SIZE'] = int(os.getenv('ASYNC_DB_POOL_SIZE', '20'))
+
+    # Warm-up before /system/ready reports ready: pool connections, team list and rosters
+    app.config['WARMUP_ENABLED'] = os.getenv('WARMUP_ENABLED', 'false').lower() == 'true'
+    app.config['WARMUP_POOL_CONNECTIONS'] = int(os.getenv('WARMUP_POOL_CONNECTIONS', '4'))
+    app.config['WARMUP_MAX_TEAMS'] = int(os.getenv('WARMUP_MAX_TEAMS', '50'))
+    app.config['WARMUP_PATHS'] = [p.strip() for p in os.getenv('WARMUP_PATHS', '').split(',') if p.strip()]
+
+    # Response encoding (backend/json_provider.py): auto | orjson | stdlib, http | iso dates
+    app.config['JSON_PROVIDER'] = os.getenv('JSON_PROVIDER', 'auto').strip().lower()
+    app.config['JSON_DATE_FORMAT'] = os.getenv('JSON_DATE_FORMAT', 'http').strip().lower()
+
+    # Arrow IPC / MessagePack list responses for clients that ask for them (backend/columnar.py)
+    app.config['COLUMNAR_ENABLED'] = os.getenv('COLUMNAR_ENABLED', 'true').lower() == 'true'
+
+    # Opt-in gzip/brotli for responses of at least COMPRESS_MIN_BYTES
+    app.config['COMPRESSION_ENABLED'] = os.getenv('COMPRESSION_ENABLED', 'false').lower() == 'true'
+    app.config['COMPRESS_MIN_BYTES'] = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+    app.config['COMPRESS_GZIP_LEVEL'] = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    app.config['COMPRESS_BROTLI_QUALITY'] = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+
+    # Request/DB metrics served at /system/metrics
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Request tracing: ids in logs and SQL comments, recent traces at /system/traces
+    app.config['TRACING_ENABLED'] = os.getenv('TRACING_ENABLED', 'true').lower() == 'true'
+    app.config['TRACE_BUFFER_SIZE'] = int(os.getenv('TRACE_BUFFER_SIZE', '500'))
+    app.config['TRACE_SQL_COMMENTS'] = os.getenv('TRACE_SQL_COMMENTS', 'true').lower() == 'true'
+
+    # Per-fingerprint statement stats at /system/query-stats, the index advisor's workload
+    app.config['QUERY_STATS_ENABLED'] = os.getenv('QUERY_STATS_ENABLED', 'true').lower() == 'true'
+
+    # POST /batch: calls per batch, and threads running a batch's GETs concurrently
+    app.config['BATCH_MAX_REQUESTS'] = int(os.getenv('BATCH_MAX_REQUESTS', '50'))
+    app.config['BATCH_MAX_WORKERS'] = int(os.getenv('BATCH_MAX_WORKERS', '4'))
+
+    # Single-flight: identical concurrent GETs to these endpoints (fnmatch patterns) share one run
+    app.config['COALESCE_ENABLED'] = os.getenv('COALESCE_ENABLED', 'true').lower() == 'true'
+    app.config['COALESCE_ENDPOINTS'] = tuple(
+        p.strip() for p in os.getenv(
+            'COALESCE_ENDPOINTS', 'analytics.*,strategy.get_*,pages.*,admin.get_system_health').split(',')
+        if p.strip())
+    app.config['COALESCE_TIMEOUT'] = float(os.getenv('COALESCE_TIMEOUT', '10'))
+
+    # Live game streams (/basketball/games/<id>/live): TableVersions check interval for writes
+    # from other processes, keep-alive interval, and streams per process
+    app.config['LIVE_POLL_SECONDS'] = float(os.getenv('LIVE_POLL_SECONDS', '2'))
+    app.config['LIVE_HEARTBEAT_SECONDS'] = float(os.getenv('LIVE_HEARTBEAT_SECONDS', '15'))
+    app.config['LIVE_MAX_WATCHERS'] = int(os.getenv('LIVE_MAX_WATCHERS', '1000'))
+
+    # Conditional GETs: ETags from TableVersions, read on every GET unless cached for ETAG_VERSIONS_TTL seconds
+    app.config['ETAGS_ENABLED'] = os.getenv('ETAGS_ENABLED', 'true').lower() == 'true'
+    app.config['ETAG_VERSIONS_TTL'] = float(os.getenv('ETAG_VERSIONS_TTL', '0'))
+    app.config['ETAG_EXCLUDE_PREFIXES'] = tuple(
+        p.strip() for p in os.getenv('ETAG_EXCLUDE_PREFIXES', '/system,/auth').split(',') if p.strip())
+
+    # Opt-in per-request profiling (X-Profile: 1 or ?profile=1)
+    app.config['PROFILING_ENABLED'] = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    app.config['PROFILING_TOKEN'] = os.getenv('PROFILING_TOKEN', '').strip() or None
+    app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', profiling.DEFAULT_PROFILE_DIR)
+    app.config['PROFILE_MAX_FILES'] = int(os.getenv('PROFILE_MAX_FILES', '200'))
+
+    # Set by gunicorn.conf.py: background jobs and warm-up start per worker after fork
+    app.config['DEFER_WORKER_START'] = os.getenv('DEFER_WORKER_START', 'false').lower() == 'true'
+    if app.config['DEFER_WORKER_START']:
+        # Under gunicorn each live stream holds one of the worker's GUNICORN_THREADS: leave one for
+        # everything else, so extra watchers get 503 rather than starving the worker
+        threads = int(os.getenv('GUNICORN_THREADS', '4'))
+        app.config['LIVE_MAX_WATCHERS'] = min(app.config['LIVE_MAX_WATCHERS'], max(threads - 1, 0))
+
+    # SystemLogs partition retention
+    app.config['BACKGROUND_JOBS_ENABLED'] = os.getenv('BACKGROUND_JOBS_ENABLED', 'true').lower() == 'true'
+    app.config['LOG_RETENTION_DAYS'] = int(os.getenv('LOG_RETENTION_DAYS', '90'))
+    app.config['LOG_PARTITION_MONTHS_AHEAD'] = int(os.getenv('LOG_PARTITION_MONTHS_AHEAD', '3'))
+    app.config['LOG_PARTITION_MAINTENANCE_INTERVAL'] = int(os.getenv('LOG_PARTITION_MAINTENANCE_INTERVAL', '21600'))
+
+    # Failed data load retries
+    app.config['DATA_LOAD_RETRY_INTERVAL'] = int(os.getenv('DATA_LOAD_RETRY_INTERVAL', '15'))
+
+    # Seconds between /system/health snapshots
+    app.config['HEALTH_SAMPLE_INTERVAL'] = int(os.getenv('HEALTH_SAMPLE_INTERVAL', '15'))
 
 
 def _initialize_database(app):
@@ -115,6 +274,8 @@ def _register_blueprints(app):
         (strategy, '/strategy', 'Game Plans & Draft Evaluations'),
         (admin, '/system', 'System Administration'),
         (auth, '/auth', 'Authentication & User Management'),
+        (pages, '/pages', 'Page Data (one request per page render)'),
+        (batch, '/batch', 'Batched API Calls'),
         # Persona-oriented prefixes (lightweight proxies)
         (superfan, '/superfan', 'Superfan features'),
         (data_engineer, '/data-engineer', 'Data Engineer features'),
@@ -127,11 +288,42 @@ def _register_blueprints(app):
         app.logger.info(f'  ✔ {blueprint.name} ({prefix}): {description}')
 
 
+def _start_background_jobs(app):
+    """Register and start periodic maintenance jobs."""
+    if not app.config.get('BACKGROUND_JOBS_ENABLED'):
+        app.logger.info('⏸ Background jobs disabled (BACKGROUND_JOBS_ENABLED=false)')
+        return
+
+    app.logger.info('⏱ Starting background jobs...')
+    scheduler.add_job(
+        'log_partition_maintenance',
+        run_partition_maintenance,
+        app.config['LOG_PARTITION_MAINTENANCE_INTERVAL']
+    )
+    scheduler.add_job(
+        'data_load_retries',
+        process_due_retries,
+        app.config['DATA_LOAD_RETRY_INTERVAL']
+    )
+    scheduler.add_job(
+        'health_snapshot',
+        sample_health,
+        app.config['HEALTH_SAMPLE_INTERVAL']
+    )
+    # One process runs the jobs, whatever the number of workers (advisory locks are
+    # server-wide, so the name includes the database)
+    scheduler.start(app, connect=db.new_connection,
+                    lock_name=f"ballwatch_scheduler_{app.config['MYSQL_DATABASE_DB']}")
+
+
 def _log_startup_info(app):
     """Log application startup information."""
     app.logger.info('=' * 60)
     app.logger.info('🏀 BALLWATCH BASKETBALL ANALYTICS API')
     app.logger.info('🚀 Server Ready!')
+    phases = startup.status()['phases']
+    app.logger.info('⏱ Startup: ' + ', '.join(f"{p['phase']} {p['ms']:,.0f} ms" for p in phases)
+                    + f" (total {sum(p['ms'] for p in phases):,.0f} ms)")
     app.logger.info('=' * 60)
 
 
@@ -0,0 +1,149 @@
+"""Lightweight in-process scheduler for periodic maintenance jobs.
+
+Each job runs on its own daemon thread inside an application context, so job
+functions can use `db.get_db()` exactly like route handlers do.
+
+Started with a lock name, the jobs only run in the process holding that MySQL
+advisory lock (GET_LOCK on a connection of its own), so gunicorn's workers and
+the dev server's reloader run each job once rather than once per process. The
+other processes retry every LEADER_CHECK_SECONDS and take over when the holder
+exits (or its connection drops, which releases the lock). Jobs should still be
+idempotent: a takeover can repeat a run the previous holder was in the middle of.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+LEADER_CHECK_SECONDS = 15
+
+
+class PeriodicJob:
+    """A function run every `interval_seconds`, with bookkeeping for monitoring."""
+
+    def __init__(self, name, func, interval_seconds, run_at_start=True):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.run_at_start = run_at_start
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at = None
+        self.last_duration_ms = None
+        self.last_error = None
+        self.last_result = None
+
+    def run_once(self, app):
+        self.last_started_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            with app.app_context():
+                self.last_result = self.func()
+            self.last_error = None
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            app.logger.error(f'Background job {self.name} failed: {e}')
+        finally:
+            self.runs += 1
+            self.last_duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    def status(self):
+        return {
+            'name': self.name,
+            'interval_seconds': self.interval_seconds,
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_duration_ms': self.last_duration_ms,
+            'last_error': self.last_error
+        }
+
+
+class BackgroundScheduler:
+    """Owns the periodic jobs and their threads."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._threads = []
+        self._stop = threading.Event()
+
+    def add_job(self, name, func, interval_seconds, run_at_start=True):
+        job = PeriodicJob(name, func, interval_seconds, run_at_start)
+        self._jobs[name] = job
+        return job
+
+    def get_job(self, name):
+        return self._jobs.get(name)
+
+    def start(self, app, connect=None, lock_name=None):
+        """Start one daemon thread per registered job; with `connect` (opening a
+        connection outside the pool) and `lock_name`, once this process holds the lock."""
+        self._stop.clear()
+        if connect is None:
+            self._start_jobs(app, self._stop)
+            return
+        thread = threading.Thread(
+            target=self._elect, args=(app, connect, lock_name), name='job-leader', daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def status(self):
+        return [job.status() for job in self._jobs.values()]
+
+    def _start_jobs(self, app, stop):
+        for job in self._jobs.values():
+            thread = threading.Thread(
+                target=self._loop, args=(app, job, stop), name=f'job-{job.name}', daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+            app.logger.info(f'  ⏱ {job.name}: every {job.interval_seconds}s')
+
+    def _loop(self, app, job, stop):
+        if not job.run_at_start and stop.wait(job.interval_seconds):
+            return
+        while not stop.is_set():
+            job.run_once(app)
+            if stop.wait(job.interval_seconds):
+                return
+
+    def _elect(self, app, connect, lock_name):
+        """Hold `lock_name` and run the jobs while holding it; otherwise keep retrying."""
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = connect()
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT GET_LOCK(%s, 0) AS acquired', (lock_name,))
+                    acquired = cursor.fetchone()['acquired'] == 1
+                if acquired:
+                    app.logger.info(f'⏱ Background jobs run in this process (holds {lock_name})')
+                    term = threading.Event()
+                    self._start_jobs(app, term)
+                    try:
+                        # A dropped connection has lost the lock: stop and contend again
+                        while not self._stop.wait(LEADER_CHECK_SECONDS):
+                            conn.ping(reconnect=False)
+                    finally:
+                        term.set()
+            except Exception as e:
+                app.logger.warning(f'Background job lock {lock_name} check failed: {e}')
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            self._stop.wait(LEADER_CHECK_SECONDS)
+
+
+# Shared scheduler instance, populated by create_app
+scheduler = BackgroundScheduler()
@@ -0,0 +1,113 @@
+"""Startup phase timings, warm-up and readiness.
+
+create_app times each startup phase; the timings are logged once the app is
+built and served by /system/ready. With WARMUP_ENABLED the app then warms up
+in a background thread before it reports ready: it opens
+WARMUP_POOL_CONNECTIONS pooled connections and replays the reference-data
+routes - the team list and each team's roster, plus any WARMUP_PATHS -
+through the test client. That loads their pages into the InnoDB buffer pool
+and fills whatever those routes cache.
+
+/system/live answers as soon as the process serves requests; /system/ready
+returns 503 until warm-up has finished, so a rolling restart only sends
+traffic to warm processes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.db_connection import db
+
+WARMUP_HEADERS = {'X-Trace-Page': 'warmup'}
+
+_lock = threading.Lock()
+_phases = []
+_state = {'ready': False, 'ready_after_ms': None, 'warmup': None}
+_started = time.perf_counter()
+
+
+def record_phase(app, name, ms):
+    with _lock:
+        _phases.append({'phase': name, 'ms': round(ms, 1)})
+    app.logger.info(f'⏱ Startup phase {name}: {ms:,.0f} ms')
+
+
+@contextmanager
+def phase(app, name):
+    """Time a block as a named startup phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(app, name, (time.perf_counter() - started) * 1000)
+
+
+def mark_ready(app):
+    with _lock:
+        _state['ready'] = True
+        _state['ready_after_ms'] = round((time.perf_counter() - _started) * 1000, 1)
+    app.logger.info(f"✅ Ready to serve after {_state['ready_after_ms']:,.0f} ms")
+
+
+def is_ready():
+    return _state['ready']
+
+
+def status():
+    """Readiness, startup phases and the warm-up summary."""
+    with _lock:
+        return {
+            'ready': _state['ready'],
+            'ready_after_ms': _state['ready_after_ms'],
+            'phases': list(_phases),
+            'warmup': dict(_state['warmup']) if _state['warmup'] else None
+        }
+
+
+def _warm_routes(app, summary):
+    client = app.test_client()
+
+    def get(path):
+        response = client.get(path, headers=WARMUP_HEADERS)
+        summary['requests'] += 1
+        if response.status_code >= 400:
+            summary['failed'].append(f'{path} -> {response.status_code}')
+        return response
+
+    teams = (get('/basketball/teams').get_json(silent=True) or {}).get('teams') or []
+    for team in teams[:app.config['WARMUP_MAX_TEAMS']]:
+        get(f"/basketball/teams/{team['team_id']}/players")
+    for path in app.config['WARMUP_PATHS']:
+        get(path)
+
+
+def warm_up(app):
+    """Open pooled connections and preload reference data, then mark the app ready."""
+    summary = {'status': 'running', 'pool_connections': 0, 'requests': 0, 'failed': []}
+    with _lock:
+        _state['warmup'] = summary
+    started = time.perf_counter()
+    try:
+        with phase(app, 'warmup_pool'):
+            summary['pool_connections'] = db.pool.prefill(app.config['WARMUP_POOL_CONNECTIONS'])
+        with phase(app, 'warmup_reference_data'):
+            _warm_routes(app, summary)
+        summary['status'] = 'completed'
+    except Exception as e:
+        # A failed warm-up must not keep the process out of rotation: /system/ready
+        # still checks the database itself
+        summary['status'] = 'failed'
+        summary['error'] = str(e)
+        app.logger.warning(f'Warm-up failed: {e}')
+    summary['ms'] = round((time.perf_counter() - started) * 1000, 1)
+    if summary['failed']:
+        app.logger.warning(f"Warm-up requests failed: {', '.join(summary['failed'])}")
+    mark_ready(app)
+
+
+def start_warmup(app):
+    """Warm up in the background; the process serves /system/live meanwhile."""
+    thread = threading.Thread(target=warm_up, args=(app,), name='warmup', daemon=True)
+    thread.start()
+    return thread
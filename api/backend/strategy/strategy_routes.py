@@ -2,6 +2,8 @@
 
 from flask import Blueprint, request, jsonify, make_response, current_app
 from backend.db_connection import db
+from backend.fanout import Query
+from backend.query_routes import query_route
 from datetime import datetime
 
 # Create the Strategy Blueprint
@@ -12,8 +14,8 @@ strategy = Blueprint('strategy', __name__)
 # GAME PLANNING & STRATEGY ROUTES
 # ============================================================================
 
-@strategy.route('/game-plans', methods=['GET'])
-def get_game_plans():
+@query_route(strategy, '/game-plans')
+def get_game_plans(args):
     """
     Get game strategies and tactical plans.
 
@@ -28,15 +30,13 @@ def get_game_plans():
     try:
         current_app.logger.info('GET /strategy/game-plans - Fetching strategic game plans')
 
-        team_id = request.args.get('team_id', type=int)
-        opponent_id = request.args.get('opponent_id', type=int)
-        game_id = request.args.get('game_id', type=int)
-        status = request.args.get('status')
+        team_id = args.get('team_id', type=int)
+        opponent_id = args.get('opponent_id', type=int)
+        game_id = args.get('game_id', type=int)
+        status = args.get('status')
 
         if not team_id:
-            return make_response(jsonify({"error": "team_id is required"}), 400)
-
-        cursor = db.get_db().cursor()
+            return {"error": "team_id is required"}, 400
 
         # Build comprehensive game plans query
         query = '''
@@ -79,8 +79,7 @@ def get_game_plans():
 
         query += ' ORDER BY gp.created_date DESC'
 
-        cursor.execute(query, params)
-        game_plans = cursor.fetchall()
+        game_plans = yield Query(query, params)
 
         response_data = {
             'game_plans': game_plans,
@@ -93,11 +92,11 @@ def get_game_plans():
             }
         }
 
-        return make_response(jsonify(response_data), 200)
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error fetching game plans: {e}')
-        return make_response(jsonify({"error": "Failed to fetch game plans"}), 500)
+        return {"error": "Failed to fetch game plans"}, 500
 
 
 @strategy.route('/game-plans', methods=['POST'])
@@ -264,8 +263,8 @@ def update_game_plan(plan_id):
 # DRAFT EVALUATION & SCOUTING ROUTES
 # ============================================================================
 
-@strategy.route('/draft-evaluations', methods=['GET'])
-def get_draft_evaluations():
+@query_route(strategy, '/draft-evaluations')
+def get_draft_evaluations(args):
     """
     Get player rankings and comprehensive draft evaluations.
 
@@ -281,13 +280,11 @@ def get_draft_evaluations():
     try:
         current_app.logger.info('GET /strategy/draft-evaluations - Fetching draft evaluations')
 
-        position = request.args.get('position')
-        min_age = request.args.get('min_age', type=int)
-        max_age = request.args.get('max_age', type=int)
-        college = request.args.get('college')
-        evaluation_type = request.args.get('evaluation_type')
-
-        cursor = db.get_db().cursor()
+        position = args.get('position')
+        min_age = args.get('min_age', type=int)
+        max_age = args.get('max_age', type=int)
+        college = args.get('college')
+        evaluation_type = args.get('evaluation_type')
 
         # Get comprehensive player evaluations with performance data
         query = '''
@@ -357,8 +354,7 @@ def get_draft_evaluations():
             ORDER BY de.overall_rating DESC
         '''
 
-        cursor.execute(query, params)
-        evaluations = cursor.fetchall()
+        evaluations = yield Query(query, params)
 
         response_data = {
             'evaluations': evaluations,
@@ -371,11 +367,11 @@ def get_draft_evaluations():
             }
         }
 
-        return make_response(jsonify(response_data), 200)
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error fetching draft evaluations: {e}')
-        return make_response(jsonify({"error": "Failed to fetch draft evaluations"}), 500)
+        return {"error": "Failed to fetch draft evaluations"}, 500
 
 
 @strategy.route('/draft-evaluations', methods=['POST'])
@@ -612,8 +608,8 @@ def delete_draft_evaluation(evaluation_id):
         return make_response(jsonify({"error": "Failed to delete draft evaluation"}), 500)
 
 
-@strategy.route('/contract-analysis', methods=['GET'])
-def get_contract_analysis():
+@query_route(strategy, '/contract-analysis')
+def get_contract_analysis(args):
     """
     Get contract efficiency analysis for roster management.
 
@@ -627,11 +623,9 @@ def get_contract_analysis():
     try:
         current_app.logger.info('GET /strategy/contract-analysis - Analyzing contract efficiency')
 
-        team_id = request.args.get('team_id', type=int)
-        position = request.args.get('position')
-        min_salary = request.args.get('min_salary', type=float)
-
-        cursor = db.get_db().cursor()
+        team_id = args.get('team_id', type=int)
+        position = args.get('position')
+        min_salary = args.get('min_salary', type=float)
 
         # Get contract efficiency metrics
         query = '''
@@ -678,8 +672,7 @@ def get_contract_analysis():
             ORDER BY production_per_million DESC
         '''
 
-        cursor.execute(query, params)
-        contract_analysis = cursor.fetchall()
+        contract_analysis = yield Query(query, params)
 
         response_data = {
             'contract_analysis': contract_analysis,
@@ -691,8 +684,8 @@ def get_contract_analysis():
             }
         }
 
-        return make_response(jsonify(response_data), 200)
+        return response_data, 200
 
     except Exception as e:
         current_app.logger.error(f'Error analyzing contracts: {e}')
-        return make_response(jsonify({"error": "Failed to analyze contracts"}), 500)
\ No newline at end of file
+        return {"error": "Failed to analyze contracts"}, 500
\ No newline at end of file
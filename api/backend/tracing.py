@@ -0,0 +1,209 @@
+"""Request tracing from the Streamlit client through Flask to SQL.
+
+Every request gets a request id (the client's `X-Request-ID`, or a new one)
+and belongs to a trace (`X-Trace-ID`, shared by all calls of one Streamlit
+page run, with the page name in `X-Trace-Page`). The ids are
+
+  * echoed back in the `X-Request-ID` response header,
+  * added to every log record as `trace_id` / `request_id`,
+  * prepended to every SQL statement as `/* trace_id=... request_id=... */`
+    so they show up in the MySQL slow log and processlist, and
+  * attached to a span recorded for each statement.
+
+Responses also carry `Server-Timing: app;dur=..., db;dur=...` so the
+Streamlit timing panel can tell server time from network and parsing time.
+
+Finished requests are kept in an in-memory ring buffer of the last
+TRACE_BUFFER_SIZE traces per process, served by /system/traces.
+
+The routes backend/asgi.py serves natively are traced the same way through
+start_trace, response_headers and record_trace.
+"""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+
+from flask import g, request
+from flask.logging import default_handler
+
+from backend.db_connection import add_query_listener, set_statement_comment
+
+MAX_SPANS = 200
+MAX_SQL_LENGTH = 2000
+LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s [trace=%(trace_id)s req=%(request_id)s]: %(message)s'
+
+_UNSAFE = re.compile(r'[^\w.:-]')
+_WHITESPACE = re.compile(r'\s+')
+
+# A context variable rather than a thread-local: ASGI requests share the event loop's thread
+_trace = ContextVar('trace', default=None)
+_lock = threading.Lock()
+_traces = deque(maxlen=500)
+
+
+def _clean_id(value, limit=64):
+    """Header values end up in SQL comments and logs: keep them short and inert."""
+    return _UNSAFE.sub('', value or '')[:limit] or None
+
+
+def current_trace():
+    """The trace of the current request, or None."""
+    return _trace.get()
+
+
+def bind_trace(trace):
+    """Attribute this thread's statements to `trace` (e.g. a fan-out worker
+    running queries for a request); bind None when done."""
+    _trace.set(trace)
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds trace_id and request_id to every log record."""
+
+    def filter(self, record):
+        trace = current_trace()
+        record.trace_id = trace['trace_id'] if trace else '-'
+        record.request_id = trace['request_id'] if trace else '-'
+        return True
+
+
+def _statement_comment():
+    trace = current_trace()
+    if trace is None:
+        return None
+    return f"trace_id={trace['trace_id']} request_id={trace['request_id']}"
+
+
+def _on_query(sql, duration, error):
+    trace = current_trace()
+    if trace is None:
+        return
+    if len(trace['spans']) >= MAX_SPANS:
+        trace['dropped_spans'] += 1
+    else:
+        text = _WHITESPACE.sub(' ', sql if isinstance(sql, str) else str(sql)).strip()
+        started = time.perf_counter() - duration - trace['_started']
+        trace['spans'].append({
+            'sql': text[:MAX_SQL_LENGTH],
+            'start_ms': round(started * 1000, 3),
+            'duration_ms': round(duration * 1000, 3),
+            'error': str(error) if error else None
+        })
+    trace['db_ms'] += duration * 1000
+
+
+def start_trace(headers, method, path, query_string):
+    """Start and bind the trace of a request with these headers (case-insensitive mapping)."""
+    request_id = _clean_id(headers.get('X-Request-ID')) or uuid.uuid4().hex[:16]
+    trace = {
+        'trace_id': _clean_id(headers.get('X-Trace-ID')) or request_id,
+        'request_id': request_id,
+        'page': _clean_id(headers.get('X-Trace-Page'), 100),
+        'method': method,
+        'path': path,
+        'query_string': query_string[:500],
+        'started_at': datetime.now().isoformat(),
+        'spans': [],
+        'dropped_spans': 0,
+        'db_ms': 0.0,
+        '_started': time.perf_counter()
+    }
+    bind_trace(trace)
+    return trace
+
+
+def response_headers(trace):
+    """X-Request-ID and Server-Timing for the response of `trace`."""
+    app_ms = (time.perf_counter() - trace['_started']) * 1000
+    return {
+        'X-Request-ID': trace['request_id'],
+        'Server-Timing': f"app;dur={app_ms:.1f}, db;dur={trace['db_ms']:.1f}"
+    }
+
+
+def record_trace(trace, route, exception=None):
+    """Close a finished request's trace and keep it in the buffer."""
+    trace['duration_ms'] = round((time.perf_counter() - trace.pop('_started')) * 1000, 3)
+    trace['db_ms'] = round(trace['db_ms'], 3)
+    trace['queries'] = len(trace['spans']) + trace['dropped_spans']
+    trace['route'] = route
+    trace.setdefault('status_code', 500)
+    if exception is not None:
+        trace['error'] = str(exception)
+    with _lock:
+        _traces.append(trace)
+
+
+def _before_request():
+    trace = start_trace(request.headers, request.method, request.path,
+                        request.query_string.decode('utf-8', 'replace'))
+    g.request_id = trace['request_id']
+
+
+def _after_request(response):
+    trace = current_trace()
+    if trace is not None:
+        response.headers.update(response_headers(trace))
+        trace['status_code'] = response.status_code
+    return response
+
+
+def _teardown_request(exception):
+    trace = current_trace()
+    bind_trace(None)
+    if trace is None or request.path.startswith('/system/traces'):
+        return
+    record_trace(trace, request.url_rule.rule if request.url_rule else None, exception)
+
+
+def _summary(trace):
+    return {k: v for k, v in trace.items() if k != 'spans'}
+
+
+def recent_traces(limit=100, trace_id=None, page=None, min_duration_ms=None):
+    """Newest-first summaries (without spans) of buffered requests."""
+    with _lock:
+        traces = list(_traces)
+    out = []
+    for trace in reversed(traces):
+        if trace_id and trace['trace_id'] != trace_id:
+            continue
+        if page and page not in (trace.get('page') or ''):
+            continue
+        if min_duration_ms is not None and trace['duration_ms'] < min_duration_ms:
+            continue
+        out.append(_summary(trace))
+        if len(out) >= limit:
+            break
+    return out
+
+
+def get_trace(request_id):
+    """A buffered request with its SQL spans, or None."""
+    with _lock:
+        for trace in reversed(_traces):
+            if trace['request_id'] == request_id:
+                return trace
+    return None
+
+
+def init_app(app):
+    global _traces
+    with _lock:
+        _traces = deque(_traces, maxlen=app.config['TRACE_BUFFER_SIZE'])
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    add_query_listener(_on_query)
+    if app.config['TRACE_SQL_COMMENTS']:
+        set_statement_comment(_statement_comment)
+
+    default_handler.addFilter(TraceContextFilter())
+    default_handler.setFormatter(logging.Formatter(LOG_FORMAT))
@@ -0,0 +1,346 @@
+"""Persona traffic-mix load generator.
+
+Replays scripted user sessions against a running API over HTTP:
+
+  superfan       searches players by position, opens a player's stats and
+                 compares two players
+  coach          pulls an opponent report, lineup configurations and
+                 situational performance for their team
+  gm             browses draft evaluations by position and age band and
+                 reviews contract analysis
+  data_engineer  polls system health, error logs, data loads and validation
+
+Sessions arrive as a Poisson process at --arrival-rate sessions per second
+and are served by --concurrency workers; when every worker is busy new
+sessions queue, and the time they wait is reported separately from request
+latency. The persona mix is a preset (--mix gamenight) or explicit weights
+(--mix superfan=4,coach=4,gm=1,data_engineer=1).
+
+Run from the api/ directory against a seeded database:
+    python -m bench.load_gen --base-url http://localhost:4000 --mix gamenight \\
+        --arrival-rate 20 --concurrency 32 --duration 120 --output /tmp/gamenight.json
+"""
+
+import argparse
+import json
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+import numpy as np
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C']
+AGE_BANDS = [(19, 21), (22, 24), (25, 28), (29, 40)]
+
+MIX_PRESETS = {
+    'default': {'superfan': 0.5, 'coach': 0.2, 'gm': 0.2, 'data_engineer': 0.1},
+    # Game nights: coaches and fans hit the API together
+    'gamenight': {'superfan': 0.45, 'coach': 0.45, 'gm': 0.05, 'data_engineer': 0.05},
+    'offseason': {'superfan': 0.3, 'coach': 0.1, 'gm': 0.5, 'data_engineer': 0.1}
+}
+
+
+# ============================================================================
+# PERSONA SESSIONS
+# ============================================================================
+# Each session is a list of (step name, path, query params); steps run in
+# order with a think time between them.
+
+def superfan_session(rng, ctx):
+    first, second = rng.sample(ctx['player_ids'], 2)
+    steps = [('search_players', '/superfan/players', {'position': rng.choice(POSITIONS)})]
+    if rng.random() < 0.5:
+        low, high = rng.choice(AGE_BANDS)
+        steps.append(('search_players', '/superfan/players', {'min_age': low, 'max_age': high}))
+    steps += [
+        ('player_stats', f'/superfan/players/{first}/stats', {'season': ctx['season']}),
+        ('player_stats', f'/superfan/players/{second}/stats', {'season': ctx['season']}),
+        ('compare_players', '/superfan/player-comparisons',
+         {'player_ids': f'{first},{second}', 'season': ctx['season']})
+    ]
+    return steps
+
+
+def coach_session(rng, ctx):
+    team_id, opponent_id = rng.sample(ctx['team_ids'], 2)
+    return [
+        ('opponent_report', '/coach/opponent-reports', {'team_id': team_id, 'opponent_id': opponent_id}),
+        ('lineups', '/coach/lineup-configurations', {'team_id': team_id}),
+        ('situational', '/analytics/situational-performance', {'team_id': team_id, 'season': ctx['season']}),
+        ('opponent_report', '/coach/opponent-reports',
+         {'team_id': team_id, 'opponent_id': opponent_id, 'last_n_games': 5})
+    ]
+
+
+def gm_session(rng, ctx):
+    # The evaluation list is not paginated; GMs page through it by filters
+    steps = []
+    for position in rng.sample(POSITIONS, 3):
+        low, high = rng.choice(AGE_BANDS)
+        steps.append(('draft_evaluations', '/gm/draft-evaluations',
+                      {'position': position, 'min_age': low, 'max_age': high}))
+    steps.append(('contract_analysis', '/strategy/contract-analysis', {'team_id': rng.choice(ctx['team_ids'])}))
+    return steps
+
+
+def data_engineer_session(rng, ctx):
+    steps = []
+    for _ in range(3):
+        steps += [
+            ('health', '/system/health', {}),
+            ('error_logs', '/system/error-logs', {'days': 1}),
+            ('data_loads', '/system/data-loads', {})
+        ]
+    steps.append(('data_validation', '/data-engineer/data-validation', {'days': 7}))
+    return steps
+
+
+PERSONAS = {
+    'superfan': superfan_session,
+    'coach': coach_session,
+    'gm': gm_session,
+    'data_engineer': data_engineer_session
+}
+
+
+def parse_mix(value):
+    """'gamenight' or 'superfan=4,coach=4,gm=1' -> normalised {persona: weight}."""
+    if value in MIX_PRESETS:
+        weights = dict(MIX_PRESETS[value])
+    else:
+        weights = {}
+        for part in value.split(','):
+            name, _, weight = part.partition('=')
+            name = name.strip()
+            if name not in PERSONAS:
+                raise argparse.ArgumentTypeError(f'unknown persona {name!r}')
+            weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError('mix weights must be positive')
+    return {name: weight / total for name, weight in weights.items()}
+
+
+# ============================================================================
+# HTTP + RECORDING
+# ============================================================================
+
+class Recorder:
+    """Thread-safe collector of request and session outcomes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []   # (persona, step, started, latency_s, status)
+        self.sessions = []   # (persona, queue_wait_s, duration_s, ok)
+
+    def request(self, persona, step, started, latency, status):
+        with self.lock:
+            self.requests.append((persona, step, started, latency, status))
+
+    def session(self, persona, queue_wait, duration, ok):
+        with self.lock:
+            self.sessions.append((persona, queue_wait, duration, ok))
+
+
+def http_get(base_url, path, params, timeout):
+    """GET a path; returns (status, parsed JSON or None). Status 0 means no response."""
+    url = base_url + path
+    if params:
+        url += '?' + urllib.parse.urlencode(params)
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, OSError):
+        return 0, None
+    try:
+        return status, json.loads(body)
+    except ValueError:
+        return status, None
+
+
+def run_session(persona, steps, args, recorder, rng, enqueued_at):
+    queue_wait = time.perf_counter() - enqueued_at
+    session_started = time.perf_counter()
+    ok = True
+    for i, (step, path, params) in enumerate(steps):
+        if i and args.think_time > 0:
+            time.sleep(rng.expovariate(1 / args.think_time))
+        started = time.perf_counter()
+        status, _ = http_get(args.base_url, path, params, args.timeout)
+        recorder.request(persona, step, started, time.perf_counter() - started, status)
+        ok = ok and 200 <= status < 300
+    recorder.session(persona, queue_wait, time.perf_counter() - session_started, ok)
+
+
+def load_context(args):
+    """Ids and the latest season the sessions draw from, read from the API itself."""
+    _, teams = http_get(args.base_url, '/basketball/teams', {}, args.timeout)
+    _, players = http_get(args.base_url, '/basketball/players', {}, args.timeout)
+    _, games = http_get(args.base_url, '/basketball/games', {}, args.timeout)
+    team_ids = [t['team_id'] for t in (teams or {}).get('teams', [])]
+    player_ids = [p['player_id'] for p in (players or {}).get('players', [])]
+    if len(team_ids) < 2 or len(player_ids) < 2:
+        raise SystemExit(f'Need at least two teams and players at {args.base_url} (is the API up and seeded?)')
+    seasons = sorted({g['season'] for g in (games or {}).get('games', []) if g.get('season')})
+    return {'team_ids': team_ids, 'player_ids': player_ids, 'season': args.season or (seasons[-1] if seasons else None)}
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def run(args, mix, ctx):
+    """Generate arrivals for args.duration seconds and wait for sessions to drain."""
+    recorder = Recorder()
+    pending = queue.Queue()
+    rng = random.Random(args.seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    def worker(worker_id):
+        worker_rng = random.Random(args.seed * 1000 + worker_id)
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            persona, steps, enqueued_at = item
+            run_session(persona, steps, args, recorder, worker_rng, enqueued_at)
+
+    workers = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in workers:
+        thread.start()
+
+    started = time.perf_counter()
+    next_arrival = started
+    arrivals = 0
+    while True:
+        next_arrival += rng.expovariate(args.arrival_rate)
+        if next_arrival - started >= args.duration:
+            break
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        persona = rng.choices(names, weights)[0]
+        pending.put((persona, PERSONAS[persona](rng, ctx), time.perf_counter()))
+        arrivals += 1
+
+    for _ in workers:
+        pending.put(None)
+    for thread in workers:
+        thread.join(args.drain_timeout)
+    elapsed = time.perf_counter() - started
+    return recorder, arrivals, elapsed
+
+
+def _latency_summary(latencies):
+    ms = np.array(latencies) * 1000
+    if not len(ms):
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    return {
+        'p50_ms': round(float(np.percentile(ms, 50)), 1),
+        'p95_ms': round(float(np.percentile(ms, 95)), 1),
+        'p99_ms': round(float(np.percentile(ms, 99)), 1)
+    }
+
+
+def summarize(recorder, arrivals, elapsed):
+    with recorder.lock:
+        requests = list(recorder.requests)
+        sessions = list(recorder.sessions)
+
+    def group(rows):
+        errors = sum(1 for r in rows if not 200 <= r[4] < 300)
+        summary = {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': round(errors / len(rows), 4) if rows else 0.0,
+            'throughput_rps': round(len(rows) / elapsed, 2) if elapsed else 0.0
+        }
+        summary.update(_latency_summary([r[3] for r in rows]))
+        return summary
+
+    by_persona, by_step = {}, {}
+    for row in requests:
+        by_persona.setdefault(row[0], []).append(row)
+        by_step.setdefault(f'{row[0]}.{row[1]}', []).append(row)
+
+    statuses = {}
+    for row in requests:
+        statuses[str(row[4])] = statuses.get(str(row[4]), 0) + 1
+
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'sessions_started': arrivals,
+        'sessions_completed': len(sessions),
+        'sessions_failed': sum(1 for s in sessions if not s[3]),
+        'session_rate': round(len(sessions) / elapsed, 2) if elapsed else 0.0,
+        'queue_wait': _latency_summary([s[1] for s in sessions]),
+        'statuses': statuses,
+        'overall': group(requests),
+        'personas': {name: group(rows) for name, rows in sorted(by_persona.items())},
+        'steps': {name: group(rows) for name, rows in sorted(by_step.items())}
+    }
+
+
+def print_report(report):
+    overall = report['overall']
+    print(f"\n{report['sessions_completed']}/{report['sessions_started']} sessions in {report['elapsed_s']}s "
+          f"({report['session_rate']}/s), queue wait p95 {report['queue_wait']['p95_ms']} ms")
+    print(f"{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+          f"error rate {overall['error_rate']:.2%}, statuses {report['statuses']}\n")
+    print(f"{'':<36}{'reqs':>8}{'req/s':>9}{'err %':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for section in ('personas', 'steps'):
+        for name, row in report[section].items():
+            print(f"{name:<36}{row['requests']:>8}{row['throughput_rps']:>9.1f}{row['error_rate'] * 100:>8.2f}"
+                  f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay persona sessions against a running BallWatch API.')
+    parser.add_argument('--base-url', default='http://localhost:4000')
+    parser.add_argument('--mix', type=parse_mix, default='default',
+                        help=f'preset ({", ".join(MIX_PRESETS)}) or persona=weight,...')
+    parser.add_argument('--arrival-rate', type=float, default=5.0, help='new sessions per second')
+    parser.add_argument('--concurrency', type=int, default=16, help='sessions served at once')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds to generate arrivals for')
+    parser.add_argument('--think-time', type=float, default=0.5, help='mean seconds between steps (0 for none)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='per-request timeout in seconds')
+    parser.add_argument('--drain-timeout', type=float, default=60.0,
+                        help='seconds to wait per worker for queued sessions after arrivals stop')
+    parser.add_argument('--season', default=None, help='season for stats queries (default: latest)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='write the JSON report here')
+    args = parser.parse_args()
+
+    ctx = load_context(args)
+    print(f"Mix {', '.join(f'{k}={v:.0%}' for k, v in args.mix.items())}; "
+          f"{args.arrival_rate} sessions/s for {args.duration}s on {args.concurrency} workers "
+          f"({len(ctx['team_ids'])} teams, {len(ctx['player_ids'])} players, season {ctx['season']})")
+
+    recorder, arrivals, elapsed = run(args, args.mix, ctx)
+    report = summarize(recorder, arrivals, elapsed)
+    report['config'] = {
+        'base_url': args.base_url, 'mix': args.mix, 'arrival_rate': args.arrival_rate,
+        'concurrency': args.concurrency, 'duration': args.duration, 'think_time': args.think_time,
+        'created_at': datetime.now().isoformat(timespec='seconds')
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Report written to {args.output}')
+    return 1 if report['overall']['requests'] == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Query-plan regression checks for every route's SQL.
+
+Runs each GET route (see bench.route_bench) against the seeded database,
+captures every statement it executes with its parameters bound, and EXPLAINs
+each SELECT on a separate connection. Two kinds of checks fail the run, the
+second only when asked for with --compare-snapshots:
+
+  rules      no full table scan on a large table (FULL_SCAN_TABLES above
+             --full-scan-rows estimated rows), no filesort on a statement
+             with LIMIT, and the indexes in REQUIRED_INDEXES used by the
+             routes that depend on them
+  snapshots  each route's plans (table, access type, key, Extra per row;
+             row estimates are left out) match the snapshot file recorded
+             with --update-snapshots, keyed by statement fingerprint, so a
+             harmless-looking change to a concatenated query that alters its
+             plan or adds a new statement shape shows up
+
+Run from the api/ directory:
+    python -m bench.plan_check
+    python -m bench.plan_check --route /analytics/
+    python -m bench.plan_check --seed --teams 30 --seasons 10 --update-snapshots
+    python -m bench.plan_check --compare-snapshots
+
+No snapshot file ships with the repo: plans depend on table statistics and
+the MySQL version, so record one against the same seeded scale and server
+the comparison will run on, and commit it if it should guard reviews.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+import pymysql
+from dotenv import load_dotenv
+
+from bench.route_bench import (BENCH_DIR, DEFAULT_RESULTS_DIR, build_requests, create_bench_app,
+                               sample_ids, seed_database)
+from backend.db_connection.fingerprint import fingerprint, normalize, strip_comments
+
+DEFAULT_SNAPSHOTS = os.path.join(BENCH_DIR, 'plan_snapshots.json')
+
+# Tables that must not be read with a full scan once they are this large
+FULL_SCAN_TABLES = ('PlayerGameStats', 'Game', 'TeamsPlayers', 'PlayerMatchup', 'SystemLogs')
+
+# Route -> [(table, acceptable keys)]: the route must read `table` through one
+# of the keys. PRIMARY is accepted where the primary key leads with the same
+# column, since the optimizer may prefer it.
+REQUIRED_INDEXES = {
+    'GET /basketball/players/<int:player_id>/stats': [('PlayerGameStats', ('idx_pgs_player_id', 'PRIMARY'))],
+    'GET /superfan/players/<int:player_id>/stats': [('PlayerGameStats', ('idx_pgs_player_id', 'PRIMARY'))],
+    'GET /basketball/teams': [('TeamsPlayers', ('idx_tp_team_current',))],
+    'GET /basketball/teams/<int:team_id>/players': [('TeamsPlayers', ('idx_tp_team_current',))],
+    'GET /basketball/games': [('Game', ('idx_game_season',))],
+    'GET /system/error-logs': [('SystemLogs', ('idx_logs_created', 'idx_logs_type_created'))],
+    'GET /system/data-loads': [('DataLoads', ('idx_loads_started', 'idx_loads_status_started'))]
+}
+
+EXPLAINABLE = ('SELECT', 'WITH')
+
+
+class StatementCapture:
+    """Bound query listener collecting the statements of one request."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, statement, duration, error):
+        if error is None:
+            self.statements.append(statement)
+
+
+def explain(conn, statement):
+    """Tabular EXPLAIN rows for a statement, or None when it cannot be explained."""
+    sql = strip_comments(statement)
+    if not sql.upper().startswith(EXPLAINABLE):
+        return None
+    with conn.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql)
+        return cursor.fetchall()
+
+
+def plan_shape(rows):
+    """The stable part of a plan: what the snapshot compares."""
+    return [{
+        'id': row.get('id'),
+        'select_type': row.get('select_type'),
+        'table': row.get('table'),
+        'type': row.get('type'),
+        'key': row.get('key'),
+        'extra': row.get('Extra')
+    } for row in rows]
+
+
+def check_rules(route, statements, full_scan_rows):
+    """Rule violations for one route. `statements` is [(fingerprint, normalized sql, explain rows)]."""
+    violations = []
+    keys_used = {}
+    for fp, sql, rows in statements:
+        has_limit = ' LIMIT ' in f' {sql.upper()} '
+        for row in rows:
+            table = row.get('table') or ''
+            keys_used.setdefault(table, set()).add(row.get('key'))
+            if table in FULL_SCAN_TABLES and row.get('type') == 'ALL' and (row.get('rows') or 0) > full_scan_rows:
+                violations.append(f'{route}: full table scan on {table} (~{row["rows"]:,} rows) in {fp}')
+            if has_limit and 'Using filesort' in (row.get('Extra') or ''):
+                violations.append(f'{route}: filesort on a LIMIT query ({table}) in {fp}')
+
+    for table, accepted in REQUIRED_INDEXES.get(route, []):
+        used = keys_used.get(table)
+        if used is None:
+            violations.append(f'{route}: expected {table} to be read via {"/".join(accepted)} but it is not read')
+        elif not used & set(accepted):
+            shown = ', '.join(sorted(k or 'none' for k in used))
+            violations.append(f'{route}: {table} read via {shown}, expected {"/".join(accepted)}')
+    return violations
+
+
+def compare_snapshots(current, snapshots, routes):
+    """Differences between captured plans and the snapshot for the checked routes."""
+    problems = []
+    for route in routes:
+        expected = snapshots.get(route)
+        actual = current.get(route, {})
+        if expected is None:
+            problems.append(f'{route}: no snapshot (run with --update-snapshots)')
+            continue
+        for fp, entry in actual.items():
+            if fp not in expected:
+                problems.append(f'{route}: new statement shape {fp}: {entry["sql"][:160]}')
+            elif expected[fp]['plan'] != entry['plan']:
+                before = ', '.join(f"{r['table']}:{r['type']}/{r['key']}" for r in expected[fp]['plan'])
+                after = ', '.join(f"{r['table']}:{r['type']}/{r['key']}" for r in entry['plan'])
+                problems.append(f'{route}: plan changed for {fp}: {before} -> {after}')
+    return problems
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="EXPLAIN every route's SQL and check plans against rules "
+                                                 "(and, optionally, snapshots).")
+    parser.add_argument('--seed', action='store_true', help='regenerate the league with bench.seed_data first')
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--route', action='append', default=[],
+                        help='only check routes whose path contains this (repeatable)')
+    parser.add_argument('--full-scan-rows', type=int, default=1000,
+                        help='estimated rows above which a full scan of a FULL_SCAN_TABLES table fails')
+    parser.add_argument('--snapshots', default=DEFAULT_SNAPSHOTS)
+    parser.add_argument('--update-snapshots', action='store_true', help='rewrite snapshots for the checked routes')
+    parser.add_argument('--compare-snapshots', action='store_true',
+                        help='also fail on plans that differ from the snapshot file')
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR)
+    parser.add_argument('--host', default=os.getenv('DB_HOST', 'db').strip())
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3306').strip()))
+    parser.add_argument('--user', default=os.getenv('DB_USER', 'root').strip())
+    parser.add_argument('--password', default=os.getenv('MYSQL_ROOT_PASSWORD', '').strip())
+    parser.add_argument('--database', default=os.getenv('DB_NAME', 'BallWatch').strip())
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_database(args)
+
+    from backend.db_connection import add_query_listener, remove_query_listener
+
+    app = create_bench_app(args)
+    requests, _ = build_requests(app, sample_ids(app))
+    if args.route:
+        requests = [(name, url) for name, url in requests if any(r in name for r in args.route)]
+
+    explain_conn = pymysql.connect(host=args.host, port=args.port, user=args.user, password=args.password,
+                                   database=args.database, cursorclass=pymysql.cursors.DictCursor)
+    capture = StatementCapture()
+    add_query_listener(capture, bound=True)
+    client = app.test_client()
+
+    current, violations, report = {}, [], {}
+    try:
+        for name, url in requests:
+            capture.statements = []
+            status = client.get(url).status_code
+
+            explained, seen = [], set()
+            for statement in capture.statements:
+                fp = fingerprint(statement)
+                if fp in seen:
+                    continue
+                seen.add(fp)
+                rows = explain(explain_conn, statement)
+                if rows is not None:
+                    explained.append((fp, normalize(statement), rows))
+
+            current[name] = {fp: {'sql': sql, 'plan': plan_shape(rows)} for fp, sql, rows in explained}
+            route_violations = check_rules(name, explained, args.full_scan_rows)
+            violations.extend(route_violations)
+            report[name] = {
+                'url': url,
+                'status': status,
+                'statements': [{'fingerprint': fp, 'sql': sql, 'explain': rows} for fp, sql, rows in explained],
+                'violations': route_violations
+            }
+            print(f'{name:<60} {len(explained):>3} statements  {len(route_violations)} violation(s)')
+    finally:
+        remove_query_listener(capture)
+        explain_conn.close()
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    out_path = os.path.join(args.results_dir, f'plans-{datetime.now():%Y%m%d-%H%M%S}.json')
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f'\nEXPLAIN output written to {out_path}')
+
+    snapshots = None
+    if os.path.exists(args.snapshots):
+        with open(args.snapshots) as f:
+            snapshots = json.load(f)
+
+    problems = []
+    if args.update_snapshots:
+        snapshots = {**(snapshots or {}), **current}
+        with open(args.snapshots, 'w') as f:
+            json.dump(snapshots, f, indent=2, sort_keys=True)
+        print(f'Snapshots updated for {len(current)} routes: {args.snapshots}')
+    elif args.compare_snapshots:
+        if snapshots is None:
+            problems = [f'no snapshot file at {args.snapshots} (record one with --update-snapshots)']
+        else:
+            problems = compare_snapshots(current, snapshots, [name for name, _ in requests])
+
+    for title, lines in (('Rule violations', violations), ('Plan differences', problems)):
+        if lines:
+            print(f'\n{title} ({len(lines)}):')
+            for line in lines:
+                print(f'  {line}')
+    if violations or problems:
+        return 1
+    print('All plans pass.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
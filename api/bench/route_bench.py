@@ -0,0 +1,377 @@
+"""Per-route latency benchmark for the REST API.
+
+Builds the real application (background jobs off), enumerates every GET
+route registered by `_register_blueprints`, and drives each one through the
+Flask test client against the configured database. For every route it
+records p50/p95/p99/mean latency, the number of SQL queries one request runs
+and the peak Python memory allocated while serving it. Write routes (POST,
+PUT, DELETE) mutate data and are listed as skipped.
+
+Run from the api/ directory:
+    python -m bench.route_bench --seed --teams 30 --seasons 10
+    python -m bench.route_bench --iterations 50 --baseline bench/baselines/routes.json
+    python -m bench.route_bench --update-baseline
+
+--seed (re)generates the league with bench.seed_data first (truncating the
+generated tables). Results are written as JSON to bench/results/. With a
+baseline, the run exits 1 when a route's p95 grows past --tolerance (and by
+more than --min-delta-ms), when it starts running more queries, or when it
+stops returning 2xx. Baselines are machine specific: record one on the
+machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+from dotenv import load_dotenv
+from flask import url_for
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'routes.json')
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Sample value used for each path variable, keyed by variable name
+PATH_SAMPLES = {
+    'player_id': 'player_id',
+    'team_id': 'team_id',
+    'game_id': 'game_id',
+    'evaluation_id': 'evaluation_id',
+    'plan_id': 'plan_id',
+    'load_id': 'load_id',
+    'user_id': 'user_id',
+    'log_id': 'log_id',
+    'validation_id': 'log_id'
+}
+
+# Query string per route; {name} is filled from the sampled ids. Routes not
+# listed are requested without parameters.
+QUERY_PARAMS = {
+    '/analytics/player-comparisons': {'player_ids': '{player_id},{player_id_2}', 'season': '{season}'},
+    '/analytics/player-matchups': {'player1_id': '{player_id}', 'player2_id': '{player_id_2}'},
+    '/analytics/opponent-reports': {'team_id': '{team_id}', 'opponent_id': '{team_id_2}'},
+    '/analytics/lineup-configurations': {'team_id': '{team_id}', 'season': '{season}'},
+    '/analytics/season-summaries': {'entity_type': 'team', 'entity_id': '{team_id}', 'season': '{season}'},
+    '/analytics/situational-performance': {'team_id': '{team_id}', 'season': '{season}'},
+    '/basketball/games': {'season': '{season}'},
+    '/basketball/players/<int:player_id>/stats': {'season': '{season}'},
+    '/basketball/teams/<int:team_id>/players': {'include_stats': 'true'},
+    '/coach/opponent-reports': {'team_id': '{team_id}', 'opponent_id': '{team_id_2}'},
+    '/coach/lineup-configurations': {'team_id': '{team_id}'},
+    '/gm/player-comparisons': {'player_ids': '{player_id},{player_id_2}', 'season': '{season}'},
+    '/strategy/game-plans': {'team_id': '{team_id}'},
+    '/strategy/contract-analysis': {'team_id': '{team_id}'},
+    '/superfan/player-comparisons': {'player_ids': '{player_id},{player_id_2}', 'season': '{season}'},
+    '/superfan/players/<int:player_id>/stats': {'season': '{season}'}
+}
+
+# Id samples: the most active player and team in the latest season give the
+# heaviest realistic responses
+SAMPLE_QUERIES = {
+    'season': 'SELECT season FROM Game ORDER BY game_date DESC LIMIT 1',
+    'game_id': 'SELECT MAX(game_id) AS game_id FROM Game',
+    'evaluation_id': 'SELECT MIN(evaluation_id) AS evaluation_id FROM DraftEvaluations',
+    'plan_id': 'SELECT MIN(plan_id) AS plan_id FROM GamePlans',
+    'load_id': 'SELECT MAX(load_id) AS load_id FROM DataLoads',
+    'user_id': 'SELECT MIN(user_id) AS user_id FROM Users',
+    'log_id': 'SELECT MAX(log_id) AS log_id FROM SystemLogs'
+}
+
+
+class QueryCounter:
+    """Query listener counting queries and their time for the current request."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, sql, duration, error):
+        self.count += 1
+        self.seconds += duration
+
+
+def sample_ids(app):
+    """Pick representative ids for path and query parameters from the database."""
+    from backend.db_connection import db
+
+    samples = {}
+    with app.app_context():
+        cursor = db.get_db().cursor()
+        for name, query in SAMPLE_QUERIES.items():
+            cursor.execute(query)
+            row = cursor.fetchone()
+            samples[name] = row[name] if row else None
+
+        cursor.execute('''
+            SELECT pgs.player_id
+            FROM PlayerGameStats pgs
+            JOIN Game g ON g.game_id = pgs.game_id
+            WHERE g.season = %s
+            GROUP BY pgs.player_id
+            ORDER BY COUNT(*) DESC, SUM(pgs.minutes_played) DESC
+            LIMIT 2
+        ''', (samples['season'],))
+        players = [row['player_id'] for row in cursor.fetchall()]
+        cursor.execute('''
+            SELECT team_id, COUNT(*) AS games
+            FROM (
+                SELECT home_team_id AS team_id FROM Game WHERE season = %s
+                UNION ALL
+                SELECT away_team_id FROM Game WHERE season = %s
+            ) t
+            GROUP BY team_id
+            ORDER BY games DESC, team_id
+            LIMIT 2
+        ''', (samples['season'], samples['season']))
+        teams = [row['team_id'] for row in cursor.fetchall()]
+
+    players += [None] * (2 - len(players))
+    teams += [None] * (2 - len(teams))
+    samples['player_id'], samples['player_id_2'] = players
+    samples['team_id'], samples['team_id_2'] = teams
+    return samples
+
+
+def build_requests(app, samples):
+    """
+    Turn every registered GET route into a concrete (name, url) request.
+    Returns (requests, skipped) where skipped maps route names to a reason.
+    """
+    requests, skipped = [], {}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if rule.endpoint == 'static':
+            continue
+        for method in sorted((rule.methods or set()) - {'HEAD', 'OPTIONS'}):
+            name = f'{method} {rule.rule}'
+            if method != 'GET':
+                skipped[name] = 'write route'
+                continue
+
+            values = {}
+            for arg in rule.arguments:
+                sample = samples.get(PATH_SAMPLES.get(arg, arg))
+                if sample is None:
+                    break
+                values[arg] = sample
+            if len(values) != len(rule.arguments):
+                skipped[name] = 'no sample row for path parameter'
+                continue
+
+            params = {}
+            try:
+                for key, template in QUERY_PARAMS.get(rule.rule, {}).items():
+                    params[key] = template.format(**{k: '' if v is None else v for k, v in samples.items()})
+            except KeyError as e:
+                skipped[name] = f'unknown sample {e}'
+                continue
+
+            with app.test_request_context():
+                url = url_for(rule.endpoint, **values, **params)
+            requests.append((name, url))
+    return requests, skipped
+
+
+def benchmark_route(client, url, counter, warmup, iterations):
+    """Time one route. Memory is measured on a separate request so tracing does not skew latency."""
+    for _ in range(warmup):
+        client.get(url)
+
+    timings, statuses, queries, query_ms = [], {}, [], []
+    for _ in range(iterations):
+        counter.reset()
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        queries.append(counter.count)
+        query_ms.append(counter.seconds * 1000)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = np.array(timings) * 1000
+    return {
+        'url': url,
+        'iterations': iterations,
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'mean_ms': round(float(ms.mean()), 3),
+        'max_ms': round(float(ms.max()), 3),
+        'queries': int(max(queries)),
+        'query_ms_mean': round(float(np.mean(query_ms)), 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'statuses': {str(code): n for code, n in sorted(statuses.items())}
+    }
+
+
+def _ok(route):
+    return all(code.startswith('2') for code in route['statuses'])
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta_ms):
+    """Return a list of human-readable regressions of `results` against `baseline`."""
+    regressions = []
+    for name, base in baseline.get('routes', {}).items():
+        current = results['routes'].get(name)
+        if current is None:
+            continue
+        if _ok(base) and not _ok(current):
+            regressions.append(f'{name}: status {base["statuses"]} -> {current["statuses"]}')
+        limit = base['p95_ms'] * (1 + tolerance)
+        if current['p95_ms'] > limit and current['p95_ms'] - base['p95_ms'] > min_delta_ms:
+            regressions.append(f'{name}: p95 {base["p95_ms"]:.1f}ms -> {current["p95_ms"]:.1f}ms '
+                               f'(limit {limit:.1f}ms)')
+        if current['queries'] > base['queries']:
+            regressions.append(f'{name}: queries {base["queries"]} -> {current["queries"]}')
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=BENCH_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _table_counts(app):
+    from backend.db_connection import db
+
+    counts = {}
+    with app.app_context():
+        cursor = db.get_db().cursor()
+        for table in ('Teams', 'Players', 'Game', 'PlayerGameStats', 'SystemLogs'):
+            cursor.execute(f'SELECT COUNT(*) AS n FROM {table}')
+            counts[table] = cursor.fetchone()['n']
+    return counts
+
+
+def seed_database(args):
+    """Regenerate the benchmark league with bench.seed_data."""
+    command = [sys.executable, '-m', 'bench.seed_data', '--truncate',
+               '--teams', str(args.teams), '--seasons', str(args.seasons),
+               '--host', args.host, '--port', str(args.port), '--user', args.user,
+               '--password', args.password, '--database', args.database]
+    subprocess.run(command, check=True, cwd=os.path.dirname(BENCH_DIR))
+
+
+def create_bench_app(args):
+    # The app reads its connection settings from the environment
+    os.environ.update({
+        'DB_HOST': args.host,
+        'DB_PORT': str(args.port),
+        'DB_USER': args.user,
+        'MYSQL_ROOT_PASSWORD': args.password,
+        'DB_NAME': args.database,
+        'BACKGROUND_JOBS_ENABLED': 'false',
+        'WARMUP_ENABLED': 'false'
+    })
+    from backend.rest_entry import create_app
+
+    app = create_app()
+    app.logger.setLevel('WARNING')
+    return app
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Benchmark every GET route of the BallWatch API.')
+    parser.add_argument('--seed', action='store_true', help='regenerate the league with bench.seed_data first')
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--route', action='append', default=[],
+                        help='only benchmark routes whose path contains this (repeatable)')
+    parser.add_argument('--results-dir', default=DEFAULT_RESULTS_DIR)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative p95 growth')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                        help='ignore p95 growth smaller than this many milliseconds')
+    parser.add_argument('--host', default=os.getenv('DB_HOST', 'db').strip())
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3306').strip()))
+    parser.add_argument('--user', default=os.getenv('DB_USER', 'root').strip())
+    parser.add_argument('--password', default=os.getenv('MYSQL_ROOT_PASSWORD', '').strip())
+    parser.add_argument('--database', default=os.getenv('DB_NAME', 'BallWatch').strip())
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_database(args)
+
+    from backend.db_connection import add_query_listener, remove_query_listener
+
+    app = create_bench_app(args)
+    samples = sample_ids(app)
+    requests, skipped = build_requests(app, samples)
+    if args.route:
+        requests = [(name, url) for name, url in requests if any(r in name for r in args.route)]
+
+    counter = QueryCounter()
+    add_query_listener(counter)
+    client = app.test_client()
+    routes = {}
+    try:
+        for name, url in requests:
+            routes[name] = benchmark_route(client, url, counter, args.warmup, args.iterations)
+            r = routes[name]
+            print(f'{name:<60} p50 {r["p50_ms"]:>8.1f}  p95 {r["p95_ms"]:>8.1f}  p99 {r["p99_ms"]:>8.1f} ms  '
+                  f'{r["queries"]:>3} q  {r["peak_memory_kb"]:>9.1f} KB  {r["statuses"]}')
+    finally:
+        remove_query_listener(counter)
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'rows': _table_counts(app),
+        'samples': {k: (str(v) if v is not None else None) for k, v in samples.items()},
+        'routes': routes,
+        'skipped': skipped
+    }
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    out_path = os.path.join(args.results_dir, f'routes-{datetime.now():%Y%m%d-%H%M%S}.json')
+    with open(out_path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f'\n{len(routes)} routes benchmarked, {len(skipped)} skipped -> {out_path}')
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'Baseline updated: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline to compare against (record one with --update-baseline)')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) against {args.baseline}:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'No regressions against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,763 @@
+"""Synthetic league-scale dataset generator for benchmarks.
+
+Simulates a league season by season: rosters with offseason turnover and
+trade-deadline moves (so TeamsPlayers carries real date ranges), a balanced
+schedule, and box scores whose team totals add up to the final score. The
+tables are written as tab-separated files and bulk loaded with
+LOAD DATA LOCAL INFILE, falling back to batched multi-row INSERTs when the
+server or client has local_infile disabled.
+
+Run from the api/ directory:
+    python -m bench.seed_data --teams 30 --seasons 10 --truncate
+    python -m bench.seed_data --seasons 2 --files-only --out-dir /tmp/ballwatch-seed
+
+Connection settings come from the same environment variables as the API
+(DB_HOST, DB_PORT, DB_USER, MYSQL_ROOT_PASSWORD, DB_NAME) and can be
+overridden on the command line. From the host machine against the Docker
+database use --host 127.0.0.1 --port 3200.
+
+--truncate empties the generated tables first and numbers everything from 1;
+otherwise the new league is appended after the current maximum ids. Tables
+that reference generated rows but are not generated here (GamePlans,
+DraftEvaluations, Users.team_id) are left untouched.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pymysql
+from dotenv import load_dotenv
+
+# Column order of each generated file; also the column list used for loading
+TABLE_COLUMNS = {
+    'Teams': ['team_id', 'name', 'city', 'conference', 'division', 'coach', 'arena',
+              'founded_year', 'championships', 'offensive_system', 'defensive_system'],
+    'Players': ['player_id', 'first_name', 'last_name', 'age', 'height', 'weight', 'college',
+                'position', 'years_exp', 'draft_year', 'player_status', 'dominant_hand',
+                'expected_salary', 'current_salary', 'DOB'],
+    'TeamsPlayers': ['player_id', 'team_id', 'joined_date', 'jersey_num', 'left_date', 'status'],
+    'Game': ['game_id', 'game_date', 'game_time', 'home_team_id', 'away_team_id', 'home_score',
+             'away_score', 'season', 'game_type', 'status', 'attendance', 'venue'],
+    'PlayerGameStats': ['player_id', 'game_id', 'points', 'rebounds', 'assists', 'steals', 'blocks',
+                        'turnovers', 'shooting_percentage', 'three_point_percentage',
+                        'free_throw_percentage', 'plus_minus', 'minutes_played'],
+    'PlayerMatchup': ['game_id', 'offensive_player_id', 'defensive_player_id', 'offensive_rating',
+                      'defensive_rating', 'possessions', 'points_scored', 'shooting_percentage'],
+    'LineupConfiguration': ['lineup_id', 'team_id', 'quarter', 'time_on', 'time_off', 'plus_minus',
+                            'offensive_rating', 'defensive_rating'],
+    'PlayerLineups': ['player_id', 'lineup_id', 'position_in_lineup'],
+    'SystemLogs': ['log_type', 'service_name', 'severity', 'message', 'error_rate_pct', 'response_time',
+                   'records_processed', 'records_failed', 'source_file', 'user_id', 'created_at',
+                   'resolved_at']
+}
+
+# Parents before children, so foreign keys hold even with checks enabled
+LOAD_ORDER = ['Teams', 'Players', 'TeamsPlayers', 'Game', 'PlayerGameStats', 'PlayerMatchup',
+              'LineupConfiguration', 'PlayerLineups', 'SystemLogs']
+
+CITIES = ['Atlanta', 'Boston', 'Brooklyn', 'Charlotte', 'Chicago', 'Cleveland', 'Dallas', 'Denver',
+          'Detroit', 'Golden State', 'Houston', 'Indiana', 'Los Angeles', 'Memphis', 'Miami',
+          'Milwaukee', 'Minnesota', 'New Orleans', 'New York', 'Oklahoma City', 'Orlando',
+          'Philadelphia', 'Phoenix', 'Portland', 'Sacramento', 'San Antonio', 'Toronto', 'Utah',
+          'Washington', 'Seattle', 'Las Vegas', 'Kansas City', 'St. Louis', 'Vancouver']
+NICKNAMES = ['Hawks', 'Comets', 'Lights', 'Hornets', 'Wind', 'Cavaliers', 'Stars', 'Peaks', 'Engines',
+             'Waves', 'Rockets', 'Pacers', 'Kings', 'Blues', 'Heat', 'Bucks', 'Wolves', 'Pelicans',
+             'Empire', 'Thunder', 'Magic', 'Liberty', 'Suns', 'Trail', 'Monarchs', 'Spurs', 'Raptors',
+             'Summit', 'Generals', 'Sonics', 'Aces', 'Monarchs', 'Spirits', 'Orcas']
+FIRST_NAMES = ['James', 'Marcus', 'Anthony', 'Chris', 'Kevin', 'Jalen', 'Tyrese', 'Devin', 'Jaylen',
+               'Luka', 'Nikola', 'Darius', 'Malik', 'Andre', 'Trae', 'Zion', 'Paolo', 'Evan', 'Scottie',
+               'Cade', 'Jamal', 'Brandon', 'Derrick', 'Kyle', 'Jordan', 'Tyler', 'Austin', 'Isaiah',
+               'Cameron', 'Jabari', 'Keegan', 'Franz', 'Alperen', 'Victor', 'Shai', 'Donovan', 'Bam',
+               'Mikal', 'OG', 'Dejounte']
+LAST_NAMES = ['Johnson', 'Williams', 'Brown', 'Davis', 'Miller', 'Wilson', 'Moore', 'Taylor', 'Thomas',
+              'Jackson', 'White', 'Harris', 'Martin', 'Thompson', 'Robinson', 'Walker', 'Young', 'Allen',
+              'King', 'Wright', 'Green', 'Baker', 'Adams', 'Nelson', 'Hill', 'Mitchell', 'Carter',
+              'Roberts', 'Turner', 'Phillips', 'Campbell', 'Parker', 'Evans', 'Edwards', 'Collins',
+              'Murray', 'Barnes', 'Holiday', 'Porter', 'Bridges']
+COLLEGES = ['University of Kentucky', 'Duke University', 'University of North Carolina',
+            'University of Kansas', 'Gonzaga University', 'University of Arizona', 'Villanova University',
+            'University of Michigan', 'UCLA', 'Baylor University', None, None]
+OFFENSIVE_SYSTEMS = ['Motion Offense', 'Pace and Space', 'Pick and Roll Heavy', 'Post-Up Heavy', 'Five Out']
+DEFENSIVE_SYSTEMS = ['Switching Defense', 'Drop Coverage', 'Zone Defense', 'Aggressive Help', 'Man-to-Man']
+GAME_TIMES = ['19:00:00', '19:30:00', '20:00:00', '22:00:00']
+
+POSITIONS = np.array(['PG', 'SG', 'SF', 'PF', 'C'])
+POSITION_NAMES = {'PG': 'Point Guard', 'SG': 'Shooting Guard', 'SF': 'Small Forward',
+                  'PF': 'Power Forward', 'C': 'Center'}
+# Per-position means (height in inches, weight in lbs) and per-minute stat rates
+POSITION_HEIGHT = np.array([75.0, 77.0, 79.0, 81.0, 83.0])
+POSITION_WEIGHT = np.array([190.0, 205.0, 220.0, 235.0, 250.0])
+REBOUND_RATE = np.array([0.12, 0.14, 0.18, 0.25, 0.30])
+ASSIST_RATE = np.array([0.22, 0.12, 0.09, 0.07, 0.06])
+BLOCK_RATE = np.array([0.01, 0.015, 0.02, 0.035, 0.05])
+STEAL_RATE = 0.03
+TURNOVER_RATE = 0.06
+
+LOG_TYPES = np.array(['info', 'warning', 'error', 'debug', 'validation'])
+LOG_TYPE_WEIGHTS = np.array([0.45, 0.2, 0.1, 0.15, 0.1])
+LOG_SEVERITY = {'info': 'low', 'warning': 'medium', 'error': 'high', 'debug': 'low', 'validation': 'error'}
+LOG_SERVICES = np.array(['player_stats_service', 'game_results_feed', 'lineup_optimizer', 'draft_evaluation_engine',
+                         'matchup_analyzer', 'data_warehouse_sync', 'external_data_feed', 'user_authentication',
+                         'PlayerGameStats', 'Game'])
+LOG_MESSAGES = {
+    'info': 'Batch processed successfully',
+    'warning': 'Processing slower than expected',
+    'error': 'Failed to process batch',
+    'debug': 'Diagnostic metrics collected',
+    'validation': 'Rejected row: value out of range'
+}
+
+TEAM_MINUTES = 240
+ROTATION_MINUTES = [36, 34, 32, 30, 28, 22, 18, 16, 12, 8, 4]
+NULL = '\\N'
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+class LeagueGenerator:
+    """Builds every table as a dict of column name -> NumPy array or list."""
+
+    def __init__(self, teams=30, seasons=10, roster_size=15, games_per_season=82, start_year=None,
+                 turnover=0.15, trade_rate=0.05, matchup_depth=5, lineups_per_team=12,
+                 log_rows=100000, log_days=120, seed=42, id_offsets=None):
+        if teams < 2:
+            raise ValueError('at least 2 teams are required')
+        if roster_size < 5:
+            raise ValueError('rosters need at least 5 players')
+        self.rng = np.random.default_rng(seed)
+        self.n_teams = teams
+        self.n_seasons = seasons
+        self.roster_size = roster_size
+        self.games_per_season = games_per_season
+        self.start_year = start_year or (date.today().year - seasons)
+        self.turnover = turnover
+        self.trade_rate = trade_rate
+        self.matchup_depth = min(matchup_depth, roster_size)
+        self.lineups_per_team = lineups_per_team
+        self.log_rows = log_rows
+        self.log_days = log_days
+        offsets = id_offsets or {}
+        self.team_base = offsets.get('Teams', 0) + 1
+        self.player_base = offsets.get('Players', 0) + 1
+        self.game_base = offsets.get('Game', 0) + 1
+        self.lineup_base = offsets.get('LineupConfiguration', 0) + 1
+
+        self.tables = {name: [] for name in TABLE_COLUMNS}
+        self._player_count = 0
+        self._player_chunks = []
+        self._team_of = np.empty(0, dtype=np.int64)
+        self._joined = np.empty(0, dtype='datetime64[D]')
+        self._next_game_id = self.game_base
+        self._next_lineup_id = self.lineup_base
+
+    # ------------------------------------------------------------------------
+    def generate(self):
+        """Run the whole simulation; returns {table: {column: values}}."""
+        self._generate_teams()
+
+        rosters = self._new_players(self.n_teams * self.roster_size, self.start_year)
+        rosters = rosters.reshape(self.n_teams, self.roster_size)
+        # Current stint per player, indexed by player_id - player_base
+        self._grow_stint_state()
+        first_day = date(self.start_year, 7, 1)
+        self._start_stints(rosters.ravel(), np.repeat(np.arange(self.n_teams), self.roster_size), first_day)
+
+        for s in range(self.n_seasons):
+            year = self.start_year + s
+            if s:
+                rosters = self._offseason(rosters, year)
+            season_start = date(year, 10, 20)
+            deadline = date(year + 1, 2, 8)
+            season_end = date(year + 1, 4, 12)
+            season = f'{year}-{(year + 1) % 100:02d}'
+
+            dates, home, away = self._schedule(season_start, season_end)
+            before = dates < np.datetime64(deadline)
+            self._play_games(season, dates[before], home[before], away[before], rosters)
+            rosters = self._trade_deadline(rosters, deadline)
+            self._play_games(season, dates[~before], home[~before], away[~before], rosters)
+            self._generate_lineups(rosters)
+
+        self._close_open_stints()
+        self._finish_players()
+        self._generate_system_logs()
+        return {name: self._concat(name) for name in TABLE_COLUMNS}
+
+    def _concat(self, name):
+        chunks = self.tables[name]
+        if not chunks:
+            return {col: np.array([]) for col in TABLE_COLUMNS[name]}
+        return {col: np.concatenate([np.asarray(c[col]) for c in chunks]) for col in TABLE_COLUMNS[name]}
+
+    # ------------------------------------------------------------------------
+    def _generate_teams(self):
+        rng, n = self.rng, self.n_teams
+        idx = np.arange(n)
+        cities = [CITIES[i % len(CITIES)] for i in idx]
+        names = [NICKNAMES[i % len(NICKNAMES)] + ('' if i < len(NICKNAMES) else f' {i // len(NICKNAMES) + 1}')
+                 for i in idx]
+        conference = np.where(idx < (n + 1) // 2, 'East', 'West')
+        division = np.array([f'{c} {d + 1}' for c, d in zip(conference, (idx % ((n + 1) // 2)) // 5)])
+        self.team_ids = self.team_base + idx
+        self.arenas = np.array([f'{c} Arena' for c in cities])
+        self.team_strength = rng.normal(0, 1, n)
+        self.tables['Teams'].append({
+            'team_id': self.team_ids,
+            'name': np.array(names),
+            'city': np.array(cities),
+            'conference': conference,
+            'division': division,
+            'coach': np.array([f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}' for _ in idx]),
+            'arena': self.arenas,
+            'founded_year': rng.integers(1946, 2005, n),
+            'championships': rng.poisson(1.5, n),
+            'offensive_system': rng.choice(OFFENSIVE_SYSTEMS, n),
+            'defensive_system': rng.choice(DEFENSIVE_SYSTEMS, n)
+        })
+
+    def _new_players(self, n, year):
+        """Create n players entering the league in `year`; returns their ids."""
+        rng = self.rng
+        ids = self.player_base + self._player_count + np.arange(n)
+        self._player_count += n
+        pos_idx = rng.integers(0, 5, n)
+        self._player_chunks.append({
+            'ids': ids,
+            'pos_idx': pos_idx,
+            'entry_year': np.full(n, year),
+            'entry_age': rng.integers(19, 24, n),
+            # Skill drives minutes, usage and efficiency; heavy right tail like real rosters
+            'skill': np.clip(rng.gamma(2.0, 0.5, n), 0.2, 3.0),
+            'jersey': rng.integers(0, 100, n)
+        })
+        return ids
+
+    def _grow_stint_state(self):
+        """Extend the per-player arrays to cover players created since the last call."""
+        missing = self._player_count - len(self._team_of)
+        if missing:
+            self._team_of = np.concatenate([self._team_of, np.full(missing, -1, dtype=np.int64)])
+            self._joined = np.concatenate([self._joined, np.full(missing, np.datetime64('NaT'), dtype='datetime64[D]')])
+        self._skill = np.concatenate([c['skill'] for c in self._player_chunks])
+        self._pos_idx = np.concatenate([c['pos_idx'] for c in self._player_chunks])
+        self._jersey = np.concatenate([c['jersey'] for c in self._player_chunks])
+
+    def _start_stints(self, players, team_idx, day):
+        local = players - self.player_base
+        self._team_of[local] = team_idx
+        self._joined[local] = np.datetime64(day, 'D')
+
+    def _end_stints(self, players, day, status='inactive'):
+        local = players - self.player_base
+        self.tables['TeamsPlayers'].append({
+            'player_id': players,
+            'team_id': self.team_ids[self._team_of[local]],
+            'joined_date': self._joined[local],
+            'jersey_num': self._jersey[local],
+            'left_date': np.full(len(players), np.datetime64(day, 'D')),
+            'status': np.full(len(players), status)
+        })
+        self._team_of[local] = -1
+
+    def _move(self, rosters, slots_team, slots_pos, new_players, day):
+        """Put new_players into the given roster slots, closing/opening stints as needed."""
+        old_players = rosters[slots_team, slots_pos]
+        local_new = new_players - self.player_base
+        changed = self._team_of[local_new] != slots_team
+        self._end_stints(old_players[np.isin(old_players, new_players, invert=True)], day - timedelta(days=1))
+        moving = new_players[changed & (self._team_of[local_new] >= 0)]
+        self._end_stints(moving, day - timedelta(days=1), status='traded')
+        self._start_stints(new_players[changed], slots_team[changed], day)
+        rosters[slots_team, slots_pos] = new_players
+        return rosters
+
+    def _random_slots(self, fraction):
+        n_slots = self.n_teams * self.roster_size
+        k = int(round(n_slots * fraction))
+        flat = self.rng.choice(n_slots, size=k, replace=False)
+        return flat // self.roster_size, flat % self.roster_size
+
+    def _offseason(self, rosters, year):
+        """Retire a share of the league, replace them with rookies, then shuffle some free agents."""
+        day = date(year, 7, 1)
+        teams, pos = self._random_slots(self.turnover)
+        rookies = self._new_players(len(teams), year)
+        self._grow_stint_state()
+        rosters = self._move(rosters, teams, pos, rookies, day)
+
+        teams, pos = self._random_slots(self.trade_rate)
+        movers = rosters[teams, pos]
+        return self._move(rosters, teams, pos, self.rng.permutation(movers), day)
+
+    def _trade_deadline(self, rosters, deadline):
+        teams, pos = self._random_slots(self.trade_rate)
+        if len(teams) < 2:
+            return rosters
+        players = rosters[teams, pos]
+        # Rotate players among the chosen slots so most of them change team
+        return self._move(rosters, teams, pos, np.roll(players, 1), deadline)
+
+    def _close_open_stints(self):
+        open_local = np.flatnonzero(self._team_of >= 0)
+        players = open_local + self.player_base
+        self.tables['TeamsPlayers'].append({
+            'player_id': players,
+            'team_id': self.team_ids[self._team_of[open_local]],
+            'joined_date': self._joined[open_local],
+            'jersey_num': self._jersey[open_local],
+            'left_date': np.full(len(players), None, dtype=object),
+            'status': np.full(len(players), 'active')
+        })
+
+    def _finish_players(self):
+        rng = self.rng
+        ids = np.concatenate([c['ids'] for c in self._player_chunks])
+        pos_idx = self._pos_idx
+        entry_year = np.concatenate([c['entry_year'] for c in self._player_chunks])
+        entry_age = np.concatenate([c['entry_age'] for c in self._player_chunks])
+        n = len(ids)
+        final_year = self.start_year + self.n_seasons
+        # The founding league already has veterans; later players enter as rookies
+        prior_exp = np.where(entry_year == self.start_year, rng.integers(0, 12, n), 0)
+        age = entry_age + prior_exp + (final_year - entry_year)
+        years_exp = prior_exp + (final_year - entry_year)
+        height_in = np.round(rng.normal(POSITION_HEIGHT[pos_idx], 2.0)).astype(int)
+        salary = np.round(np.clip(rng.lognormal(15.5, 0.8, n) * (0.5 + self._skill), 1.1e6, 5.5e7), -3)
+        birth_year = final_year - age
+        dob = (np.array(birth_year - 1970, dtype='datetime64[Y]').astype('datetime64[D]')
+               + rng.integers(0, 365, n).astype('timedelta64[D]'))
+        active = self._team_of >= 0
+        self.tables['Players'].append({
+            'player_id': ids,
+            'first_name': rng.choice(FIRST_NAMES, n),
+            'last_name': rng.choice(LAST_NAMES, n),
+            'age': age,
+            'height': np.array([f'{h // 12}-{h % 12}' for h in height_in]),
+            'weight': np.round(rng.normal(POSITION_WEIGHT[pos_idx], 12)).astype(int),
+            'college': np.array([rng.choice(COLLEGES) for _ in range(n)], dtype=object),
+            'position': POSITIONS[pos_idx],
+            'years_exp': years_exp,
+            'draft_year': entry_year - prior_exp,
+            'player_status': np.where(active, 'Active', 'Retired'),
+            'dominant_hand': np.where(rng.random(n) < 0.1, 'Left', 'Right'),
+            'expected_salary': np.round(salary * rng.uniform(0.9, 1.2, n), -3),
+            'current_salary': np.where(active, salary, 0),
+            'DOB': dob
+        })
+
+    # ------------------------------------------------------------------------
+    def _schedule(self, season_start, season_end):
+        """Balanced schedule: each round pairs every team once, rounds spread across the season."""
+        rng, n = self.rng, self.n_teams
+        rounds = self.games_per_season
+        span = (season_end - season_start).days
+        pairs_per_round = n // 2
+
+        order = np.argsort(rng.random((rounds, n)), axis=1)[:, :pairs_per_round * 2]
+        first, second = order[:, 0::2].ravel(), order[:, 1::2].ravel()
+        swap = rng.random(len(first)) < 0.5
+        home = np.where(swap, second, first)
+        away = np.where(swap, first, second)
+
+        round_day = (np.arange(rounds) * span) // max(rounds, 1)
+        dates = (np.datetime64(season_start, 'D')
+                 + np.repeat(round_day, pairs_per_round).astype('timedelta64[D]'))
+        return dates, home, away
+
+    def _play_games(self, season, dates, home, away, rosters):
+        rng = self.rng
+        g = len(dates)
+        if not g:
+            return
+        game_ids = self._next_game_id + np.arange(g)
+        self._next_game_id += g
+
+        completed = dates < np.datetime64(date.today(), 'D')
+        home_score = np.zeros(g, dtype=np.int64)
+        away_score = np.zeros(g, dtype=np.int64)
+
+        played = np.flatnonzero(completed)
+        if len(played):
+            hs, as_ = self._box_scores(game_ids[played], home[played], away[played], rosters)
+            home_score[played] = hs
+            away_score[played] = as_
+
+        self.tables['Game'].append({
+            'game_id': game_ids,
+            'game_date': dates,
+            'game_time': rng.choice(GAME_TIMES, g),
+            'home_team_id': self.team_ids[home],
+            'away_team_id': self.team_ids[away],
+            'home_score': home_score,
+            'away_score': away_score,
+            'season': np.full(g, season),
+            'game_type': np.full(g, 'regular'),
+            'status': np.where(completed, 'completed', 'scheduled'),
+            'attendance': np.where(completed, np.clip(rng.normal(18000, 1500, g), 9000, 21000).astype(int), 0),
+            'venue': self.arenas[home]
+        })
+
+    def _box_scores(self, game_ids, home, away, rosters):
+        """Generate PlayerGameStats/PlayerMatchup rows for completed games; returns final scores."""
+        rng = self.rng
+        g, r = len(game_ids), self.roster_size
+
+        # One row per team-game: first g rows are home sides, next g are away
+        team = np.concatenate([home, away])
+        opp = np.concatenate([away, home])
+        players = rosters[team]
+        local = players - self.player_base
+        skill = self._skill[local]
+        pos_idx = self._pos_idx[local]
+
+        # Minutes: rank players by noisy skill and hand out a typical rotation
+        form = skill * rng.lognormal(0, 0.2, skill.shape)
+        rank = np.argsort(np.argsort(-form, axis=1), axis=1)
+        template = _rotation_template(r)
+        minutes = template[rank] + np.where(template[rank] > 0, rng.integers(-3, 4, skill.shape), 0)
+        minutes = np.clip(minutes, 0, 48)
+
+        # Team points, then split between players by minutes x usage
+        strength = self.team_strength[team] - self.team_strength[opp]
+        home_edge = np.concatenate([np.full(g, 1.5), np.full(g, -1.5)])
+        team_points = np.clip(np.round(rng.normal(112 + 3 * strength + home_edge, 11)), 70, 165).astype(np.int64)
+        usage = minutes * skill
+        pvals = usage / usage.sum(axis=1, keepdims=True)
+        points = rng.multinomial(team_points, pvals)
+
+        # No ties: the home side's top scorer gets an overtime bucket
+        tie = points[:g].sum(axis=1) == points[g:].sum(axis=1)
+        if tie.any():
+            top = np.argmax(points[:g][tie], axis=1)
+            points[np.flatnonzero(tie), top] += rng.integers(1, 8, int(tie.sum()))
+        scores = points.sum(axis=1)
+        margin = scores - np.concatenate([scores[g:], scores[:g]])
+
+        skill_z = (skill - 1.0) / 0.7
+        fg = np.clip(rng.beta(40, 48, skill.shape) + 0.015 * skill_z, 0.2, 0.75)
+        three = np.clip(rng.beta(35, 65, skill.shape) + 0.01 * skill_z, 0.0, 0.6)
+        ft = np.clip(rng.beta(60, 18, skill.shape), 0.4, 1.0)
+
+        on_court = minutes > 0
+        rows = np.nonzero(on_court)
+        game_of_row = np.concatenate([game_ids, game_ids])
+        self.tables['PlayerGameStats'].append({
+            'player_id': players[rows],
+            'game_id': game_of_row[rows[0]],
+            'points': points[rows],
+            'rebounds': rng.poisson(minutes * REBOUND_RATE[pos_idx])[rows],
+            'assists': rng.poisson(minutes * ASSIST_RATE[pos_idx])[rows],
+            'steals': rng.poisson(minutes * STEAL_RATE)[rows],
+            'blocks': rng.poisson(minutes * BLOCK_RATE[pos_idx])[rows],
+            'turnovers': rng.poisson(minutes * TURNOVER_RATE)[rows],
+            'shooting_percentage': np.round(fg[rows], 3),
+            'three_point_percentage': np.round(three[rows], 3),
+            'free_throw_percentage': np.round(ft[rows], 3),
+            'plus_minus': np.round(margin[rows[0]] * minutes[rows] / 48 + rng.normal(0, 4, len(rows[0]))).astype(int),
+            'minutes_played': minutes[rows]
+        })
+
+        if self.matchup_depth:
+            self._matchups(game_ids, players, minutes, skill)
+
+        return scores[:g], scores[g:]
+
+    def _matchups(self, game_ids, players, minutes, skill):
+        """Starters guard their counterpart (by minutes rank), both directions."""
+        rng = self.rng
+        g, depth = len(game_ids), self.matchup_depth
+        top = np.argsort(-minutes, axis=1, kind='stable')[:, :depth]
+        starters = np.take_along_axis(players, top, axis=1)
+        starter_skill = np.take_along_axis(skill, top, axis=1)
+
+        offense = np.concatenate([starters[:g], starters[g:]]).ravel()
+        defense = np.concatenate([starters[g:], starters[:g]]).ravel()
+        off_skill = np.concatenate([starter_skill[:g], starter_skill[g:]]).ravel()
+        n = len(offense)
+
+        possessions = rng.poisson(12, n) + 1
+        attempts = np.maximum(1, np.round(possessions * 0.8)).astype(int)
+        made = rng.binomial(attempts, np.clip(0.42 + 0.03 * (off_skill - 1.0), 0.2, 0.7))
+        points = made * 2 + rng.binomial(made, 0.35) + rng.binomial(possessions - attempts, 0.75)
+
+        self.tables['PlayerMatchup'].append({
+            'game_id': np.tile(np.repeat(game_ids, depth), 2),
+            'offensive_player_id': offense,
+            'defensive_player_id': defense,
+            'offensive_rating': np.round(rng.normal(112, 8, n), 2),
+            'defensive_rating': np.round(rng.normal(110, 8, n), 2),
+            'possessions': possessions,
+            'points_scored': points,
+            'shooting_percentage': np.round(made / attempts, 3)
+        })
+
+    def _generate_lineups(self, rosters):
+        rng = self.rng
+        k = self.lineups_per_team
+        if not k:
+            return
+        n = self.n_teams * k
+        lineup_ids = self._next_lineup_id + np.arange(n)
+        self._next_lineup_id += n
+        team_idx = np.repeat(np.arange(self.n_teams), k)
+
+        # Five distinct players per lineup, favouring the better players
+        skill = self._skill[rosters[team_idx] - self.player_base]
+        keys = rng.random(skill.shape) ** (1.0 / skill)
+        picks = np.argsort(-keys, axis=1)[:, :5]
+        members = np.take_along_axis(rosters[team_idx], picks, axis=1)
+
+        start = rng.integers(0, 9 * 60, n)
+        stint = rng.integers(90, 5 * 60, n)
+        self.tables['LineupConfiguration'].append({
+            'lineup_id': lineup_ids,
+            'team_id': self.team_ids[team_idx],
+            'quarter': rng.integers(1, 5, n),
+            'time_on': _clock(start),
+            'time_off': _clock(np.minimum(start + stint, 12 * 60)),
+            'plus_minus': np.round(rng.normal(0, 6, n)).astype(int),
+            'offensive_rating': np.round(rng.normal(112, 6, n), 1),
+            'defensive_rating': np.round(rng.normal(110, 6, n), 1)
+        })
+        member_pos = POSITIONS[self._pos_idx[members.ravel() - self.player_base]]
+        self.tables['PlayerLineups'].append({
+            'player_id': members.ravel(),
+            'lineup_id': np.repeat(lineup_ids, 5),
+            'position_in_lineup': np.array([POSITION_NAMES[p] for p in member_pos])
+        })
+
+    def _generate_system_logs(self):
+        rng, n = self.rng, self.log_rows
+        if not n:
+            return
+        now = datetime.now().replace(microsecond=0)
+        offsets = rng.integers(0, self.log_days * 86400, n).astype('timedelta64[s]')
+        created = np.datetime64(now, 's') - offsets
+        log_type = rng.choice(LOG_TYPES, n, p=LOG_TYPE_WEIGHTS)
+        is_problem = np.isin(log_type, ['error', 'warning', 'validation'])
+        resolved = is_problem & (rng.random(n) < 0.6)
+        resolved_at = np.where(resolved, (created + rng.integers(60, 86400, n).astype('timedelta64[s]')).astype(object),
+                               None)
+        processed = rng.integers(1, 10000, n)
+        self.tables['SystemLogs'].append({
+            'log_type': log_type,
+            'service_name': rng.choice(LOG_SERVICES, n),
+            'severity': np.array([LOG_SEVERITY[t] for t in log_type]),
+            'message': np.array([LOG_MESSAGES[t] for t in log_type]),
+            'error_rate_pct': np.round(np.where(is_problem, rng.gamma(2, 1.5, n), 0), 2),
+            'response_time': np.round(rng.lognormal(6.3, 0.6, n), 2),
+            'records_processed': processed,
+            'records_failed': np.where(is_problem, rng.binomial(processed, 0.01), 0),
+            'source_file': np.array([f'{s}.py' for s in rng.choice(LOG_SERVICES, n)]),
+            'user_id': np.full(n, None, dtype=object),
+            'created_at': created,
+            'resolved_at': resolved_at
+        })
+
+
+def _rotation_template(roster_size):
+    """Minutes by rotation rank summing to 240: five starters, six reserves, rest DNP."""
+    template = np.zeros(roster_size, dtype=np.int64)
+    n = min(roster_size, len(ROTATION_MINUTES))
+    template[:n] = np.round(np.array(ROTATION_MINUTES[:n]) * TEAM_MINUTES / sum(ROTATION_MINUTES[:n]))
+    return template
+
+
+def _clock(seconds):
+    """Seconds into a quarter -> 'HH:MM:SS' as stored in LineupConfiguration."""
+    return np.array([f'00:{s // 60:02d}:{s % 60:02d}' for s in seconds])
+
+
+# ============================================================================
+# FILE OUTPUT & LOADING
+# ============================================================================
+
+def _format(value):
+    if value is None:
+        return NULL
+    if isinstance(value, float) and np.isnan(value):
+        return NULL
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', ' ').replace('\n', ' ')
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def write_table(path, table, columns):
+    """Write one table as a LOAD DATA-compatible tab-separated file; returns row count."""
+    names = TABLE_COLUMNS[table]
+    values = []
+    for name in names:
+        col = columns[name]
+        if np.issubdtype(col.dtype, np.datetime64):
+            col = col.astype(object)
+            col = [None if v is None else (v.isoformat(sep=' ') if isinstance(v, datetime) else str(v))
+                   for v in col]
+        else:
+            col = col.tolist()
+        values.append(col)
+
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in zip(*values):
+            f.write('\t'.join(_format(v) for v in row))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def _read_rows(path, batch_size):
+    batch = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            batch.append([None if v == NULL else v for v in line.rstrip('\n').split('\t')])
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def load_table(conn, table, path, method='auto', batch_size=5000):
+    """Bulk load one generated file. Returns the method that was used."""
+    columns = ', '.join(TABLE_COLUMNS[table])
+    cursor = conn.cursor()
+
+    if method in ('auto', 'load-data'):
+        try:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+                f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({columns})",
+                (path,)
+            )
+            conn.commit()
+            return 'load-data'
+        except pymysql.err.MySQLError as e:
+            conn.rollback()
+            if method == 'load-data':
+                raise
+            print(f'  LOAD DATA unavailable for {table} ({e}); using batched INSERT')
+
+    placeholders = ', '.join(['%s'] * len(TABLE_COLUMNS[table]))
+    query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+    for batch in _read_rows(path, batch_size):
+        # pymysql rewrites executemany on INSERT ... VALUES into multi-row statements
+        cursor.executemany(query, batch)
+        conn.commit()
+    return 'insert'
+
+
+def current_max_ids(conn):
+    cursor = conn.cursor()
+    offsets = {}
+    for table, key in (('Teams', 'team_id'), ('Players', 'player_id'), ('Game', 'game_id'),
+                       ('LineupConfiguration', 'lineup_id')):
+        cursor.execute(f'SELECT IFNULL(MAX({key}), 0) AS max_id FROM {table}')
+        offsets[table] = cursor.fetchone()[0]
+    return offsets
+
+
+def truncate_tables(conn):
+    cursor = conn.cursor()
+    for table in reversed(LOAD_ORDER):
+        cursor.execute(f'TRUNCATE TABLE {table}')
+    conn.commit()
+
+
+def connect(args):
+    return pymysql.connect(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        database=args.database,
+        local_infile=True,
+        autocommit=False
+    )
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Generate and bulk load a synthetic BallWatch league.')
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--players-per-roster', type=int, default=15)
+    parser.add_argument('--games-per-season', type=int, default=82, help='games per team per season')
+    parser.add_argument('--start-year', type=int, default=None, help='first season year (default: seasons ago)')
+    parser.add_argument('--turnover', type=float, default=0.15, help='share of roster slots replaced each offseason')
+    parser.add_argument('--trade-rate', type=float, default=0.05, help='share of roster slots moved at each trade window')
+    parser.add_argument('--matchup-depth', type=int, default=5, help='starters per side with matchup rows (0 to skip)')
+    parser.add_argument('--lineups-per-team', type=int, default=12, help='lineups per team per season')
+    parser.add_argument('--log-rows', type=int, default=100000)
+    parser.add_argument('--log-days', type=int, default=120, help='SystemLogs spread over this many recent days')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out-dir', default=None, help='where to write the .tsv files (default: temp dir)')
+    parser.add_argument('--files-only', action='store_true', help='write files without loading them')
+    parser.add_argument('--truncate', action='store_true', help='empty the generated tables first')
+    parser.add_argument('--method', choices=['auto', 'load-data', 'insert'], default='auto')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--host', default=os.getenv('DB_HOST', 'db').strip())
+    parser.add_argument('--port', type=int, default=int(os.getenv('DB_PORT', '3306').strip()))
+    parser.add_argument('--user', default=os.getenv('DB_USER', 'root').strip())
+    parser.add_argument('--password', default=os.getenv('MYSQL_ROOT_PASSWORD', '').strip())
+    parser.add_argument('--database', default=os.getenv('DB_NAME', 'BallWatch').strip())
+    args = parser.parse_args()
+
+    conn = None
+    offsets = {}
+    if not args.files_only:
+        conn = connect(args)
+        if args.truncate:
+            cursor = conn.cursor()
+            cursor.execute('SET FOREIGN_KEY_CHECKS = 0')
+            truncate_tables(conn)
+            cursor.execute('SET FOREIGN_KEY_CHECKS = 1')
+        else:
+            offsets = current_max_ids(conn)
+
+    started = time.perf_counter()
+    generator = LeagueGenerator(
+        teams=args.teams, seasons=args.seasons, roster_size=args.players_per_roster,
+        games_per_season=args.games_per_season, start_year=args.start_year, turnover=args.turnover,
+        trade_rate=args.trade_rate, matchup_depth=args.matchup_depth,
+        lineups_per_team=args.lineups_per_team, log_rows=args.log_rows, log_days=args.log_days,
+        seed=args.seed, id_offsets=offsets
+    )
+    tables = generator.generate()
+    print(f'Generated league in {time.perf_counter() - started:.1f}s')
+
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix='ballwatch-seed-')
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for table in LOAD_ORDER:
+        paths[table] = os.path.join(out_dir, f'{table}.tsv')
+        rows = write_table(paths[table], table, tables[table])
+        print(f'  {table:<20} {rows:>10,} rows -> {paths[table]}')
+
+    if conn is None:
+        return
+
+    cursor = conn.cursor()
+    # Rows are generated consistent with each other; skip per-row checks while loading
+    cursor.execute('SET FOREIGN_KEY_CHECKS = 0')
+    cursor.execute('SET UNIQUE_CHECKS = 0')
+    try:
+        for table in LOAD_ORDER:
+            started = time.perf_counter()
+            used = load_table(conn, table, paths[table], args.method, args.batch_size)
+            print(f'  loaded {table:<20} via {used:<9} in {time.perf_counter() - started:.1f}s')
+    finally:
+        cursor.execute('SET UNIQUE_CHECKS = 1')
+        cursor.execute('SET FOREIGN_KEY_CHECKS = 1')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark the serving modes against each other.
+
+Starts the API in each mode on a local port, waits for /system/ready, runs
+the same bench.load_gen traffic mix against it at each concurrency level and
+prints throughput, error rate and latency percentiles side by side:
+
+  dev       create_app().run(threaded=True): one process, one thread per request
+  gunicorn  gunicorn.conf.py: pre-forked gthread workers with preload
+  asgi      uvicorn backend.asgi:app: analytics/strategy aggregates on asyncio
+            and aiomysql, every other route through Flask
+
+Run from the api/ directory against a seeded database:
+    python -m bench.serve_compare --mix gamenight --arrival-rate 30 --concurrency 64 --duration 60
+    python -m bench.serve_compare --modes gunicorn,asgi --mix coach --concurrency 16,64,256
+    python -m bench.serve_compare --workers 4 --threads 8 --output /tmp/serve.json
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from bench.load_gen import MIX_PRESETS, load_context, parse_mix, run, summarize
+from bench.route_bench import BENCH_DIR, DEFAULT_RESULTS_DIR
+
+API_DIR = os.path.dirname(BENCH_DIR)
+
+DEV_SERVER = ("from backend.rest_entry import create_app; "
+              "create_app().run(host='127.0.0.1', port={port}, threaded=True)")
+
+
+def server_command(mode, port, workers=None):
+    if mode == 'dev':
+        return [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    if mode == 'asgi':
+        return [sys.executable, '-m', 'uvicorn', 'backend.asgi:app', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(workers or 1), '--log-level', 'warning']
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+            'backend_app:app']
+
+
+def wait_ready(base_url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{base_url}/system/ready', timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def parse_levels(value):
+    return [int(level) for level in value.split(',') if level.strip()]
+
+
+def run_mode(mode, args):
+    """{concurrency: load_gen summary} for one server, started once for all levels."""
+    env = dict(os.environ, BACKGROUND_JOBS_ENABLED='false', WARMUP_ENABLED='true')
+    if mode == 'gunicorn':
+        if args.workers:
+            env['WEB_CONCURRENCY'] = str(args.workers)
+        if args.threads:
+            env['GUNICORN_THREADS'] = str(args.threads)
+        env['GUNICORN_LOG_LEVEL'] = 'warning'
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    server = subprocess.Popen(server_command(mode, args.port, args.workers), cwd=API_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_ready(base_url, args.ready_timeout):
+            raise SystemExit(f'{mode} server did not become ready on {base_url}')
+        args.base_url = base_url
+        ctx = load_context(args)
+        reports = {}
+        for level in args.levels:
+            args.concurrency = level
+            print(f'{mode}: running {args.duration}s of load on {level} workers...')
+            recorder, arrivals, elapsed = run(args, args.mix, ctx)
+            reports[level] = summarize(recorder, arrivals, elapsed)
+        return reports
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def print_comparison(reports, level):
+    modes = list(reports)
+    print(f"\nconcurrency {level:<16}" + ''.join(f'{mode:>14}' for mode in modes))
+    rows = [('throughput (req/s)', lambda r: r['overall']['throughput_rps']),
+            ('error rate %', lambda r: round(r['overall']['error_rate'] * 100, 2)),
+            ('p50 ms', lambda r: r['overall']['p50_ms']),
+            ('p95 ms', lambda r: r['overall']['p95_ms']),
+            ('p99 ms', lambda r: r['overall']['p99_ms']),
+            ('queue wait p95 ms', lambda r: r['queue_wait']['p95_ms'])]
+    for label, value in rows:
+        print(f'{label:<28}' + ''.join(f'{value(reports[mode])!s:>14}' for mode in modes))
+    for persona in sorted(next(iter(reports.values()))['personas']):
+        print(f'{persona + " p95 ms":<28}' + ''.join(
+            f"{reports[mode]['personas'].get(persona, {}).get('p95_ms')!s:>14}" for mode in modes))
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Compare the serving modes under the same load.')
+    parser.add_argument('--modes', default='dev,gunicorn', help='comma-separated: dev, gunicorn, asgi')
+    parser.add_argument('--port', type=int, default=4100)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='gunicorn/uvicorn workers (default: gunicorn.conf.py, 1 for uvicorn)')
+    parser.add_argument('--threads', type=int, default=None, help='gunicorn threads per worker')
+    parser.add_argument('--mix', type=parse_mix, default='gamenight',
+                        help=f'preset ({", ".join(MIX_PRESETS)}) or persona=weight,...')
+    parser.add_argument('--arrival-rate', type=float, default=20.0)
+    parser.add_argument('--concurrency', dest='levels', type=parse_levels, default='32',
+                        help='load_gen workers; a comma-separated list runs each level in turn')
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--think-time', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--drain-timeout', type=float, default=60.0)
+    parser.add_argument('--ready-timeout', type=float, default=120.0)
+    parser.add_argument('--season', default=None)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='JSON report path (default: bench/results/)')
+    args = parser.parse_args()
+
+    runs = {mode: run_mode(mode, args) for mode in args.modes.split(',')}
+    for level in args.levels:
+        print_comparison({mode: reports[level] for mode, reports in runs.items()}, level)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f'serve-{datetime.now():%Y%m%d-%H%M%S}.json')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'config': {k: v for k, v in vars(args).items() if k not in ('base_url', 'concurrency')},
+                   'reports': runs}, f, indent=2)
+    print(f'\nReport written to {output}')
+
+
+if __name__ == '__main__':
+    main()
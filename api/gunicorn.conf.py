@@ -0,0 +1,62 @@
+"""Gunicorn configuration for the production serving mode.
+
+    gunicorn -c gunicorn.conf.py backend_app:app
+
+Concurrency model: WEB_CONCURRENCY pre-forked worker processes (default
+2 x cores + 1, capped at GUNICORN_MAX_WORKERS), each serving GUNICORN_THREADS
+requests at once on threads (gthread). Processes sidestep the GIL for the
+JSON/pandas work in the routes; threads overlap the time requests spend
+waiting on MySQL.
+
+The app is imported once in the master (preload_app), so workers fork with
+routes, blueprints and config already loaded. Nothing that must not be
+shared across fork is started there: database connections are pooled per
+process (db_connection.PooledMySQL builds a fresh pool on first use in each
+pid), and the warm-up starts in every worker from post_worker_init. The
+background jobs are started there too, but only run in the one worker
+holding the scheduler's MySQL advisory lock (backend/scheduler.py). Each worker therefore holds up to DB_POOL_SIZE
+connections (default: one per thread); keep workers x DB_POOL_SIZE below
+MySQL's max_connections.
+
+Workers are recycled after GUNICORN_MAX_REQUESTS requests (with jitter so
+they do not all restart together). `kill -HUP <master>` replaces the workers
+gracefully, letting in-flight requests finish within graceful_timeout;
+since the app is preloaded, deploying new code needs `kill -USR2` (new
+master) followed by `kill -QUIT` of the old one, or a container restart.
+"""
+
+import multiprocessing
+import os
+
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+workers = int(os.getenv('WEB_CONCURRENCY', '0')) or min(
+    multiprocessing.cpu_count() * 2 + 1, int(os.getenv('GUNICORN_MAX_WORKERS', '8')))
+worker_class = 'gthread'
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('FLASK_PORT', '4000')}")
+preload_app = True
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Read by create_app (imported after this file): one pooled connection per
+# thread by default, and leave the jobs and warm-up to the workers
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ['DEFER_WORKER_START'] = 'true'
+
+
+def when_ready(server):
+    server.log.info(f'{workers} workers x {threads} threads; up to '
+                    f"{workers * int(os.environ['DB_POOL_SIZE'])} MySQL connections")
+
+
+def post_worker_init(worker):
+    from backend.rest_entry import start_worker
+    start_worker(worker.wsgi)
@@ -60,7 +60,7 @@ def _default_api_base():
         for url in docker_urls:
             try:
                 logger.info(f"Trying Docker service: {url}")
-                resp = api_session.get(f'{url}/system/health', timeout=2)
+                resp = api_session.get(f'{url}/system/live', timeout=2)
                 if resp.status_code in [200, 404]:
                     logger.info(f"✅ Docker API found at: {url}")
                     return url
@@ -78,7 +78,7 @@ def _default_api_base():
     for url in localhost_urls:
         try:
             logger.info(f"Trying localhost: {url}")
-            resp = api_session.get(f'{url}/system/health', timeout=2)
+            resp = api_session.get(f'{url}/system/live', timeout=2)
             if resp.status_code in [200, 404]:
                 logger.info(f"✅ Local API found at: {url}")
                 return url
@@ -102,7 +102,7 @@ def initialize_api_base():
         
         # Test the connection
         try:
-            test_endpoints = ['/system/health', '/basketball/teams', '/auth/users']
+            test_endpoints = ['/system/live', '/basketball/teams', '/auth/users']
             for endpoint in test_endpoints:
                 try:
                     resp = api_session.get(f"{api_base}{endpoint}", timeout=2)
@@ -137,7 +137,7 @@ def test_api_connection():
     """Check connectivity against multiple API endpoints and set session state."""
     try:
         # Try multiple endpoints in case health check doesn't exist
-        test_endpoints = ['/system/health', '/basketball/teams', '/auth/users']
+        test_endpoints = ['/system/live', '/basketball/teams', '/auth/users']
         
         for endpoint in test_endpoints:
             try:
@@ -224,6 +224,16 @@ except ImportError:
         except:
             return None
 
+_home_cache = {}
+
+def _home_data(timeout=5):
+    """Users and teams from /pages/home, fetched once per script run
+    (the persona cards and team pickers all read from it)."""
+    if 'data' not in _home_cache:
+        data = call_get_raw('/pages/home', timeout=timeout)
+        _home_cache['data'] = data if isinstance(data, dict) else {}
+    return _home_cache['data']
+
 def get_users_for_role(role, timeout=5):
     """Return a list of users for the given role with enhanced error handling."""
     
@@ -242,6 +252,15 @@ def get_users_for_role(role, timeout=5):
             'general_manager': 'gm',
         }
         
+        # All users arrive with the page data; filter them here before asking per role
+        roles = [role.lower(), alias_map.get(role, '').lower()]
+        prefetched = [
+            user for user in (_home_data(timeout).get('users') or [])
+            if isinstance(user, dict) and user.get('username') and (user.get('role') or '').lower() in roles
+        ]
+        if prefetched:
+            return prefetched
+
         # Try primary role first
         candidates = [role]
         if role in alias_map:
@@ -301,6 +320,9 @@ def get_users_for_role(role, timeout=5):
 
 def get_teams(timeout=5):
     """Return teams list from backend API."""
+    teams = _home_data(timeout).get('teams')
+    if teams:
+        return teams
     try:
         data = call_get_raw('/basketball/teams', timeout=timeout)
         if isinstance(data, dict) and 'teams' in data:
@@ -1,16 +1,55 @@
 import os
+import re
+import json
 import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import pandas as pd
 import requests
 from urllib.parse import urljoin, parse_qs
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import pyarrow as pa
+except ImportError:  # optional: get_frame() asks for MessagePack or JSON instead
+    pa = None
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 # Module-level API base and session
 API_BASE = None
 _session = None
 
+# Trace context of the page run executing on this thread (Streamlit runs each
+# script run on its own thread); set by start_page_trace()
+_trace = threading.local()
+
+# Calls recorded per page run for the timing panel (modules/perf_panel)
+MAX_RECORDED_CALLS = 200
+_SERVER_TIMING = re.compile(r'(\w+);dur=([\d.]+)')
+
+# Last ETag and body per GET URL + params: revalidated with If-None-Match, so an
+# unchanged result costs a 304 instead of the query and the transfer
+ETAG_CACHE_MAX_BYTES = int(os.getenv('API_ETAG_CACHE_MB', '64')) * 1024 * 1024
+_etag_cache = OrderedDict()  # key -> (etag, body bytes, content type)
+_etag_cache_bytes = 0
+_etag_lock = threading.Lock()
+
+# get_frame() asks for columns (see api/backend/columnar.py) in the best format installed here
+ARROW = 'application/vnd.apache.arrow.stream'
+MSGPACK = 'application/x-msgpack'
+FRAME_ACCEPT = ', '.join(
+    ([ARROW] if pa is not None else []) + ([f'{MSGPACK};q=0.9'] if msgpack is not None else [])
+    + ['application/json;q=0.5'])
+
 
 def _default_api_base():
     """Resolve API base from environment with sensible fallbacks.
@@ -56,6 +95,138 @@ def ensure_api_base():
     return API_BASE
 
 
+def start_page_trace(page=None):
+    """Start a new trace for this page run; every API call until the next
+    start_page_trace() carries its trace id and page name."""
+    _trace.trace_id = uuid.uuid4().hex[:16]
+    _trace.page = page
+    _trace.started = time.perf_counter()
+    _trace.calls = []
+    _trace.listener = None
+    return _trace.trace_id
+
+
+def current_trace_id():
+    return getattr(_trace, 'trace_id', None)
+
+
+def page_calls():
+    """API calls and cache hits recorded since this page run started."""
+    return list(getattr(_trace, 'calls', []))
+
+
+def page_elapsed_ms():
+    started = getattr(_trace, 'started', None)
+    return (time.perf_counter() - started) * 1000 if started else 0.0
+
+
+def set_call_listener(listener):
+    """Call `listener()` after each call recorded in this page run."""
+    _trace.listener = listener
+
+
+def _record_call(entry):
+    calls = getattr(_trace, 'calls', None)
+    if calls is None or len(calls) >= MAX_RECORDED_CALLS:
+        return
+    calls.append(entry)
+    listener = getattr(_trace, 'listener', None)
+    if listener is not None:
+        try:
+            listener()
+        except Exception:
+            logger.debug('Timing panel listener failed', exc_info=True)
+
+
+def record_cache_hit(name, started, duration_ms):
+    """Record a cached data function that returned without calling the API."""
+    _record_call({
+        'kind': 'cache',
+        'call': name,
+        'start_ms': (started - getattr(_trace, 'started', started)) * 1000,
+        'ms': duration_ms,
+        'status': None,
+        'bytes': 0,
+        'server_ms': None,
+        'db_ms': None,
+        'parse_ms': None,
+        'error': None
+    })
+
+
+def _server_timing(resp):
+    """{'app': ms, 'db': ms} from the API's Server-Timing header."""
+    return {name: float(value) for name, value in _SERVER_TIMING.findall(resp.headers.get('Server-Timing', ''))}
+
+
+def _trace_headers():
+    """X-Request-ID for this call plus the page's X-Trace-ID / X-Trace-Page."""
+    request_id = uuid.uuid4().hex[:16]
+    headers = {'X-Request-ID': request_id, 'X-Trace-ID': current_trace_id() or request_id}
+    page = getattr(_trace, 'page', None)
+    if page:
+        headers['X-Trace-Page'] = page
+    return headers
+
+
+def _etag_key(url, params, accept=None):
+    return url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())), accept
+
+
+def _cached_etag(key):
+    with _etag_lock:
+        entry = _etag_cache.get(key)
+        if entry is None:
+            return None
+        _etag_cache.move_to_end(key)
+        return entry
+
+
+def _store_etag(key, etag, body, content_type):
+    global _etag_cache_bytes
+    if len(body) > ETAG_CACHE_MAX_BYTES // 4:
+        return
+    with _etag_lock:
+        old = _etag_cache.pop(key, None)
+        if old is not None:
+            _etag_cache_bytes -= len(old[1])
+        _etag_cache[key] = (etag, body, content_type)
+        _etag_cache_bytes += len(body)
+        while _etag_cache_bytes > ETAG_CACHE_MAX_BYTES:
+            _, (_, evicted, _) = _etag_cache.popitem(last=False)
+            _etag_cache_bytes -= len(evicted)
+
+
+def _forget_etag(key):
+    global _etag_cache_bytes
+    with _etag_lock:
+        old = _etag_cache.pop(key, None)
+        if old is not None:
+            _etag_cache_bytes -= len(old[1])
+
+
+def _decode(body, content_type):
+    """A response body as JSON, or as a DataFrame for columnar content types;
+    the rest of a columnar payload (counts, filters, ...) is in df.attrs['meta']."""
+    mimetype = (content_type or '').split(';', 1)[0].strip()
+    if mimetype == ARROW and pa is not None:
+        table = pa.ipc.open_stream(body).read_all()
+        df = table.to_pandas()
+        df.attrs['meta'] = json.loads((table.schema.metadata or {}).get(b'ballwatch.meta', b'{}'))
+        return df
+    if mimetype == MSGPACK and msgpack is not None:
+        doc = msgpack.unpackb(body, raw=False)
+        df = pd.DataFrame(dict(zip(doc['columns'], doc['data'])), columns=doc['columns'])
+        for column, kind in doc.get('types', {}).items():
+            df[column] = pd.to_datetime(df[column])
+            if kind == 'date':
+                df[column] = df[column].dt.date
+        df.attrs['meta'] = doc.get('meta') or {}
+        return df
+    # Defensive: some endpoints return empty body
+    return json.loads(body) if body else {}
+
+
 def _parse_endpoint_with_query(endpoint: str):
     """Return (path, params_dict) given endpoint which may include querystring."""
     if not endpoint:
@@ -67,9 +238,9 @@ def _parse_endpoint_with_query(endpoint: str):
     return (path, params)
 
 
-def _request(method: str, endpoint: str, data=None, params=None, timeout=10):
+def _request(method: str, endpoint: str, data=None, params=None, timeout=10, accept=None):
     """Generic request helper that joins the API base and handles errors.
-    Returns JSON dict or None on failure.
+    Returns JSON dict (a DataFrame for columnar responses) or None on failure.
     """
     base = ensure_api_base()
     path, implicit_params = _parse_endpoint_with_query(endpoint)
@@ -81,17 +252,48 @@ def _request(method: str, endpoint: str, data=None, params=None, timeout=10):
         merged_params.update(params)
 
     session = _ensure_session()
+    started = time.perf_counter()
+    call = {'kind': 'api', 'call': f'{method} {path}', 'params': merged_params, 'status': None,
+            'bytes': 0, 'server_ms': None, 'db_ms': None, 'parse_ms': None, 'error': None}
+    headers = _trace_headers()
+    if accept:
+        headers['Accept'] = accept
+    cache_key = cached = None
+    if method == 'GET':
+        cache_key = _etag_key(url, merged_params, accept)
+        cached = _cached_etag(cache_key)
+        if cached:
+            headers['If-None-Match'] = cached[0]
     try:
-        resp = session.request(method, url, json=data, params=merged_params or None, timeout=timeout)
+        resp = session.request(method, url, json=data, params=merged_params or None, timeout=timeout,
+                               headers=headers)
+        received = time.perf_counter()
+        timing = _server_timing(resp)
+        call.update(status=resp.status_code, bytes=len(resp.content),
+                    server_ms=timing.get('app'), db_ms=timing.get('db'))
         resp.raise_for_status()
-        # Defensive: some endpoints return empty body
-        if resp.text:
-            return resp.json()
-        return {}
+        if resp.status_code == 304 and cached:
+            # Unchanged since the last fetch: parse the stored body again (callers may mutate results)
+            result = _decode(cached[1], cached[2])
+        else:
+            result = _decode(resp.content, resp.headers.get('Content-Type'))
+            if cache_key is not None:
+                if resp.headers.get('ETag'):
+                    _store_etag(cache_key, resp.headers['ETag'], resp.content, resp.headers.get('Content-Type'))
+                elif cached:
+                    _forget_etag(cache_key)
+        call['parse_ms'] = (time.perf_counter() - received) * 1000
+        return result
     except requests.HTTPError as he:
+        call['error'] = str(he)
         logger.warning('HTTP %s %s failed: %s - %s', method, url, resp.status_code if 'resp' in locals() else '', str(he))
     except Exception as e:
+        call['error'] = str(e)
         logger.exception('Request error %s %s: %s', method, url, e)
+    finally:
+        call['start_ms'] = (started - getattr(_trace, 'started', started)) * 1000
+        call['ms'] = (time.perf_counter() - started) * 1000
+        _record_call(call)
     return None
 
 
@@ -99,6 +301,89 @@ def api_get(endpoint: str, params=None, timeout=10):
     return _request('GET', endpoint, data=None, params=params, timeout=timeout)
 
 
+def get_frame(endpoint: str, key=None, params=None, timeout=10):
+    """GET a list endpoint straight into a DataFrame, or None on failure.
+
+    `key` names the list to frame in a dict payload (e.g. 'players'); without
+    it the payload's only list of rows is used. Sent as Arrow or MessagePack
+    when both sides have the library, else as JSON; either way the rest of the
+    payload is in df.attrs['meta'].
+    """
+    params = dict(params or {})
+    if key:
+        params['frame'] = key
+    result = _request('GET', endpoint, params=params, timeout=timeout, accept=FRAME_ACCEPT)
+    if result is None or isinstance(result, pd.DataFrame):
+        return result
+    if isinstance(result, list):
+        rows, meta = result, {}
+    else:
+        if key is None:
+            lists = [k for k, v in result.items() if isinstance(v, list)]
+            key = lists[0] if len(lists) == 1 else None
+        rows = (result.get(key) or []) if key else []
+        meta = {k: v for k, v in result.items() if k != key}
+    df = pd.DataFrame(rows)
+    df.attrs['meta'] = meta
+    return df
+
+
+def get_page_data(page: str, params=None, include=None, timeout=10):
+    """GET /pages/<page>: the sections a page renders (players, stats, teams, ...)
+    in one request. `include` picks sections instead of the page's defaults.
+    Returns the payload dict, {} on failure; failed sections are named under 'errors'.
+    """
+    params = dict(params or {})
+    if include:
+        params['include'] = ','.join(include)
+    result = api_get(f'/pages/{page}', params=params, timeout=timeout)
+    if not isinstance(result, dict):
+        return {}
+    if result.get('errors'):
+        logger.warning('Page data %s: sections failed: %s', page, ', '.join(result['errors']))
+    return result
+
+
+BATCH_SIZE = int(os.getenv('API_BATCH_SIZE', '50'))  # the API's BATCH_MAX_REQUESTS
+
+
+def _batch_item(call):
+    if isinstance(call, str):
+        path, params = _parse_endpoint_with_query(call)
+        return {'method': 'GET', 'path': path, 'query': params or None}
+    item = {'method': call.get('method', 'GET').upper(), 'path': call['path']}
+    if call.get('params'):
+        item['query'] = call['params']
+    if call.get('data') is not None:
+        item['body'] = call['data']
+    return item
+
+
+def batch(calls, timeout=30):
+    """Run several API calls in one HTTP request per BATCH_SIZE calls (POST /batch).
+
+    `calls` are endpoint strings (GETs, query string allowed) or dicts
+    {'method', 'path', 'params', 'data'}. Returns one result per call, in order:
+    its JSON body, or None where that call (or the whole batch) failed.
+    """
+    items = [_batch_item(call) for call in calls]
+    results = []
+    for start in range(0, len(items), BATCH_SIZE):
+        chunk = items[start:start + BATCH_SIZE]
+        resp = _request('POST', '/batch', data={'requests': chunk}, timeout=timeout)
+        responses = resp.get('responses') if isinstance(resp, dict) else None
+        if not isinstance(responses, list) or len(responses) != len(chunk):
+            results.extend([None] * len(chunk))
+            continue
+        for item, sub in zip(chunk, responses):
+            if 200 <= sub.get('status', 500) < 300:
+                results.append(sub.get('body'))
+            else:
+                logger.warning('Batched %s %s failed: %s', item['method'], item['path'], sub.get('status'))
+                results.append(None)
+    return results
+
+
 def api_post(endpoint: str, data=None, timeout=10):
     return _request('POST', endpoint, data=data, params=None, timeout=timeout)
 
@@ -2,8 +2,13 @@
 
 # This file has function to add certain functionality to the left side bar of the app
 
+import os
+import sys
+
 import streamlit as st
 
+from modules import api_client, perf_panel
+
 
 #### ------------------------ General ------------------------
 def HomeNav():
@@ -49,6 +54,10 @@ def GeneralManagerNav():
 def SideBarLinks(show_home=False):
     """Add persona-based links and basic auth handling to the sidebar."""
 
+    # Every page calls this first: start the trace its API calls will share
+    caller = os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
+    api_client.start_page_trace(caller)
+
     # add a logo to the sidebar
     st.sidebar.image("assets/logo.png", width=150)
 
@@ -77,3 +86,6 @@ def SideBarLinks(show_home=False):
             st.session_state.pop("user_id", None)
             st.session_state.pop("username", None)
             st.switch_page("Home.py")
+
+    # Collapsible timing panel for this page run's API calls
+    perf_panel.attach()
@@ -0,0 +1,109 @@
+"""Sidebar panel showing the API calls of the current page run.
+
+`modules/api_client` records every call's latency, payload size, status and
+the API's Server-Timing (app and DB time); `cache_data` below records calls
+answered by Streamlit's cache. The panel is attached by
+`modules/nav.SideBarLinks` and redraws as calls complete, so it shows how much
+of a slow page is spent waiting on the API (and within that, server, network
+and JSON parsing time) versus the time after the last call, which is
+rendering. Set API_TIMING_PANEL=false to hide it.
+"""
+
+import functools
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from modules import api_client
+
+ENABLED = os.getenv('API_TIMING_PANEL', 'true').lower() == 'true'
+WATERFALL_WIDTH = 24
+
+
+def cache_data(*args, **kwargs):
+    """`st.cache_data` that reports cache hits to the timing panel.
+
+    Use exactly like st.cache_data: `@cache_data(ttl=300)`.
+    """
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return cache_data()(args[0])
+
+    def decorate(func):
+        state = threading.local()
+
+        @functools.wraps(func)
+        def miss(*a, **k):
+            state.missed = True
+            return func(*a, **k)
+
+        cached = st.cache_data(*args, **kwargs)(miss)
+
+        @functools.wraps(func)
+        def wrapper(*a, **k):
+            state.missed = False
+            started = time.perf_counter()
+            result = cached(*a, **k)
+            if not state.missed:
+                api_client.record_cache_hit(func.__name__, started, (time.perf_counter() - started) * 1000)
+            return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorate
+
+
+def _waterfall(start_ms, ms, span_ms):
+    offset = int(start_ms / span_ms * WATERFALL_WIDTH)
+    length = max(1, round(ms / span_ms * WATERFALL_WIDTH))
+    return '·' * offset + '█' * min(length, WATERFALL_WIDTH - offset)
+
+
+def _render(placeholder):
+    calls = api_client.page_calls()
+    api_calls = [c for c in calls if c['kind'] == 'api']
+    cache_hits = [c for c in calls if c['kind'] == 'cache']
+    waiting_ms = sum(c['ms'] for c in api_calls)
+    server_ms = sum(c['server_ms'] or 0 for c in api_calls)
+    parse_ms = sum(c['parse_ms'] or 0 for c in api_calls)
+    payload_kb = sum(c['bytes'] for c in api_calls) / 1024
+    elapsed_ms = api_client.page_elapsed_ms()
+
+    with placeholder.container():
+        st.caption(
+            f"{len(api_calls)} API calls · {len(cache_hits)} cache hits · {payload_kb:,.1f} KB\n\n"
+            f"Waiting on the API: **{waiting_ms:,.0f} ms** of {elapsed_ms:,.0f} ms so far "
+            f"(server {server_ms:,.0f} · network {max(waiting_ms - server_ms - parse_ms, 0):,.0f} "
+            f"· JSON parse {parse_ms:,.0f})"
+        )
+        if not calls:
+            return
+
+        span_ms = max(max(c['start_ms'] + c['ms'] for c in calls), 1)
+        rows = [{
+            'Call': c['call'] if c['kind'] == 'api' else f"cache: {c['call']}",
+            'Status': c['status'] if c['status'] is not None else ('hit' if c['kind'] == 'cache' else 'error'),
+            'ms': round(c['ms'], 1),
+            'Server ms': round(c['server_ms'], 1) if c['server_ms'] is not None else None,
+            'KB': round(c['bytes'] / 1024, 1),
+            'Waterfall': _waterfall(c['start_ms'], c['ms'], span_ms)
+        } for c in calls]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+        slowest = max(api_calls, key=lambda c: c['ms'], default=None)
+        if slowest is not None and slowest['db_ms'] is not None:
+            st.caption(f"Slowest: {slowest['call']} — {slowest['ms']:,.0f} ms, "
+                       f"{slowest['db_ms']:,.0f} ms of it in SQL")
+        st.caption('Time after the last call is the page rendering.')
+
+
+def attach():
+    """Add the collapsible timing panel to the sidebar for this page run."""
+    if not ENABLED:
+        return
+    placeholder = st.sidebar.expander('⏱ API timing', expanded=False).empty()
+    api_client.set_call_listener(lambda: _render(placeholder))
+    _render(placeholder)
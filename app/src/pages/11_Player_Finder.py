@@ -7,6 +7,7 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 from modules.nav import SideBarLinks
+from modules.perf_panel import cache_data
 from modules import api_client
 
 # ensure session api base is initialized
@@ -56,12 +57,6 @@ def get_players(params: dict | None = None):
         return []
 
 
-def get_player_stats(player_id: int):
-    data = api_client.api_get(f'/basketball/players/{player_id}/stats')
-    if not data:
-        return {}
-    return data.get('stats') or data.get('player_stats') or data
-
 logger = logging.getLogger(__name__)
 st.set_page_config(page_title="Player Finder - Superfan", layout="wide")
 
@@ -77,7 +72,7 @@ if "last_filters_pf" not in st.session_state:
     st.session_state.last_filters_pf = {}
 
 # ---------- Utilities ----------
-@st.cache_data(ttl=180)
+@cache_data(ttl=180)
 def resolve_team_ids_by_name(name_query: str) -> list[int]:
     """
     Look up team(s) by name using /basketball/teams and return their team_id values.
@@ -107,7 +102,7 @@ def _safe_players_df(rows):
     except Exception:
         return pd.DataFrame()
 
-@st.cache_data(ttl=120)
+@cache_data(ttl=120)
 def load_players(position=None, team_name=None, min_age=None, max_age=None, min_salary=None, max_salary=None):
     """
     Option A:
@@ -140,14 +135,17 @@ def load_players(position=None, team_name=None, min_age=None, max_age=None, min_
 
     return _safe_players_df(rows)
 
-@st.cache_data(ttl=120)
-def fetch_player_stats(player_id: int):
+@cache_data(ttl=120)
+def fetch_players_stats(player_ids: tuple) -> dict:
     """
-    Fetch per-player stats WITHOUT season/game type filters.
+    Fetch per-player stats WITHOUT season/game type filters, all players in one batch.
     Supports both {player_stats: {...}} and {stats: {...}} response shapes.
     """
-    resp = get_player_stats(player_id)
-    return resp or {}
+    results = api_client.batch([f'/basketball/players/{pid}/stats' for pid in player_ids])
+    return {
+        pid: (data.get('stats') or data.get('player_stats') or data) if isinstance(data, dict) else {}
+        for pid, data in zip(player_ids, results)
+    }
 
 def enrich_with_stats(df_players: pd.DataFrame, max_players: int = 50):
     """For performance, cap the number of stat fetches."""
@@ -156,8 +154,9 @@ def enrich_with_stats(df_players: pd.DataFrame, max_players: int = 50):
 
     rows = []
     limit = min(len(df_players), max_players)
+    stats_by_id = fetch_players_stats(tuple(int(pid) for pid in df_players.head(limit)["player_id"]))
     for _, row in df_players.head(limit).iterrows():
-        stats = fetch_player_stats(int(row["player_id"]))
+        stats = stats_by_id.get(int(row["player_id"]))
         merged = {**row.to_dict(), **(stats or {})}
         rows.append(merged)
     # If there are more players than max_players, keep the remaining without stats.
@@ -5,6 +5,7 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from modules.nav import SideBarLinks
+from modules.perf_panel import cache_data
 from modules import api_client
 import os
 
@@ -27,66 +28,6 @@ if "last_filters" not in st.session_state:
 
 api_client.ensure_api_base()
 
-# Use api_client for raw calls
-def call_get_raw(endpoint: str, params: dict | None = None, timeout=5):
-    return api_client.api_get(endpoint, params=params, timeout=timeout)
-
-
-def get_teams(timeout=5):
-    data = api_client.api_get('/basketball/teams', timeout=timeout)
-    if isinstance(data, dict) and 'teams' in data:
-        return data.get('teams', [])
-    if isinstance(data, list):
-        return data
-    return []
-
-
-def get_players(params: dict | None = None):
-    try:
-        return api_client.get_players(params=params)
-    except Exception:
-        data = api_client.api_get('/basketball/players', params=params)
-        if isinstance(data, dict) and 'players' in data:
-            return data.get('players', [])
-        if isinstance(data, list):
-            return data
-        return []
-
-
-def get_player_stats(player_id: int):
-    return api_client.api_get(f'/basketball/players/{player_id}/stats')
-
-# compatibility wrapper used by page code
-def api_get(path: str, params: dict | None = None):
-    if path.startswith('/basketball/players'):
-        return {'players': get_players(params)}
-    if path == '/basketball/teams':
-        return {'teams': get_teams()}
-    return call_get_raw(path, params)
-
-@st.cache_data(ttl=300)
-def fetch_teams_df() -> pd.DataFrame:
-    resp = api_get("/basketball/teams")
-    teams = resp.get("teams", []) if isinstance(resp, dict) else (resp or [])
-    df = pd.DataFrame(teams)
-    for col in ["team_id", "name", "city", "conference", "division"]:
-        if col not in df.columns:
-            df[col] = None
-    return df
-
-@st.cache_data(ttl=300)
-def resolve_team_ids_by_name(name_query: str) -> list[int]:
-    if not name_query:
-        return []
-    df = fetch_teams_df()
-    if df.empty:
-        return []
-    exact = df[df["name"].str.lower() == name_query.strip().lower()]
-    if not exact.empty:
-        return exact["team_id"].dropna().astype(int).tolist()
-    contains = df[df["name"].str.contains(name_query, case=False, na=False)]
-    return contains["team_id"].dropna().astype(int).tolist()
-
 def _safe_df_rows(rows):
     try:
         if isinstance(rows, list):
@@ -101,38 +42,19 @@ def _safe_df_rows(rows):
     except Exception:
         return pd.DataFrame()
 
-@st.cache_data(ttl=180)
+@cache_data(ttl=180)
 def load_all_players(position: str | None = None, team_name: str | None = None) -> pd.DataFrame:
-    base_params = {}
+    # One request: the API filters by team name itself (/pages/player-comparison)
+    params = {}
     if position:
-        base_params["position"] = position
-
-    rows: list[dict] = []
-
+        params["position"] = position
     if team_name:
-        team_ids = resolve_team_ids_by_name(team_name)
-        if team_ids:
-            for tid in team_ids:
-                params = {**base_params, "team_id": tid}
-                data = api_get("/basketball/players", params)
-                part = data.get("players", []) if isinstance(data, dict) else (data or [])
-                rows.extend(part)
-            if rows:
-                rows = list({r.get("player_id"): r for r in rows if isinstance(r, dict) and r.get("player_id") is not None}.values())
-                df = _safe_df_rows(rows)
-            else:
-                df = pd.DataFrame()
-        else:
-            data = api_get("/basketball/players", base_params)
-            rows = data.get("players", []) if isinstance(data, dict) else (data or [])
-            df = _safe_df_rows(rows)
-            if not df.empty and "current_team" in df.columns:
-                mask = df["current_team"].fillna("").str.contains(team_name, case=False, na=False)
-                df = df[mask].reset_index(drop=True)
-    else:
-        data = api_get("/basketball/players", base_params)
-        rows = data.get("players", []) if isinstance(data, dict) else (data or [])
-        df = _safe_df_rows(rows)
+        params["team_name"] = team_name
+    data = api_client.get_page_data("player-comparison", params, include=("players",))
+    rows = data.get("players") or []
+    if rows:
+        rows = list({r.get("player_id"): r for r in rows if isinstance(r, dict) and r.get("player_id") is not None}.values())
+    df = _safe_df_rows(rows)
 
     if not df.empty:
         if "position" not in df.columns:
@@ -144,16 +66,24 @@ def load_all_players(position: str | None = None, team_name: str | None = None)
         )
     return df
 
-@st.cache_data(ttl=180)
-def fetch_player_stats(player_id: int):
-    resp = get_player_stats(player_id)
-    if not resp:
-        return {}, pd.DataFrame()
-    stats = resp.get("stats") or resp.get("player_stats") or resp.get('player_stats') or {}
-    recent = pd.DataFrame(resp.get("recent_games", []) or [])
+def _recent_df(rows):
+    recent = pd.DataFrame(rows or [])
     if "game_date" not in recent.columns and "date" in recent.columns:
         recent = recent.rename(columns={"date": "game_date"})
-    return stats, recent
+    return recent
+
+@cache_data(ttl=180)
+def fetch_comparison(p1_id: int, p2_id: int):
+    """Stats and recent games of both players in one request."""
+    data = api_client.get_page_data(
+        "player-comparison",
+        {"player_ids": f"{p1_id},{p2_id}", "recent": 25},
+        include=("stats", "recent_games"),
+    )
+    stats = data.get("stats") or {}
+    recent = data.get("recent_games") or {}
+    return (stats.get(str(p1_id)) or {}, _recent_df(recent.get(str(p1_id))),
+            stats.get(str(p2_id)) or {}, _recent_df(recent.get(str(p2_id))))
 
 # ------------------------------------------------------------------------------------
 # Filters (no season or game_type)
@@ -219,8 +149,7 @@ st.markdown("---")
 # Comparison
 # ------------------------------------------------------------------------------------
 if st.session_state.compare and p1_id and p2_id:
-    p1_stats, p1_recent = fetch_player_stats(p1_id)
-    p2_stats, p2_recent = fetch_player_stats(p2_id)
+    p1_stats, p1_recent, p2_stats, p2_recent = fetch_comparison(p1_id, p2_id)
 
     c1, c2 = st.columns(2)
 
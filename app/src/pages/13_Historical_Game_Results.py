@@ -8,6 +8,7 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 from modules.nav import SideBarLinks
+from modules.perf_panel import cache_data
 import requests
 import urllib.parse
 from typing import Optional, Dict, Any, Tuple
@@ -62,7 +63,7 @@ def search_games(params: dict | None = None):
 def get_game_details(game_id: int):
     return api_client.api_get(f'/basketball/games/{int(game_id)}')
 
-@st.cache_data(ttl=300)
+@cache_data(ttl=300)
 def load_teams() -> pd.DataFrame:
     """Fetch teams for name-based selection."""
     data = get_teams()
@@ -76,7 +77,7 @@ def load_teams() -> pd.DataFrame:
         )
     return df
 
-@st.cache_data(ttl=180)
+@cache_data(ttl=180)
 def search_games_wrapper(start_date: str | None, end_date: str | None,
                  season: str | None, game_type: str | None, status: str | None) -> dict | None:
     """We do NOT pass team_id here; we'll filter by team name client-side."""
@@ -88,7 +89,7 @@ def search_games_wrapper(start_date: str | None, end_date: str | None,
     if status: params["status"] = status
     return search_games(params)
 
-@st.cache_data(ttl=180)
+@cache_data(ttl=180)
 def get_game_details_wrapper(game_id: int) -> dict | None:
     return get_game_details(game_id)
 
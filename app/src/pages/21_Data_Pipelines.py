@@ -158,7 +158,7 @@ st.subheader("Data Load History")
 # Enhanced Filters
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
 with col1:
-    status_filter = st.selectbox("Status", ["All", "completed", "running", "failed", "pending"])
+    status_filter = st.selectbox("Status", ["All", "completed", "running", "failed", "pending", "retry_scheduled", "dead_letter"])
 with col2:
     load_type_filter = st.selectbox("Load Type", ["All", "NBA API", "ESPN Feed", "Draft API", "Contract API", "Analytics Engine"])
 with col3:
@@ -224,7 +224,9 @@ if loads and len(loads) > 0:
                 'completed': 'COMPLETED',
                 'running': 'RUNNING',
                 'failed': 'FAILED',
-                'pending': 'PENDING'
+                'pending': 'PENDING',
+                'retry_scheduled': 'RETRY SCHEDULED',
+                'dead_letter': 'DEAD LETTER'
             }
             return status_icons.get(status, str(status).upper())
         
@@ -329,7 +331,7 @@ if loads and len(loads) > 0:
             st.info("Page will auto-refresh every 30 seconds for running loads")
         
         # Failed loads with enhanced details
-        failed_loads = df[df['status'] == 'failed']
+        failed_loads = df[df['status'].isin(['failed', 'retry_scheduled', 'dead_letter'])]
         if not failed_loads.empty:
             st.subheader("Failed Loads")
             for _, load in failed_loads.iterrows():
@@ -345,6 +347,12 @@ if loads and len(loads) > 0:
                         
                         if load.get('error_message'):
                             st.error(f"**Error:** {load['error_message']}")
+                        if load.get('attempt'):
+                            st.write(f"- **Attempt:** {int(load['attempt'])}")
+                        if load['status'] == 'retry_scheduled' and load.get('next_retry_at'):
+                            st.info(f"Automatic retry scheduled for {load['next_retry_at']}")
+                        elif load['status'] == 'dead_letter':
+                            st.warning("Retry attempts exhausted; manual retry required")
                     
                     with col2:
                         st.write("**Processing Summary:**")
@@ -371,13 +379,9 @@ if loads and len(loads) > 0:
                         
                         with button_col2:
                             if st.button(f"Retry Load", key=f"retry_{load['load_id']}"):
-                                result = api_post('/system/data-loads', {
-                                    'load_type': load['load_type'],
-                                    'source_file': load.get('source_file'),
-                                    'initiated_by': st.session_state.get('username', 'system')
-                                })
+                                result = api_post(f"/system/data-loads/{load['load_id']}/retry", {})
                                 if result:
-                                    st.success(f"New load started: ID {result.get('load_id')}")
+                                    st.success(f"Retry queued: ID {result.get('load_id')}")
                                     st.rerun()
     else:
         st.info("No data loads found for the selected criteria.")
@@ -159,7 +159,9 @@ if health_data:
         st.caption("Currently running")
     
     if health_data.get('health_check_timestamp'):
-        st.caption(f"Last updated: {health_data['health_check_timestamp']}")
+        age = health_data.get('sample_age_seconds')
+        age_text = f" (sampled {age:.0f}s ago)" if isinstance(age, (int, float)) else ""
+        st.caption(f"Last updated: {health_data['health_check_timestamp']}{age_text}")
     
     st.divider()
     
@@ -376,4 +378,78 @@ else:
                 'error_message', 'created_at', 'status']],
         use_container_width=True,
         hide_index=True
-    )
\ No newline at end of file
+    )
+st.divider()
+
+st.subheader("Recent Request Traces")
+st.caption("Requests recently served by the API, grouped by the page run that made them. "
+           "Select a request to see the SQL statements behind it.")
+
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    trace_page_filter = st.text_input("Page contains", placeholder="e.g. 32_Lineup_and_Situational")
+with col2:
+    trace_min_ms = st.number_input("Min duration (ms)", min_value=0, value=0, step=50)
+with col3:
+    trace_limit = st.number_input("Show", min_value=10, max_value=500, value=50, step=10)
+
+trace_params = {'limit': int(trace_limit)}
+if trace_page_filter:
+    trace_params['page'] = trace_page_filter
+if trace_min_ms:
+    trace_params['min_duration_ms'] = trace_min_ms
+
+trace_data = api_client.api_get('/system/traces', params=trace_params)
+traces = (trace_data or {}).get('traces') or []
+
+if traces:
+    df_traces = pd.DataFrame(traces)
+    trace_columns = [c for c in ['started_at', 'page', 'method', 'path', 'status_code', 'duration_ms',
+                                 'db_ms', 'queries', 'trace_id', 'request_id'] if c in df_traces.columns]
+    st.dataframe(
+        df_traces[trace_columns],
+        column_config={
+            'started_at': "Time",
+            'page': "Page",
+            'method': "Method",
+            'path': "Path",
+            'status_code': "Status",
+            'duration_ms': st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+            'db_ms': st.column_config.NumberColumn("DB (ms)", format="%.1f"),
+            'queries': "Queries",
+            'trace_id': "Trace",
+            'request_id': "Request"
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+    labels = {
+        f"{t.get('page') or '-'} · {t['method']} {t['path']} · {t['duration_ms']:.0f} ms · {t['request_id']}": t['request_id']
+        for t in traces
+    }
+    selected = st.selectbox("Inspect request", list(labels.keys()))
+    if selected:
+        detail = api_client.api_get(f"/system/traces/{labels[selected]}")
+        if detail:
+            st.caption(f"Trace {detail.get('trace_id')} · {detail.get('queries', 0)} queries · "
+                       f"{detail.get('db_ms', 0):.1f} ms in DB of {detail.get('duration_ms', 0):.1f} ms total")
+            spans = detail.get('spans') or []
+            if spans:
+                st.dataframe(
+                    pd.DataFrame(spans)[['start_ms', 'duration_ms', 'sql', 'error']],
+                    column_config={
+                        'start_ms': st.column_config.NumberColumn("Start (ms)", format="%.1f"),
+                        'duration_ms': st.column_config.NumberColumn("Duration (ms)", format="%.1f"),
+                        'sql': "Statement",
+                        'error': "Error"
+                    },
+                    use_container_width=True,
+                    hide_index=True
+                )
+            else:
+                st.info("This request ran no SQL.")
+            if detail.get('dropped_spans'):
+                st.caption(f"{detail['dropped_spans']} further statements were not recorded.")
+else:
+    st.info("No traced requests yet.")
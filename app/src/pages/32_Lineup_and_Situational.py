@@ -3,6 +3,7 @@ import logging
 import streamlit as st
 import pandas as pd
 from modules.nav import SideBarLinks
+from modules.perf_panel import cache_data
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -41,7 +42,7 @@ SideBarLinks()
 st.title('Lineup & Situational — Head Coach')
 
 # Load teams data
-@st.cache_data(ttl=300)
+@cache_data(ttl=300)
 def load_teams():
     """Load and normalize teams response into a list of dicts."""
     try:
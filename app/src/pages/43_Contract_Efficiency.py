@@ -22,12 +22,9 @@ st.title('Contract Efficiency & Free Agency Management')
 refresh = st.button('Refresh Free Agent Data')
 if refresh or 'evaluations' not in st.session_state:
     try:
-        resp = api_client.api_get('/strategy/draft-evaluations')
-        evaluations = []
-        if isinstance(resp, dict) and 'evaluations' in resp:
-            evaluations = resp.get('evaluations') or []
-        elif isinstance(resp, list):
-            evaluations = resp
+        evaluations = api_client.get_frame('/strategy/draft-evaluations', key='evaluations')
+        if evaluations is None:
+            evaluations = pd.DataFrame()
         st.session_state['evaluations'] = evaluations
         if refresh:
             st.success(f"Loaded {len(evaluations)} player evaluations")
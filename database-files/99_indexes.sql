@@ -23,5 +23,7 @@ CREATE INDEX idx_logs_created ON SystemLogs (created_at);
 CREATE INDEX idx_logs_service ON SystemLogs (service_name);
 CREATE INDEX idx_logs_severity ON SystemLogs (severity);
 CREATE INDEX idx_logs_resolved ON SystemLogs (resolved_at);
+-- log_type filters are always paired with a created_at window
+CREATE INDEX idx_logs_type_created ON SystemLogs (log_type, created_at);
 
 
@@ -7,6 +7,9 @@ DROP TABLE IF EXISTS PlayerLineups;
 DROP TABLE IF EXISTS TeamsPlayers;
 DROP TABLE IF EXISTS DraftEvaluations;
 DROP TABLE IF EXISTS GamePlans;
+DROP TABLE IF EXISTS CleanupSchedules;
+DROP TABLE IF EXISTS DataLoads;
+DROP TABLE IF EXISTS DataLoadRetryPolicies;
 DROP TABLE IF EXISTS SystemLogs;
 DROP TABLE IF EXISTS Game;
 DROP TABLE IF EXISTS LineupConfiguration;
@@ -14,6 +17,7 @@ DROP TABLE IF EXISTS Players;
 DROP TABLE IF EXISTS Teams;
 DROP TABLE IF EXISTS Agent;
 DROP TABLE IF EXISTS Users;
+DROP TABLE IF EXISTS TableVersions;
 
 CREATE TABLE Agent (
    agent_id INT PRIMARY KEY AUTO_INCREMENT,
@@ -209,8 +213,14 @@ CREATE TABLE GamePlans (
        REFERENCES Game(game_id) ON UPDATE CASCADE ON DELETE CASCADE
 );
 
+-- SystemLogs is RANGE-partitioned by month on created_at so retention can drop
+-- whole partitions instead of running DELETE. Only a catch-all partition is
+-- created here; backend/admin/log_partitions.py splits it into monthly
+-- partitions and drops expired ones. Partitioned InnoDB tables cannot carry
+-- foreign keys and every unique key must include created_at, hence the
+-- composite primary key and the plain index on user_id.
 CREATE TABLE SystemLogs (
-   log_id INT PRIMARY KEY AUTO_INCREMENT,
+   log_id INT AUTO_INCREMENT,
    log_type VARCHAR(50) NOT NULL,
    service_name VARCHAR(100),
    severity VARCHAR(20) NOT NULL,
@@ -221,10 +231,84 @@ CREATE TABLE SystemLogs (
    records_failed INT,
    source_file VARCHAR(255),
    user_id INT,
-   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+   created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
    resolved_at DATETIME,
    resolved_by VARCHAR(100),
    resolution_notes TEXT,
-   CONSTRAINT FK_SystemLogs_Users FOREIGN KEY (user_id)
+   PRIMARY KEY (log_id, created_at),
+   KEY idx_logs_user (user_id)
+)
+PARTITION BY RANGE COLUMNS (created_at) (
+   PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
+
+-- Data load runs tracked by the admin dashboard. Status is explicit rather
+-- than inferred from SystemLogs severity/resolved_at, and the composite
+-- indexes serve the dashboard's status and time-window filters.
+-- Retries of a failed load are new rows pointing at the first attempt through
+-- original_load_id; next_retry_at is set while a retry is scheduled.
+CREATE TABLE DataLoads (
+   load_id INT PRIMARY KEY AUTO_INCREMENT,
+   load_type VARCHAR(100) NOT NULL,
+   status ENUM('pending', 'running', 'completed', 'failed', 'retry_scheduled', 'dead_letter')
+       NOT NULL DEFAULT 'pending',
+   source_file VARCHAR(255),
+   records_processed INT NOT NULL DEFAULT 0,
+   records_failed INT NOT NULL DEFAULT 0,
+   error_message TEXT,
+   error_code INT,
+   initiated_by INT,
+   started_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   completed_at DATETIME,
+   attempt INT NOT NULL DEFAULT 1,
+   original_load_id INT,
+   next_retry_at DATETIME,
+   legacy_log_id INT,
+   KEY idx_loads_status_started (status, started_at),
+   KEY idx_loads_status_retry (status, next_retry_at),
+   KEY idx_loads_type_status (load_type, status),
+   KEY idx_loads_started (started_at),
+   KEY idx_loads_original (original_load_id),
+   UNIQUE KEY unique_loads_legacy_log (legacy_log_id),
+   CONSTRAINT FK_DataLoads_Users FOREIGN KEY (initiated_by)
+       REFERENCES Users(user_id) ON UPDATE CASCADE ON DELETE SET NULL,
+   CONSTRAINT FK_DataLoads_Original FOREIGN KEY (original_load_id)
+       REFERENCES DataLoads(load_id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- Retry policy per load_type; the 'default' row covers load types without one.
+CREATE TABLE DataLoadRetryPolicies (
+   load_type VARCHAR(100) PRIMARY KEY,
+   max_attempts INT NOT NULL DEFAULT 3,
+   base_delay_seconds INT NOT NULL DEFAULT 30,
+   max_delay_seconds INT NOT NULL DEFAULT 900,
+   backoff_multiplier DECIMAL(4,2) NOT NULL DEFAULT 2.00,
+   jitter_ratio DECIMAL(3,2) NOT NULL DEFAULT 0.50,
+   retry_transient_only BOOLEAN NOT NULL DEFAULT TRUE,
+   updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE CleanupSchedules (
+   schedule_id INT PRIMARY KEY AUTO_INCREMENT,
+   cleanup_type VARCHAR(100) NOT NULL,
+   frequency ENUM('daily', 'weekly', 'monthly') NOT NULL,
+   retention_days INT NOT NULL,
+   status ENUM('active', 'paused') NOT NULL DEFAULT 'active',
+   next_run DATETIME,
+   last_run DATETIME,
+   created_by INT,
+   created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   legacy_log_id INT,
+   KEY idx_cleanup_status_next (status, next_run),
+   UNIQUE KEY unique_cleanup_legacy_log (legacy_log_id),
+   CONSTRAINT FK_CleanupSchedules_Users FOREIGN KEY (created_by)
        REFERENCES Users(user_id) ON UPDATE CASCADE ON DELETE SET NULL
-);
\ No newline at end of file
+);
+
+-- Per-table change counters behind the API's ETags (api/backend/etags.py),
+-- bumped after every write made through the API. A missing row is version 0.
+CREATE TABLE TableVersions (
+   table_name VARCHAR(64) PRIMARY KEY,
+   version BIGINT UNSIGNED NOT NULL DEFAULT 1,
+   updated_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3)
+);
@@ -4,6 +4,9 @@ DELETE FROM PlayerLineups;
 DELETE FROM PlayerMatchup;
 DELETE FROM PlayerGameStats;
 DELETE FROM TeamsPlayers;
+DELETE FROM CleanupSchedules;
+DELETE FROM DataLoads;
+DELETE FROM DataLoadRetryPolicies;
 DELETE FROM SystemLogs;
 DELETE FROM GamePlans;
 DELETE FROM DraftEvaluations;
@@ -2927,4 +2930,23 @@ INSERT INTO PlayerLineups (player_id, lineup_id, position_in_lineup) VALUES
 (17, 55, 'Shooting Guard'),
 (18, 55, 'Small Forward'),
 (19, 55, 'Power Forward'),
-(20, 55, 'Center');
\ No newline at end of file
+(20, 55, 'Center');
+
+INSERT INTO DataLoads (load_type, status, source_file, records_processed, records_failed, error_message, initiated_by, started_at, completed_at) VALUES
+('player_stats', 'completed', 'nba_box_scores.csv', 4820, 0, NULL, 1, NOW() - INTERVAL 3 DAY, NOW() - INTERVAL 3 DAY + INTERVAL 14 MINUTE),
+('game_results', 'completed', 'nba_game_results.csv', 1230, 2, NULL, 35, NOW() - INTERVAL 2 DAY, NOW() - INTERVAL 2 DAY + INTERVAL 6 MINUTE),
+('external_data_feed', 'failed', 'data_feed_service.py', 1500, 67, 'External sports data feed connection unstable', NULL, NOW() - INTERVAL 1 DAY, NOW() - INTERVAL 1 DAY + INTERVAL 3 MINUTE),
+('data_warehouse_sync', 'completed', 'data_sync.py', 10000, 18, NULL, 35, NOW() - INTERVAL 20 HOUR, NOW() - INTERVAL 19 HOUR),
+('draft_prospects', 'pending', 'combine_results.csv', 0, 0, NULL, 13, NOW() - INTERVAL 2 HOUR, NULL),
+('player_stats', 'running', 'nba_box_scores_daily.csv', 350, 0, NULL, 1, NOW() - INTERVAL 10 MINUTE, NULL);
+
+INSERT INTO DataLoadRetryPolicies (load_type, max_attempts, base_delay_seconds, max_delay_seconds, backoff_multiplier, jitter_ratio, retry_transient_only) VALUES
+('default', 3, 30, 900, 2.00, 0.50, TRUE),
+('player_stats', 5, 15, 600, 2.00, 0.50, TRUE),
+('game_results', 5, 15, 600, 2.00, 0.50, TRUE),
+('external_data_feed', 4, 60, 1800, 3.00, 0.50, FALSE);
+
+INSERT INTO CleanupSchedules (cleanup_type, frequency, retention_days, status, next_run, last_run, created_by) VALUES
+('error_logs', 'weekly', 30, 'active', NOW() + INTERVAL 4 DAY, NOW() - INTERVAL 3 DAY, 1),
+('validation_logs', 'daily', 14, 'active', NOW() + INTERVAL 1 DAY, NOW() - INTERVAL 1 DAY, 35),
+('debug_logs', 'monthly', 90, 'paused', NULL, NULL, 35);
@@ -0,0 +1,39 @@
+-- Migration 001: RANGE-partition SystemLogs by month on created_at.
+--
+-- Run once against an existing BallWatch database:
+--   mysql -u root -p BallWatch < database-files/migrations/001_partition_system_logs.sql
+--
+-- Fresh installs already get the partitioned table from ballwatchers-schema.sql.
+-- The table is rebuilt with a single catch-all partition; the API's partition
+-- maintenance job (backend/admin/log_partitions.py) then splits it into
+-- monthly partitions and drops expired ones. To do that immediately run:
+--   cd api && python -m backend.admin.log_partitions
+--
+-- MySQL restrictions on partitioned InnoDB tables drive the schema changes:
+--   * foreign keys are not supported, so FK_SystemLogs_Users is dropped
+--     (user_id keeps a plain index);
+--   * every unique key must contain the partitioning column, so the primary
+--     key becomes (log_id, created_at) and created_at becomes NOT NULL.
+USE BallWatch;
+
+ALTER TABLE SystemLogs DROP FOREIGN KEY FK_SystemLogs_Users;
+
+UPDATE SystemLogs SET created_at = NOW() WHERE created_at IS NULL;
+
+ALTER TABLE SystemLogs
+   MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   DROP PRIMARY KEY,
+   ADD PRIMARY KEY (log_id, created_at);
+
+-- The FK's implicit index is named after the constraint; replace it with the
+-- index name used by the schema file.
+ALTER TABLE SystemLogs
+   DROP INDEX FK_SystemLogs_Users,
+   ADD INDEX idx_logs_user (user_id);
+
+ALTER TABLE SystemLogs
+   PARTITION BY RANGE COLUMNS (created_at) (
+      PARTITION pmax VALUES LESS THAN (MAXVALUE)
+   );
+
+CREATE INDEX idx_logs_type_created ON SystemLogs (log_type, created_at);
@@ -0,0 +1,112 @@
+-- Migration 002: move data loads and cleanup schedules out of SystemLogs.
+--
+-- Run once against an existing BallWatch database (after 001):
+--   mysql -u root -p BallWatch < database-files/migrations/002_data_loads_cleanup_schedules.sql
+--
+-- Fresh installs already get both tables from ballwatchers-schema.sql.
+-- The backfill is idempotent: each copied row records its source log_id in
+-- legacy_log_id, and rows already copied are skipped on a re-run. The source
+-- SystemLogs rows are left in place and age out with normal log retention.
+USE BallWatch;
+
+CREATE TABLE IF NOT EXISTS DataLoads (
+   load_id INT PRIMARY KEY AUTO_INCREMENT,
+   load_type VARCHAR(100) NOT NULL,
+   status ENUM('pending', 'running', 'completed', 'failed') NOT NULL DEFAULT 'pending',
+   source_file VARCHAR(255),
+   records_processed INT NOT NULL DEFAULT 0,
+   records_failed INT NOT NULL DEFAULT 0,
+   error_message TEXT,
+   initiated_by INT,
+   started_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   completed_at DATETIME,
+   legacy_log_id INT,
+   KEY idx_loads_status_started (status, started_at),
+   KEY idx_loads_type_status (load_type, status),
+   KEY idx_loads_started (started_at),
+   UNIQUE KEY unique_loads_legacy_log (legacy_log_id),
+   CONSTRAINT FK_DataLoads_Users FOREIGN KEY (initiated_by)
+       REFERENCES Users(user_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS CleanupSchedules (
+   schedule_id INT PRIMARY KEY AUTO_INCREMENT,
+   cleanup_type VARCHAR(100) NOT NULL,
+   frequency ENUM('daily', 'weekly', 'monthly') NOT NULL,
+   retention_days INT NOT NULL,
+   status ENUM('active', 'paused') NOT NULL DEFAULT 'active',
+   next_run DATETIME,
+   last_run DATETIME,
+   created_by INT,
+   created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+   legacy_log_id INT,
+   KEY idx_cleanup_status_next (status, next_run),
+   UNIQUE KEY unique_cleanup_legacy_log (legacy_log_id),
+   CONSTRAINT FK_CleanupSchedules_Users FOREIGN KEY (created_by)
+       REFERENCES Users(user_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+-- Data loads: same row selection and status rules the admin routes used to
+-- apply at query time, evaluated once here. SystemLogs.user_id has no foreign
+-- key since 001, so users are joined to drop ids that no longer exist.
+INSERT INTO DataLoads (
+   load_type, status, source_file, records_processed, records_failed,
+   error_message, initiated_by, started_at, completed_at, legacy_log_id
+)
+SELECT
+   IFNULL(l.service_name, 'unknown'),
+   CASE
+      WHEN l.severity IN ('error', 'critical', 'high') OR l.log_type = 'error' THEN 'failed'
+      WHEN l.resolved_at IS NOT NULL THEN 'completed'
+      WHEN l.log_type = 'data_load' AND l.severity IN ('info', 'low') THEN 'completed'
+      WHEN l.severity IN ('warning', 'medium') THEN 'running'
+      ELSE 'pending'
+   END,
+   l.source_file,
+   IFNULL(l.records_processed, 0),
+   IFNULL(l.records_failed, 0),
+   CASE
+      WHEN l.severity IN ('error', 'critical', 'high') OR l.log_type = 'error' THEN l.message
+   END,
+   u.user_id,
+   l.created_at,
+   l.resolved_at,
+   l.log_id
+FROM SystemLogs l
+LEFT JOIN Users u ON u.user_id = l.user_id
+WHERE (l.log_type = 'data_load'
+       OR LOWER(l.service_name) LIKE '%data%'
+       OR LOWER(l.service_name) LIKE '%feed%'
+       OR LOWER(l.message) LIKE '%load%')
+  AND l.log_type NOT IN ('validation', 'cleanup_schedule', 'cleanup_run')
+  AND NOT EXISTS (SELECT 1 FROM DataLoads d WHERE d.legacy_log_id = l.log_id);
+
+-- Cleanup schedules were stored as frequency in message, retention_days in
+-- records_processed and next_run in resolved_at.
+INSERT INTO CleanupSchedules (
+   cleanup_type, frequency, retention_days, status, next_run, created_by, created_at, legacy_log_id
+)
+SELECT
+   IFNULL(l.service_name, 'unknown'),
+   CASE WHEN LOWER(l.message) IN ('daily', 'weekly', 'monthly') THEN LOWER(l.message) ELSE 'weekly' END,
+   IFNULL(l.records_processed, 0),
+   'active',
+   l.resolved_at,
+   u.user_id,
+   l.created_at,
+   l.log_id
+FROM SystemLogs l
+LEFT JOIN Users u ON u.user_id = l.user_id
+WHERE l.log_type = 'cleanup_schedule'
+  AND NOT EXISTS (SELECT 1 FROM CleanupSchedules c WHERE c.legacy_log_id = l.log_id);
+
+-- Last run per schedule type from the recorded cleanup history
+UPDATE CleanupSchedules c
+JOIN (
+   SELECT service_name, MAX(IFNULL(resolved_at, created_at)) AS last_run
+   FROM SystemLogs
+   WHERE log_type = 'cleanup_run'
+   GROUP BY service_name
+) r ON r.service_name = c.cleanup_type
+SET c.last_run = r.last_run
+WHERE c.last_run IS NULL;
@@ -0,0 +1,33 @@
+-- Migration 003: retry policies and attempt history for data loads.
+--
+-- Run once against an existing BallWatch database (after 002):
+--   mysql -u root -p BallWatch < database-files/migrations/003_data_load_retries.sql
+--
+-- Fresh installs already get these columns and the policy table from
+-- ballwatchers-schema.sql. Existing loads become attempt 1 of themselves.
+USE BallWatch;
+
+ALTER TABLE DataLoads
+   MODIFY status ENUM('pending', 'running', 'completed', 'failed', 'retry_scheduled', 'dead_letter')
+       NOT NULL DEFAULT 'pending',
+   ADD COLUMN error_code INT AFTER error_message,
+   ADD COLUMN attempt INT NOT NULL DEFAULT 1 AFTER completed_at,
+   ADD COLUMN original_load_id INT AFTER attempt,
+   ADD COLUMN next_retry_at DATETIME AFTER original_load_id,
+   ADD KEY idx_loads_status_retry (status, next_retry_at),
+   ADD KEY idx_loads_original (original_load_id),
+   ADD CONSTRAINT FK_DataLoads_Original FOREIGN KEY (original_load_id)
+       REFERENCES DataLoads(load_id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+CREATE TABLE IF NOT EXISTS DataLoadRetryPolicies (
+   load_type VARCHAR(100) PRIMARY KEY,
+   max_attempts INT NOT NULL DEFAULT 3,
+   base_delay_seconds INT NOT NULL DEFAULT 30,
+   max_delay_seconds INT NOT NULL DEFAULT 900,
+   backoff_multiplier DECIMAL(4,2) NOT NULL DEFAULT 2.00,
+   jitter_ratio DECIMAL(3,2) NOT NULL DEFAULT 0.50,
+   retry_transient_only BOOLEAN NOT NULL DEFAULT TRUE,
+   updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO DataLoadRetryPolicies (load_type) VALUES ('default');
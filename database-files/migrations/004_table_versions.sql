@@ -0,0 +1,16 @@
+-- Migration 004: per-table version counters for conditional GETs.
+--
+-- Run once against an existing BallWatch database:
+--   mysql -u root -p BallWatch < database-files/migrations/004_table_versions.sql
+--
+-- Fresh installs already get the table from ballwatchers-schema.sql. The API
+-- bumps a table's row after each write it makes and derives response ETags
+-- from the versions (api/backend/etags.py). Until this runs the API serves
+-- responses without ETags.
+USE BallWatch;
+
+CREATE TABLE IF NOT EXISTS TableVersions (
+   table_name VARCHAR(64) PRIMARY KEY,
+   version BIGINT UNSIGNED NOT NULL DEFAULT 1,
+   updated_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) ON UPDATE CURRENT_TIMESTAMP(3)
+);